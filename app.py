@@ -28,6 +28,18 @@ def check_database_connection() -> bool:
     return container.is_supabase_available()
 
 
+def start_background_workers() -> None:
+    """
+    Arranca los workers de la cola de imágenes (idempotente entre reruns).
+    Los trabajos que quedaron pendientes antes de un reinicio se retoman sin esperar a un nuevo encargo.
+    """
+    try:
+        from services.image_service import start_image_workers
+        start_image_workers()
+    except Exception as e:
+        print(f"Workers de imagen no iniciados: {e}")
+
+
 def try_auto_login(cookie_manager) -> bool:
     """
     Intenta realizar auto-login usando la cookie de sesión.
@@ -101,6 +113,9 @@ def main():
         render_error_page(container.status.supabase_error or "Error desconocido")
         return
 
+    # V26.25: Workers de la cola de imágenes activos desde el arranque
+    start_background_workers()
+
     # Inicializar Cookie Manager (debe ser al inicio)
     cookie_manager = stx.CookieManager()
 
@@ -38,6 +38,35 @@ LOG_CONTAINER_HEIGHT = 300        # Altura del contenedor de logs en píxeles
 TEXT_MODEL_NAME = "gemini-2.5-flash"
 IMAGE_MODEL_NAME = "imagen-3.0-generate-001"
 
+# --- Caché de Respuestas IA (V26.22) ---
+AI_CACHE_ENABLED = True            # Interruptor global (las llamadas además deben optar con cache=True)
+AI_CACHE_TTL_SECONDS = 3600        # Vigencia por defecto de una respuesta cacheada
+AI_CACHE_MAX_ENTRIES = 512         # Entradas en memoria (LRU)
+AI_CACHE_DIR = ".cache/ai"         # Backend en disco (None/"" = solo memoria)
+AI_QUERY_CACHE_TTL_SECONDS = 120   # Consultas informativas del asistente (dependen del estado)
+
+# --- Gobernador de Llamadas IA (V26.23) ---
+AI_RATE_PER_SECOND = 2.0           # Token bucket: llamadas/segundo sostenidas
+AI_RATE_BURST = 5                  # Token bucket: ráfaga máxima
+AI_MAX_IN_FLIGHT = 4               # Llamadas simultáneas al proveedor
+AI_ACQUIRE_TIMEOUT_SECONDS = 30.0  # Espera máxima por turno antes de desistir
+AI_MAX_RETRIES = 2                 # Reintentos por llamada (errores transitorios)
+AI_BACKOFF_BASE_SECONDS = 0.5      # Backoff exponencial con jitter: base * 2^intento
+AI_BACKOFF_MAX_SECONDS = 8.0
+AI_RETRY_BUDGET_RATIO = 0.2        # Cada llamada aporta 0.2 reintentos al presupuesto compartido
+AI_RETRY_BUDGET_MAX = 10.0         # Presupuesto máximo acumulado
+AI_BREAKER_FAILURE_THRESHOLD = 5   # Fallos transitorios consecutivos para abrir el circuito
+AI_BREAKER_COOLDOWN_SECONDS = 60.0 # Tiempo abierto antes de probar (half-open)
+
+# --- Function Calling del Asistente (V26.24) ---
+AI_TOOL_MAX_WORKERS = 4            # Herramientas de solo lectura ejecutadas en paralelo por turno
+
+# --- Cola de Imágenes (V26.21) ---
+IMAGE_JOB_WORKERS = 2              # Hilos de render por proceso
+IMAGE_JOB_POLL_SECONDS = 5.0       # Espera de un worker ocioso antes de re-consultar la cola
+IMAGE_JOB_STALE_SECONDS = 600      # Un trabajo 'running' sin actividad se reclama de nuevo
+IMAGE_CACHE_DIR = ".cache/images"  # Caché local direccionada por contenido (sha256)
+
 # --- Configuración de Base de Datos ---
 # Modificado a 500,000 para facilitar el debug de la economía
 DEFAULT_PLAYER_CREDITS = 500000    # Créditos iniciales para nuevos jugadores
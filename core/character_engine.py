@@ -273,113 +273,158 @@ def update_character_access_level(
 
 # --- Función Principal de Progresión Pasiva (V4.3) ---
 
-def process_passive_knowledge_updates(player_id: int, current_tick: int) -> List[str]:
+def knowledge_ticks_required(level: KnowledgeLevel, presence: int) -> Optional[int]:
     """
-    Se ejecuta cada Tick. Revisa todos los personajes de la facción.
-    Aplica la fórmula dinámica basada en Presencia para subir nivel.
-    Revela secretos al alcanzar nivel FRIEND.
+    Ticks de convivencia necesarios para subir desde `level` (fórmulas V4.3).
+    Retorna None si el nivel no progresa pasivamente (FRIEND).
     """
-    from data.character_repository import (
-        get_all_player_characters,
-        set_character_knowledge_level,
-        get_character_knowledge_level,
-        update_character
-    )
+    if level == KnowledgeLevel.UNKNOWN:
+        # Fórmula: Base (20) - (Presencia - 10)
+        # Presencia 15 (+5) -> Req = 20 - 5 = 15.
+        # Presencia 5 (-5) -> Req = 20 - (-5) = 25.
+        return max(5, TICKS_REQ_KNOWN_BASE - (presence - 10))  # Seguridad
+    if level == KnowledgeLevel.KNOWN:
+        # Fórmula: Base (50) + Penalización si Presencia < 10
+        return TICKS_REQ_FRIEND_BASE + max(0, 10 - presence)
+    return None
+
+
+def _knowledge_presence(char: Dict[str, Any]) -> int:
+    """Presencia desde la proyección hot (atributos), por defecto 10."""
+    attributes = char.get("atributos")
+    if not isinstance(attributes, dict):
+        return 10
+    try:
+        return int(attributes.get("presencia", 10))
+    except (TypeError, ValueError):
+        return 10
+
+
+def plan_knowledge_progress(
+    characters: List[Dict[str, Any]],
+    knowledge: Dict[Tuple[int, int], Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    V26.15: Calcula en memoria el avance de un tick para todos los personajes.
 
-    updates_log = []
-    # get_all_player_characters devuelve dicts híbridos (cols SQL + stats_json)
-    characters = get_all_player_characters(player_id)
+    Args:
+        characters: Proyección de get_faction_characters_for_knowledge
+        knowledge: {(character_id, player_id): fila de character_knowledge}
 
+    Returns:
+        Filas para apply_knowledge_progress_bulk. Al subir de nivel el contador
+        vuelve a 0; los comandantes y los personajes FRIEND no progresan.
+    """
+    rows = []
     for char in characters:
         # Saltar comandantes (siempre son FRIEND implícito)
         if char.get("es_comandante", False):
             continue
 
-        char_id = char["id"]
-        # Obtener nivel actual desde DB o stats
-        current_level_enum = get_character_knowledge_level(char_id, player_id)
+        key = (char["id"], char["player_id"])
+        entry = knowledge.get(key) or {}
+        try:
+            current_level = KnowledgeLevel(entry.get("knowledge_level") or KnowledgeLevel.UNKNOWN.value)
+        except ValueError:
+            current_level = KnowledgeLevel.UNKNOWN
 
-        # Si ya es FRIEND, no hay más progreso pasivo
-        if current_level_enum == KnowledgeLevel.FRIEND:
+        required = knowledge_ticks_required(current_level, _knowledge_presence(char))
+        if required is None:
             continue
-            
-        # Extraer Stats y Atributos
-        stats = char.get("stats_json", {})
-        attributes = {}
-        if "capacidades" in stats and "atributos" in stats["capacidades"]:
-            attributes = stats["capacidades"]["atributos"]
-        elif "atributos" in stats:
-            attributes = stats["atributos"]
-            
-        presence = attributes.get('presencia', 10) # Default 10
 
-        # Obtener progreso acumulado
-        progress_ticks = stats.get('knowledge_progress_ticks', 0)
-        progress_ticks += 1
-        stats['knowledge_progress_ticks'] = progress_ticks
-        
-        new_level = None
+        progress_ticks = (entry.get("progress_ticks") or 0) + 1
+        new_level = current_level
+        if progress_ticks >= required:
+            new_level = KnowledgeLevel.KNOWN if current_level == KnowledgeLevel.UNKNOWN else KnowledgeLevel.FRIEND
+            progress_ticks = 0
 
-        # --- LÓGICA DE TRANSICIÓN V4.3 ---
-        
-        # 1. UNKNOWN -> KNOWN
-        if current_level_enum == KnowledgeLevel.UNKNOWN:
-            # Fórmula: Base (20) - (Presencia - 10)
-            # Presencia 15 (+5) -> Req = 20 - 5 = 15.
-            # Presencia 5 (-5) -> Req = 20 - (-5) = 25.
-            req_ticks = TICKS_REQ_KNOWN_BASE - (presence - 10)
-            req_ticks = max(5, req_ticks) # Seguridad
-            
-            if progress_ticks >= req_ticks:
-                new_level = KnowledgeLevel.KNOWN
-                # Generar bio_conocida si no existe
-                if 'bio_conocida' not in stats.get('bio', {}):
-                    if 'bio' not in stats: stats['bio'] = {}
-                    stats['bio']['bio_conocida'] = "Biografía detallada generada por IA."
-
-        # 2. KNOWN -> FRIEND
-        elif current_level_enum == KnowledgeLevel.KNOWN:
-            # Fórmula: Base (50) + Penalización si Presencia < 10
-            penalty = max(0, 10 - presence)
-            req_ticks = TICKS_REQ_FRIEND_BASE + penalty
-            
-            if progress_ticks >= req_ticks:
-                new_level = KnowledgeLevel.FRIEND
+        rows.append({
+            "character_id": key[0],
+            "player_id": key[1],
+            "from_level": current_level.value,
+            "knowledge_level": new_level.value,
+            "progress_ticks": progress_ticks
+        })
+    return rows
 
-        # --- APLICAR CAMBIOS ---
-        if new_level:
-            char_name = char.get("nombre", "Unidad")
-            
-            # Resetear contador para el nuevo nivel
-            stats['knowledge_progress_ticks'] = 0
-            
-            # Actualizar DB
-            update_character(char_id, {"stats_json": stats})
-            success = set_character_knowledge_level(char_id, player_id, new_level)
-            
-            if success:
-                if new_level == KnowledgeLevel.KNOWN:
-                    msg = f"ℹ️ Conocimiento actualizado: Has pasado suficiente tiempo con **{char_name}** para conocer sus capacidades."
-                    updates_log.append(msg)
-                    log_event(msg, player_id)
-                    update_character_access_level(char_id, BIO_ACCESS_KNOWN)
-
-                elif new_level == KnowledgeLevel.FRIEND:
-                    msg = f"🤝 Vínculo fortalecido: **{char_name}** ahora confía plenamente en ti."
-                    updates_log.append(msg)
-                    log_event(msg, player_id)
-                    update_character_access_level(char_id, BIO_ACCESS_DEEP)
-
-                    # Revelar secreto
-                    secret_type, secret_msg, _ = reveal_secret_on_friend(
-                        char_id,
-                        player_id,
-                        char
-                    )
-                    updates_log.append(secret_msg)
-                    log_event(secret_msg, player_id)
-        else:
-            # Solo actualizar contador de progreso en DB
-            update_character(char_id, {"stats_json": stats})
 
-    return updates_log
\ No newline at end of file
+def _apply_knowledge_level_up(character_id: int, player_id: int, new_level: KnowledgeLevel) -> List[str]:
+    """
+    Efectos pesados de una subida de nivel (bio y secreto), una escritura por personaje.
+    """
+    from data.character_repository import get_character_by_id, update_character
+
+    char = get_character_by_id(character_id)
+    if not char:
+        return []
+
+    char_name = char.get("nombre", "Unidad")
+    stats = char.get("stats_json") or {}
+    char["stats_json"] = stats
+    bio = stats.setdefault("bio", {})
+    messages = []
+
+    if new_level == KnowledgeLevel.KNOWN:
+        # Generar bio_conocida si no existe
+        if "bio_conocida" not in bio:
+            bio["bio_conocida"] = "Biografía detallada generada por IA."
+        bio["nivel_acceso"] = BIO_ACCESS_KNOWN
+        update_character(character_id, {"stats_json": stats})
+        messages.append(
+            f"ℹ️ Conocimiento actualizado: Has pasado suficiente tiempo con **{char_name}** para conocer sus capacidades."
+        )
+
+    elif new_level == KnowledgeLevel.FRIEND:
+        messages.append(f"🤝 Vínculo fortalecido: **{char_name}** ahora confía plenamente en ti.")
+        # reveal_secret_on_friend persiste stats_json (incluye el nuevo nivel de acceso)
+        bio["nivel_acceso"] = BIO_ACCESS_DEEP
+        _, secret_msg, _ = reveal_secret_on_friend(character_id, player_id, char)
+        messages.append(secret_msg)
+
+    for msg in messages:
+        log_event(msg, player_id)
+    return messages
+
+
+def process_passive_knowledge_bulk(
+    current_tick: int,
+    player_ids: Optional[List[int]] = None
+) -> Dict[int, List[str]]:
+    """
+    V26.15: Progresión pasiva de conocimiento de todas las facciones en lote.
+    1 lectura de personajes (proyección) + 1 de character_knowledge + 1 RPC de
+    contadores; solo las subidas de nivel cargan y reescriben el personaje.
+
+    Returns:
+        {player_id: [mensajes]} de las subidas de nivel aplicadas.
+    """
+    from data.character_repository import (
+        get_faction_characters_for_knowledge,
+        get_all_character_knowledge,
+        apply_knowledge_progress_bulk
+    )
+
+    characters = get_faction_characters_for_knowledge(player_ids)
+    if not characters:
+        return {}
+
+    knowledge = get_all_character_knowledge(player_ids)
+    rows = plan_knowledge_progress(characters, knowledge)
+    level_ups = apply_knowledge_progress_bulk(rows)
+
+    updates_log: Dict[int, List[str]] = {}
+    for character_id, player_id, new_level in level_ups:
+        messages = _apply_knowledge_level_up(character_id, player_id, new_level)
+        if messages:
+            updates_log.setdefault(player_id, []).extend(messages)
+    return updates_log
+
+
+def process_passive_knowledge_updates(player_id: int, current_tick: int) -> List[str]:
+    """
+    Se ejecuta cada Tick. Revisa todos los personajes de la facción.
+    Aplica la fórmula dinámica basada en Presencia para subir nivel.
+    Revela secretos al alcanzar nivel FRIEND.
+    V26.15: Delegado en process_passive_knowledge_bulk (contador en character_knowledge).
+    """
+    return process_passive_knowledge_bulk(current_tick, [player_id]).get(player_id, [])
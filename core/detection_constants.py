@@ -20,6 +20,10 @@ DETECTION_TOTAL_SUCCESS_MARGIN = 25
 # Dificultad base para tiradas de detección
 DETECTION_BASE_DIFFICULTY = 50
 
+# --- ENCUENTROS EN STARLANE (V26.10) ---
+# Radio de encuentro como fracción de la longitud del lane (0.0 = origen, 1.0 = destino)
+STARLANE_ENCOUNTER_RADIUS = 0.05
+
 # --- CONTEXTO DE COMBATE ---
 # Tipos de situación resultante de la detección
 class DetectionOutcome:
@@ -9,16 +9,20 @@ V14.1 Nuevas funcionalidades:
 - resolve_mutual_detection: Detección bidireccional (Conflicto/Emboscada)
 - resolve_escape_attempt: Mecánica de huida y caza
 - Lógica de revelación de entidades con estado HIDDEN
+
+V26.10: Encuentros en starlane por segmentos espacio-tiempo (barrido de intervalos por lane).
+V26.13: Agrupación con UnitRecord; UnitSchema una vez por unidad y solo en ubicaciones disputadas.
 """
 
 from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 from enum import Enum
+import heapq
 
 from core.mrg_engine import resolve_action, MRGResult, ResultType
 from core.mrg_constants import DIFFICULTY_STANDARD, DIFFICULTY_CHALLENGING
-from core.models import UnitSchema, UnitStatus, UnitMemberSchema
+from core.models import UnitSchema, UnitStatus, UnitMemberSchema, UnitRecord
 from core.movement_constants import INTERDICTION_MODULE_ID
 from core.rules import calculate_skills
 from core.detection_constants import (
@@ -33,7 +37,8 @@ from core.detection_constants import (
     SKILL_STEALTH_GROUND,
     SKILL_SENSOR_EVASION,
     SKILL_TACTICAL_ESCAPE,
-    SKILL_HUNT
+    SKILL_HUNT,
+    STARLANE_ENCOUNTER_RADIUS
 )
 from data.unit_repository import (
     get_units_at_location,
@@ -284,7 +289,7 @@ def process_detection_phase(current_tick: int) -> List[DetectionResult]:
     detections.extend(sector_detections)
 
     # 2. Detectar en starlanes (unidades en tránsito)
-    starlane_detections = _process_starlane_detections()
+    starlane_detections = _process_starlane_detections(current_tick)
     detections.extend(starlane_detections)
 
     # 3. Registrar detecciones en DB
@@ -310,25 +315,33 @@ def _process_location_detections() -> List[DetectionResult]:
         if not response.data:
             return []
 
-        units = response.data
+        # V26.13: Registros compactos para agrupar; UnitSchema solo para unidades
+        # en ubicaciones disputadas y una sola vez por unidad (no por par)
+        units = [UnitRecord.from_row(u) for u in response.data]
+        schemas: Dict[int, UnitSchema] = {}
+
+        def _schema(record: UnitRecord) -> UnitSchema:
+            if record.id not in schemas:
+                schemas[record.id] = record.to_schema()
+            return schemas[record.id]
 
         # Agrupar por ubicación
         location_groups = defaultdict(list)
-        for unit_data in units:
+        for unit in units:
             loc_key = (
-                unit_data.get('location_system_id'),
-                unit_data.get('ring', 0),
-                unit_data.get('location_planet_id'),
-                unit_data.get('location_sector_id')
+                unit.location_system_id,
+                unit.ring,
+                unit.location_planet_id,
+                unit.location_sector_id
             )
-            location_groups[loc_key].append(unit_data)
+            location_groups[loc_key].append(unit)
 
         # Procesar grupos con múltiples facciones
         for loc_key, units_at_loc in location_groups.items():
             # Agrupar por jugador
             by_player = defaultdict(list)
             for u in units_at_loc:
-                by_player[u.get('player_id')].append(u)
+                by_player[u.player_id].append(u)
 
             # Si hay más de un jugador, hacer checks cruzados
             player_ids = list(by_player.keys())
@@ -339,10 +352,10 @@ def _process_location_detections() -> List[DetectionResult]:
             for i, player_a in enumerate(player_ids):
                 for player_b in player_ids[i+1:]:
                     # Player A intenta detectar a Player B
-                    for unit_a_data in by_player[player_a]:
-                        for unit_b_data in by_player[player_b]:
-                            unit_a = UnitSchema.from_dict(unit_a_data)
-                            unit_b = UnitSchema.from_dict(unit_b_data)
+                    for record_a in by_player[player_a]:
+                        for record_b in by_player[player_b]:
+                            unit_a = _schema(record_a)
+                            unit_b = _schema(record_b)
 
                             # A detecta a B
                             det_result = check_detection(unit_a, unit_b, "passive")
@@ -358,17 +371,149 @@ def _process_location_detections() -> List[DetectionResult]:
     return detections
 
 
-def _process_starlane_detections() -> List[DetectionResult]:
+# --- SEGMENTOS DE STARLANE (V26.10) ---
+
+# Columnas mínimas para indexar tránsitos (las filas completas solo se cargan para candidatos)
+_LANE_INDEX_COLUMNS = (
+    "id, player_id, starlane_id, transit_origin_system_id, "
+    "transit_destination_system_id, transit_start_tick, transit_end_tick"
+)
+
+
+@dataclass
+class LaneSegment:
     """
-    Procesa detecciones entre unidades en la misma starlane.
+    Tramo recorrido por una unidad en su starlane durante el tick [t-1, t].
+    Posición normalizada al sentido canónico del lane (sistema de menor ID = 0.0),
+    de modo que unidades en sentidos opuestos comparten coordenadas.
+    """
+    unit_id: int
+    player_id: int
+    starlane_id: int
+    direction: int          # +1 hacia el sistema de mayor ID, -1 en sentido contrario
+    t_start: float
+    t_end: float
+    pos_start: float
+    pos_end: float
+
+    @property
+    def low(self) -> float:
+        return min(self.pos_start, self.pos_end)
+
+    @property
+    def high(self) -> float:
+        return max(self.pos_start, self.pos_end)
+
+    def position_at(self, t: float) -> float:
+        if self.t_end <= self.t_start:
+            return self.pos_start
+        frac = (t - self.t_start) / (self.t_end - self.t_start)
+        return self.pos_start + (self.pos_end - self.pos_start) * frac
+
+
+def build_lane_segment(unit_data: Dict[str, Any], current_tick: int) -> Optional[LaneSegment]:
+    """
+    Segmento de una unidad en tránsito a partir de sus ticks de salida y llegada.
+    Sin ticks fiables (datos legados) la unidad ocupa el lane completo durante el tick.
+    """
+    starlane_id = unit_data.get('starlane_id')
+    if not starlane_id:
+        return None
+
+    origin = unit_data.get('transit_origin_system_id')
+    dest = unit_data.get('transit_destination_system_id')
+    direction = -1 if (origin is not None and dest is not None and origin > dest) else 1
+
+    start_tick = unit_data.get('transit_start_tick')
+    end_tick = unit_data.get('transit_end_tick')
+    window_start, window_end = current_tick - 1, current_tick
+
+    if start_tick is None or end_tick is None or end_tick <= start_tick:
+        return LaneSegment(
+            unit_id=unit_data['id'], player_id=unit_data.get('player_id'),
+            starlane_id=starlane_id, direction=direction,
+            t_start=window_start, t_end=window_end, pos_start=0.0, pos_end=1.0
+        )
+
+    t_start = max(window_start, start_tick)
+    t_end = min(window_end, end_tick)
+    if t_end < t_start:
+        return None  # Aún no salió o ya llegó
+
+    def progress(t: float) -> float:
+        p = (t - start_tick) / (end_tick - start_tick)
+        return p if direction > 0 else 1.0 - p
+
+    return LaneSegment(
+        unit_id=unit_data['id'], player_id=unit_data.get('player_id'),
+        starlane_id=starlane_id, direction=direction,
+        t_start=t_start, t_end=t_end,
+        pos_start=progress(t_start), pos_end=progress(t_end)
+    )
+
+
+def index_lane_segments(
+    units: List[Dict[str, Any]],
+    current_tick: int
+) -> Dict[int, List[LaneSegment]]:
+    """Agrupa los segmentos por starlane (solo lanes con más de un jugador)."""
+    by_lane: Dict[int, List[LaneSegment]] = defaultdict(list)
+    for unit_data in units:
+        segment = build_lane_segment(unit_data, current_tick)
+        if segment:
+            by_lane[segment.starlane_id].append(segment)
+    return {
+        lane_id: segments for lane_id, segments in by_lane.items()
+        if len({s.player_id for s in segments}) > 1
+    }
+
+
+def _segments_meet(a: LaneSegment, b: LaneSegment, radius: float) -> bool:
+    """Las trayectorias (lineales) se acercan a <= radius en el tiempo común."""
+    t0 = max(a.t_start, b.t_start)
+    t1 = min(a.t_end, b.t_end)
+    if t1 < t0:
+        return False
+    gap_0 = a.position_at(t0) - b.position_at(t0)
+    gap_1 = a.position_at(t1) - b.position_at(t1)
+    if gap_0 * gap_1 <= 0:
+        return True  # Se cruzan dentro de la ventana
+    return min(abs(gap_0), abs(gap_1)) <= radius
+
+
+def find_lane_encounters(
+    segments: List[LaneSegment],
+    radius: float = STARLANE_ENCOUNTER_RADIUS
+) -> List[Tuple[LaneSegment, LaneSegment]]:
+    """
+    Pares de jugadores distintos cuyos segmentos se solapan en el lane este tick.
+    Barrido por inicio de intervalo con un heap de activos por fin: O(n log n + k).
+    """
+    encounters = []
+    active: List[Tuple[float, int, LaneSegment]] = []
+
+    for idx, seg in enumerate(sorted(segments, key=lambda s: (s.low, s.unit_id))):
+        while active and active[0][0] + radius < seg.low:
+            heapq.heappop(active)
+        for _, _, other in active:
+            if other.player_id != seg.player_id and _segments_meet(other, seg, radius):
+                encounters.append((other, seg))
+        heapq.heappush(active, (seg.high, idx, seg))
+
+    return encounters
+
+
+def _process_starlane_detections(current_tick: int) -> List[DetectionResult]:
+    """
+    Procesa detecciones entre unidades que coinciden en la misma starlane.
+    V26.10: Solo se comparan unidades cuyos tramos del tick se solapan (no todo el lane).
     """
     detections = []
     db = get_supabase()
 
     try:
-        # Obtener starlanes con múltiples unidades
         response = db.table("units")\
-            .select("*")\
+            .select(_LANE_INDEX_COLUMNS)\
             .eq("status", "TRANSIT")\
             .not_.is_("starlane_id", "null")\
             .execute()
@@ -376,36 +521,25 @@ def _process_starlane_detections() -> List[DetectionResult]:
         if not response.data:
             return []
 
-        # Agrupar por starlane
-        starlane_groups = defaultdict(list)
-        for unit_data in response.data:
-            starlane_id = unit_data.get('starlane_id')
-            if starlane_id:
-                starlane_groups[starlane_id].append(unit_data)
-
-        # Procesar grupos con múltiples facciones
-        for starlane_id, units_on_lane in starlane_groups.items():
-            by_player = defaultdict(list)
-            for u in units_on_lane:
-                by_player[u.get('player_id')].append(u)
-
-            player_ids = list(by_player.keys())
-            if len(player_ids) < 2:
-                continue
+        pairs = []
+        for segments in index_lane_segments(response.data, current_tick).values():
+            pairs.extend(find_lane_encounters(segments))
 
-            # Checks cruzados
-            for i, player_a in enumerate(player_ids):
-                for player_b in player_ids[i+1:]:
-                    for unit_a_data in by_player[player_a]:
-                        for unit_b_data in by_player[player_b]:
-                            unit_a = UnitSchema.from_dict(unit_a_data)
-                            unit_b = UnitSchema.from_dict(unit_b_data)
+        if not pairs:
+            return []
 
-                            det_result = check_detection(unit_a, unit_b, "passive")
-                            detections.append(det_result)
+        # Filas completas solo para las unidades implicadas en encuentros
+        unit_ids = sorted({seg.unit_id for pair in pairs for seg in pair})
+        full = db.table("units").select("*").in_("id", unit_ids).execute()
+        units = {row['id']: UnitSchema.from_dict(row) for row in (full.data or [])}
 
-                            det_result_b = check_detection(unit_b, unit_a, "passive")
-                            detections.append(det_result_b)
+        for seg_a, seg_b in pairs:
+            unit_a = units.get(seg_a.unit_id)
+            unit_b = units.get(seg_b.unit_id)
+            if not unit_a or not unit_b:
+                continue
+            detections.append(check_detection(unit_a, unit_b, "passive"))
+            detections.append(check_detection(unit_b, unit_a, "passive"))
 
     except Exception as e:
         log_event(f"Error en detección de starlane: {e}", is_error=True)
@@ -18,6 +18,7 @@ Refactorizado V23.2: Validación estricta de built_at_tick para edificios activo
 Refactorizado V24.0: Corrección de 'Bug de Desactivación Perpetua' y aplanamiento de estructura de stock de lujo.
 Refactorizado V25.0: Centralización de Extracción de Lujo (Eliminación de lógica ad-hoc Tier 2).
 Refactorizado V25.1: Sincronización estricta de proyección económica con activation.
+Refactorizado V26.1: Liquidación de mercado global por lotes antes del bucle por jugador.
 """
 
 from typing import Dict, List, Any, Tuple, Optional
@@ -48,7 +49,8 @@ from core.world_constants import (
     SECTOR_TYPE_STELLAR
 )
 from core.models import ProductionSummary, EconomyTickResult
-from core.market_engine import process_pending_market_orders
+from core.market_engine import process_pending_market_orders, settle_all_pending_market_orders
+from core.order_book_engine import process_order_book_tick
 # Importamos la lógica centralizada (V5.6 + V5.7)
 from core.rules import (
     calculate_and_update_system_security, 
@@ -447,7 +449,7 @@ def get_stellar_buildings_for_system(system_id: int, player_id: int) -> List[Dic
 
 # --- ORQUESTADOR PRINCIPAL ---
 
-def run_economy_tick_for_player(player_id: int) -> EconomyTickResult:
+def run_economy_tick_for_player(player_id: int, settle_market: bool = True) -> EconomyTickResult:
     """
     Ejecuta el ciclo económico completo para un jugador.
     Actualizado V8.0: Soporte para bonos de sistema y estructuras estelares.
@@ -457,15 +459,17 @@ def run_economy_tick_for_player(player_id: int) -> EconomyTickResult:
     Refactor V23.2: Filtrado robusto de edificios no terminados (built_at_tick).
     Fix V24.0: Corrección de 'Bug de Desactivación Perpetua' y Logs de Tier 2.
     Refactor V25.0: Centralización de Extracción de Lujo (Eliminación de lógica ad-hoc Tier 2).
+    Refactor V26.1: settle_market=False cuando el mercado ya se liquidó globalmente.
     """
     result = EconomyTickResult(player_id=player_id)
     db = get_supabase()
 
     try:
-        try:
-            process_pending_market_orders(player_id)
-        except Exception as e:
-            log_event(f"Error procesando mercado en tick: {e}", player_id, is_error=True)
+        if settle_market:
+            try:
+                process_pending_market_orders(player_id)
+            except Exception as e:
+                log_event(f"Error procesando mercado en tick: {e}", player_id, is_error=True)
 
         planets = get_all_player_planets_with_buildings(player_id)
         # Nota: Incluso si no hay planetas, puede haber unidades en tránsito o edificios estelares.
@@ -733,10 +737,27 @@ def run_economy_tick_for_player(player_id: int) -> EconomyTickResult:
 def run_global_economy_tick() -> List[EconomyTickResult]:
     log_event("🏛️ Iniciando fase económica global (Control V4.4)...")
     results = []
+
+    # V26.1: Liquidación de mercado de toda la galaxia en una sola etapa
+    try:
+        settled = settle_all_pending_market_orders()
+        if settled:
+            log_event(f"🚚 Mercado: {sum(settled.values())} órdenes liquidadas para {len(settled)} jugadores.")
+    except Exception as e:
+        log_event(f"Error en liquidación global de mercado: {e}", is_error=True)
+
+    # V26.2: Subasta por lotes del libro de órdenes límite
+    try:
+        auction = process_order_book_tick()
+        if auction.fills:
+            log_event(f"📒 Libro de Órdenes: {len(auction.fills)} operaciones casadas ({auction.matched_volume} u.).")
+    except Exception as e:
+        log_event(f"Error en subasta del libro de órdenes: {e}", is_error=True)
+
     try:
         players = get_all_players()
         for player in players:
-            results.append(run_economy_tick_for_player(player["id"]))
+            results.append(run_economy_tick_for_player(player["id"], settle_market=False))
     except Exception as e:
         log_event(f"Error global economy: {e}", is_error=True)
     return results
@@ -7,6 +7,7 @@ Actualizado V1.4:
 - Recálculo dinámico de habilidades (skill_exploracion) antes de la acción.
 - Formateo estandarizado de recursos en narrativa y logs.
 - Limpieza de prefijos en logs.
+Actualizado V26.11: Una sola carga de la unidad (habilidades memoizadas sobre la misma fila).
 """
 
 from typing import Optional, Dict, Any
@@ -49,7 +50,7 @@ def resolve_sector_exploration(
     Reglas V1.4:
     1. Validación de unidad básica.
     2. Recálculo de habilidades (Unit Engine).
-    3. Validación de fatiga con datos frescos.
+    3. Validación de fatiga (misma fila, con habilidades al día).
     4. MRG: skill_exploracion vs Dificultad 50 (STANDARD).
     5. Narrativa estandarizada: 'Sector {nombre}. Recursos: {lista}.'
     """
@@ -70,10 +71,8 @@ def resolve_sector_exploration(
 
     # 2. Recálculo de Habilidades y Actualización de Objeto Unidad
     # Importante: Esto asegura que el skill_exploracion sea el correcto antes de tirar MRG
-    skill_calc_result = calculate_and_update_unit_skills(unit_id)
-
-    # Recargar datos frescos de la base de datos tras el cálculo
-    unit_data = get_unit_by_id(unit_id)
+    # V26.11: Reutiliza la fila ya cargada (memoizado; actualiza unit_data en el sitio)
+    skill_calc_result = calculate_and_update_unit_skills(unit_id, unit_data)
     unit = UnitSchema.from_dict(unit_data)
 
     # 2b. Extracción EXPLÍCITA de skill_exploracion desde la unidad (Prioridad)
@@ -88,7 +87,7 @@ def resolve_sector_exploration(
             event_type="SKILL_DEBUG"
         )
 
-    # Validación de Fatiga de Movimiento (con datos actualizados)
+    # Validación de Fatiga de Movimiento
     move_limit = 1 if unit.status == UnitStatus.STEALTH_MODE else MAX_LOCAL_MOVES_PER_TURN
     
     if unit.local_moves_count >= move_limit:
@@ -0,0 +1,361 @@
+# core/forecast_engine.py
+"""
+Motor de Pronóstico Económico Multi-Tick (V26.0).
+Responde a "¿dónde estarán mis reservas dentro de K ticks?" sin tocar la DB
+durante la simulación.
+
+Flujo:
+    1. load_economy_snapshot(player_id): Carga UNA vez todo el estado económico
+       del jugador (finanzas, planetas + edificios, estructuras estelares,
+       sitios de lujo, órdenes de mercado pendientes y tropas en tránsito).
+    2. simulate_economy_forecast(snapshot, ticks): Simulación pura en memoria
+       que replica run_economy_tick_for_player tick a tick, incluyendo las
+       cascadas de apagado/reactivación por prioridad de mantenimiento,
+       entregas de mercado diferidas y coste logístico de tránsito.
+
+A diferencia de get_player_projected_economy (delta de un tick usando el
+is_active de la DB), aquí el estado de los edificios evoluciona entre ticks.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
+import copy
+
+from data.player_repository import get_player_finances
+from data.planet_repository import (
+    get_all_player_planets_with_buildings,
+    get_luxury_extraction_sites_for_player,
+)
+from data.market_repository import get_pending_orders_for_player
+from data.unit_repository import get_troops_in_transit_count
+from data.world_repository import get_world_state
+
+from core.world_constants import DISPUTED_PENALTY_MULTIPLIER
+from core.economy_engine import (
+    SystemBonuses,
+    calculate_planet_security,
+    calculate_income,
+    process_building_maintenance,
+    calculate_planet_production,
+    calculate_system_bonuses,
+    calculate_stellar_production,
+    process_stellar_building_maintenance,
+    calculate_luxury_extraction,
+    merge_luxury_resources,
+    get_stellar_buildings_for_system,
+)
+
+# Recursos base que se proyectan (mismo orden que el tick económico)
+FORECAST_RESOURCES = ["creditos", "materiales", "componentes", "celulas_energia", "influencia", "datos"]
+
+# Coste fijo por tropa en espacio (ver run_economy_tick_for_player, V9.0)
+TRANSIT_COST_PER_TROOP = 5
+
+# Horizonte máximo permitido para evitar simulaciones desmedidas desde la UI
+MAX_FORECAST_TICKS = 200
+
+
+@dataclass
+class EconomySnapshot:
+    """Estado económico de un jugador cargado una sola vez desde la DB."""
+    player_id: int
+    current_tick: int
+    resources: Dict[str, int]
+    luxury_stock: Dict[str, Any] = field(default_factory=dict)
+    planets: List[Dict[str, Any]] = field(default_factory=list)
+    stellar_buildings: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+    luxury_sites: List[Dict[str, Any]] = field(default_factory=list)
+    pending_orders: List[Dict[str, Any]] = field(default_factory=list)
+    troops_in_transit: int = 0
+
+
+@dataclass
+class ForecastTick:
+    """Resultado simulado de un tick individual."""
+    tick: int
+    resources: Dict[str, int]
+    delta: Dict[str, int]
+    income: int = 0
+    production: Dict[str, int] = field(default_factory=dict)
+    maintenance_cost: Dict[str, int] = field(default_factory=dict)
+    luxury_stock: Dict[str, int] = field(default_factory=dict)
+    market_deliveries: int = 0
+    transit_cost: int = 0
+    logistics_failure: bool = False
+    buildings_disabled: List[int] = field(default_factory=list)
+    buildings_reactivated: List[int] = field(default_factory=list)
+
+
+@dataclass
+class EconomyForecast:
+    """Serie temporal completa del pronóstico."""
+    player_id: int
+    start_tick: int
+    initial_resources: Dict[str, int]
+    ticks: List[ForecastTick] = field(default_factory=list)
+
+    def curves(self) -> Dict[str, List[int]]:
+        """Curvas por recurso (reservas al final de cada tick simulado)."""
+        return {
+            res: [t.resources.get(res, 0) for t in self.ticks]
+            for res in FORECAST_RESOURCES
+        }
+
+    def luxury_curves(self) -> Dict[str, List[int]]:
+        """Curvas de recursos de lujo (claves planas 'Categoría.Recurso')."""
+        keys = set()
+        for t in self.ticks:
+            keys.update(t.luxury_stock.keys())
+        return {
+            key: [t.luxury_stock.get(key, 0) for t in self.ticks]
+            for key in sorted(keys)
+        }
+
+    def first_shutdown_tick(self) -> Optional[int]:
+        """Primer tick en el que algún edificio se detiene por falta de recursos."""
+        for t in self.ticks:
+            if t.buildings_disabled:
+                return t.tick
+        return None
+
+
+# --- CARGA ÚNICA ---
+
+def load_economy_snapshot(player_id: int) -> Optional[EconomySnapshot]:
+    """
+    Carga el estado económico del jugador. Es el ÚNICO punto con acceso a DB.
+    Retorna None si el jugador no tiene finanzas válidas.
+    """
+    finances = get_player_finances(player_id)
+    if not finances:
+        return None
+
+    current_tick = get_world_state().get("current_tick", 1)
+    planets = get_all_player_planets_with_buildings(player_id)
+
+    stellar_by_system: Dict[int, List[Dict[str, Any]]] = {}
+    for planet in planets:
+        sys_id = planet.get("system_id")
+        if sys_id not in stellar_by_system:
+            stellar_by_system[sys_id] = get_stellar_buildings_for_system(sys_id, player_id)
+
+    pending_orders = [
+        {
+            "resource_type": o.resource_type,
+            "amount": o.amount,
+            "price_per_unit": o.price_per_unit,
+            "created_at_tick": o.created_at_tick,
+        }
+        for o in get_pending_orders_for_player(player_id)
+    ]
+
+    return EconomySnapshot(
+        player_id=player_id,
+        current_tick=current_tick,
+        resources={res: finances.get(res, 0) or 0 for res in FORECAST_RESOURCES},
+        luxury_stock=dict(finances.get("recursos_lujo") or {}),
+        planets=planets,
+        stellar_buildings=stellar_by_system,
+        luxury_sites=get_luxury_extraction_sites_for_player(player_id),
+        pending_orders=pending_orders,
+        troops_in_transit=get_troops_in_transit_count(player_id),
+    )
+
+
+# --- SIMULACIÓN PURA ---
+
+def _planet_penalty(planet: Dict[str, Any], player_id: int) -> Tuple[float, bool]:
+    """Replica la lógica de soberanía/bloqueo (V6.3, V6.4, V20.0). Retorna (penalty, is_sovereign)."""
+    orbital_owner = planet.get("orbital_owner_id")
+    is_sovereign = planet.get("surface_owner_id") == player_id
+
+    penalty = 1.0
+    if planet.get("is_disputed", False):
+        penalty = 0.0
+    elif orbital_owner is not None and orbital_owner != player_id:
+        penalty = DISPUTED_PENALTY_MULTIPLIER
+
+    if not is_sovereign:
+        penalty = 0.0
+    return penalty, is_sovereign
+
+
+def _planet_security(planet: Dict[str, Any], bonuses: SystemBonuses) -> float:
+    pop = float(planet.get("population", 0.0))
+    orbital_dist = planet.get("orbital_distance", 0)
+    if orbital_dist == 0 and "ring_index" in planet:
+        orbital_dist = planet["ring_index"]
+    security, _ = calculate_planet_security(pop, planet.get("infraestructura_defensiva", 0), orbital_dist)
+    return min(100.0, security + bonuses.security_flat)
+
+
+def _apply_market_deliveries(
+    orders: List[Dict[str, Any]],
+    sim_tick: int,
+    resources: Dict[str, int]
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Entrega órdenes creadas antes de sim_tick (Entrega tick + 1). Retorna (restantes, entregadas)."""
+    remaining = []
+    delivered = 0
+    for order in orders:
+        if order["created_at_tick"] < sim_tick:
+            if order["amount"] > 0:
+                res = order["resource_type"]
+                resources[res] = resources.get(res, 0) + order["amount"]
+            else:
+                resources["creditos"] += abs(order["amount"]) * order["price_per_unit"]
+            delivered += 1
+        else:
+            remaining.append(order)
+    return remaining, delivered
+
+
+def simulate_economy_forecast(snapshot: EconomySnapshot, ticks: int = 10) -> EconomyForecast:
+    """
+    Simula K ticks económicos en memoria a partir de un snapshot.
+    No accede a la DB ni modifica el snapshot recibido.
+
+    El tick simulado k corresponde a current_tick + k. Los edificios en
+    construcción entran en línea cuando built_at_tick <= tick simulado y el
+    estado is_active resultante del mantenimiento se arrastra al tick siguiente.
+    """
+    ticks = max(0, min(int(ticks), MAX_FORECAST_TICKS))
+    player_id = snapshot.player_id
+
+    resources = dict(snapshot.resources)
+    luxury_stock = dict(snapshot.luxury_stock)
+    orders = list(snapshot.pending_orders)
+
+    # Estado mutable de activación (copias para no alterar el snapshot)
+    planets = copy.deepcopy(snapshot.planets)
+    stellar = copy.deepcopy(snapshot.stellar_buildings)
+
+    # Los sitios de lujo activos no dependen del mantenimiento: extracción constante
+    luxury_per_tick = calculate_luxury_extraction(snapshot.luxury_sites)
+    transit_cost = snapshot.troops_in_transit * TRANSIT_COST_PER_TROOP
+
+    forecast = EconomyForecast(
+        player_id=player_id,
+        start_tick=snapshot.current_tick,
+        initial_resources=dict(resources),
+    )
+
+    for step in range(1, ticks + 1):
+        sim_tick = snapshot.current_tick + step
+        start = dict(resources)
+        tick_result = ForecastTick(tick=sim_tick, resources={}, delta={})
+
+        # 0. Entregas de mercado diferidas (process_pending_market_orders)
+        orders, tick_result.market_deliveries = _apply_market_deliveries(orders, sim_tick, resources)
+
+        production = {res: 0 for res in FORECAST_RESOURCES}
+        maintenance: Dict[str, int] = {}
+        status_updates: Dict[int, bool] = {}
+        bonuses_cache: Dict[int, SystemBonuses] = {}
+
+        # 1. Estructuras estelares por sistema
+        for sys_id, buildings in stellar.items():
+            valid = [b for b in buildings if b.get("built_at_tick", 0) <= sim_tick]
+            if not valid:
+                bonuses_cache[sys_id] = SystemBonuses()
+                continue
+
+            bonuses = calculate_system_bonuses(valid)
+            bonuses_cache[sys_id] = bonuses
+            maint = process_stellar_building_maintenance(
+                valid, resources, maintenance_multiplier=bonuses.maintenance_multiplier
+            )
+            for res, cost in maint.total_cost.items():
+                maintenance[res] = maintenance.get(res, 0) + cost
+                resources[res] -= cost
+            for bid, _ in maint.buildings_to_disable:
+                status_updates[bid] = False
+                tick_result.buildings_disabled.append(bid)
+            for bid, _ in maint.buildings_to_enable:
+                status_updates[bid] = True
+                tick_result.buildings_reactivated.append(bid)
+
+            prod = calculate_stellar_production(maint.paid_buildings, bonuses)
+            for res, amount in prod.to_dict().items():
+                production[res] += amount
+
+            for b in buildings:
+                if b["id"] in status_updates:
+                    b["is_active"] = status_updates[b["id"]]
+
+        # 2. Planetas: ingresos, mantenimiento con cascada y producción
+        for planet in planets:
+            bonuses = bonuses_cache.get(planet.get("system_id"), SystemBonuses())
+            penalty, is_sovereign = _planet_penalty(planet, player_id)
+
+            security = _planet_security(planet, bonuses)
+            pop = float(planet.get("population", 0.0))
+            income = calculate_income(pop, security, penalty_multiplier=bonuses.fiscal_multiplier * penalty)
+            tick_result.income += income
+
+            buildings = planet.get("buildings", [])
+            valid = [b for b in buildings if b.get("built_at_tick", 0) <= sim_tick]
+            maint = process_building_maintenance(valid, resources, float(planet.get("pops_activos", pop)))
+
+            for res, cost in maint.total_cost.items():
+                adjusted = int(cost * bonuses.maintenance_multiplier)
+                maintenance[res] = maintenance.get(res, 0) + adjusted
+                resources[res] -= adjusted
+
+            planet_updates: Dict[int, bool] = {}
+            for bid, _ in maint.buildings_to_disable:
+                planet_updates[bid] = False
+                tick_result.buildings_disabled.append(bid)
+            for bid, _ in maint.buildings_to_enable:
+                planet_updates[bid] = True
+                tick_result.buildings_reactivated.append(bid)
+            for b in buildings:
+                if b.get("id") in planet_updates:
+                    b["is_active"] = planet_updates[b["id"]]
+
+            if is_sovereign:
+                prod = calculate_planet_production(maint.paid_buildings, penalty_multiplier=penalty)
+                prod.materiales = int(prod.materiales * bonuses.material_multiplier)
+                prod.datos = int(prod.datos * bonuses.data_multiplier)
+                for res, amount in prod.to_dict().items():
+                    production[res] += amount
+
+        # 3. Logística de transporte (V9.0)
+        if transit_cost > 0:
+            if resources["creditos"] >= transit_cost:
+                paid = transit_cost
+            else:
+                paid = resources["creditos"]
+                tick_result.logistics_failure = True
+            resources["creditos"] -= paid
+            maintenance["creditos"] = maintenance.get("creditos", 0) + paid
+            tick_result.transit_cost = paid
+
+        # 4. Cálculo final (idéntico a la fase 5 del tick real)
+        resources["creditos"] += tick_result.income + production["creditos"]
+        for res in FORECAST_RESOURCES:
+            if res != "creditos":
+                resources[res] += production[res]
+
+        if luxury_per_tick:
+            luxury_stock = merge_luxury_resources(luxury_stock, luxury_per_tick)
+
+        tick_result.resources = dict(resources)
+        tick_result.delta = {res: resources[res] - start.get(res, 0) for res in FORECAST_RESOURCES}
+        tick_result.production = production
+        tick_result.maintenance_cost = maintenance
+        tick_result.luxury_stock = {k: v for k, v in luxury_stock.items() if isinstance(v, (int, float))}
+        forecast.ticks.append(tick_result)
+
+    return forecast
+
+
+def forecast_player_economy(player_id: int, ticks: int = 10) -> Optional[EconomyForecast]:
+    """
+    API de conveniencia: carga el snapshot (una vez) y simula K ticks.
+    Retorna None si no se pudo cargar el estado económico del jugador.
+    """
+    snapshot = load_economy_snapshot(player_id)
+    if snapshot is None:
+        return None
+    return simulate_economy_forecast(snapshot, ticks)
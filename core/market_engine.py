@@ -4,6 +4,8 @@ Motor de Mercado y Logística - V5.3
 Gestiona precios dinámicos, validación de órdenes y procesamiento diferido.
 Spec 4.2: Influencia del Prestigio y Broker Dinámico.
 Spec 5.3: Integración de Recursos de Lujo (Solo Venta) y Ajuste Logístico.
+V26.1: Liquidación global por lotes (settle_all_pending_market_orders).
+V26.3: Caché de tablas de precios por cubo de prestigio.
 """
 
 from typing import Dict, List, Tuple, Any
@@ -18,11 +20,18 @@ from data.market_repository import (
     create_market_order, 
     get_orders_by_tick, 
     get_pending_orders_for_player,
-    mark_orders_as_completed
+    mark_orders_as_completed,
+    get_all_pending_orders_before_tick,
+    claim_pending_orders,
+    reopen_market_orders
+)
+from data.player_repository import (
+    get_player_resources,
+    update_player_resources,
+    apply_player_resource_deltas
 )
-from data.player_repository import get_player_resources, update_player_resources
 from data.planet_repository import get_all_player_planets
-from data.log_repository import log_event
+from data.log_repository import log_event, log_events_batch
 
 # Precios Base V4.2 (Actualizados)
 BASE_PRICES = {
@@ -36,9 +45,22 @@ BASE_PRICES = {
 MARKET_FEE_PERCENT = 0.20 # Markup base del 20%
 PRESTIGE_BASELINE = 14    # Nivel de prestigio neutral (14%)
 
-def calculate_market_prices(player_id: int) -> Dict[str, Dict[str, Any]]:
+# V26.3: Caché de tablas de precios por cubo de prestigio.
+# El prestigio se persiste con 2 decimales (update_faction_prestige), por lo que
+# redondear a esa precisión no altera ningún precio y acota el número de tablas.
+PRESTIGE_PRICE_PRECISION = 2
+
+_PRICE_TABLE_CACHE: Dict[float, Dict[str, Dict[str, Any]]] = {}
+_PLAYER_PRESTIGE_CACHE: Dict[int, float] = {}
+
+
+def _prestige_bucket(prestige: float) -> float:
+    return round(float(prestige or 0.0), PRESTIGE_PRICE_PRECISION)
+
+
+def build_price_table(prestige: float) -> Dict[str, Dict[str, Any]]:
     """
-    Calcula precios de compra y venta personalizados según el prestigio.
+    Calcula la tabla de precios de compra y venta para un nivel de prestigio (pura).
     Retorna: { "recurso": { "buy": int/None, "sell": int } }
     
     Lógica V4.2 + V5.3:
@@ -46,8 +68,6 @@ def calculate_market_prices(player_id: int) -> Dict[str, Dict[str, Any]]:
     - Ajuste: +/- 1% de markup por cada 1% de prestigio de diferencia con Baseline (14).
     - Lujo: Solo Venta disponible.
     """
-    prestige = get_player_prestige_level(player_id)
-    
     # Delta: Positivo (Prestigio > 14) mejora precios.
     # Negativo (Prestigio < 14) empeora precios.
     prestige_delta = prestige - PRESTIGE_BASELINE
@@ -102,6 +122,45 @@ def calculate_market_prices(player_id: int) -> Dict[str, Dict[str, Any]]:
         
     return prices
 
+
+def get_price_table(prestige: float) -> Dict[str, Dict[str, Any]]:
+    """Tabla de precios precalculada para el cubo de prestigio (V26.3)."""
+    bucket = _prestige_bucket(prestige)
+    table = _PRICE_TABLE_CACHE.get(bucket)
+    if table is None:
+        table = build_price_table(bucket)
+        _PRICE_TABLE_CACHE[bucket] = table
+    return table
+
+
+def _get_cached_prestige(player_id: int) -> float:
+    """Prestigio del jugador, leído de la DB solo una vez por ciclo de invalidación."""
+    prestige = _PLAYER_PRESTIGE_CACHE.get(player_id)
+    if prestige is None:
+        prestige = _prestige_bucket(get_player_prestige_level(player_id))
+        _PLAYER_PRESTIGE_CACHE[player_id] = prestige
+    return prestige
+
+
+def invalidate_market_price_cache() -> None:
+    """
+    Descarta el prestigio cacheado de los jugadores (V26.3).
+    Debe llamarse cuando el tick modifica el prestigio. Las tablas por cubo son
+    funciones puras del prestigio y se conservan.
+    """
+    _PLAYER_PRESTIGE_CACHE.clear()
+
+
+def calculate_market_prices(player_id: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Calcula precios de compra y venta personalizados según el prestigio.
+    Retorna: { "recurso": { "buy": int/None, "sell": int } }
+    V26.3: Servido desde la caché de tablas por cubo de prestigio (sin recálculo
+    ni lecturas extra tras la primera consulta del ciclo).
+    """
+    table = get_price_table(_get_cached_prestige(player_id))
+    return {resource: dict(row) for resource, row in table.items()}
+
 def get_market_limits(player_id: int) -> Tuple[int, int]:
     """
     Calcula límites de operación por tick.
@@ -293,4 +352,66 @@ def process_pending_market_orders(player_id: int) -> int:
         if processed_count > 0:
             log_event(f"🚚 Logística de Mercado: {processed_count} órdenes entregadas.", player_id)
             
-    return processed_count
\ No newline at end of file
+    return processed_count
+
+
+# --- V26.1: LIQUIDACIÓN GLOBAL POR LOTES ---
+
+def calculate_settlement_deltas(orders: List[MarketOrder]) -> Tuple[Dict[int, Dict[str, int]], Dict[int, int]]:
+    """
+    Calcula en memoria los deltas de recursos por jugador para un lote de órdenes.
+    - Compra (amount > 0): ya pagó créditos, recibe el recurso.
+    - Venta (amount < 0): ya entregó el recurso, recibe créditos.
+    Returns: ({player_id: {recurso: delta}}, {player_id: órdenes_entregadas})
+    """
+    deltas: Dict[int, Dict[str, int]] = {}
+    counts: Dict[int, int] = {}
+
+    for order in orders:
+        player_delta = deltas.setdefault(order.player_id, {})
+        if order.amount > 0:
+            player_delta[order.resource_type] = player_delta.get(order.resource_type, 0) + order.amount
+        else:
+            player_delta["creditos"] = player_delta.get("creditos", 0) + order.total_value
+        counts[order.player_id] = counts.get(order.player_id, 0) + 1
+
+    return deltas, counts
+
+
+def settle_all_pending_market_orders(current_tick: int = None) -> Dict[int, int]:
+    """
+    Liquida las órdenes pendientes de TODOS los jugadores en una sola etapa.
+    Reemplaza la llamada por jugador a process_pending_market_orders en el tick:
+        1. Una consulta: órdenes PENDING con created_at_tick < current_tick.
+        2. Deltas por jugador calculados en memoria.
+        3. Una actualización de órdenes (solo las que siguen PENDING se reclaman).
+        4. Una actualización de recursos (RPC de deltas) con lo reclamado.
+    Returns: {player_id: órdenes_entregadas}
+    """
+    if current_tick is None:
+        current_tick = get_current_tick()
+
+    pending = get_all_pending_orders_before_tick(current_tick)
+    if not pending:
+        return {}
+
+    # Reclamar primero: si el lote se procesa dos veces, la segunda no acredita nada
+    claimed_ids = set(claim_pending_orders([o.id for o in pending], current_tick))
+    claimed = [o for o in pending if o.id in claimed_ids]
+    if not claimed:
+        return {}
+
+    deltas, counts = calculate_settlement_deltas(claimed)
+
+    # Los recursos de lujo no se compran (solo venta -> créditos), por lo que
+    # todos los deltas caen en columnas base.
+    if not apply_player_resource_deltas(deltas):
+        reopen_market_orders(list(claimed_ids))
+        log_event(f"Error aplicando liquidación de mercado ({len(claimed)} órdenes). Se reintentará.", is_error=True)
+        return {}
+
+    log_events_batch([
+        (f"🚚 Logística de Mercado: {count} órdenes entregadas.", pid)
+        for pid, count in counts.items()
+    ])
+    return counts
@@ -21,6 +21,8 @@ Actualizado V15.2: Fix Validación CommanderData (Ring Nullable).
 Actualizado V15.3: Fix Resolución Nombres Ubicación Espacial (Fix entidades desaparecidas).
 Actualizado V17.0: Habilidades Colectivas de Unidad (Unit Skills).
 Actualizado V19.0: Estado de Unidad CONSTRUCTING para bloqueo durante obras.
+Actualizado V26.2: Órdenes límite (MarketOrderType) para el libro de órdenes.
+Actualizado V26.13: Registros compactos (__slots__) UnitRecord/UnitMemberRecord para el tick.
 """
 
 from typing import Dict, Any, Optional, List, Union
@@ -83,6 +85,12 @@ class MarketOrderStatus(str, Enum):
     PENDING = "PENDING"
     COMPLETED = "COMPLETED"
     CANCELLED = "CANCELLED"
+    OPEN = "OPEN"  # V26.2: Orden límite en reposo en el libro (puede tener llenado parcial)
+
+class MarketOrderType(str, Enum):
+    """V26.2: Tipo de orden de mercado."""
+    BROKER = "BROKER"  # Contra el broker NPC a precio fijo (entrega tick + 1)
+    LIMIT = "LIMIT"    # Orden límite en el libro (subasta por lotes en cada tick)
 
 # --- V9.0: ENUMS DE UNIDADES Y TROPAS ---
 
@@ -313,11 +321,19 @@ class MarketOrder(BaseModel):
     status: MarketOrderStatus = MarketOrderStatus.PENDING
     created_at_tick: int
     processed_at_tick: Optional[int] = None
+    # V26.2: Libro de órdenes (price_per_unit actúa como precio límite)
+    order_type: MarketOrderType = MarketOrderType.BROKER
+    filled_amount: int = 0
 
     @property
     def total_value(self) -> int:
         return abs(self.amount) * self.price_per_unit
 
+    @property
+    def remaining_amount(self) -> int:
+        """V26.2: Cantidad aún sin llenar (siempre positiva)."""
+        return max(0, abs(self.amount) - self.filled_amount)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'MarketOrder':
         return cls(**data)
@@ -757,8 +773,9 @@ class UnitSchema(BaseModel):
 
     # V10.0: Control de movimiento
     movement_locked: bool = False           # True = acaba de moverse, no puede volver
-    transit_end_tick: Optional[int] = None  # Tick en que termina el viaje
-    transit_ticks_remaining: int = 0        # Ticks restantes de viaje
+    transit_end_tick: Optional[int] = None  # Tick absoluto de llegada
+    transit_ticks_remaining: int = 0        # Obsoleto V26.8: solo snapshot al interdictar
+    transit_start_tick: Optional[int] = None  # V26.8: Tick de salida (progreso en UI)
     transit_origin_system_id: Optional[int] = None
     transit_destination_system_id: Optional[int] = None
     
@@ -819,6 +836,21 @@ class UnitSchema(BaseModel):
 
         return min(12, 4 + (leadership_skill // 10))
 
+    def transit_ticks_left(self, current_tick: int) -> int:
+        """V26.8: Ticks restantes derivados del tick actual (sin contadores persistidos)."""
+        if self.transit_end_tick is None:
+            return self.transit_ticks_remaining
+        return max(0, self.transit_end_tick - current_tick)
+
+    def transit_progress(self, current_tick: int) -> float:
+        """V26.8: Fracción recorrida del tránsito (0.0 - 1.0)."""
+        if self.transit_end_tick is None or self.transit_start_tick is None:
+            return 0.0
+        total = self.transit_end_tick - self.transit_start_tick
+        if total <= 0:
+            return 1.0
+        return min(1.0, max(0.0, (current_tick - self.transit_start_tick) / total))
+
     @property
     def location(self) -> UnitLocation:
         """Construye UnitLocation desde campos legacy + nuevos."""
@@ -838,4 +870,136 @@ class UnitSchema(BaseModel):
         # Convertir ring de int a enum si viene de DB
         if 'ring' in data and isinstance(data['ring'], int):
             data['ring'] = LocationRing(data['ring'])
-        return cls(**data)
\ No newline at end of file
+        return cls(**data)
+
+
+# --- V26.13: REGISTROS COMPACTOS PARA MOTORES ---
+
+_MEMBER_FIELDS = ("slot_index", "entity_type", "entity_id", "name", "details", "is_leader")
+
+
+class UnitMemberRecord:
+    """Miembro de unidad sin validación (mismos campos que UnitMemberSchema)."""
+    __slots__ = _MEMBER_FIELDS
+
+    def __init__(
+        self,
+        slot_index: int = 0,
+        entity_type: str = "character",
+        entity_id: int = 0,
+        name: str = "???",
+        details: Optional[Dict[str, Any]] = None,
+        is_leader: bool = False
+    ):
+        self.slot_index = slot_index
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.name = name
+        self.details = details
+        self.is_leader = is_leader
+
+    @classmethod
+    def from_row(cls, row: Union[Dict[str, Any], UnitMemberSchema, 'UnitMemberRecord']) -> 'UnitMemberRecord':
+        if isinstance(row, UnitMemberRecord):
+            return row
+        if isinstance(row, UnitMemberSchema):
+            return cls.from_schema(row)
+        return cls(
+            row.get("slot_index", 0),
+            row.get("entity_type", "character"),
+            row.get("entity_id", 0),
+            row.get("name", "???"),
+            row.get("details"),
+            bool(row.get("is_leader", False))
+        )
+
+    @classmethod
+    def from_schema(cls, member: UnitMemberSchema) -> 'UnitMemberRecord':
+        return cls(
+            member.slot_index, member.entity_type, member.entity_id,
+            member.name, member.details, member.is_leader
+        )
+
+    def to_schema(self) -> UnitMemberSchema:
+        return UnitMemberSchema(**self.to_row())
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "slot_index": self.slot_index,
+            "entity_type": self.entity_type,
+            "entity_id": self.entity_id,
+            "name": self.name,
+            "details": self.details,
+            "is_leader": self.is_leader,
+        }
+
+
+_UNIT_FIELDS = tuple(name for name in UnitSchema.model_fields if name != "members")
+_UNIT_FIELD_SET = frozenset(UnitSchema.model_fields)
+_UNIT_DEFAULTS = {
+    name: info.default for name, info in UnitSchema.model_fields.items()
+    if name != "members" and not info.is_required()
+}
+
+
+class UnitRecord:
+    """
+    Unidad sin validación para bucles calientes de los motores (agrupar, filtrar).
+    ring y status se guardan como valores crudos (int/str) de la DB. Los miembros
+    se materializan al primer acceso. Las columnas que UnitSchema no declara se
+    conservan en 'extra' (conversión sin pérdida).
+    """
+    __slots__ = _UNIT_FIELDS + ("extra", "_member_rows", "_members")
+
+    @classmethod
+    def from_row(cls, row: Union[Dict[str, Any], UnitSchema]) -> 'UnitRecord':
+        if isinstance(row, UnitSchema):
+            return cls.from_schema(row)
+        record = cls.__new__(cls)
+        values = {**_UNIT_DEFAULTS, **row}
+        for key in _UNIT_FIELDS:
+            setattr(record, key, values[key])
+        if record.ring is None:
+            record.ring = 0
+        elif type(record.ring) is not int:
+            record.ring = int(record.ring)
+        if isinstance(record.status, UnitStatus):
+            record.status = record.status.value
+        record.extra = {k: v for k, v in row.items() if k not in _UNIT_FIELD_SET}
+        record._member_rows = row.get("members") or []
+        record._members = None
+        return record
+
+    @classmethod
+    def from_schema(cls, unit: UnitSchema) -> 'UnitRecord':
+        record = cls.__new__(cls)
+        for key in _UNIT_FIELDS:
+            setattr(record, key, getattr(unit, key))
+        record.ring = int(unit.ring)
+        record.status = unit.status.value
+        record.extra = dict(unit.__pydantic_extra__ or {})
+        record._member_rows = unit.members
+        record._members = None
+        return record
+
+    @property
+    def members(self) -> List[UnitMemberRecord]:
+        if self._members is None:
+            self._members = [UnitMemberRecord.from_row(m) for m in self._member_rows]
+        return self._members
+
+    def to_schema(self) -> UnitSchema:
+        """
+        Conversión a UnitSchema validada: la validación nativa de Pydantic v2 es más
+        rápida que construir el modelo sin validar desde Python (ver benchmark).
+        """
+        values = {key: getattr(self, key) for key in _UNIT_FIELDS}
+        values["members"] = self._member_rows if self._members is None else [m.to_row() for m in self._members]
+        values.update(self.extra)
+        return UnitSchema.from_dict(values)
+
+    def to_row(self) -> Dict[str, Any]:
+        row = {key: getattr(self, key) for key in _UNIT_FIELDS}
+        row["members"] = [m.to_row() for m in self.members]
+        row.update(self.extra)
+        return row
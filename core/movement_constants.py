@@ -47,4 +47,7 @@ MAX_LOCAL_MOVES_PER_TURN = 2         # Máximo de movimientos locales (intra-sis
 # --- ANILLOS PLANETARIOS ---
 RING_STELLAR = 0                     # Sector Estelar (espacio profundo del sistema)
 RING_MIN = 1                         # Anillo planetario interior
-RING_MAX = 6                         # Anillo planetario exterior
\ No newline at end of file
+RING_MAX = 6                         # Anillo planetario exterior
+
+# --- ALCANCE / ISÓCRONAS (V26.9) ---
+REACHABILITY_DEFAULT_MAX_TICKS = 6   # Horizonte por defecto del mapa de alcance (cubre el Warp más largo)
\ No newline at end of file
@@ -21,11 +21,14 @@ Refactorizado V14.4: Fix cálculo de ship_count dinámico (basado en miembros) y
 Refactorizado V14.5: Persistencia de STEALTH_MODE en movimientos y restricción estricta (1 movimiento local).
 Refactorizado V15.2: Refuerzo detección SURFACE_ORBIT para evitar falsos INTER_RING (Fix Anillo 0).
 Refactorizado V16.1: Unificación de respuesta MovementResult (message en lugar de error_message) y mensajes de éxito explícitos.
+Actualizado V26.7: Llegadas de tránsito en lote (build_arrival_update + complete_unit_transits_bulk).
+Actualizado V26.9: Mapa de alcance (compute_reachability) sobre un índice de navegación cacheado.
 """
 
 from typing import Optional, Dict, Any, Tuple, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+import heapq
 import math
 import json
 
@@ -45,22 +48,30 @@ from core.movement_constants import (
     WARP_TICKS_PER_10_DISTANCE,
     WARP_MAX_DISTANCE,
     MOVEMENT_LOCK_ON_ORBIT_CHANGE,
-    MAX_LOCAL_MOVES_PER_TURN
+    MAX_LOCAL_MOVES_PER_TURN,
+    RING_STELLAR,
+    RING_MAX,
+    REACHABILITY_DEFAULT_MAX_TICKS
 )
 # Eliminado DISORIENTED_MAX_LOCAL_MOVES ya que V14.3 unifica el límite
 from data.unit_repository import (
     get_unit_by_id,
     start_unit_transit,
-    complete_unit_transit,
     update_unit_location_advanced,
     update_unit_movement_lock,
     get_units_in_transit_arriving_at_tick,
-    increment_unit_local_moves
+    increment_unit_local_moves,
+    complete_unit_transits_bulk
+)
+from data.world_repository import (
+    get_system_by_id,
+    get_starlanes_from_db,
+    get_system_names,
+    get_system_coordinates
 )
-from data.world_repository import get_system_by_id, get_starlanes_from_db
 from data.planet_repository import get_planet_by_id
 from data.player_repository import get_player_finances, update_player_resources
-from data.log_repository import log_event
+from data.log_repository import log_event, log_events_batch
 
 
 class MovementType(Enum):
@@ -573,74 +584,88 @@ def _execute_instant_movement(
 
 # --- FUNCIONES DE PROCESAMIENTO DE TRÁNSITO ---
 
+def build_arrival_update(unit_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Calcula la ubicación y estado final de una unidad que completa su tránsito.
+    V14.5: Intenta preservar STEALTH_MODE si la unidad lo tiene activo.
+    """
+    # Recuperar valores específicos (V13.3 / V13.4)
+    dest_json = unit_data.get('transit_destination_data')
+    dest_data = {}
+    if isinstance(dest_json, str):
+        try:
+            dest_data = json.loads(dest_json)
+        except json.JSONDecodeError:
+            dest_data = {}
+    elif isinstance(dest_json, dict):
+        dest_data = dest_json
+
+    target_ring = unit_data.get('transit_destination_ring') or dest_data.get('ring', 0)
+    target_planet = dest_data.get('planet_id')
+    target_sector = dest_data.get('sector_id')
+
+    dest_system = unit_data.get('transit_destination_system_id')
+    final_system_id = dest_system if dest_system else unit_data.get('location_system_id')
+
+    # Determinar nuevo status (V14.5: Persistencia de Stealth)
+    if unit_data.get('status') == UnitStatus.STEALTH_MODE.value:
+        new_status = UnitStatus.STEALTH_MODE
+    else:
+        new_status = UnitStatus.GROUND if target_sector is not None else UnitStatus.SPACE
+
+    return {
+        "id": unit_data.get('id'),
+        "status": new_status.value,
+        "location_system_id": final_system_id,
+        "location_planet_id": target_planet,
+        "location_sector_id": target_sector,
+        "ring": target_ring or 0,
+    }
+
+
 def process_transit_arrivals(current_tick: int) -> List[Dict[str, Any]]:
     """
     Procesa las llegadas de unidades en tránsito.
     V14.5: Intenta preservar STEALTH_MODE si la unidad lo tiene activo.
+    V26.7: Procesamiento en lote: una lectura, una RPC de actualización,
+    nombres de destino desde el índice cacheado de sistemas y logs en un INSERT.
     """
-    arrivals = []
     arriving_units = get_units_in_transit_arriving_at_tick(current_tick)
+    if not arriving_units:
+        return []
+
+    updates = [build_arrival_update(u) for u in arriving_units]
+    completed = set(complete_unit_transits_bulk(updates, current_tick))
+
+    system_ids = list({u["location_system_id"] for u in updates if u["location_system_id"]})
+    system_names = get_system_names(system_ids) if system_ids else {}
 
-    for unit_data in arriving_units:
+    arrivals = []
+    log_entries = []
+    error_entries = []
+    for unit_data, update in zip(arriving_units, updates):
         unit_id = unit_data.get('id')
         unit_name = unit_data.get('name', f'Unit {unit_id}')
         player_id = unit_data.get('player_id')
-        dest_system = unit_data.get('transit_destination_system_id')
-        
-        # Recuperar status actual para persistencia (V14.5)
-        current_status_str = unit_data.get('status')
-        
-        # Recuperar valores específicos (V13.3 / V13.4)
-        dest_json = unit_data.get('transit_destination_data')
-        dest_data = {}
-        if isinstance(dest_json, str):
-            try:
-                dest_data = json.loads(dest_json)
-            except json.JSONDecodeError:
-                dest_data = {}
-        elif isinstance(dest_json, dict):
-            dest_data = dest_json
-        
-        target_ring = unit_data.get('transit_destination_ring') or dest_data.get('ring', 0)
-        target_planet = dest_data.get('planet_id')
-        target_sector = dest_data.get('sector_id')
-        
-        final_system_id = dest_system if dest_system else unit_data.get('location_system_id')
-        
-        # Determinar nuevo status (V14.5: Persistencia de Stealth)
-        if current_status_str == UnitStatus.STEALTH_MODE.value:
-            new_status = UnitStatus.STEALTH_MODE
-        else:
-            new_status = UnitStatus.GROUND if target_sector is not None else UnitStatus.SPACE
-
-        update_success = update_unit_location_advanced(
-            unit_id=unit_id,
-            system_id=final_system_id,
-            planet_id=target_planet,
-            sector_id=target_sector,
-            ring=target_ring,
-            status=new_status
-        )
 
-        success = complete_unit_transit(unit_id, current_tick)
+        if unit_id not in completed:
+            error_entries.append((f"Error completando tránsito de unidad {unit_id}", player_id))
+            continue
 
-        if success and update_success:
-            dest_name = "Destino Local"
-            if final_system_id:
-                dest_system_data = get_system_by_id(final_system_id)
-                dest_name = dest_system_data.get('name', f'Sistema {final_system_id}') if dest_system_data else f'Sistema {final_system_id}'
+        final_system_id = update["location_system_id"]
+        dest_name = system_names.get(final_system_id, "Destino Local") if final_system_id else "Destino Local"
 
-            arrivals.append({
-                'unit_id': unit_id,
-                'unit_name': unit_name,
-                'player_id': player_id,
-                'destination': dest_name,
-                'destination_system_id': final_system_id
-            })
+        arrivals.append({
+            'unit_id': unit_id,
+            'unit_name': unit_name,
+            'player_id': player_id,
+            'destination': dest_name,
+            'destination_system_id': final_system_id
+        })
+        log_entries.append((f"✅ Unidad '{unit_name}' ha completado su maniobra hacia {dest_name}", player_id))
 
-            log_event(f"✅ Unidad '{unit_name}' ha completado su maniobra hacia {dest_name}", player_id)
-        else:
-            log_event(f"❌ Error completando tránsito de unidad {unit_id}", player_id, is_error=True)
+    log_events_batch(log_entries)
+    log_events_batch(error_entries, is_error=True)
 
     return arrivals
 
@@ -656,72 +681,30 @@ def estimate_travel_time(
     """
     Estima el tiempo de viaje entre dos ubicaciones.
     V14.0: Soporta use_boost y retorna flags para UI (can_boost).
+    V26.9: Las reglas de costo viven en los constructores de TravelLeg (compartidos con compute_reachability).
     """
     # Mismo sistema
     if origin_system_id == dest_system_id:
-        ring_diff = abs(origin_ring - dest_ring)
-        if ring_diff == 0:
+        if origin_ring == dest_ring:
             return {
                 'route_type': 'local',
                 'ticks': 0,
                 'is_instant': True,
                 'description': 'Movimiento local (instantáneo)'
             }
-        
-        # Inter-ring
-        ticks = TICKS_BETWEEN_RINGS_SHORT
-        energy_cost = 0
-        
-        # V14.0: Costo para saltos largos
-        if ring_diff > INTER_RING_LONG_DISTANCE_THRESHOLD:
-            energy_cost = INTER_RING_ENERGY_COST_PER_SHIP * ship_count
-            
-        return {
-            'route_type': 'inter_ring',
-            'ticks': ticks,
-            'is_instant': False,
-            'energy_cost': energy_cost,
-            'description': f'Maniobra orbital ({ring_diff} anillos de distancia)'
-        }
+        return _inter_ring_leg(origin_system_id, origin_ring, dest_ring, ship_count).as_estimate()
 
     # Buscar starlane
     starlane = find_starlane_between(origin_system_id, dest_system_id)
     if starlane:
         distance = get_starlane_distance(starlane)
-        
-        can_boost = False
-        ticks = 0
-        energy_cost = 0
-        
-        if distance <= STARLANE_DISTANCE_THRESHOLD:
-            ticks = TICKS_STARLANE_SHORT
-            desc = f'Vía Starlane (distancia: {distance:.1f})'
-        else:
-            # Distancia larga
-            can_boost = True
-            if use_boost:
-                ticks = TICKS_STARLANE_SHORT
-                energy_cost = STARLANE_ENERGY_BOOST_COST * ship_count
-                desc = f'Vía Starlane BOOSTED (distancia: {distance:.1f})'
-            else:
-                ticks = TICKS_STARLANE_LONG
-                desc = f'Vía Starlane (distancia: {distance:.1f})'
-        
-        return {
-            'route_type': 'starlane',
-            'starlane_id': starlane.get('id'),
-            'distance': distance,
-            'ticks': ticks,
-            'is_instant': False,
-            'energy_cost': energy_cost,
-            'can_boost': can_boost,
-            'boost_cost_per_ship': STARLANE_ENERGY_BOOST_COST,
-            'description': desc
-        }
+        return _starlane_leg(
+            dest_system_id, starlane.get('id'), distance, ship_count, use_boost
+        ).as_estimate()
 
     # Warp
     distance = calculate_euclidean_distance(origin_system_id, dest_system_id)
-    
+
     # V14.0: Validar distancia Warp
     if distance > WARP_MAX_DISTANCE:
         return {
@@ -731,25 +714,365 @@ def estimate_travel_time(
             'description': f'Destino fuera de rango Warp ({distance:.1f} > {WARP_MAX_DISTANCE})'
         }
 
-    ticks = WARP_TICKS_BASE + int(distance / 10) * WARP_TICKS_PER_10_DISTANCE
-    energy_cost_base = int(WARP_ENERGY_COST_PER_UNIT_DISTANCE * distance * ship_count)
+    return _warp_leg(dest_system_id, distance, origin_ring, ship_count).as_estimate()
+
+
+# --- ALCANCE / ISÓCRONAS (V26.9) ---
+
+@dataclass
+class TravelLeg:
+    """Un tramo de movimiento ordenable en una sola orden (anillo, starlane o warp)."""
+    dest_system_id: int
+    dest_ring: int
+    route_type: str                 # 'inter_ring' | 'starlane' | 'warp'
+    ticks: int
+    energy_cost: int = 0
+    distance: float = 0.0
+    starlane_id: Optional[int] = None
+    use_boost: bool = False
+    can_boost: bool = False
+    has_gravity_penalty: bool = False
+    ring_diff: int = 0
+
+    @property
+    def movement_type(self) -> MovementType:
+        if self.route_type == 'starlane':
+            return MovementType.STARLANE
+        if self.route_type == 'warp':
+            return MovementType.WARP
+        return MovementType.INTER_RING
+
+    def as_estimate(self) -> Dict[str, Any]:
+        """Mismo formato que estimate_travel_time (consumido por la UI)."""
+        if self.route_type == 'inter_ring':
+            return {
+                'route_type': 'inter_ring',
+                'ticks': self.ticks,
+                'is_instant': False,
+                'energy_cost': self.energy_cost,
+                'description': f'Maniobra orbital ({self.ring_diff} anillos de distancia)'
+            }
+
+        if self.route_type == 'starlane':
+            boosted = ' BOOSTED' if self.use_boost else ''
+            return {
+                'route_type': 'starlane',
+                'starlane_id': self.starlane_id,
+                'distance': self.distance,
+                'ticks': self.ticks,
+                'is_instant': False,
+                'energy_cost': self.energy_cost,
+                'can_boost': self.can_boost,
+                'boost_cost_per_ship': STARLANE_ENERGY_BOOST_COST,
+                'description': f'Vía Starlane{boosted} (distancia: {self.distance:.1f})'
+            }
+
+        energy_cost_base = self.energy_cost // 2 if self.has_gravity_penalty else self.energy_cost
+        desc = f'Salto Warp (distancia: {self.distance:.1f}, energía: {self.energy_cost})'
+        if self.has_gravity_penalty:
+            desc += ' ⚠️ Penalización gravitacional x2'
+        return {
+            'route_type': 'warp',
+            'distance': self.distance,
+            'ticks': self.ticks,
+            'is_instant': False,
+            'is_valid': True,
+            'energy_cost': self.energy_cost,
+            'energy_cost_base': energy_cost_base,
+            'has_gravity_penalty': self.has_gravity_penalty,
+            'description': desc
+        }
+
+
+def _inter_ring_leg(system_id: int, origin_ring: int, dest_ring: int, ship_count: int) -> TravelLeg:
+    ring_diff = abs(origin_ring - dest_ring)
+    energy_cost = 0
+    # V14.0: Costo para saltos largos
+    if ring_diff > INTER_RING_LONG_DISTANCE_THRESHOLD:
+        energy_cost = INTER_RING_ENERGY_COST_PER_SHIP * ship_count
+    return TravelLeg(
+        dest_system_id=system_id,
+        dest_ring=dest_ring,
+        route_type='inter_ring',
+        ticks=TICKS_BETWEEN_RINGS_SHORT,
+        energy_cost=energy_cost,
+        ring_diff=ring_diff
+    )
+
+
+def _starlane_leg(
+    dest_system_id: int,
+    starlane_id: Optional[int],
+    distance: float,
+    ship_count: int,
+    use_boost: bool
+) -> TravelLeg:
+    leg = TravelLeg(
+        dest_system_id=dest_system_id,
+        dest_ring=RING_STELLAR,
+        route_type='starlane',
+        ticks=TICKS_STARLANE_SHORT,
+        distance=distance,
+        starlane_id=starlane_id
+    )
+    if distance > STARLANE_DISTANCE_THRESHOLD:
+        leg.can_boost = True
+        if use_boost:
+            leg.use_boost = True
+            leg.energy_cost = STARLANE_ENERGY_BOOST_COST * ship_count
+        else:
+            leg.ticks = TICKS_STARLANE_LONG
+    return leg
+
 
+def _warp_leg(dest_system_id: int, distance: float, origin_ring: int, ship_count: int) -> TravelLeg:
+    energy_cost = int(WARP_ENERGY_COST_PER_UNIT_DISTANCE * distance * ship_count)
     # V10.1: Penalización gravitacional
     warp_penalty = origin_ring > 0
-    energy_cost_final = energy_cost_base * 2 if warp_penalty else energy_cost_base
+    return TravelLeg(
+        dest_system_id=dest_system_id,
+        dest_ring=RING_STELLAR,
+        route_type='warp',
+        ticks=WARP_TICKS_BASE + int(distance / 10) * WARP_TICKS_PER_10_DISTANCE,
+        energy_cost=energy_cost * 2 if warp_penalty else energy_cost,
+        distance=distance,
+        has_gravity_penalty=warp_penalty
+    )
 
-    desc = f'Salto Warp (distancia: {distance:.1f}, energía: {energy_cost_final})'
-    if warp_penalty:
-        desc += ' ⚠️ Penalización gravitacional x2'
 
-    return {
-        'route_type': 'warp',
-        'distance': distance,
-        'ticks': ticks,
-        'is_instant': False,
-        'is_valid': True,
-        'energy_cost': energy_cost_final,
-        'energy_cost_base': energy_cost_base,
-        'has_gravity_penalty': warp_penalty,
-        'description': desc
-    }
\ No newline at end of file
+@dataclass
+class NavigationIndex:
+    """
+    Grafo galáctico en memoria: coordenadas y adyacencia de starlanes.
+    Los vecinos Warp se resuelven con una rejilla espacial de celda WARP_MAX_DISTANCE.
+    """
+    coords: Dict[int, Tuple[float, float]] = field(default_factory=dict)
+    lanes: Dict[int, List[Tuple[int, Optional[int], float]]] = field(default_factory=dict)
+    _grid: Dict[Tuple[int, int], List[int]] = field(default_factory=dict, repr=False)
+    _warp_cache: Dict[int, List[Tuple[int, float]]] = field(default_factory=dict, repr=False)
+
+    def distance(self, system_a_id: int, system_b_id: int) -> float:
+        a = self.coords.get(system_a_id)
+        b = self.coords.get(system_b_id)
+        if a is None or b is None:
+            return float('inf')
+        return math.hypot(a[0] - b[0], a[1] - b[1])
+
+    def _cell(self, system_id: int) -> Tuple[int, int]:
+        x, y = self.coords[system_id]
+        return (int(math.floor(x / WARP_MAX_DISTANCE)), int(math.floor(y / WARP_MAX_DISTANCE)))
+
+    def warp_neighbors(self, system_id: int) -> List[Tuple[int, float]]:
+        """Sistemas a distancia <= WARP_MAX_DISTANCE sin starlane directa (memoizado)."""
+        cached = self._warp_cache.get(system_id)
+        if cached is not None:
+            return cached
+        if system_id not in self.coords:
+            return []
+
+        if not self._grid:
+            for sid in self.coords:
+                self._grid.setdefault(self._cell(sid), []).append(sid)
+
+        lane_dests = {dest for dest, _, _ in self.lanes.get(system_id, [])}
+        cx, cy = self._cell(system_id)
+        neighbors = []
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for other in self._grid.get((gx, gy), []):
+                    if other == system_id or other in lane_dests:
+                        continue
+                    dist = self.distance(system_id, other)
+                    if dist <= WARP_MAX_DISTANCE:
+                        neighbors.append((other, dist))
+        neighbors.sort()
+        self._warp_cache[system_id] = neighbors
+        return neighbors
+
+
+_NAVIGATION_INDEX: Optional[NavigationIndex] = None
+
+
+def build_navigation_index() -> NavigationIndex:
+    """Una lectura de coordenadas y una de starlanes. Distancias por defecto (1.0) se recalculan."""
+    index = NavigationIndex()
+    for s in get_system_coordinates():
+        index.coords[s['id']] = (float(s.get('x') or 0), float(s.get('y') or 0))
+
+    for lane in get_starlanes_from_db():
+        a, b = lane.get('system_a_id'), lane.get('system_b_id')
+        if a is None or b is None:
+            continue
+        # Misma regla que get_starlane_distance (V14.4) sin consultas por sistema
+        dist_val = lane.get('distancia')
+        try:
+            distance = float(dist_val)
+            if abs(distance - 1.0) < 0.001:
+                distance = index.distance(a, b)
+        except (ValueError, TypeError):
+            distance = index.distance(a, b)
+        index.lanes.setdefault(a, []).append((b, lane.get('id'), distance))
+        index.lanes.setdefault(b, []).append((a, lane.get('id'), distance))
+    return index
+
+
+def get_navigation_index(refresh: bool = False) -> NavigationIndex:
+    """Índice compartido (la topología no cambia durante la partida)."""
+    global _NAVIGATION_INDEX
+    if _NAVIGATION_INDEX is None or refresh:
+        _NAVIGATION_INDEX = build_navigation_index()
+    return _NAVIGATION_INDEX
+
+
+def invalidate_navigation_index() -> None:
+    global _NAVIGATION_INDEX
+    _NAVIGATION_INDEX = None
+
+
+@dataclass
+class ReachableNode:
+    """Mejor llegada conocida a (sistema, anillo): menor tiempo, desempate por energía."""
+    system_id: int
+    ring: int
+    ticks: int
+    energy_cost: int
+    hops: int = 0
+    leg: Optional[TravelLeg] = None
+    previous: Optional[Tuple[int, int]] = None
+
+
+@dataclass
+class ReachabilityMap:
+    """Resultado de compute_reachability: isócrona de una unidad desde su posición."""
+    origin_system_id: int
+    origin_ring: int
+    ship_count: int
+    max_ticks: int
+    nodes: Dict[Tuple[int, int], ReachableNode] = field(default_factory=dict)
+    direct_legs: List[TravelLeg] = field(default_factory=list)
+
+    def get(self, system_id: int, ring: int = RING_STELLAR) -> Optional[ReachableNode]:
+        return self.nodes.get((system_id, ring))
+
+    def is_reachable(self, system_id: int, ring: Optional[int] = None) -> bool:
+        if ring is not None:
+            return (system_id, ring) in self.nodes
+        return any(sid == system_id for sid, _ in self.nodes)
+
+    def path_to(self, system_id: int, ring: int = RING_STELLAR) -> List[TravelLeg]:
+        """Tramos (en orden) de la mejor ruta hasta el destino; vacío si no es alcanzable."""
+        legs: List[TravelLeg] = []
+        node = self.nodes.get((system_id, ring))
+        while node is not None and node.leg is not None:
+            legs.append(node.leg)
+            node = self.nodes.get(node.previous) if node.previous else None
+        legs.reverse()
+        return legs
+
+    def direct(self, route_type: str, use_boost: bool = False) -> List[TravelLeg]:
+        """Opciones de una sola orden desde el origen (sin límite de horizonte)."""
+        return [
+            leg for leg in self.direct_legs
+            if leg.route_type == route_type and leg.use_boost == use_boost
+        ]
+
+    def leg_to(self, system_id: int, ring: int = RING_STELLAR, use_boost: bool = False) -> Optional[TravelLeg]:
+        for leg in self.direct_legs:
+            if leg.dest_system_id == system_id and leg.dest_ring == ring and leg.use_boost == use_boost:
+                return leg
+        return None
+
+    def systems_by_tick(self) -> Dict[int, List[int]]:
+        """Isócronas: tick -> sistemas alcanzados por primera vez en ese tick (cualquier anillo)."""
+        best: Dict[int, int] = {}
+        for (system_id, _), node in self.nodes.items():
+            if system_id == self.origin_system_id:
+                continue
+            if system_id not in best or node.ticks < best[system_id]:
+                best[system_id] = node.ticks
+        bands: Dict[int, List[int]] = {}
+        for system_id, ticks in best.items():
+            bands.setdefault(ticks, []).append(system_id)
+        return {t: sorted(ids) for t, ids in sorted(bands.items())}
+
+
+def _expand_legs(
+    index: NavigationIndex,
+    system_id: int,
+    ring: int,
+    ship_count: int,
+    allow_boost: bool
+) -> List[TravelLeg]:
+    legs = [
+        _inter_ring_leg(system_id, ring, dest_ring, ship_count)
+        for dest_ring in range(RING_STELLAR, RING_MAX + 1)
+        if dest_ring != ring
+    ]
+    for dest, lane_id, distance in index.lanes.get(system_id, []):
+        leg = _starlane_leg(dest, lane_id, distance, ship_count, use_boost=False)
+        legs.append(leg)
+        if leg.can_boost and allow_boost:
+            legs.append(_starlane_leg(dest, lane_id, distance, ship_count, use_boost=True))
+    for dest, distance in index.warp_neighbors(system_id):
+        legs.append(_warp_leg(dest, distance, ring, ship_count))
+    return legs
+
+
+def compute_reachability(
+    origin_system_id: int,
+    origin_ring: int = RING_STELLAR,
+    ship_count: int = 1,
+    max_ticks: int = REACHABILITY_DEFAULT_MAX_TICKS,
+    allow_boost: bool = True,
+    index: Optional[NavigationIndex] = None
+) -> ReachabilityMap:
+    """
+    Todos los (sistema, anillo) alcanzables en <= max_ticks con su costo, en una sola
+    expansión tipo Dijkstra (ticks, energía) sobre el índice de navegación.
+    Usa las mismas reglas de costo que estimate_travel_time; los tramos directos
+    desde el origen se exponen completos para la consola de movimiento.
+    """
+    index = index or get_navigation_index()
+    ship_count = max(1, ship_count)
+    origin = (origin_system_id, origin_ring)
+
+    reach = ReachabilityMap(
+        origin_system_id=origin_system_id,
+        origin_ring=origin_ring,
+        ship_count=ship_count,
+        max_ticks=max_ticks
+    )
+    reach.nodes[origin] = ReachableNode(origin_system_id, origin_ring, 0, 0)
+
+    heap: List[Tuple[int, int, int, int]] = [(0, 0, origin_system_id, origin_ring)]
+    while heap:
+        ticks, energy, system_id, ring = heapq.heappop(heap)
+        node = reach.nodes[(system_id, ring)]
+        if (node.ticks, node.energy_cost) != (ticks, energy):
+            continue  # Entrada obsoleta
+
+        legs = _expand_legs(index, system_id, ring, ship_count, allow_boost)
+        if (system_id, ring) == origin:
+            reach.direct_legs = legs
+
+        for leg in legs:
+            new_ticks = ticks + leg.ticks
+            if new_ticks > max_ticks:
+                continue
+            new_energy = energy + leg.energy_cost
+            key = (leg.dest_system_id, leg.dest_ring)
+            best = reach.nodes.get(key)
+            if best is not None and (best.ticks, best.energy_cost) <= (new_ticks, new_energy):
+                continue
+            reach.nodes[key] = ReachableNode(
+                system_id=leg.dest_system_id,
+                ring=leg.dest_ring,
+                ticks=new_ticks,
+                energy_cost=new_energy,
+                hops=node.hops + 1,
+                leg=leg,
+                previous=(system_id, ring)
+            )
+            heapq.heappush(heap, (new_ticks, new_energy, leg.dest_system_id, leg.dest_ring))
+
+    return reach
@@ -0,0 +1,497 @@
+# core/order_book_engine.py
+"""
+Motor de Libro de Órdenes - V26.2
+Liquidez jugador-a-jugador mediante órdenes límite por recurso.
+
+Reglas:
+- Las órdenes límite se colocan durante el tick con los fondos en custodia
+  (escrow): compra reserva créditos (cantidad * límite), venta reserva el recurso.
+- Una vez por tick se ejecuta una subasta por lotes por recurso:
+    * Prioridad precio-tiempo: compras por precio desc., ventas por precio asc.,
+      desempate por (created_at_tick, id).
+    * Precio de cierre uniforme: punto medio entre la compra y la venta
+      marginales casadas. Todas las operaciones del lote se ejecutan a ese precio.
+    * Llenados parciales: la orden conserva el remanente en el libro.
+- El broker NPC (BASE_PRICES con el markup base) actúa como creador de mercado
+  de respaldo con liquidez infinita: el remanente que cruza su cotización se
+  ejecuta al precio del NPC.
+- El libro es una estructura compacta en memoria reconstruida desde la tabla
+  market_orders en cada tick (no hay estado persistente fuera de la DB).
+"""
+
+from typing import Any, Dict, List, Set, Tuple, Optional, Iterable
+from dataclasses import dataclass, field
+import math
+
+from core.models import MarketOrder, MarketOrderStatus, MarketOrderType
+from core.market_engine import (
+    BASE_PRICES,
+    MARKET_FEE_PERCENT,
+    get_market_limits,
+    get_current_tick,
+)
+from data.market_repository import (
+    create_market_order,
+    get_open_limit_orders,
+    get_market_order_by_id,
+    update_market_orders_bulk,
+    cancel_open_order,
+    insert_market_trades,
+)
+from data.player_repository import (
+    get_player_resources,
+    update_player_resources,
+    apply_player_resource_deltas,
+)
+from data.log_repository import log_event, log_events_batch
+
+# Identificador del broker NPC en las operaciones (sin orden asociada)
+NPC_MAKER = None
+
+# Liquidez "infinita" y prioridad temporal última de las órdenes virtuales del NPC
+_NPC_DEPTH = 1 << 62
+_NPC_TICK = 1 << 62
+
+
+# --- ESTRUCTURAS EN MEMORIA ---
+
+class BookOrder:
+    """Orden en reposo del libro. Compacta (__slots__) para libros de 100k+ órdenes."""
+    __slots__ = ("order_id", "player_id", "is_buy", "price", "remaining", "filled", "tick")
+
+    def __init__(self, order_id: int, player_id: int, is_buy: bool, price: int,
+                 remaining: int, filled: int = 0, tick: int = 0):
+        self.order_id = order_id
+        self.player_id = player_id
+        self.is_buy = is_buy
+        self.price = price
+        self.remaining = remaining
+        self.filled = filled
+        self.tick = tick
+
+    @classmethod
+    def from_market_order(cls, order: MarketOrder) -> 'BookOrder':
+        return cls(
+            order_id=order.id,
+            player_id=order.player_id,
+            is_buy=order.amount > 0,
+            price=order.price_per_unit,
+            remaining=order.remaining_amount,
+            filled=order.filled_amount,
+            tick=order.created_at_tick,
+        )
+
+
+@dataclass
+class Fill:
+    """Operación casada. buy/sell None significa contraparte NPC."""
+    resource: str
+    quantity: int
+    price: int
+    buy: Optional[BookOrder] = None
+    sell: Optional[BookOrder] = None
+
+
+class OrderBook:
+    """Libro de órdenes por recurso: {recurso: (compras, ventas)}."""
+
+    def __init__(self):
+        self.bids: Dict[str, List[BookOrder]] = {}
+        self.asks: Dict[str, List[BookOrder]] = {}
+
+    def add(self, resource: str, order: BookOrder) -> None:
+        if order.remaining <= 0:
+            return
+        side = self.bids if order.is_buy else self.asks
+        side.setdefault(resource, []).append(order)
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[MarketOrder]) -> 'OrderBook':
+        """Reconstruye el libro desde filas de market_orders (status OPEN)."""
+        book = cls()
+        for order in orders:
+            book.add(order.resource_type, BookOrder.from_market_order(order))
+        return book
+
+    def resources(self) -> List[str]:
+        return sorted(set(self.bids) | set(self.asks))
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.bids.values()) + sum(len(v) for v in self.asks.values())
+
+    def depth(self, resource: str, levels: int = 5) -> Dict[str, List[Tuple[int, int]]]:
+        """Profundidad agregada por nivel de precio [(precio, cantidad)] para UI."""
+        def aggregate(orders: List[BookOrder], reverse: bool) -> List[Tuple[int, int]]:
+            totals: Dict[int, int] = {}
+            for o in orders:
+                totals[o.price] = totals.get(o.price, 0) + o.remaining
+            return sorted(totals.items(), reverse=reverse)[:levels]
+
+        return {
+            "bids": aggregate(self.bids.get(resource, []), reverse=True),
+            "asks": aggregate(self.asks.get(resource, []), reverse=False),
+        }
+
+
+@dataclass
+class AuctionResult:
+    """Resultado de la subasta por lotes de un tick."""
+    fills: List[Fill] = field(default_factory=list)
+    clearing_prices: Dict[str, int] = field(default_factory=dict)
+    touched: Dict[int, BookOrder] = field(default_factory=dict)
+
+    @property
+    def matched_volume(self) -> int:
+        return sum(f.quantity for f in self.fills)
+
+
+# --- COTIZACIÓN DEL BROKER NPC ---
+
+def get_npc_quotes() -> Dict[str, Tuple[int, int]]:
+    """
+    Cotización (bid, ask) del broker NPC por recurso, con el markup base
+    (prestigio neutral). Mismas fórmulas que calculate_market_prices.
+    """
+    return {
+        resource: (
+            max(1, math.floor(base * (1 - MARKET_FEE_PERCENT))),
+            math.ceil(base * (1 + MARKET_FEE_PERCENT)),
+        )
+        for resource, base in BASE_PRICES.items()
+    }
+
+
+# --- MATCHING (PURO) ---
+
+def _npc_order(is_buy: bool, price: int) -> BookOrder:
+    """Orden virtual del broker NPC: cantidad infinita y última prioridad temporal."""
+    return BookOrder(order_id=NPC_MAKER, player_id=NPC_MAKER, is_buy=is_buy,
+                     price=price, remaining=_NPC_DEPTH, tick=_NPC_TICK)
+
+
+def match_resource(
+    resource: str,
+    bids: List[BookOrder],
+    asks: List[BookOrder],
+    npc_quote: Optional[Tuple[int, int]] = None
+) -> Tuple[List[Fill], Optional[int]]:
+    """
+    Subasta por lotes de un recurso. Muta remaining/filled de las órdenes.
+    El broker NPC participa como una orden más en cada lado (a su cotización),
+    por lo que solo ejecuta lo que ningún jugador ofrece a mejor precio.
+    Returns: (fills, precio_de_cierre jugador-a-jugador o None)
+    """
+    bids = list(bids)
+    asks = list(asks)
+    npc_bid = npc_ask = None
+    if npc_quote:
+        npc_bid, npc_ask = npc_quote
+        bids.append(_npc_order(True, npc_bid))
+        asks.append(_npc_order(False, npc_ask))
+
+    bids.sort(key=lambda o: (-o.price, o.tick, o.order_id or 0))
+    asks.sort(key=lambda o: (o.price, o.tick, o.order_id or 0))
+
+    # 1. Casar por prioridad precio-tiempo. Los pares jugador-jugador quedan con
+    #    precio pendiente (uniforme); los pares con el NPC se ejecutan a su cotización.
+    pairs: List[Tuple[BookOrder, BookOrder, int]] = []
+    fills: List[Fill] = []
+    i = j = 0
+    marginal_bid = marginal_ask = None
+    while i < len(bids) and j < len(asks) and bids[i].price >= asks[j].price:
+        bid, ask = bids[i], asks[j]
+        bid_is_npc = bid.player_id is NPC_MAKER
+        ask_is_npc = ask.player_id is NPC_MAKER
+        if bid_is_npc and ask_is_npc:
+            break
+
+        qty = min(bid.remaining, ask.remaining)
+        if bid_is_npc:
+            fills.append(Fill(resource, qty, bid.price, NPC_MAKER, ask))
+        elif ask_is_npc:
+            fills.append(Fill(resource, qty, ask.price, bid, NPC_MAKER))
+        else:
+            pairs.append((bid, ask, qty))
+            marginal_bid, marginal_ask = bid.price, ask.price
+
+        if not bid_is_npc:
+            bid.remaining -= qty
+            bid.filled += qty
+            if bid.remaining == 0:
+                i += 1
+        if not ask_is_npc:
+            ask.remaining -= qty
+            ask.filled += qty
+            if ask.remaining == 0:
+                j += 1
+
+    if not pairs:
+        return fills, None
+
+    # 2. Precio uniforme: punto medio de los marginales, acotado a la cotización
+    #    NPC para que ningún jugador opere peor que contra el broker.
+    clearing_price = (marginal_bid + marginal_ask) // 2
+    low, high = marginal_ask, marginal_bid
+    if npc_quote:
+        low, high = max(low, npc_bid), min(high, npc_ask)
+    clearing_price = min(max(clearing_price, low), high)
+
+    fills = [Fill(resource, qty, clearing_price, bid, ask) for bid, ask, qty in pairs] + fills
+    return fills, clearing_price
+
+
+def run_batch_auction(
+    book: OrderBook,
+    npc_quotes: Optional[Dict[str, Tuple[int, int]]] = None
+) -> AuctionResult:
+    """Ejecuta la subasta de todos los recursos del libro."""
+    result = AuctionResult()
+    npc_quotes = npc_quotes or {}
+
+    for resource in book.resources():
+        fills, price = match_resource(
+            resource,
+            book.bids.get(resource, []),
+            book.asks.get(resource, []),
+            npc_quotes.get(resource)
+        )
+        if price is not None:
+            result.clearing_prices[resource] = price
+        for f in fills:
+            if f.buy is not None:
+                result.touched[f.buy.order_id] = f.buy
+            if f.sell is not None:
+                result.touched[f.sell.order_id] = f.sell
+        result.fills.extend(fills)
+
+    return result
+
+
+def calculate_fill_deltas(fills: List[Fill]) -> Dict[int, Dict[str, int]]:
+    """
+    Deltas de recursos por jugador a partir de las operaciones casadas.
+    - Comprador: recibe el recurso + reembolso de custodia (límite - precio) * cantidad.
+    - Vendedor: recibe créditos (precio * cantidad). El recurso ya estaba en custodia.
+    """
+    deltas: Dict[int, Dict[str, int]] = {}
+    for f in fills:
+        if f.buy is not None:
+            d = deltas.setdefault(f.buy.player_id, {})
+            d[f.resource] = d.get(f.resource, 0) + f.quantity
+            refund = (f.buy.price - f.price) * f.quantity
+            if refund:
+                d["creditos"] = d.get("creditos", 0) + refund
+        if f.sell is not None:
+            d = deltas.setdefault(f.sell.player_id, {})
+            d["creditos"] = d.get("creditos", 0) + f.price * f.quantity
+    return deltas
+
+
+# --- API DE JUGADOR ---
+
+def place_limit_order(
+    player_id: int,
+    resource: str,
+    amount: int,
+    limit_price: int,
+    is_buy: bool
+) -> Tuple[bool, str]:
+    """
+    Coloca una orden límite en el libro. Los fondos quedan en custodia hasta
+    que la orden se llena o se cancela. Solo recursos base.
+    """
+    if amount <= 0 or limit_price <= 0:
+        return False, "Cantidad y precio límite deben ser mayores a 0."
+    if resource not in BASE_PRICES:
+        return False, "Solo los recursos base admiten órdenes límite."
+
+    used, total = get_market_limits(player_id)
+    if used >= total:
+        return False, f"Capacidad logística saturada ({used}/{total}). Espera al siguiente tick."
+
+    player_resources = get_player_resources(player_id)
+    if is_buy:
+        escrow_key, escrow_amount = "creditos", amount * limit_price
+    else:
+        escrow_key, escrow_amount = resource, amount
+
+    current = player_resources.get(escrow_key, 0) or 0
+    if current < escrow_amount:
+        return False, f"Fondos insuficientes para custodia ({escrow_amount} {escrow_key})."
+
+    try:
+        if not update_player_resources(player_id, {escrow_key: current - escrow_amount}):
+            return False, "Error al actualizar recursos del jugador."
+
+        order = MarketOrder(
+            id=0,
+            player_id=player_id,
+            resource_type=resource,
+            amount=amount if is_buy else -amount,
+            price_per_unit=limit_price,
+            status=MarketOrderStatus.OPEN,
+            created_at_tick=get_current_tick(),
+            order_type=MarketOrderType.LIMIT,
+        )
+        if not create_market_order(order):
+            update_player_resources(player_id, {escrow_key: current})
+            return False, "Error de base de datos al crear orden."
+
+        action_str = "Compra" if is_buy else "Venta"
+        log_event(f"📒 Libro: {action_str} límite {amount} {resource} @ {limit_price} Cr/u", player_id)
+        return True, "Orden límite registrada. Se casará en la subasta del próximo ciclo."
+    except Exception as e:
+        return False, f"Error inesperado: {e}"
+
+
+def cancel_limit_order(order_id: int, player_id: int) -> Tuple[bool, str]:
+    """Cancela una orden límite en reposo y devuelve la custodia del remanente."""
+    order = get_market_order_by_id(order_id)
+    if not order or order.player_id != player_id or order.order_type != MarketOrderType.LIMIT:
+        return False, "Orden no encontrada."
+    if order.status != MarketOrderStatus.OPEN:
+        return False, "La orden ya no está activa."
+
+    # V26.25: La custodia se calcula con la fila cancelada, no con la lectura previa
+    # (la subasta pudo llenar parte de la orden entre ambas).
+    cancelled = cancel_open_order(order_id, player_id)
+    if not cancelled:
+        return False, "La orden ya no está activa."
+
+    remaining = cancelled.remaining_amount
+    if order.amount > 0:
+        refund = {"creditos": remaining * order.price_per_unit}
+    else:
+        refund = {order.resource_type: remaining}
+    apply_player_resource_deltas({player_id: refund})
+
+    log_event(f"📒 Libro: Orden {order_id} cancelada ({remaining} u. devueltas a custodia).", player_id)
+    return True, "Orden cancelada."
+
+
+# --- ORQUESTADOR DE TICK ---
+
+def _order_update(order: BookOrder, current_tick: int) -> Dict[str, Any]:
+    """Fila de update_market_orders_bulk con el llenado en memoria de la orden."""
+    completed = order.remaining == 0
+    return {
+        "id": order.order_id,
+        "filled_amount": order.filled,
+        "status": (MarketOrderStatus.COMPLETED if completed else MarketOrderStatus.OPEN).value,
+        "processed_at_tick": current_tick if completed else None,
+    }
+
+
+def _drop_unapplied_fills(
+    result: AuctionResult,
+    applied: Set[int],
+    previous_filled: Dict[int, int],
+    current_tick: int
+) -> AuctionResult:
+    """
+    V26.25: Descarta las operaciones con alguna orden que no se pudo escribir
+    (cancelada entre la lectura del libro y la escritura) y corrige el llenado
+    ya escrito de sus contrapartes.
+    """
+    kept = [
+        f for f in result.fills
+        if all(o is None or o.order_id in applied for o in (f.buy, f.sell))
+    ]
+    actual = {oid: previous_filled[oid] for oid in applied}
+    for f in kept:
+        for o in (f.buy, f.sell):
+            if o is not None:
+                actual[o.order_id] += f.quantity
+
+    touched = {oid: o for oid, o in result.touched.items() if oid in applied}
+    corrections = []
+    for oid, o in touched.items():
+        if actual[oid] == o.filled:
+            continue
+        written = _order_update(o, current_tick)
+        o.remaining += o.filled - actual[oid]
+        o.filled = actual[oid]
+        corrections.append({
+            **_order_update(o, current_tick),
+            "expected_filled": written["filled_amount"],
+            "expected_status": written["status"],
+        })
+
+    corrected = update_market_orders_bulk(corrections) if corrections else set()
+    missed = {c["id"] for c in corrections} - (corrected or set())
+    if missed:
+        log_event(f"Libro de órdenes: no se pudo corregir el llenado de las órdenes {sorted(missed)}.", is_error=True)
+
+    skipped = len(result.touched) - len(applied)
+    log_event(f"📒 Libro de Órdenes: {skipped} orden(es) canceladas durante la subasta; operaciones descartadas.")
+    return AuctionResult(fills=kept, clearing_prices=result.clearing_prices, touched=touched)
+
+
+def process_order_book_tick(current_tick: Optional[int] = None) -> AuctionResult:
+    """
+    Subasta por lotes global (una vez por tick):
+        1. Una consulta: órdenes LIMIT en reposo -> libro en memoria.
+        2. Matching precio-tiempo + broker NPC de respaldo (en memoria).
+        3. Una actualización de órdenes (RPC), un INSERT de operaciones y una
+           aplicación de deltas de recursos (RPC).
+    """
+    if current_tick is None:
+        current_tick = get_current_tick()
+
+    orders = get_open_limit_orders()
+    if not orders:
+        return AuctionResult()
+
+    book = OrderBook.from_orders(orders)
+    result = run_batch_auction(book, get_npc_quotes())
+    if not result.fills:
+        return result
+
+    previous_filled = {o.id: o.filled_amount for o in orders}
+    order_updates = [
+        {**_order_update(o, current_tick), "expected_filled": previous_filled[o.order_id]}
+        for o in result.touched.values()
+    ]
+    applied = update_market_orders_bulk(order_updates)
+    if applied is None:
+        log_event("Error persistiendo llenados del libro de órdenes. Subasta descartada.", is_error=True)
+        return AuctionResult()
+
+    # V26.25: Órdenes canceladas durante la subasta no se liquidan (evita doble reembolso)
+    if len(applied) < len(result.touched):
+        result = _drop_unapplied_fills(result, applied, previous_filled, current_tick)
+        if not result.fills:
+            return result
+
+    if not apply_player_resource_deltas(calculate_fill_deltas(result.fills)):
+        # Compensación: restaurar el estado previo para reintentar en el próximo tick
+        update_market_orders_bulk([
+            {"id": oid, "filled_amount": previous_filled[oid],
+             "status": MarketOrderStatus.OPEN.value, "processed_at_tick": None,
+             "expected_filled": o.filled, "expected_status": _order_update(o, current_tick)["status"]}
+            for oid, o in result.touched.items()
+        ])
+        log_event("Error acreditando subasta del libro de órdenes. Se reintentará.", is_error=True)
+        return AuctionResult()
+
+    insert_market_trades([
+        {
+            "resource_type": f.resource,
+            "buy_order_id": f.buy.order_id if f.buy else None,
+            "sell_order_id": f.sell.order_id if f.sell else None,
+            "quantity": f.quantity,
+            "price": f.price,
+            "tick": current_tick,
+        }
+        for f in result.fills
+    ])
+
+    filled_by_player: Dict[int, int] = {}
+    for o in result.touched.values():
+        filled_by_player[o.player_id] = filled_by_player.get(o.player_id, 0) + 1
+    log_events_batch([
+        (f"📒 Libro de Órdenes: {count} orden(es) con llenados en la subasta.", pid)
+        for pid, count in filled_by_player.items()
+    ])
+
+    return result
@@ -106,7 +106,8 @@ def analyze_candidates_value(player_id: int, candidates: List[Dict[str, Any]]) -
         return recommendations
 
     # 1. Obtener Roster Actual y sus máximos
-    roster = get_all_characters_by_player_id(player_id)
+    # V26.17: Proyección hot (atributos/habilidades sin el stats_json completo)
+    roster = get_all_characters_by_player_id(player_id, projection="hot")
     
     max_attrs = {}
     max_skills = {}
@@ -114,15 +115,13 @@ def analyze_candidates_value(player_id: int, candidates: List[Dict[str, Any]]) -
     for char in roster:
         # Ignorar personajes retirados o muertos si los hubiera en el fetch general
         # (Aunque el repo suele traer todo, filtremos por seguridad si es necesario)
-        stats = char.get("stats_json", {})
-        caps = stats.get("capacidades", {})
         
         # Atributos
-        for attr, val in caps.get("atributos", {}).items():
+        for attr, val in (char.get("atributos") or {}).items():
             max_attrs[attr] = max(max_attrs.get(attr, 0), val)
             
         # Habilidades
-        for skill, val in caps.get("habilidades", {}).items():
+        for skill, val in (char.get("habilidades") or {}).items():
             max_skills[skill] = max(max_skills.get(skill, 0), val)
 
     # 2. Analizar Candidatos
@@ -0,0 +1,159 @@
+# core/territory_engine.py
+"""
+Mapa de Control Territorial - V26.5
+Instantánea en memoria de la soberanía de la galaxia, construida una vez por tick:
+    planeta -> (surface_owner_id, orbital_owner_id)
+    sistema -> controlling_player_id
+
+Permite resolver chequeos de hostilidad en O(1) sin consultas por unidad.
+Compartido por supervivencia de tropas, detección, validación de movimiento y UI
+táctica. Los cambios de soberanía (update_planet_sovereignty, colonización,
+update_system_controller) actualizan el mapa en el sitio si ya está cargado.
+"""
+
+from typing import Dict, Optional, Tuple, Any
+from dataclasses import dataclass, field
+
+from data.database import get_supabase
+from data.log_repository import log_event
+
+
+PlanetOwners = Tuple[Optional[int], Optional[int]]
+
+
+@dataclass
+class ControlMap:
+    """Soberanía galáctica indexada por ID."""
+    tick: int = 0
+    planets: Dict[int, PlanetOwners] = field(default_factory=dict)
+    systems: Dict[int, Optional[int]] = field(default_factory=dict)
+
+    def planet_owners(self, planet_id: int) -> Optional[PlanetOwners]:
+        return self.planets.get(planet_id)
+
+    def system_controller(self, system_id: int) -> Optional[int]:
+        return self.systems.get(system_id)
+
+    def is_controlled(
+        self,
+        player_id: int,
+        planet_id: Optional[int] = None,
+        system_id: Optional[int] = None
+    ) -> bool:
+        """
+        Reglas V16.0 de control territorial:
+        - Planeta: surface_owner_id o orbital_owner_id == player_id
+        - Sistema (sin planeta): controlling_player_id == player_id
+        - Neutral (todos NULL) o ubicación desconocida: considerado seguro/controlado
+        """
+        if planet_id:
+            owners = self.planets.get(planet_id)
+            if owners is not None:
+                surface_owner, orbital_owner = owners
+                if surface_owner is None and orbital_owner is None:
+                    return True
+                return surface_owner == player_id or orbital_owner == player_id
+
+        if system_id and system_id in self.systems:
+            controller = self.systems[system_id]
+            return controller is None or controller == player_id
+
+        return True
+
+    def set_planet_owners(
+        self,
+        planet_id: int,
+        surface_owner_id: Optional[int],
+        orbital_owner_id: Optional[int]
+    ) -> None:
+        self.planets[planet_id] = (surface_owner_id, orbital_owner_id)
+
+    def set_system_controller(self, system_id: int, controller_id: Optional[int]) -> None:
+        self.systems[system_id] = controller_id
+
+
+_CONTROL_MAP: Optional[ControlMap] = None
+
+
+def build_control_map(current_tick: int = 0) -> ControlMap:
+    """Construye el mapa desde la DB: una lectura de planetas y una de sistemas."""
+    control = ControlMap(tick=current_tick)
+    try:
+        db = get_supabase()
+        planets = db.table("planets").select("id, surface_owner_id, orbital_owner_id").execute()
+        for p in (planets.data or []):
+            control.planets[p["id"]] = (p.get("surface_owner_id"), p.get("orbital_owner_id"))
+
+        systems = db.table("systems").select("id, controlling_player_id").execute()
+        for s in (systems.data or []):
+            control.systems[s["id"]] = s.get("controlling_player_id")
+    except Exception as e:
+        log_event(f"Error construyendo mapa de control territorial: {e}", is_error=True)
+    return control
+
+
+def build_location_control_map(
+    planet_id: Optional[int] = None,
+    system_id: Optional[int] = None
+) -> ControlMap:
+    """
+    V26.25: Lectura puntual y fresca de la soberanía de una ubicación (planeta y/o sistema).
+    Para chequeos fuera del tick (UI, validación de movimiento), donde el mapa compartido
+    puede estar desfasado por cambios hechos en otro proceso.
+    """
+    control = ControlMap()
+    try:
+        db = get_supabase()
+        if planet_id:
+            planets = db.table("planets").select("id, surface_owner_id, orbital_owner_id")\
+                .eq("id", planet_id).execute()
+            for p in (planets.data or []):
+                control.planets[p["id"]] = (p.get("surface_owner_id"), p.get("orbital_owner_id"))
+        if system_id:
+            systems = db.table("systems").select("id, controlling_player_id")\
+                .eq("id", system_id).execute()
+            for s in (systems.data or []):
+                control.systems[s["id"]] = s.get("controlling_player_id")
+    except Exception as e:
+        log_event(f"Error leyendo control territorial de la ubicación: {e}", is_error=True)
+    return control
+
+
+def get_control_map(current_tick: Optional[int] = None) -> ControlMap:
+    """
+    Devuelve el mapa compartido. Se reconstruye si aún no existe o si se indica
+    un tick distinto al de la instantánea.
+    """
+    global _CONTROL_MAP
+    if _CONTROL_MAP is None or (current_tick is not None and _CONTROL_MAP.tick != current_tick):
+        _CONTROL_MAP = build_control_map(current_tick or 0)
+    return _CONTROL_MAP
+
+
+def invalidate_control_map() -> None:
+    """Descarta el mapa compartido (se reconstruirá en el próximo acceso)."""
+    global _CONTROL_MAP
+    _CONTROL_MAP = None
+
+
+def on_planet_sovereignty_changed(
+    planet_id: int,
+    surface_owner_id: Optional[int],
+    orbital_owner_id: Optional[int]
+) -> None:
+    """
+    Aplica un cambio de soberanía planetaria al mapa cargado (si lo hay).
+    V26.25: Invalida el catálogo de planetas de nacimiento (la colonización
+    cambia planets.population, que pondera la selección).
+    """
+    if _CONTROL_MAP is not None:
+        _CONTROL_MAP.set_planet_owners(planet_id, surface_owner_id, orbital_owner_id)
+
+    from services.character_generation_service import invalidate_birth_planet_catalogue
+    invalidate_birth_planet_catalogue()
+
+
+def on_system_controller_changed(system_id: int, controller_id: Optional[int]) -> None:
+    """Aplica un cambio de controlador de sistema al mapa cargado (si lo hay)."""
+    if _CONTROL_MAP is not None:
+        _CONTROL_MAP.set_system_controller(system_id, controller_id)
@@ -5,6 +5,9 @@
 # V22.1: Nueva fase 3.7 (Activación Estelar) y limpieza selectiva de construcción.
 # V23.2: Nueva fase 3.55 (Activación Planetaria) para edificios civiles.
 # V25.1: Activación sincronizada de extracción de lujo (Tier 2).
+# V26.12: Nueva fase 2.4 (Recalculo de Habilidades de Unidad en lote).
+# V26.16: Fases 1, 6 y búsqueda de candidatos con parches parciales de stats_json.
+# V26.18: Expiración global de candidatos en la fase 7.
 
 from datetime import datetime, time
 import pytz
@@ -22,12 +25,16 @@ from data.world_repository import (
     mark_action_processed
 )
 from data.player_repository import get_all_players, get_player_credits, update_player_credits
-from data.log_repository import log_event, clear_player_logs
+from data.log_repository import log_event, log_events_batch, clear_player_logs
 # Imports para la lógica del MRG (Misiones)
 from data.database import get_supabase
-from data.character_repository import update_character, STATUS_ID_MAP
+from data.character_repository import (
+    STATUS_ID_MAP,
+    stats_patch,
+    patch_character_stats_bulk
+)
 # Import para sincronización de lujo
-from data.planets.buildings import sync_luxury_sites
+from data.planets.buildings import reconcile_luxury_sites
 
 # Configuración de Logging Profesional
 logger = logging.getLogger(__name__)
@@ -51,7 +58,7 @@ from core.prestige_engine import (
 # IMPORT V10.0: Motores de Movimiento y Detección
 from core.movement_engine import process_transit_arrivals
 from core.detection_engine import process_detection_phase
-from data.unit_repository import reset_all_movement_locks, decrement_transit_ticks
+from data.unit_repository import reset_all_movement_locks
 
 # IMPORT V10.4: Soberanía Diferida
 from data.planet_repository import update_planet_sovereignty
@@ -168,6 +175,9 @@ def _execute_game_logic_tick(execution_time: datetime):
         # 2. Resolución de Simultaneidad (Conflictos en el mismo Tick)
         _phase_concurrency_resolution()
 
+        # 2.4 V26.12: Recalculo de Habilidades de Unidad (antes de detectar)
+        _phase_unit_skill_refresh()
+
         # 2.5 V10.0: Fase de Detección de Encuentros
         _phase_detection_encounters(current_tick)
 
@@ -223,56 +233,59 @@ def _phase_decrement_and_persistence():
         db = _get_db()
 
         # 1. Decrement mission remaining days
+        # V26.16: Proyección de la ruta y decremento atómico en una RPC
         missions_res = db.table("characters")\
-            .select("id, player_id, nombre, stats_json")\
+            .select("id, player_id, nombre, remaining_days:stats_json->active_mission->remaining_days")\
             .eq("estado_id", STATUS_ID_MAP["En Misión"])\
             .execute()
 
-        for char in (missions_res.data or []):
-            stats = char.get('stats_json', {})
-            mission = stats.get('active_mission', {})
-            remaining = mission.get('remaining_days', 0)
-
-            if remaining > 0:
-                mission['remaining_days'] = remaining - 1
-                stats['active_mission'] = mission
-                update_character(char['id'], {"stats_json": stats})
-
-                if mission['remaining_days'] == 0:
-                    log_event(f"Mission ready for resolution: {char['nombre']}", char.get('player_id'))
+        on_mission = {
+            char["id"]: char for char in (missions_res.data or [])
+            if (char.get("remaining_days") or 0) > 0
+        }
+        remaining = patch_character_stats_bulk([
+            stats_patch(char_id, "increment", ["active_mission", "remaining_days"], -1)
+            for char_id in on_mission
+        ])
+        log_events_batch([
+            (f"Mission ready for resolution: {on_mission[char_id]['nombre']}", on_mission[char_id].get('player_id'))
+            for char_id, value in remaining.items()
+            if char_id in on_mission and value == 0
+        ])
 
         # 2. Heal wounded characters
         wounded_res = db.table("characters")\
-            .select("id, player_id, nombre, stats_json")\
+            .select("id, player_id, nombre, wound_ticks:stats_json->wound_ticks_remaining")\
             .eq("estado_id", STATUS_ID_MAP["Herido"])\
             .execute()
 
+        patches = []
+        recovered = []
         for char in (wounded_res.data or []):
-            stats = char.get('stats_json', {})
-            wound_ticks = stats.get('wound_ticks_remaining', 2)
+            wound_ticks = char.get("wound_ticks")
+            if wound_ticks is None:
+                wound_ticks = 2
 
             if wound_ticks > 1:
-                stats['wound_ticks_remaining'] = wound_ticks - 1
-                update_character(char['id'], {"stats_json": stats})
+                patches.append(stats_patch(char['id'], "increment", ["wound_ticks_remaining"], -1, default=2))
             else:
-                stats.pop('wound_ticks_remaining', None)
-                
+                patches.append(stats_patch(char['id'], "delete", ["wound_ticks_remaining"]))
+                recovered.append(char)
                 # V4.3.1: Eliminada lógica de "ubicacion_local".
-                
-                update_character(char['id'], {
-                    "estado_id": STATUS_ID_MAP["Disponible"],
-                    "stats_json": stats
-                })
-                log_event(f"{char['nombre']} has recovered from injuries.", char.get('player_id'))
-
-        # 3. Decrement unit transit ticks
-        # Se ejecuta para todas las unidades en TRANSIT con ticks > 0
-        try:
-            updated_transits = decrement_transit_ticks()
-            if updated_transits > 0:
-                log_event(f"⏳ Actualizados {updated_transits} tránsitos en progreso (tick -1).")
-        except Exception as e:
-            logger.error(f"Error decrementando tránsitos: {e}")
+
+        patch_character_stats_bulk(patches)
+        if recovered:
+            db.table("characters")\
+                .update({"estado_id": STATUS_ID_MAP["Disponible"]})\
+                .in_("id", [char['id'] for char in recovered])\
+                .execute()
+            log_events_batch([
+                (f"{char['nombre']} has recovered from injuries.", char.get('player_id'))
+                for char in recovered
+            ])
+
+        # 3. V26.8: Los tránsitos usan tick absoluto de llegada (transit_end_tick);
+        # no requieren escrituras por tick. Las llegadas se resuelven en la fase 1.5.
 
     except Exception as e:
         logger.error(f"Error en fase de decremento: {e}")
@@ -294,19 +307,33 @@ def _phase_movement_arrivals(current_tick: int):
         # Procesar llegadas
         arrivals = process_transit_arrivals(current_tick)
 
+        # V26.7: Los logs por unidad se emiten en lote desde process_transit_arrivals
         if arrivals:
             log_event(f"🚀 {len(arrivals)} unidades han completado su tránsito")
-            for arrival in arrivals:
-                log_event(
-                    f"✅ '{arrival['unit_name']}' llegó a {arrival['destination']}",
-                    arrival['player_id']
-                )
 
     except Exception as e:
         logger.error(f"Error en fase de movimiento: {e}")
         log_event(f"❌ Error procesando llegadas de tránsito: {e}", is_error=True)
 
 
+def _phase_unit_skill_refresh():
+    """
+    V26.12: Fase 2.4 - Recalcula en lote las habilidades colectivas de las unidades
+    cuya composición o estadísticas de miembros cambiaron, para que la detección
+    no use valores obsoletos.
+    """
+    log_event("running phase 2.4: Recalculo de Habilidades de Unidad...")
+    try:
+        from core.unit_engine import recompute_changed_unit_skills
+
+        result = recompute_changed_unit_skills()
+        if result.get("updated", 0) > 0:
+            log_event(f"🎯 Habilidades recalculadas en {result['updated']}/{result['checked']} unidades")
+
+    except Exception as e:
+        logger.error(f"Error en recalculo de habilidades de unidad: {e}")
+
+
 def _phase_detection_encounters(current_tick: int):
     """
     V10.0: Fase 2.5 - Procesa detecciones automáticas entre unidades.
@@ -393,24 +420,22 @@ def _process_candidate_search(player_id: int, current_tick: int):
         )
 
         candidates_fixed = 0
-        if new_candidates:
-            for char in new_candidates:
-                try:
-                    char_id = char.get('id')
-                    if not char_id: continue
-
-                    stats = char.get("stats_json", {})
-                    if "estado" not in stats: stats["estado"] = {}
-                    
-                    # V4.3.1: Eliminada lógica de "ubicacion_local".
-                    
-                    update_character(char_id, {
-                        "estado_id": STATUS_ID_MAP["Candidato"],
-                        "stats_json": stats
-                    })
-                    candidates_fixed += 1
-                except Exception:
-                    pass
+        candidate_ids = [char.get('id') for char in (new_candidates or []) if char.get('id')]
+        if candidate_ids:
+            try:
+                # V26.16: Asegurar stats_json->estado con un parche (merge de {}
+                # crea la clave si falta y conserva la existente) y estado en lote.
+                # V4.3.1: Eliminada lógica de "ubicacion_local".
+                patch_character_stats_bulk([
+                    stats_patch(char_id, "merge", ["estado"], {}) for char_id in candidate_ids
+                ])
+                _get_db().table("characters")\
+                    .update({"estado_id": STATUS_ID_MAP["Candidato"]})\
+                    .in_("id", candidate_ids)\
+                    .execute()
+                candidates_fixed = len(candidate_ids)
+            except Exception:
+                pass
 
         log_event(f"✅ RECLUTAMIENTO COMPLETADO: {candidates_fixed} nuevos expedientes.", player_id)
 
@@ -538,6 +563,7 @@ def _phase_prestige_calculation(current_tick: int):
         new_prestige_map = apply_prestige_changes(factions_map, adjustments)
         
         # Persistir cambios
+        # V26.25: update_faction_prestige invalida el prestigio cacheado del mercado
         for fid, new_val in new_prestige_map.items():
             update_faction_prestige(fid, new_val)
                 
@@ -591,6 +617,8 @@ def _phase_planetary_activation(current_tick: int):
     Fase 3.55: Activación de Edificios Planetarios (V23.2).
     Activa edificios civiles (planet_buildings) que han completado su tiempo de construcción.
     V25.1: Sincroniza activación de extracción de lujo Tier 2.
+    V26.4: Activación en un único UPDATE y reconciliación global de sitios de lujo
+    en una sola RPC (sin escrituras por edificio ni sync por jugador).
     """
     log_event("running phase 3.55: Activación de Edificios Planetarios...")
     try:
@@ -602,41 +630,39 @@ def _phase_planetary_activation(current_tick: int):
             .eq("is_active", False)\
             .lte("built_at_tick", current_tick)\
             .execute()
-            
-        if not ready_buildings.data:
-            return
 
-        # 2. Activar masivamente
-        updates_count = 0
-        luxury_synced_count = 0
-        players_to_sync = set()
-
-        for b in ready_buildings.data:
-            bid = b['id']
-            pid = b['player_id']
-            btype = b['building_type']
-            tier = b.get("building_tier", 1)
-            
-            # Update single row to safe concurrency
-            res = db.table("planet_buildings").update({"is_active": True}).eq("id", bid).execute()
-            if res.data:
-                updates_count += 1
-                log_event(f"🏗️ Edificio '{btype}' operativo en sector {b['sector_id']}.", pid)
-                players_to_sync.add(pid)
-
-                # V25.1: Activar sitio de extracción de lujo si es Tier >= 2
-                if tier >= 2:
-                    lux_update = db.table("luxury_extraction_sites").update({"is_active": True}).eq("building_id", bid).execute()
-                    if lux_update.data:
-                        luxury_synced_count += 1
-                        log_event(f"Sistemas de extracción calibrados: Iniciada producción en Sector {b['sector_id']}", pid)
-        
-        # Sincronización final por seguridad
-        for pid in players_to_sync:
-            sync_luxury_sites(pid)
-        
-        if updates_count > 0:
-            log_event(f"✅ {updates_count} edificios civiles han entrado en línea. ({luxury_synced_count} Tier 2)")
+        # 2. Activar masivamente (condicional sobre is_active=False para concurrencia segura)
+        activated = []
+        if ready_buildings.data:
+            ids = [b['id'] for b in ready_buildings.data]
+            res = db.table("planet_buildings")\
+                .update({"is_active": True})\
+                .in_("id", ids)\
+                .eq("is_active", False)\
+                .execute()
+            activated_ids = {row['id'] for row in (res.data or [])}
+            activated = [b for b in ready_buildings.data if b['id'] in activated_ids]
+
+        if activated:
+            log_events_batch([
+                (f"🏗️ Edificio '{b['building_type']}' operativo en sector {b['sector_id']}.", b['player_id'])
+                for b in activated
+            ])
+
+        # 3. V26.4: Reconciliación deseado/actual de sitios de lujo de toda la galaxia
+        luxury = reconcile_luxury_sites(current_tick)
+        log_events_batch([
+            (f"Sistemas de extracción calibrados: {counts['activated'] + counts['created']} sitio(s) en producción.", pid)
+            for pid, counts in luxury["by_player"].items()
+            if counts["activated"] or counts["created"]
+        ])
+
+        if activated or any(luxury[k] for k in ("created", "activated", "deactivated")):
+            log_event(
+                f"✅ {len(activated)} edificios civiles han entrado en línea. "
+                f"Lujo: {luxury['created']} creados, {luxury['activated']} activados, "
+                f"{luxury['deactivated']} desactivados."
+            )
             
     except Exception as e:
         logger.error(f"Error en fase de activación planetaria: {e}")
@@ -729,20 +755,30 @@ def _phase_macroeconomics():
         logger.error(f"Error crítico en fase macroeconómica: {e}")
 
 def _phase_mission_resolution():
-    """Fase 6: Resolución de Misiones (MRG v2.0)."""
+    """
+    Fase 6: Resolución de Misiones (MRG v2.0).
+    V26.16: Proyección de active_mission/atributos; limpieza por parche y estados en lote.
+    V26.17: Atributos desde la columna hot (estructura V2 con fallback V1).
+    """
     log_event("running phase 6: Resolución de Misiones (MRG 2d50)...")
     try:
-        response = _get_db().table("characters")\
-            .select("*")\
+        db = _get_db()
+        response = db.table("characters")\
+            .select(
+                "id, player_id, nombre, "
+                "active_mission:stats_json->active_mission, atributos:hot_atributos"
+            )\
             .eq("estado_id", STATUS_ID_MAP["En Misión"])\
             .execute()
             
         active_operatives = response.data or []
+        ids_by_status = {}
+        log_entries = []
         for char in active_operatives:
             player_id = char['player_id']
-            stats = char.get('stats_json', {})
-            mission_data = stats.get('active_mission', {})
-            attr_value = stats.get('atributos', {}).get(mission_data.get('attribute', 'fuerza').lower(), 10)
+            mission_data = char.get('active_mission') or {}
+            attributes = char.get('atributos') or {}
+            attr_value = attributes.get(mission_data.get('attribute', 'fuerza').lower(), 10)
             result = resolve_action(merit_points=attr_value, difficulty=mission_data.get('difficulty', 50), action_description=f"Misión de {char['nombre']}")
             
             reward = 0
@@ -760,16 +796,17 @@ def _phase_mission_resolution():
                 else:
                     msg = f"❌ FRACASO: {char['nombre']} falló la misión."
             
-            # Limpieza de datos de misión activa
-            if 'active_mission' in stats: del stats['active_mission']
-            
             # V4.3.1: Eliminada lógica de inyección de "ubicacion_local".
-            
-            update_character(char['id'], {
-                "estado_id": status_id,
-                "stats_json": stats
-            })
-            log_event(msg, player_id)
+            ids_by_status.setdefault(status_id, []).append(char['id'])
+            log_entries.append((msg, player_id))
+
+        # Limpieza de datos de misión activa (sin reescribir stats_json)
+        patch_character_stats_bulk([
+            stats_patch(char['id'], "delete", ["active_mission"]) for char in active_operatives
+        ])
+        for status_id, char_ids in ids_by_status.items():
+            db.table("characters").update({"estado_id": status_id}).in_("id", char_ids).execute()
+        log_events_batch(log_entries)
     except Exception as e:
         logger.error(f"Error en fase de misiones: {e}")
 
@@ -779,9 +816,10 @@ def _phase_cleanup_and_audit():
     try:
         db = _get_db()
         # Limpieza de candidatos expirados
-        from data.recruitment_repository import expire_old_candidates
+        # V26.18: Una RPC para toda la galaxia (nombres por jugador para los logs)
+        from data.recruitment_repository import expire_all_old_candidates
         current_tick = get_world_state().get('current_tick', 1)
-        for player in get_all_players(): expire_old_candidates(player['id'], current_tick)
+        expire_all_old_candidates(current_tick)
         
         # V19.0 / V22.1: Reset de Unidades Constructoras
         # Solo liberamos unidades cuyo tiempo de construcción haya finalizado (construction_end_tick <= current_tick)
@@ -803,21 +841,20 @@ def _phase_troop_survival():
     V16.0: Fase 7.5 - Procesa supervivencia de tropas en territorios hostiles.
     Las tropas en unidades que exceden su capacidad (basada en líder)
     y están en territorio hostil serán eliminadas.
+    V26.6: Pasada única para toda la galaxia (sin bucle por jugador).
     """
     log_event("running phase 7.5: Supervivencia de Tropas...")
     try:
-        from core.unit_engine import process_troop_survival
+        from core.unit_engine import process_global_troop_survival
+        from core.territory_engine import get_control_map
 
-        total_removed = 0
-        total_units_affected = 0
         current_tick = get_world_state().get('current_tick', 1)
 
-        for player in get_all_players():
-            player_id = player['id']
-            result = process_troop_survival(player_id, current_tick)
+        # V26.5: Mapa de control territorial construido una vez para todo el tick
+        result = process_global_troop_survival(current_tick, get_control_map(current_tick))
 
-            total_removed += result.get("total_removed", 0)
-            total_units_affected += len(result.get("units_affected", []))
+        total_removed = result.get("total_removed", 0)
+        total_units_affected = len(result.get("units_affected", []))
 
         if total_removed > 0:
             log_event(
@@ -830,11 +867,14 @@ def _phase_troop_survival():
 
 
 def _phase_knowledge_progression(current_tick: int):
-    """Fase 8: Progresión de Conocimiento Pasivo (V4.3)."""
+    """
+    Fase 8: Progresión de Conocimiento Pasivo (V4.3).
+    V26.15: Todas las facciones en lote (lecturas únicas + una RPC de contadores).
+    """
     log_event("running phase 8: Progresión de Conocimiento...")
     try:
-        from core.character_engine import process_passive_knowledge_updates
-        for player in get_all_players(): process_passive_knowledge_updates(player['id'], current_tick)
+        from core.character_engine import process_passive_knowledge_bulk
+        process_passive_knowledge_bulk(current_tick)
     except Exception as e:
         logger.error(f"Error en progresión de conocimiento: {e}")
 
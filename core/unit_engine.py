@@ -8,9 +8,16 @@ Gestiona:
 4. V16.0: Liderazgo dinámico y supervivencia de tropas.
 V17.2: Refactorización de cálculo de habilidades para aislamiento estricto de datos.
 V17.3: Fix Crítico Mapeo de Habilidades (Mapping explícito Unit -> Character Keys).
+V26.5: Chequeos de hostilidad contra el mapa de control territorial del tick.
+V26.6: Supervivencia de tropas global en una sola pasada (process_global_troop_survival).
+V26.11: Habilidades colectivas memoizadas por huella de composición (unit_skill_digest).
+V26.12: Recalculo en lote de habilidades en el tick (recompute_changed_unit_skills).
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+import hashlib
+import json
+
 from data.unit_repository import (
     get_troop_by_id,
     update_troop_stats,
@@ -20,11 +27,20 @@ from data.unit_repository import (
     add_unit_member,
     remove_unit_member,
     get_unit_leader_skill,
-    update_unit_skills
+    update_unit_skills,
+    get_all_stationed_units,
+    get_members_for_units,
+    get_troop_levels,
+    get_character_attributes,
+    delete_troops_bulk,
+    get_units_skill_state,
+    hydrate_unit_members,
+    update_unit_skills_bulk
 )
-from data.log_repository import log_event
+from data.log_repository import log_event, log_events_batch
 from services.character_generation_service import recruit_character_with_ai
 from core.models import TroopSchema, UnitSchema, UnitMemberSchema, CharacterRole, UnitStatus
+from core.territory_engine import ControlMap, get_control_map, build_location_control_map
 
 # Constantes de configuración
 MAX_TROOP_LEVEL = 4
@@ -149,12 +165,25 @@ def calculate_unit_max_capacity(unit_id: int) -> int:
     Fórmula: 4 + (skill_liderazgo // 10)
     Rango: 4 (sin líder) a 12 (liderazgo 80+)
     """
-    leader_skill = get_unit_leader_skill(unit_id)
+    return capacity_from_leader_skill(get_unit_leader_skill(unit_id))
+
+
+def capacity_from_leader_skill(leader_skill: int) -> int:
+    """Capacidad de unidad para una habilidad de Liderazgo dada (4 + skill // 10, máx. 12)."""
     bonus = leader_skill // 10
     return min(MAX_CAPACITY, BASE_CAPACITY + bonus)
 
 
-def is_location_controlled(player_id: int, location_data: Dict[str, Any]) -> bool:
+def leader_skill_from_attributes(attrs: Dict[str, Any]) -> int:
+    """Liderazgo = (presencia + voluntad) * 2 (según SKILL_MAPPING)."""
+    return (attrs.get("presencia", 5) + attrs.get("voluntad", 5)) * 2
+
+
+def is_location_controlled(
+    player_id: int,
+    location_data: Dict[str, Any],
+    control_map: Optional[ControlMap] = None
+) -> bool:
     """
     V16.0: Verifica si un jugador controla un territorio dado.
 
@@ -163,54 +192,23 @@ def is_location_controlled(player_id: int, location_data: Dict[str, Any]) -> boo
     - Sistema (sin planeta): controlling_player_id == player_id
     - Neutral (todos NULL): Considerado seguro/controlado
 
+    V26.5: Resuelto contra el mapa de control territorial del tick (O(1), sin consultas).
+    V26.25: Sin mapa (llamadas fuera del tick) se lee la soberanía actual de la
+    ubicación; el mapa compartido solo es fiable dentro del tick que lo construyó.
+
     Retorna True si el territorio es controlado o neutral.
     """
-    from data.planet_repository import get_planet_by_id
-    from data.world_repository import get_system_by_id
-
     planet_id = location_data.get("location_planet_id")
     system_id = location_data.get("location_system_id")
+    control = control_map or build_location_control_map(planet_id, system_id)
+    return control.is_controlled(player_id, planet_id=planet_id, system_id=system_id)
 
-    # 1. Si hay planeta, verificar soberanía planetaria
-    if planet_id:
-        planet = get_planet_by_id(planet_id)
-        if planet:
-            surface_owner = planet.get("surface_owner_id")
-            orbital_owner = planet.get("orbital_owner_id")
-
-            # Neutral = controlado para este propósito
-            if surface_owner is None and orbital_owner is None:
-                return True
-
-            # Controlado si soy dueño de superficie u órbita
-            if surface_owner == player_id or orbital_owner == player_id:
-                return True
 
-            # Territorio hostil
-            return False
-
-    # 2. Si solo hay sistema (espacio profundo), verificar controlador
-    if system_id:
-        system = get_system_by_id(system_id)
-        if system:
-            controller = system.get("controlling_player_id")
-
-            # Neutral = controlado para este propósito
-            if controller is None:
-                return True
-
-            # Controlado si soy el controlador del sistema
-            if controller == player_id:
-                return True
-
-            # Territorio hostil en espacio
-            return False
-
-    # 3. Sin ubicación definida, considerar seguro
-    return True
-
-
-def check_unit_at_risk(unit_id: int, player_id: int) -> Dict[str, Any]:
+def check_unit_at_risk(
+    unit_id: int,
+    player_id: int,
+    control_map: Optional[ControlMap] = None
+) -> Dict[str, Any]:
     """
     V16.0: Determina si una unidad está en riesgo.
 
@@ -248,7 +246,7 @@ def check_unit_at_risk(unit_id: int, player_id: int) -> Dict[str, Any]:
         "location_sector_id": unit_data.get("location_sector_id")
     }
 
-    is_hostile = not is_location_controlled(player_id, location_data)
+    is_hostile = not is_location_controlled(player_id, location_data, control_map)
     result["is_hostile_territory"] = is_hostile
 
     # 2. Verificar capacidad excedida
@@ -309,7 +307,11 @@ def handle_unit_leadership_change(unit_id: int) -> Dict[str, Any]:
     return result
 
 
-def process_troop_survival(player_id: int, current_tick: int) -> Dict[str, Any]:
+def process_troop_survival(
+    player_id: int,
+    current_tick: int,
+    control_map: Optional[ControlMap] = None
+) -> Dict[str, Any]:
     """
     V16.0: Procesa la supervivencia de tropas huérfanas en territorio hostil.
 
@@ -331,6 +333,8 @@ def process_troop_survival(player_id: int, current_tick: int) -> Dict[str, Any]:
         "total_removed": 0
     }
 
+    # V26.25: Proceso de tick: mapa del tick (una construcción) en lugar de lecturas por unidad
+    control_map = control_map or get_control_map(current_tick)
     units = get_units_by_player(player_id)
 
     for unit_data in units:
@@ -343,7 +347,7 @@ def process_troop_survival(player_id: int, current_tick: int) -> Dict[str, Any]:
             continue
 
         # Verificar riesgo
-        risk_check = check_unit_at_risk(unit_id, player_id)
+        risk_check = check_unit_at_risk(unit_id, player_id, control_map)
 
         # Solo procesar si está en territorio hostil Y excede capacidad
         if not risk_check["is_hostile_territory"]:
@@ -404,13 +408,204 @@ def process_troop_survival(player_id: int, current_tick: int) -> Dict[str, Any]:
     return result
 
 
+def find_leader_character_id(members: List[Dict[str, Any]]) -> Optional[int]:
+    """Líder marcado de la unidad o, en su defecto, el primer personaje por slot."""
+    characters = [m for m in members if m.get("entity_type") == "character"]
+    if not characters:
+        return None
+    leader = next((m for m in characters if m.get("is_leader")), None)
+    if leader is None:
+        leader = min(characters, key=lambda m: m.get("slot_index", 0))
+    return leader.get("entity_id")
+
+
+def select_troops_for_desertion(
+    members: List[Dict[str, Any]],
+    troop_levels: Dict[int, int],
+    max_capacity: int
+) -> List[int]:
+    """
+    Tropas a eliminar para volver a la capacidad (NUNCA personajes).
+    Se eliminan primero las de menor nivel.
+    """
+    excess = len(members) - max_capacity
+    if excess <= 0:
+        return []
+
+    troops = [m for m in members if m.get("entity_type") == 'troop']
+    troops_sorted = sorted(troops, key=lambda t: troop_levels.get(t.get("entity_id"), 1))
+    return [t.get("entity_id") for t in troops_sorted[:excess]]
+
+
+def process_global_troop_survival(
+    current_tick: int,
+    control_map: Optional[ControlMap] = None
+) -> Dict[str, Any]:
+    """
+    V26.6: Supervivencia de tropas de toda la galaxia en una sola pasada.
+
+    1. Una consulta: unidades fuera de tránsito. Hostilidad resuelta en memoria
+       contra el mapa de control territorial.
+    2. Solo para unidades en territorio hostil: miembros, niveles de tropa y
+       atributos de líderes en tres consultas por lote. Capacidad en memoria.
+    3. Borrado en lote de membresías y tropas (dos sentencias) y logs en un INSERT.
+
+    Retorna:
+    - troops_removed: Lista de IDs de tropas eliminadas
+    - units_affected: Lista de IDs de unidades afectadas
+    - total_removed: Conteo total
+    """
+    result = {
+        "troops_removed": [],
+        "units_affected": [],
+        "total_removed": 0
+    }
+
+    control = control_map or get_control_map(current_tick)
+
+    hostile_units = [
+        u for u in get_all_stationed_units()
+        if not control.is_controlled(
+            u.get("player_id"),
+            planet_id=u.get("location_planet_id"),
+            system_id=u.get("location_system_id")
+        )
+    ]
+    if not hostile_units:
+        return result
+
+    members_by_unit = get_members_for_units([u["id"] for u in hostile_units])
+
+    troop_ids = []
+    leader_ids = set()
+    for members in members_by_unit.values():
+        troop_ids.extend(m["entity_id"] for m in members if m.get("entity_type") == "troop")
+        leader_id = find_leader_character_id(members)
+        if leader_id is not None:
+            leader_ids.add(leader_id)
+
+    troop_levels = get_troop_levels(troop_ids)
+    leader_attrs = get_character_attributes(list(leader_ids))
+
+    # Plan de deserción en memoria
+    doomed_by_unit: Dict[int, List[int]] = {}
+    for unit in hostile_units:
+        members = members_by_unit.get(unit["id"], [])
+        leader_id = find_leader_character_id(members)
+        leader_skill = 0
+        if leader_id is not None and leader_id in leader_attrs:
+            leader_skill = leader_skill_from_attributes(leader_attrs[leader_id])
+
+        doomed = select_troops_for_desertion(members, troop_levels, capacity_from_leader_skill(leader_skill))
+        if doomed:
+            doomed_by_unit[unit["id"]] = doomed
+
+    if not doomed_by_unit:
+        return result
+
+    removed = set(delete_troops_bulk([tid for ids in doomed_by_unit.values() for tid in ids]))
+
+    log_entries = []
+    for unit in hostile_units:
+        removed_count = len([tid for tid in doomed_by_unit.get(unit["id"], []) if tid in removed])
+        if removed_count > 0:
+            result["units_affected"].append(unit["id"])
+            unit_name = unit.get("name", f"Unidad {unit['id']}")
+            log_entries.append((
+                f"⚠️ Deserción: {removed_count} tropa(s) de '{unit_name}' "
+                f"se perdieron en territorio hostil por falta de liderazgo.",
+                unit.get("player_id")
+            ))
+    log_events_batch(log_entries)
+
+    result["troops_removed"] = sorted(removed)
+    result["total_removed"] = len(removed)
+    return result
+
+
 # --- V17.0: HABILIDADES COLECTIVAS DE UNIDAD ---
 
 # Peso del líder en el promedio ponderado
 LEADER_WEIGHT = 4
 
 
-def calculate_and_update_unit_skills(unit_id: int) -> Dict[str, Any]:
+SKILL_KEYS = ["deteccion", "radares", "exploracion", "sigilo", "evasion_sensores"]
+
+# V26.11: Caché de habilidades colectivas {unit_id: (digest, skills)}
+_UNIT_SKILL_CACHE: Dict[int, Tuple[str, Dict[str, int]]] = {}
+
+
+def _empty_unit_skills() -> Dict[str, int]:
+    return {f"skill_{key}": 0 for key in SKILL_KEYS}
+
+
+def _split_leader(characters: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Líder explícito (is_leader is True) o, en su defecto, el primer personaje."""
+    leader = None
+    others = []
+    for char in characters:
+        # Asegurar lectura booleana
+        if char.get("is_leader") is True:
+            leader = char
+        else:
+            others.append(char)
+    if leader is None:
+        return characters[0], characters[1:]
+    return leader, others
+
+
+def unit_skill_digest(members: List[Dict[str, Any]]) -> str:
+    """
+    V26.11: Huella de la composición relevante para las habilidades colectivas:
+    entidades miembro, líder efectivo y habilidades saneadas de cada personaje.
+    """
+    characters = [m for m in members if m.get("entity_type") == "character"]
+    leader_id = _split_leader(characters)[0].get("entity_id") if characters else None
+    payload = {
+        "members": sorted((str(m.get("entity_type")), m.get("entity_id") or 0) for m in members),
+        "leader": leader_id,
+        "skills": sorted(
+            (c.get("entity_id") or 0, sorted(_extract_character_skills(c).items()))
+            for c in characters
+        ),
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def compute_unit_skills(members: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Promedio ponderado (líder con peso LEADER_WEIGHT) de las habilidades
+    saneadas de los personajes miembro. Sin personajes: todo 0.
+    """
+    characters = [m for m in members if m.get("entity_type") == "character"]
+    if not characters:
+        return _empty_unit_skills()
+
+    leader, others = _split_leader(characters)
+    leader_skills = _extract_character_skills(leader)
+    others_skills = [_extract_character_skills(c) for c in others]
+
+    return {
+        f"skill_{key}": _calculate_weighted_skill(
+            leader_skills.get(key, 0),
+            [s.get(key, 0) for s in others_skills]
+        )
+        for key in SKILL_KEYS
+    }
+
+
+def invalidate_unit_skill_cache(unit_id: Optional[int] = None) -> None:
+    """Descarta la entrada de una unidad (o toda la caché)."""
+    if unit_id is None:
+        _UNIT_SKILL_CACHE.clear()
+    else:
+        _UNIT_SKILL_CACHE.pop(unit_id, None)
+
+
+def calculate_and_update_unit_skills(
+    unit_id: int,
+    unit_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     V17.1: Calcula y actualiza las habilidades colectivas de una unidad.
 
@@ -418,99 +613,119 @@ def calculate_and_update_unit_skills(unit_id: int) -> Dict[str, Any]:
     ya calculadas de los personajes miembros (desde member['details']['habilidades']).
     El líder tiene peso 4 en el promedio.
 
+    V26.11: Memoizado por unit_skill_digest. Si la composición no cambió se omite
+    el recálculo y la escritura; también se omite la escritura si la fila ya tiene
+    esos valores. Acepta unit_data ya cargado (con miembros hidratados) y lo
+    actualiza en el sitio con las habilidades vigentes.
+
     Args:
         unit_id: ID de la unidad a actualizar
+        unit_data: Fila de la unidad con 'members' hidratados (opcional)
 
     Returns:
         Dict con:
         - success: bool
         - skills: Dict con las 5 habilidades calculadas
         - character_count: int
+        - cached: bool (True si no hubo recálculo)
         - message: str (en caso de error)
     """
     result = {
         "success": False,
-        "skills": {
-            "skill_deteccion": 0,
-            "skill_radares": 0,
-            "skill_exploracion": 0,
-            "skill_sigilo": 0,
-            "skill_evasion_sensores": 0
-        },
+        "skills": _empty_unit_skills(),
         "character_count": 0,
+        "cached": False,
         "message": ""
     }
 
     # 1. Obtener datos de la unidad con miembros hidratados
-    unit_data = get_unit_by_id(unit_id)
+    if unit_data is None:
+        unit_data = get_unit_by_id(unit_id)
     if not unit_data:
         result["message"] = f"Unit {unit_id} not found"
+        invalidate_unit_skill_cache(unit_id)
         update_unit_skills(unit_id, result["skills"])
         return result
 
     members = unit_data.get("members", [])
-
-    # 2. Filtrar solo miembros tipo 'character'
-    characters = [m for m in members if m.get("entity_type") == "character"]
-    result["character_count"] = len(characters)
-
-    # 3. Si no hay personajes, habilidades son 0
-    if not characters:
-        result["message"] = "No characters in unit"
-        update_unit_skills(unit_id, result["skills"])
-        result["success"] = True
+    result["character_count"] = len([m for m in members if m.get("entity_type") == "character"])
+
+    # 2. Caché por composición (memoria o skill_digest persistido por el tick)
+    digest = unit_skill_digest(members)
+    cached = _UNIT_SKILL_CACHE.get(unit_id)
+    if cached is None and unit_data.get("skill_digest") == digest:
+        cached = (digest, {k: unit_data.get(k, 0) for k in _empty_unit_skills()})
+        _UNIT_SKILL_CACHE[unit_id] = cached
+    if cached and cached[0] == digest:
+        skills = dict(cached[1])
+        unit_data.update(skills)
+        result.update(success=True, skills=skills, cached=True, message="Skills unchanged (cached)")
         return result
 
-    # 4. Identificar al líder
-    leader = None
-    others = []
-
-    for char in characters:
-        # Asegurar lectura booleana
-        if char.get("is_leader") is True:
-            leader = char
-        else:
-            others.append(char)
-
-    # Si no hay líder explícito, el primer personaje asume el rol (fallback)
-    if leader is None:
-        leader = characters[0]
-        others = characters[1:]
-
-    # 5. Extraer habilidades saneadas del líder (aplica mapping explícito)
-    leader_skills = _extract_character_skills(leader)
-
-    # 6. Extraer habilidades saneadas de los otros personajes
-    others_skills = [_extract_character_skills(c) for c in others]
-
-    # 7. Calcular cada habilidad con promedio ponderado
-    skills = {}
-
-    skill_keys = ["deteccion", "radares", "exploracion", "sigilo", "evasion_sensores"]
-
-    for key in skill_keys:
-        # Calcular promedio ponderado
-        # Construimos la lista de valores de 'otros' para esa key específica (ya mapeada)
-        others_values_for_key = [s.get(key, 0) for s in others_skills]
-        
-        # Mapeamos la key interna a la key de base de datos (skill_*)
-        db_key = f"skill_{key}"
-        skills[db_key] = _calculate_weighted_skill(
-            leader_skills.get(key, 0),
-            others_values_for_key
-        )
+    # 3. Recalcular y persistir solo si difieren de la fila
+    skills = compute_unit_skills(members)
+    if all(unit_data.get(k) == v for k, v in skills.items()) and unit_data.get("skill_digest") == digest:
+        persisted = True
+    else:
+        persisted = update_unit_skills(unit_id, skills, digest)
 
-    # 8. Persistir en base de datos
-    if update_unit_skills(unit_id, skills):
+    if persisted:
+        _UNIT_SKILL_CACHE[unit_id] = (digest, dict(skills))
+        unit_data.update(skills)
+        unit_data["skill_digest"] = digest
         result["success"] = True
         result["skills"] = skills
-        result["message"] = "Skills updated successfully"
+        result["message"] = "Skills updated successfully" if result["character_count"] else "No characters in unit"
     else:
         result["message"] = "Failed to persist skills"
 
     return result
 
 
+def recompute_changed_unit_skills() -> Dict[str, int]:
+    """
+    V26.12: Recalcula en el tick las habilidades de todas las unidades cuya
+    composición o estadísticas de miembros cambiaron desde el último cálculo.
+    V26.25: Solo se leen las unidades marcadas (skills_dirty); el coste por tick
+    depende de lo que cambió, no del tamaño del roster.
+
+    1. Estado persistido (skill_digest, skills_version) de las unidades marcadas: una consulta.
+    2. Miembros de esas unidades: una consulta. Personajes y tropas
+       implicados: una consulta cada uno (hidratación en lote).
+    3. Huella y promedio ponderado en memoria; escritura única por RPC
+       (que también confirma la versión calculada y desmarca la unidad).
+
+    Retorna: {"checked": n, "updated": n}
+    """
+    units = get_units_skill_state()
+    if not units:
+        return {"checked": 0, "updated": 0}
+
+    members_by_unit = get_members_for_units([u["id"] for u in units])
+    hydrate_unit_members([m for members in members_by_unit.values() for m in members])
+
+    rows, acks = [], []
+    for unit in units:
+        members = members_by_unit.get(unit["id"], [])
+        digest = unit_skill_digest(members)
+        version = unit.get("skills_version")
+        if digest == unit.get("skill_digest"):
+            _UNIT_SKILL_CACHE[unit["id"]] = (digest, {k: unit.get(k, 0) for k in _empty_unit_skills()})
+            acks.append({"id": unit["id"], "skills_version": version})
+            continue
+        skills = compute_unit_skills(members)
+        rows.append({"id": unit["id"], **skills, "skill_digest": digest, "skills_version": version})
+
+    written = update_unit_skills_bulk(rows + acks)
+    updated = len(rows) if written else 0
+    if updated:
+        for row in rows:
+            skills = {k: row[k] for k in _empty_unit_skills()}
+            _UNIT_SKILL_CACHE[row["id"]] = (row["skill_digest"], skills)
+
+    return {"checked": len(units), "updated": updated}
+
+
 def _extract_character_skills(member: Dict[str, Any]) -> Dict[str, int]:
     """
     V17.3 FIX: Extrae las habilidades y realiza el MAPEO EXPLÍCITO entre
@@ -15,6 +15,8 @@ Refactorizado v10.0: Purga de ubicación en JSON (Ubicación SQL como Source of
 Refactorizado v10.2: Asignación automática de ubicación base para Comandante (Create/Update).
 Refactorizado v11.1: Hotfix Fetch & Stitch para garantizar carga de personajes.
 Actualizado V15.2: Soporte completo para persistencia de 'ring' en funciones CRUD.
+Actualizado V26.17: Proyecciones hot/cold (atributos y habilidades sin stats_json completo).
+Actualizado V26.20: Inserción de personajes en lote (create_characters_bulk).
 """
 
 from typing import Dict, Any, Optional, List, Tuple
@@ -68,6 +70,9 @@ STATUS_ID_MAP = {
     "Sin Asignar": 1
 }
 
+# V26.20: Filas por INSERT en create_characters_bulk
+CHARACTER_INSERT_CHUNK_SIZE = 500
+
 # --- HELPER: EXTRACT & CLEAN ---
 def _extract_and_clean_data(full_stats: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
@@ -176,6 +181,70 @@ def _ensure_v2_structure(stats_json: Dict, name: str = "") -> Dict:
         }
     }
 
+# --- V26.17: PROYECCIONES HOT / COLD ---
+
+# Proyección "hot": nivel, estado, ubicación, atributos y habilidades (columnas
+# generadas hot_*). Excluye bio, secretos y ADN visual del documento stats_json.
+# El progreso de conocimiento vive en character_knowledge (get_all_character_knowledge).
+CHARACTER_HOT_COLUMNS = (
+    "id, player_id, nombre, apellido, level, xp, rango, class_id, estado_id, rol, "
+    "es_comandante, loyalty, portrait_url, "
+    "location_system_id, location_planet_id, location_sector_id, ring, "
+    "atributos:hot_atributos, habilidades:hot_habilidades"
+)
+
+# Secciones "cold" de stats_json (narrativa), cargadas bajo demanda
+CHARACTER_COLD_SECTIONS = ("bio", "taxonomia", "comportamiento", "logistica", "secreto_revelado")
+
+CHARACTER_PROJECTIONS = {
+    "full": "*",
+    "hot": CHARACTER_HOT_COLUMNS
+}
+
+
+def _projection_columns(projection: str) -> str:
+    """Resuelve un nombre de proyección ('full', 'hot') o una lista de columnas explícita."""
+    return CHARACTER_PROJECTIONS.get(projection, projection)
+
+
+def get_characters_by_ids(character_ids: List[int], projection: str = "hot") -> List[Dict[str, Any]]:
+    """V26.17: Personajes por ID con la proyección indicada (hot por defecto)."""
+    if not character_ids:
+        return []
+    try:
+        response = _get_db().table("characters")\
+            .select(_projection_columns(projection))\
+            .in_("id", list(character_ids))\
+            .execute()
+        return response.data or []
+    except Exception as e:
+        log_event(f"Error cargando personajes por ID: {e}", is_error=True)
+        return []
+
+
+def get_character_cold_data(
+    character_id: int,
+    sections: Tuple[str, ...] = CHARACTER_COLD_SECTIONS
+) -> Dict[str, Any]:
+    """
+    V26.17: Carga bajo demanda las secciones narrativas de stats_json
+    (bio, secretos, apariencia...) de un personaje.
+    Returns: {seccion: valor} (secciones ausentes se omiten).
+    """
+    try:
+        columns = ", ".join(f"{section}:stats_json->{section}" for section in sections)
+        response = _get_db().table("characters")\
+            .select(f"id, {columns}")\
+            .eq("id", character_id)\
+            .maybe_single()\
+            .execute()
+        row = response.data or {}
+        return {section: row[section] for section in sections if row.get(section) is not None}
+    except Exception as e:
+        log_event(f"Error cargando datos narrativos (CharID: {character_id}): {e}", is_error=True)
+        return {}
+
+
 def get_commander_by_player_id(player_id: int) -> Optional[Dict[str, Any]]:
     try:
         response = _get_db().table("characters").select("*").eq("player_id", player_id).eq("es_comandante", True).single().execute()
@@ -364,49 +433,62 @@ def update_commander_profile(
         log_event(f"Error update comandante: {e}", player_id, is_error=True)
         raise Exception(f"Error actualizando perfil: {e}")
 
+def _build_character_payload(player_id: Optional[int], character_data: Dict[str, Any], tick: int) -> Tuple[Dict[str, Any], KnowledgeLevel]:
+    """
+    Construye la fila SQL (Extract & Clean) de un personaje generado.
+    V26.20: Compartido por create_character y create_characters_bulk.
+    Returns: (payload, nivel de conocimiento inicial)
+    """
+    # Extraemos el nivel inicial si viene en la data, si no, es UNKNOWN por defecto
+    # Se elimina del dict para no ensuciar el JSON de stats
+    initial_knowledge = character_data.pop("initial_knowledge_level", KnowledgeLevel.UNKNOWN)
+    tick = character_data.pop("recruited_at_tick", tick)
+    is_npc = bool(character_data.pop("is_npc", False))
+
+    # _extract_and_clean_data trabaja sobre una copia profunda: basta una copia superficial
+    if "stats_json" in character_data:
+        stats_input = character_data["stats_json"]
+    else:
+        stats_input = {k: v for k, v in character_data.items() if k != "player_id"}
+
+    cols, cleaned_stats = _extract_and_clean_data(stats_input)
+
+    payload = {
+        "player_id": player_id,
+        "recruited_at_tick": tick,
+        "stats_json": cleaned_stats,
+
+        "nombre": cols.get("nombre", "Unit"),
+        "apellido": cols.get("apellido", ""),
+        "level": cols.get("level", 1),
+        "xp": cols.get("xp", 0),
+        "rango": cols.get("rango", "Iniciado"),
+        "class_id": cols.get("class_id", 0),
+        "estado_id": cols.get("estado_id", 1),
+        "loyalty": cols.get("loyalty", 50),
+        "is_npc": is_npc,
+        "portrait_url": cols.get("portrait_url"),
+
+        # Sincronización de Rol como INTEGER ID
+        "rol": cols.get("rol", 0),
+
+        "location_system_id": cols.get("location_system_id"),
+        "location_planet_id": cols.get("location_planet_id"),
+        "location_sector_id": cols.get("location_sector_id"),
+        "ring": cols.get("ring", 0) # V15.2: Ring persistence
+    }
+    return payload, (initial_knowledge if initial_knowledge else KnowledgeLevel.UNKNOWN)
+
+
 def create_character(player_id: Optional[int], character_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Persiste un personaje generado con ID de rol numérico."""
     from data.game_config_repository import get_current_tick
 
     try:
-        # Extraemos el nivel inicial si viene en la data, si no, es UNKNOWN por defecto
-        # Se elimina del dict para no ensuciar el JSON de stats
-        initial_knowledge = character_data.pop("initial_knowledge_level", KnowledgeLevel.UNKNOWN)
-        
-        tick = character_data.pop("recruited_at_tick", get_current_tick())
-        
-        stats_input = copy.deepcopy(character_data)
-        stats_input.pop("player_id", None)
-        
-        if "stats_json" in stats_input:
-            stats_input = stats_input["stats_json"]
-
-        cols, cleaned_stats = _extract_and_clean_data(stats_input)
-
-        payload = {
-            "player_id": player_id,
-            "recruited_at_tick": tick,
-            "stats_json": cleaned_stats,
-            
-            "nombre": cols.get("nombre", "Unit"),
-            "apellido": cols.get("apellido", ""),
-            "level": cols.get("level", 1),
-            "xp": cols.get("xp", 0),
-            "rango": cols.get("rango", "Iniciado"),
-            "class_id": cols.get("class_id", 0),
-            "estado_id": cols.get("estado_id", 1),
-            "loyalty": cols.get("loyalty", 50),
-            "is_npc": False,
-            "portrait_url": cols.get("portrait_url"),
-            
-            # Sincronización de Rol como INTEGER ID
-            "rol": cols.get("rol", 0),
-            
-            "location_system_id": cols.get("location_system_id"),
-            "location_planet_id": cols.get("location_planet_id"),
-            "location_sector_id": cols.get("location_sector_id"),
-            "ring": cols.get("ring", 0) # V15.2: Ring persistence
-        }
+        tick = character_data.get("recruited_at_tick")
+        payload, initial_knowledge = _build_character_payload(
+            player_id, character_data, tick if tick is not None else get_current_tick()
+        )
 
         response = _get_db().table("characters").insert(payload).execute()
         
@@ -417,8 +499,7 @@ def create_character(player_id: Optional[int], character_data: Dict[str, Any]) -
             # FIX CRÍTICO: Asegurar que se crea la entrada de conocimiento si hay player_id
             # Esto es vital para la consistencia entre UI de Facción y Reclutamiento
             if player_id is not None:
-                kl = initial_knowledge if initial_knowledge else KnowledgeLevel.UNKNOWN
-                set_character_knowledge_level(new_char_id, player_id, kl)
+                set_character_knowledge_level(new_char_id, player_id, initial_knowledge)
 
             log_event(f"Generado/Reclutado: {payload['nombre']}", player_id)
             return new_char
@@ -428,16 +509,69 @@ def create_character(player_id: Optional[int], character_data: Dict[str, Any]) -
         log_event(f"Error reclutando: {e}", player_id, is_error=True)
         raise RuntimeError(f"Error guardando personaje: {e}")
 
-def get_all_characters_by_player_id(player_id: int) -> list[Dict[str, Any]]:
+
+def create_characters_bulk(
+    player_id: Optional[int],
+    characters: List[Dict[str, Any]],
+    chunk_size: int = CHARACTER_INSERT_CHUNK_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    V26.20: Inserta muchos personajes generados en lotes de chunk_size filas.
+    Un INSERT por lote en 'characters' y otro en 'character_knowledge' (si hay player_id).
+    Un lote fallido se registra y se omite; devuelve las filas creadas.
+    """
+    from data.game_config_repository import get_current_tick
+
+    if not characters:
+        return []
+
+    tick = get_current_tick()
+    built = [_build_character_payload(player_id, data, tick) for data in characters]
+    chunk_size = max(1, chunk_size)
+    created: List[Dict[str, Any]] = []
+    db = _get_db()
+
+    for start in range(0, len(built), chunk_size):
+        chunk = built[start:start + chunk_size]
+        try:
+            response = db.table("characters").insert([payload for payload, _ in chunk]).execute()
+            rows = response.data or []
+        except Exception as e:
+            log_event(f"Error insertando lote de personajes ({start}-{start + len(chunk)}): {e}", player_id, is_error=True)
+            continue
+
+        if player_id is not None and rows:
+            # PostgREST devuelve las filas en el orden del INSERT
+            knowledge_rows = [
+                {"character_id": row["id"], "player_id": player_id, "knowledge_level": knowledge.value}
+                for row, (_, knowledge) in zip(rows, chunk)
+            ]
+            try:
+                db.table("character_knowledge")\
+                    .upsert(knowledge_rows, on_conflict="character_id, player_id")\
+                    .execute()
+            except Exception as e:
+                log_event(f"Error registrando conocimiento del lote ({start}-{start + len(chunk)}): {e}", player_id, is_error=True)
+        created.extend(rows)
+
+    log_event(f"Generados/Reclutados en lote: {len(created)}/{len(built)} personajes.", player_id)
+    return created
+
+
+def get_all_characters_by_player_id(player_id: int, projection: str = "full") -> list[Dict[str, Any]]:
     """
     Obtiene todos los personajes del jugador.
     Versión V11.1 (Hotfix): Fetch & Stitch manual para evitar errores de JOIN en PostgREST.
     Garantiza que siempre se devuelvan los personajes, enriqueciendo ubicación si es posible.
+    V26.17: projection='hot' evita traer el stats_json completo (ver CHARACTER_HOT_COLUMNS).
     """
     try:
         # 1. Recuperar personajes (Query Simple y Segura)
         # Esto asegura que los personajes SIEMPRE se carguen, incluso si la info de planetas falla.
-        response = _get_db().table("characters").select("*").eq("player_id", player_id).execute()
+        response = _get_db().table("characters")\
+            .select(_projection_columns(projection))\
+            .eq("player_id", player_id)\
+            .execute()
         chars = response.data if response.data else []
         
         if not chars:
@@ -544,6 +678,66 @@ def update_character_stats(character_id: int, new_stats_json: Dict[str, Any], pl
     return update_character(character_id, payload)
 
 
+# --- V26.16: PARCHES PARCIALES DE STATS_JSON ---
+
+STATS_PATCH_OPS = ("set", "increment", "delete", "merge")
+
+
+def stats_patch(
+    character_id: int,
+    op: str,
+    path: List[str],
+    value: Any = None,
+    default: Any = None
+) -> Dict[str, Any]:
+    """
+    V26.16: Construye un parche de stats_json para patch_character_stats_bulk.
+
+    Args:
+        character_id: ID del personaje
+        op: 'set' | 'increment' | 'delete' | 'merge'
+        path: Ruta dentro de stats_json, p.ej. ["active_mission", "remaining_days"]
+        value: Valor a fijar, delta a sumar u objeto a fusionar
+        default: Valor base de 'increment' si la ruta no existe (0 si se omite)
+    """
+    if op not in STATS_PATCH_OPS:
+        raise ValueError(f"Operación de parche inválida: {op}")
+    return {"id": character_id, "op": op, "path": list(path), "value": value, "default": default}
+
+
+def patch_character_stats_bulk(patches: List[Dict[str, Any]]) -> Dict[int, Any]:
+    """
+    V26.16: Aplica parches por ruta JSON a muchos personajes vía RPC, sin
+    reescribir el documento stats_json completo.
+    La RPC admite un parche por personaje y llamada: los parches se agrupan en
+    rondas que respetan el orden de entrada de cada personaje.
+
+    Returns:
+        {character_id: valor resultante en la ruta del último parche aplicado}
+    """
+    if not patches:
+        return {}
+
+    rounds: List[List[Dict[str, Any]]] = []
+    depth: Dict[int, int] = {}
+    for patch in patches:
+        level = depth.get(patch["id"], 0)
+        depth[patch["id"]] = level + 1
+        if level == len(rounds):
+            rounds.append([])
+        rounds[level].append(patch)
+
+    results: Dict[int, Any] = {}
+    try:
+        for batch in rounds:
+            response = _get_db().rpc("patch_character_stats_bulk", {"p_patches": batch}).execute()
+            for row in (response.data or []):
+                results[row["id"]] = row.get("value")
+    except Exception as e:
+        log_event(f"Error aplicando parches de stats_json: {e}", is_error=True)
+    return results
+
+
 # --- SISTEMA DE CONOCIMIENTO (Fixed: player_id column match) ---
 
 def get_character_knowledge_level(character_id: int, player_id: int) -> KnowledgeLevel:
@@ -574,6 +768,71 @@ def set_character_knowledge_level(character_id: int, player_id: int, level: Know
         log_event(f"Error actualizando conocimiento (CharID: {character_id}): {e}", player_id, is_error=True)
         return False
 
+
+# --- V26.15: PROGRESIÓN DE CONOCIMIENTO EN LOTE ---
+
+def get_faction_characters_for_knowledge(player_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """
+    V26.15: Proyección mínima de los personajes con facción para la progresión pasiva.
+    V26.17: Atributos desde la columna hot (sin stats_json).
+    player_ids None = todos los jugadores.
+    """
+    try:
+        query = _get_db().table("characters")\
+            .select("id, player_id, nombre, es_comandante, atributos:hot_atributos")
+        if player_ids is None:
+            query = query.not_.is_("player_id", "null")
+        else:
+            query = query.in_("player_id", player_ids)
+        response = query.execute()
+        return response.data or []
+    except Exception as e:
+        log_event(f"Error cargando personajes para progresión de conocimiento: {e}", is_error=True)
+        return []
+
+
+def get_all_character_knowledge(player_ids: Optional[List[int]] = None) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """
+    V26.15: Carga character_knowledge en UNA consulta.
+    Returns: {(character_id, player_id): {"knowledge_level", "progress_ticks"}}
+    """
+    try:
+        query = _get_db().table("character_knowledge")\
+            .select("character_id, player_id, knowledge_level, progress_ticks")
+        if player_ids is not None:
+            query = query.in_("player_id", player_ids)
+        response = query.execute()
+        return {
+            (row["character_id"], row["player_id"]): row
+            for row in (response.data or [])
+        }
+    except Exception as e:
+        log_event(f"Error cargando conocimiento de personajes: {e}", is_error=True)
+        return {}
+
+
+def apply_knowledge_progress_bulk(rows: List[Dict[str, Any]]) -> List[Tuple[int, int, KnowledgeLevel]]:
+    """
+    V26.15: Persiste contadores y transiciones de conocimiento en una sola RPC.
+
+    Args:
+        rows: [{"character_id", "player_id", "from_level", "knowledge_level", "progress_ticks"}, ...]
+
+    Returns:
+        Subidas de nivel aplicadas: [(character_id, player_id, nuevo_nivel), ...]
+    """
+    if not rows:
+        return []
+    try:
+        response = _get_db().rpc("apply_knowledge_progress_bulk", {"p_rows": rows}).execute()
+        return [
+            (row["character_id"], row["player_id"], KnowledgeLevel(row["knowledge_level"]))
+            for row in (response.data or [])
+        ]
+    except Exception as e:
+        log_event(f"Error aplicando progreso de conocimiento en lote: {e}", is_error=True)
+        return []
+
 # --- WRAPPERS DE RECLUTAMIENTO ---
 
 def recruit_random_character_with_ai(player_id: int, **kwargs) -> Optional[Dict[str, Any]]:
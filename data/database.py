@@ -3,6 +3,7 @@
 Gestor de Conexiones y Contenedor de Servicios.
 Implementa el patrón Singleton con inyección de dependencias.
 Facilita testing mediante mocks y garantiza graceful degradation.
+Actualizado V26.22: El cliente de IA se expone envuelto en CachedAIClient.
 """
 
 import logging
@@ -24,6 +25,20 @@ class ConnectionStatus:
     ai_error: Optional[str] = None
 
 
+def _wrap_ai_client(client: Any) -> Any:
+    """
+    V26.22: Envuelve el cliente GenAI con la caché de respuestas (utils/ai_cache.py).
+    V26.23: Por debajo de la caché, el gobernador compartido (utils/ai_governor.py);
+    los aciertos de caché no consumen turno ni cuentan para el circuito.
+    """
+    from utils.ai_cache import CachedAIClient
+    from utils.ai_governor import GovernedAIClient
+
+    if client is None or isinstance(client, CachedAIClient):
+        return client
+    return CachedAIClient(GovernedAIClient(client))
+
+
 # --- CONTENEDOR DE SERVICIOS (Singleton) ---
 
 class ServiceContainer:
@@ -89,7 +104,8 @@ class ServiceContainer:
                 logger.warning(self._status.ai_error)
                 return
 
-            self._ai_client = genai.Client(api_key=GEMINI_API_KEY)
+            # V26.22: Envoltorio con caché de respuestas (opt-in por llamada)
+            self._ai_client = _wrap_ai_client(genai.Client(api_key=GEMINI_API_KEY))
             self._status.ai_connected = True
             logger.info("Conexión a Gemini AI establecida correctamente")
 
@@ -130,8 +146,14 @@ class ServiceContainer:
         return self._status.supabase_connected
 
     def is_ai_available(self) -> bool:
-        """Verifica si el servicio de IA está disponible."""
-        return self._status.ai_connected
+        """
+        Verifica si el servicio de IA está disponible.
+        V26.23: False mientras el circuito del gobernador está abierto (los llamadores usan su fallback).
+        """
+        if not self._status.ai_connected:
+            return False
+        from utils.ai_governor import is_ai_circuit_open
+        return not is_ai_circuit_open()
 
     # --- MÉTODOS PARA TESTING ---
 
@@ -143,7 +165,7 @@ class ServiceContainer:
 
     def inject_ai(self, client: Any) -> None:
         """Inyecta un cliente de IA (útil para mocks en tests)."""
-        self._ai_client = client
+        self._ai_client = _wrap_ai_client(client)
         self._status.ai_connected = True
         self._status.ai_error = None
 
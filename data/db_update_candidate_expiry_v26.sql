@@ -0,0 +1,41 @@
+-- =====================================================
+-- MIGRACION V26.18: Expiración Global de Candidatos
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. Índice parcial para localizar candidatos (estado_id = 7) de toda la galaxia
+CREATE INDEX IF NOT EXISTS idx_characters_candidates
+ON characters(player_id) WHERE estado_id = 7;
+
+-- 2. RPC: Eliminar en UNA sentencia todos los candidatos expirados
+-- Expira: no seguido, no en investigación y
+--         recruitment_data.tick_created <= p_current_tick - p_lifespan.
+-- Retorna una fila por jugador con los nombres eliminados (para los logs).
+CREATE OR REPLACE FUNCTION expire_recruitment_candidates(
+    p_current_tick INTEGER,
+    p_lifespan INTEGER DEFAULT 4
+)
+RETURNS TABLE(player_id INTEGER, names TEXT[])
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    WITH expired AS (
+        DELETE FROM characters c
+        WHERE c.estado_id = 7
+          AND NOT COALESCE((c.stats_json->'recruitment_data'->>'is_tracked')::BOOLEAN, FALSE)
+          AND NOT COALESCE((c.stats_json->'recruitment_data'->>'is_being_investigated')::BOOLEAN, FALSE)
+          AND COALESCE((c.stats_json->'recruitment_data'->>'tick_created')::INTEGER, 0)
+              <= p_current_tick - p_lifespan
+        RETURNING c.player_id, c.nombre
+    )
+    SELECT e.player_id::INTEGER, array_agg(e.nombre ORDER BY e.nombre)
+    FROM expired e
+    GROUP BY e.player_id;
+$$;
+
+GRANT EXECUTE ON FUNCTION expire_recruitment_candidates(INTEGER, INTEGER) TO authenticated;
+GRANT EXECUTE ON FUNCTION expire_recruitment_candidates(INTEGER, INTEGER) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.18
+-- =====================================================
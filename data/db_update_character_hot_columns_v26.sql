@@ -0,0 +1,30 @@
+-- =====================================================
+-- MIGRACION V26.17: Separación Hot/Cold de Datos de Personaje
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. Columnas "hot" derivadas de stats_json
+-- Atributos y habilidades se leen en cada tick (unidades, misiones, supervivencia).
+-- Como columnas generadas STORED viven en la fila principal: leerlas no obliga a
+-- descomprimir (TOAST) el documento stats_json completo con bio, secretos y ADN visual.
+-- Las escrituras siguen yendo a stats_json; PostgreSQL mantiene estas columnas.
+ALTER TABLE characters ADD COLUMN IF NOT EXISTS hot_atributos JSONB
+GENERATED ALWAYS AS (
+    COALESCE(stats_json->'capacidades'->'atributos', stats_json->'atributos', '{}'::jsonb)
+) STORED;
+
+ALTER TABLE characters ADD COLUMN IF NOT EXISTS hot_habilidades JSONB
+GENERATED ALWAYS AS (
+    COALESCE(stats_json->'capacidades'->'habilidades', stats_json->'habilidades', '{}'::jsonb)
+) STORED;
+
+COMMENT ON COLUMN characters.hot_atributos IS 'V26.17: Copia generada de stats_json.capacidades.atributos (proyección hot).';
+COMMENT ON COLUMN characters.hot_habilidades IS 'V26.17: Copia generada de stats_json.capacidades.habilidades (proyección hot).';
+
+-- 2. Índice para la lectura del roster por jugador (proyección hot)
+CREATE INDEX IF NOT EXISTS idx_characters_player_estado
+ON characters(player_id, estado_id);
+
+-- =====================================================
+-- FIN MIGRACION V26.17
+-- =====================================================
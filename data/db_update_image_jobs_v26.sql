@@ -0,0 +1,94 @@
+-- =====================================================
+-- MIGRACION V26.21: Cola Persistente de Trabajos de Imagen
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. Tabla de trabajos (un trabajo por hash de personaje + prompt)
+CREATE TABLE IF NOT EXISTS image_jobs (
+    id SERIAL PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    player_id INTEGER REFERENCES players(id) ON DELETE CASCADE,
+    character_id INTEGER REFERENCES characters(id) ON DELETE CASCADE,
+    prompt TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'done', 'failed')),
+    content_hash TEXT,
+    public_url TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- V26.25: Regeneración forzada (ignora la caché local del worker)
+ALTER TABLE image_jobs ADD COLUMN IF NOT EXISTS force_render BOOLEAN NOT NULL DEFAULT FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_image_jobs_pending
+ON image_jobs(created_at) WHERE status IN ('queued', 'running');
+
+-- 2. RPC: Encolar con deduplicación
+-- Si ya existe un trabajo con el mismo job_key se devuelve tal cual
+-- (hecho o en curso). Un trabajo fallido se vuelve a encolar.
+-- V26.25: p_force vuelve a encolar también un trabajo 'done' (regenerar retrato).
+DROP FUNCTION IF EXISTS enqueue_image_job(TEXT, INTEGER, INTEGER, TEXT);
+
+CREATE OR REPLACE FUNCTION enqueue_image_job(
+    p_job_key TEXT,
+    p_player_id INTEGER,
+    p_character_id INTEGER,
+    p_prompt TEXT,
+    p_force BOOLEAN DEFAULT FALSE
+)
+RETURNS SETOF image_jobs
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    INSERT INTO image_jobs (job_key, player_id, character_id, prompt, force_render)
+    VALUES (p_job_key, p_player_id, p_character_id, p_prompt, p_force)
+    ON CONFLICT (job_key) DO UPDATE
+        SET status = 'queued', error = NULL, updated_at = NOW(),
+            force_render = image_jobs.force_render OR p_force
+        WHERE image_jobs.status = 'failed'
+           OR (p_force AND image_jobs.status = 'done');
+
+    RETURN QUERY SELECT * FROM image_jobs WHERE job_key = p_job_key;
+END;
+$$;
+
+-- 3. RPC: Reclamar trabajos para los workers
+-- SKIP LOCKED permite varios workers (o procesos) sin doble reclamo.
+-- Los trabajos 'running' sin actividad en p_stale_seconds se consideran
+-- abandonados (worker caído) y se reclaman de nuevo.
+-- V26.25: Cada reclamo incrementa attempts; complete/fail filtran por
+-- status = 'running' y el attempts reclamado, así un worker reemplazado no
+-- sobrescribe el resultado del reclamo vigente.
+CREATE OR REPLACE FUNCTION claim_image_jobs(
+    p_limit INTEGER DEFAULT 1,
+    p_stale_seconds INTEGER DEFAULT 600
+)
+RETURNS SETOF image_jobs
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    UPDATE image_jobs j
+    SET status = 'running', attempts = j.attempts + 1, updated_at = NOW()
+    WHERE j.id IN (
+        SELECT id FROM image_jobs
+        WHERE status = 'queued'
+           OR (status = 'running' AND updated_at < NOW() - make_interval(secs => p_stale_seconds))
+        ORDER BY created_at
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING j.*;
+$$;
+
+GRANT EXECUTE ON FUNCTION enqueue_image_job(TEXT, INTEGER, INTEGER, TEXT, BOOLEAN) TO authenticated;
+GRANT EXECUTE ON FUNCTION enqueue_image_job(TEXT, INTEGER, INTEGER, TEXT, BOOLEAN) TO service_role;
+GRANT EXECUTE ON FUNCTION claim_image_jobs(INTEGER, INTEGER) TO authenticated;
+GRANT EXECUTE ON FUNCTION claim_image_jobs(INTEGER, INTEGER) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.21
+-- =====================================================
@@ -0,0 +1,90 @@
+-- =====================================================
+-- MIGRACION V26.15: Progresión Pasiva de Conocimiento en Lote
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. Contador de progreso compacto por (personaje, jugador)
+-- Reemplaza stats_json->'knowledge_progress_ticks' (reescritura completa del JSON por tick).
+ALTER TABLE character_knowledge ADD COLUMN IF NOT EXISTS progress_ticks INTEGER NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN character_knowledge.progress_ticks IS 'V26.15: Ticks acumulados hacia el siguiente nivel de conocimiento.';
+
+-- 2. Migrar contadores legados desde stats_json (solo el jugador dueño del personaje)
+INSERT INTO character_knowledge (character_id, player_id, knowledge_level, progress_ticks)
+SELECT c.id,
+       c.player_id,
+       'unknown',
+       COALESCE((c.stats_json->>'knowledge_progress_ticks')::INTEGER, 0)
+FROM characters c
+WHERE c.player_id IS NOT NULL
+  AND c.stats_json ? 'knowledge_progress_ticks'
+ON CONFLICT (character_id, player_id) DO UPDATE
+SET progress_ticks = EXCLUDED.progress_ticks;
+
+UPDATE characters
+SET stats_json = stats_json - 'knowledge_progress_ticks'
+WHERE stats_json ? 'knowledge_progress_ticks';
+
+-- 3. RPC: Aplicar el avance de TODOS los personajes en UNA llamada
+-- p_rows: [{"character_id": 1, "player_id": 2, "from_level": "unknown",
+--           "knowledge_level": "known", "progress_ticks": 0}, ...]
+-- Solo se aplica si el nivel almacenado sigue siendo from_level (un cambio manual
+-- concurrente, p.ej. desde la IA o el reclutamiento, tiene prioridad).
+-- Retorna las subidas de nivel efectivamente aplicadas.
+CREATE OR REPLACE FUNCTION apply_knowledge_progress_bulk(p_rows JSONB)
+RETURNS TABLE(character_id INTEGER, player_id INTEGER, knowledge_level TEXT)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+#variable_conflict use_column
+BEGIN
+    RETURN QUERY
+    WITH r AS (
+        SELECT *
+        FROM jsonb_to_recordset(p_rows) AS x(
+            character_id INTEGER,
+            player_id INTEGER,
+            from_level TEXT,
+            knowledge_level TEXT,
+            progress_ticks INTEGER
+        )
+    ),
+    updated AS (
+        UPDATE character_knowledge ck
+        SET knowledge_level = r.knowledge_level,
+            progress_ticks = r.progress_ticks,
+            updated_at = NOW()
+        FROM r
+        WHERE ck.character_id = r.character_id
+          AND ck.player_id = r.player_id
+          AND ck.knowledge_level = r.from_level
+        RETURNING ck.character_id, ck.player_id, ck.knowledge_level, r.from_level
+    ),
+    inserted AS (
+        INSERT INTO character_knowledge (character_id, player_id, knowledge_level, progress_ticks)
+        SELECT r.character_id, r.player_id, r.knowledge_level, r.progress_ticks
+        FROM r
+        WHERE r.from_level = 'unknown'
+          AND NOT EXISTS (
+              SELECT 1 FROM character_knowledge ck
+              WHERE ck.character_id = r.character_id
+                AND ck.player_id = r.player_id
+          )
+        ON CONFLICT DO NOTHING
+        RETURNING character_knowledge.character_id,
+                  character_knowledge.player_id,
+                  character_knowledge.knowledge_level,
+                  'unknown'::TEXT AS from_level
+    )
+    SELECT a.character_id, a.player_id, a.knowledge_level
+    FROM (SELECT * FROM updated UNION ALL SELECT * FROM inserted) a
+    WHERE a.knowledge_level <> a.from_level;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION apply_knowledge_progress_bulk(JSONB) TO authenticated;
+GRANT EXECUTE ON FUNCTION apply_knowledge_progress_bulk(JSONB) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.15
+-- =====================================================
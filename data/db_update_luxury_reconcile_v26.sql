@@ -0,0 +1,87 @@
+-- =====================================================
+-- MIGRACION V26.4: Reconciliación de Sitios de Extracción de Lujo
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. Índices para el diff deseado/actual
+CREATE INDEX IF NOT EXISTS idx_luxury_sites_building
+ON luxury_extraction_sites(building_id);
+
+CREATE INDEX IF NOT EXISTS idx_planet_buildings_tier2
+ON planet_buildings(player_id) WHERE building_tier >= 2;
+
+-- 2. RPC: Reconciliar TODOS los sitios en una sola sentencia
+-- Estado deseado: cada edificio Tier >= 2 en un sector con recurso de lujo tiene
+-- un sitio, activo si el edificio está activo y ya pasó su built_at_tick.
+-- p_player_ids NULL = toda la galaxia.
+-- Retorna una fila por jugador afectado con los conteos de creados/activados/desactivados.
+CREATE OR REPLACE FUNCTION reconcile_luxury_extraction_sites(
+    p_current_tick INTEGER,
+    p_player_ids BIGINT[] DEFAULT NULL
+)
+RETURNS TABLE(
+    player_id BIGINT,
+    created_count INTEGER,
+    activated_count INTEGER,
+    deactivated_count INTEGER
+)
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    WITH desired AS (
+        SELECT b.id AS building_id,
+               b.planet_asset_id,
+               b.player_id,
+               b.sector_id,
+               (COALESCE(b.is_active, TRUE) AND COALESCE(b.built_at_tick, 0) <= p_current_tick) AS should_be_active
+        FROM planet_buildings b
+        WHERE b.building_tier >= 2
+          AND (p_player_ids IS NULL OR b.player_id = ANY(p_player_ids))
+    ),
+    updated AS (
+        UPDATE luxury_extraction_sites l
+        SET is_active = d.should_be_active
+        FROM desired d
+        WHERE l.building_id = d.building_id
+          AND l.is_active IS DISTINCT FROM d.should_be_active
+        RETURNING l.player_id, l.is_active
+    ),
+    inserted AS (
+        INSERT INTO luxury_extraction_sites (
+            planet_asset_id, player_id, resource_key, resource_category,
+            extraction_rate, is_active, pops_required, building_id
+        )
+        SELECT d.planet_asset_id, d.player_id, s.luxury_resource, s.luxury_category,
+               1, d.should_be_active, 0, d.building_id
+        FROM desired d
+        JOIN sectors s ON s.id = d.sector_id
+        WHERE s.luxury_resource IS NOT NULL
+          AND s.luxury_resource <> 'null'
+          AND NOT EXISTS (
+              SELECT 1 FROM luxury_extraction_sites l WHERE l.building_id = d.building_id
+          )
+        ON CONFLICT (planet_asset_id, resource_key) DO NOTHING
+        RETURNING player_id
+    ),
+    changes AS (
+        SELECT i.player_id, 1 AS c, 0 AS a, 0 AS dd FROM inserted i
+        UNION ALL
+        SELECT u.player_id, 0,
+               CASE WHEN u.is_active THEN 1 ELSE 0 END,
+               CASE WHEN u.is_active THEN 0 ELSE 1 END
+        FROM updated u
+    )
+    SELECT ch.player_id::BIGINT,
+           SUM(ch.c)::INTEGER,
+           SUM(ch.a)::INTEGER,
+           SUM(ch.dd)::INTEGER
+    FROM changes ch
+    GROUP BY ch.player_id;
+$$;
+
+GRANT EXECUTE ON FUNCTION reconcile_luxury_extraction_sites(INTEGER, BIGINT[]) TO authenticated;
+GRANT EXECUTE ON FUNCTION reconcile_luxury_extraction_sites(INTEGER, BIGINT[]) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.4
+-- =====================================================
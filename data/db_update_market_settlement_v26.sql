@@ -0,0 +1,51 @@
+-- =====================================================
+-- MIGRACION V26.1: Liquidación Global de Mercado por Lotes
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. Índice para la consulta global de órdenes pendientes
+-- (status = 'PENDING' AND created_at_tick < tick_actual)
+CREATE INDEX IF NOT EXISTS idx_market_orders_pending_tick
+ON market_orders(created_at_tick) WHERE status = 'PENDING';
+
+-- 2. RPC: Aplicar deltas de recursos a muchos jugadores en UNA sentencia
+-- p_deltas: [{"player_id": 1, "creditos": 100, "materiales": -5, ...}, ...]
+-- Los deltas se SUMAN al valor actual (no sobrescriben), evitando lost updates
+-- entre la lectura y la escritura.
+CREATE OR REPLACE FUNCTION apply_player_resource_deltas(p_deltas JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    affected_rows INTEGER;
+BEGIN
+    UPDATE players p
+    SET creditos        = COALESCE(p.creditos, 0)        + COALESCE(d.creditos, 0),
+        materiales      = COALESCE(p.materiales, 0)      + COALESCE(d.materiales, 0),
+        componentes     = COALESCE(p.componentes, 0)     + COALESCE(d.componentes, 0),
+        celulas_energia = COALESCE(p.celulas_energia, 0) + COALESCE(d.celulas_energia, 0),
+        influencia      = COALESCE(p.influencia, 0)      + COALESCE(d.influencia, 0),
+        datos           = COALESCE(p.datos, 0)           + COALESCE(d.datos, 0)
+    FROM jsonb_to_recordset(p_deltas) AS d(
+        player_id BIGINT,
+        creditos INTEGER,
+        materiales INTEGER,
+        componentes INTEGER,
+        celulas_energia INTEGER,
+        influencia INTEGER,
+        datos INTEGER
+    )
+    WHERE p.id = d.player_id;
+
+    GET DIAGNOSTICS affected_rows = ROW_COUNT;
+    RETURN affected_rows;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION apply_player_resource_deltas(JSONB) TO authenticated;
+GRANT EXECUTE ON FUNCTION apply_player_resource_deltas(JSONB) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.1
+-- =====================================================
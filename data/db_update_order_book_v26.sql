@@ -0,0 +1,71 @@
+-- =====================================================
+-- MIGRACION V26.2: Libro de Órdenes (Órdenes Límite)
+-- Ejecutar en Supabase SQL Editor
+-- Requiere: db_update_market_settlement_v26.sql (apply_player_resource_deltas)
+-- =====================================================
+
+-- 1. Nuevas columnas en market_orders
+-- price_per_unit se reutiliza como precio límite en órdenes LIMIT.
+ALTER TABLE market_orders ADD COLUMN IF NOT EXISTS order_type TEXT NOT NULL DEFAULT 'BROKER';
+ALTER TABLE market_orders ADD COLUMN IF NOT EXISTS filled_amount INTEGER NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN market_orders.order_type IS 'V26.2: BROKER (precio fijo NPC) o LIMIT (libro de órdenes).';
+COMMENT ON COLUMN market_orders.filled_amount IS 'V26.2: Unidades ya llenadas de una orden LIMIT (llenado parcial).';
+
+-- 2. Índice para reconstruir el libro (órdenes en reposo)
+CREATE INDEX IF NOT EXISTS idx_market_orders_open_book
+ON market_orders(resource_type, price_per_unit, created_at_tick, id)
+WHERE status = 'OPEN';
+
+-- 3. Historial de operaciones casadas (auditoría)
+CREATE TABLE IF NOT EXISTS market_trades (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    resource_type TEXT NOT NULL,
+    buy_order_id BIGINT REFERENCES market_orders(id) ON DELETE SET NULL,   -- NULL = broker NPC
+    sell_order_id BIGINT REFERENCES market_orders(id) ON DELETE SET NULL,  -- NULL = broker NPC
+    quantity INTEGER NOT NULL,
+    price INTEGER NOT NULL,
+    tick INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_market_trades_tick ON market_trades(tick);
+
+-- 4. RPC: Actualizar llenados/estado de muchas órdenes en UNA sentencia
+-- p_updates: [{"id": 1, "filled_amount": 40, "status": "OPEN", "processed_at_tick": null,
+--              "expected_filled": 0, "expected_status": "OPEN"}, ...]
+-- V26.25: Guardia optimista. Solo se actualizan las órdenes que siguen en el estado
+-- esperado (por defecto OPEN) y, si se indica, con el filled_amount leído por la subasta.
+-- Una orden cancelada entre la lectura y la escritura queda fuera y no se liquida.
+-- Retorna los ids realmente actualizados.
+DROP FUNCTION IF EXISTS update_market_orders_bulk(JSONB);
+
+CREATE OR REPLACE FUNCTION update_market_orders_bulk(p_updates JSONB)
+RETURNS TABLE(order_id BIGINT)
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    UPDATE market_orders o
+    SET filled_amount = u.filled_amount,
+        status = u.status,
+        processed_at_tick = COALESCE(u.processed_at_tick, o.processed_at_tick)
+    FROM jsonb_to_recordset(p_updates) AS u(
+        id BIGINT,
+        filled_amount INTEGER,
+        status TEXT,
+        processed_at_tick INTEGER,
+        expected_filled INTEGER,
+        expected_status TEXT
+    )
+    WHERE o.id = u.id
+      AND o.status = COALESCE(u.expected_status, 'OPEN')
+      AND (u.expected_filled IS NULL OR o.filled_amount = u.expected_filled)
+    RETURNING o.id;
+$$;
+
+GRANT EXECUTE ON FUNCTION update_market_orders_bulk(JSONB) TO authenticated;
+GRANT EXECUTE ON FUNCTION update_market_orders_bulk(JSONB) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.2
+-- =====================================================
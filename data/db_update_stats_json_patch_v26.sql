@@ -0,0 +1,70 @@
+-- =====================================================
+-- MIGRACION V26.16: Parches Parciales de stats_json en Lote
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. RPC: Aplicar parches por ruta JSON a muchos personajes en UNA sentencia
+-- p_patches: [{"id": 1, "op": "increment", "path": ["active_mission", "remaining_days"],
+--              "value": -1, "default": 0}, ...]
+-- Operaciones:
+--   set       -> stats_json #> path := value
+--   increment -> stats_json #> path := COALESCE(actual, default, 0) + value
+--   delete    -> elimina la clave en path
+--   merge     -> stats_json #> path := COALESCE(actual, '{}') || value (objetos)
+-- Como jsonb_set, solo se crea la última clave de la ruta: el padre debe existir.
+-- Un personaje debe aparecer como máximo una vez por llamada (el cliente agrupa en rondas).
+-- Retorna el valor resultante en la ruta de cada personaje parcheado.
+CREATE OR REPLACE FUNCTION patch_character_stats_bulk(p_patches JSONB)
+RETURNS TABLE(id INTEGER, value JSONB)
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+    WITH p AS (
+        SELECT x.id, x.op, x.path, x.value, x."default"
+        FROM jsonb_to_recordset(p_patches) AS x(
+            id INTEGER,
+            op TEXT,
+            path TEXT[],
+            value JSONB,
+            "default" JSONB
+        )
+    ),
+    patched AS (
+        UPDATE characters c
+        SET stats_json = CASE p.op
+            WHEN 'set' THEN
+                jsonb_set(COALESCE(c.stats_json, '{}'::jsonb), p.path, COALESCE(p.value, 'null'::jsonb), TRUE)
+            WHEN 'increment' THEN
+                jsonb_set(
+                    COALESCE(c.stats_json, '{}'::jsonb),
+                    p.path,
+                    to_jsonb(
+                        COALESCE((c.stats_json #>> p.path)::NUMERIC, (p."default" #>> '{}')::NUMERIC, 0)
+                        + COALESCE((p.value #>> '{}')::NUMERIC, 0)
+                    ),
+                    TRUE
+                )
+            WHEN 'delete' THEN
+                COALESCE(c.stats_json, '{}'::jsonb) #- p.path
+            WHEN 'merge' THEN
+                jsonb_set(
+                    COALESCE(c.stats_json, '{}'::jsonb),
+                    p.path,
+                    COALESCE(c.stats_json #> p.path, '{}'::jsonb) || COALESCE(p.value, '{}'::jsonb),
+                    TRUE
+                )
+            ELSE c.stats_json
+        END
+        FROM p
+        WHERE c.id = p.id
+        RETURNING c.id, c.stats_json #> p.path AS value
+    )
+    SELECT patched.id, patched.value FROM patched;
+$$;
+
+GRANT EXECUTE ON FUNCTION patch_character_stats_bulk(JSONB) TO authenticated;
+GRANT EXECUTE ON FUNCTION patch_character_stats_bulk(JSONB) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.16
+-- =====================================================
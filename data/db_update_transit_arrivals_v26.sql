@@ -0,0 +1,71 @@
+-- =====================================================
+-- MIGRACION V26.7: Llegadas de Tránsito en Lote
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. Índice para cerrar el historial de tránsitos abiertos por unidad
+CREATE INDEX IF NOT EXISTS idx_unit_transits_in_progress
+ON unit_transits(unit_id) WHERE status = 'IN_PROGRESS';
+
+-- 2. RPC: Completar muchos tránsitos en UNA llamada
+-- p_arrivals: [{"id": 1, "status": "SPACE", "location_system_id": 5,
+--               "location_planet_id": null, "location_sector_id": null, "ring": 0}, ...]
+-- Solo afecta unidades que siguen en TRANSIT (idempotente ante reintentos).
+-- Retorna los IDs de unidades efectivamente completadas.
+CREATE OR REPLACE FUNCTION complete_unit_transits_bulk(p_arrivals JSONB, p_tick INTEGER)
+RETURNS TABLE(unit_id INTEGER)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    completed_ids INTEGER[];
+BEGIN
+    WITH arrived AS (
+        UPDATE units u
+        SET status = a.status,
+            location_system_id = a.location_system_id,
+            location_planet_id = a.location_planet_id,
+            location_sector_id = a.location_sector_id,
+            ring = COALESCE(a.ring, 0),
+            transit_end_tick = NULL,
+            transit_ticks_remaining = 0,
+            transit_origin_system_id = NULL,
+            transit_destination_system_id = NULL,
+            transit_destination_ring = NULL,
+            starlane_id = NULL,
+            movement_locked = FALSE
+        FROM jsonb_to_recordset(p_arrivals) AS a(
+            id INTEGER,
+            status TEXT,
+            location_system_id INTEGER,
+            location_planet_id INTEGER,
+            location_sector_id BIGINT,
+            ring INTEGER
+        )
+        WHERE u.id = a.id
+          AND u.status = 'TRANSIT'
+        RETURNING u.id
+    )
+    SELECT array_agg(id) INTO completed_ids FROM arrived;
+
+    IF completed_ids IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- Historial de tránsitos
+    UPDATE unit_transits t
+    SET status = 'COMPLETED',
+        completed_at_tick = p_tick
+    WHERE t.unit_id = ANY(completed_ids)
+      AND t.status = 'IN_PROGRESS';
+
+    RETURN QUERY SELECT unnest(completed_ids);
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION complete_unit_transits_bulk(JSONB, INTEGER) TO authenticated;
+GRANT EXECUTE ON FUNCTION complete_unit_transits_bulk(JSONB, INTEGER) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.7
+-- =====================================================
@@ -0,0 +1,84 @@
+-- =====================================================
+-- MIGRACION V26.8: Tránsito por Tick Absoluto de Llegada
+-- Ejecutar en Supabase SQL Editor
+-- Requiere: db_update_transit_arrivals_v26.sql
+-- =====================================================
+-- transit_end_tick ya es el tick absoluto de llegada (indexado por
+-- idx_units_transit_end_tick). Se añade el tick de salida para mostrar progreso
+-- y se abandona el decremento por tick de transit_ticks_remaining.
+
+-- 1. Tick de salida
+ALTER TABLE units ADD COLUMN IF NOT EXISTS transit_start_tick integer;
+
+-- Backfill de tránsitos en curso (mejor estimación con el contador legado)
+UPDATE units
+SET transit_start_tick = transit_end_tick - COALESCE(
+        (SELECT ticks_required FROM unit_transits t
+         WHERE t.unit_id = units.id AND t.status = 'IN_PROGRESS'
+         ORDER BY t.started_at_tick DESC LIMIT 1),
+        transit_ticks_remaining)
+WHERE status = 'TRANSIT' AND transit_end_tick IS NOT NULL AND transit_start_tick IS NULL;
+
+COMMENT ON COLUMN units.transit_start_tick IS 'V26.8: Tick de salida del tránsito actual (progreso = (tick - inicio) / (fin - inicio))';
+COMMENT ON COLUMN units.transit_end_tick IS 'V26.8: Tick absoluto de llegada del tránsito actual';
+COMMENT ON COLUMN units.transit_ticks_remaining IS 'Obsoleto V26.8: Ya no se decrementa. Solo guarda los ticks restantes al ser interdictada.';
+
+-- 2. RPC de llegadas en lote: limpiar también el tick de salida
+CREATE OR REPLACE FUNCTION complete_unit_transits_bulk(p_arrivals JSONB, p_tick INTEGER)
+RETURNS TABLE(unit_id INTEGER)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    completed_ids INTEGER[];
+BEGIN
+    WITH arrived AS (
+        UPDATE units u
+        SET status = a.status,
+            location_system_id = a.location_system_id,
+            location_planet_id = a.location_planet_id,
+            location_sector_id = a.location_sector_id,
+            ring = COALESCE(a.ring, 0),
+            transit_start_tick = NULL,
+            transit_end_tick = NULL,
+            transit_ticks_remaining = 0,
+            transit_origin_system_id = NULL,
+            transit_destination_system_id = NULL,
+            transit_destination_ring = NULL,
+            starlane_id = NULL,
+            movement_locked = FALSE
+        FROM jsonb_to_recordset(p_arrivals) AS a(
+            id INTEGER,
+            status TEXT,
+            location_system_id INTEGER,
+            location_planet_id INTEGER,
+            location_sector_id BIGINT,
+            ring INTEGER
+        )
+        WHERE u.id = a.id
+          AND u.status = 'TRANSIT'
+        RETURNING u.id
+    )
+    SELECT array_agg(id) INTO completed_ids FROM arrived;
+
+    IF completed_ids IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- Historial de tránsitos
+    UPDATE unit_transits t
+    SET status = 'COMPLETED',
+        completed_at_tick = p_tick
+    WHERE t.unit_id = ANY(completed_ids)
+      AND t.status = 'IN_PROGRESS';
+
+    RETURN QUERY SELECT unnest(completed_ids);
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION complete_unit_transits_bulk(JSONB, INTEGER) TO authenticated;
+GRANT EXECUTE ON FUNCTION complete_unit_transits_bulk(JSONB, INTEGER) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.8
+-- =====================================================
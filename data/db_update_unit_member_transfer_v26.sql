@@ -0,0 +1,61 @@
+-- =====================================================
+-- MIGRACION V26.14: Transferencia de Miembros de Unidad en Lote
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. Índice para reescribir la plantilla de varias unidades a la vez
+CREATE INDEX IF NOT EXISTS idx_unit_members_unit
+ON unit_members(unit_id);
+
+-- 2. RPC: Aplicar la plantilla final de miembros de varias unidades en UNA llamada
+-- p_unit_ids: unidades afectadas (origen y destino de la reorganización)
+-- p_members: plantilla final completa de esas unidades, con slots ya renumerados
+--   [{"unit_id": 1, "entity_type": "character", "entity_id": 7,
+--     "slot_index": 0, "is_leader": true}, ...]
+-- La función es atómica: si alguna unidad está en TRANSIT se aborta sin cambios.
+-- Retorna los IDs de unidades reescritas.
+CREATE OR REPLACE FUNCTION transfer_unit_members_bulk(p_unit_ids INTEGER[], p_members JSONB)
+RETURNS TABLE(unit_id INTEGER)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF p_unit_ids IS NULL OR array_length(p_unit_ids, 1) IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- Bloquear las unidades afectadas y validar que ninguna esté en tránsito
+    PERFORM 1 FROM units u WHERE u.id = ANY(p_unit_ids) FOR UPDATE;
+
+    IF EXISTS (
+        SELECT 1 FROM units u
+        WHERE u.id = ANY(p_unit_ids)
+          AND u.status = 'TRANSIT'
+    ) THEN
+        RAISE EXCEPTION 'transfer_unit_members_bulk: unidad en TRANSIT';
+    END IF;
+
+    DELETE FROM unit_members um
+    WHERE um.unit_id = ANY(p_unit_ids);
+
+    INSERT INTO unit_members (unit_id, entity_type, entity_id, slot_index, is_leader)
+    SELECT m.unit_id, m.entity_type, m.entity_id, m.slot_index, COALESCE(m.is_leader, FALSE)
+    FROM jsonb_to_recordset(COALESCE(p_members, '[]'::jsonb)) AS m(
+        unit_id INTEGER,
+        entity_type TEXT,
+        entity_id INTEGER,
+        slot_index INTEGER,
+        is_leader BOOLEAN
+    )
+    WHERE m.unit_id = ANY(p_unit_ids);
+
+    RETURN QUERY SELECT unnest(p_unit_ids);
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION transfer_unit_members_bulk(INTEGER[], JSONB) TO authenticated;
+GRANT EXECUTE ON FUNCTION transfer_unit_members_bulk(INTEGER[], JSONB) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.14
+-- =====================================================
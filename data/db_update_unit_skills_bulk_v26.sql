@@ -0,0 +1,53 @@
+-- =====================================================
+-- MIGRACION V26.12: Recalculo de Habilidades de Unidad en Lote
+-- Ejecutar en Supabase SQL Editor
+-- =====================================================
+
+-- 1. Huella de la composición con la que se calcularon las habilidades
+-- (miembros, líder y habilidades de cada personaje). NULL = nunca calculada.
+ALTER TABLE units ADD COLUMN IF NOT EXISTS skill_digest TEXT;
+
+COMMENT ON COLUMN units.skill_digest IS
+    'V26.12: Huella (sha1) de la composición usada para calcular skill_*; se recalcula si cambia';
+
+-- 2. RPC: Escribir habilidades de muchas unidades en UNA sentencia
+-- p_rows: [{"id": 1, "skill_deteccion": 40, "skill_radares": 40, "skill_exploracion": 35,
+--           "skill_sigilo": 30, "skill_evasion_sensores": 30, "skill_digest": "ab12..."}, ...]
+-- Retorna la cantidad de unidades actualizadas.
+CREATE OR REPLACE FUNCTION update_unit_skills_bulk(p_rows JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE units u
+    SET skill_deteccion = COALESCE(r.skill_deteccion, 0),
+        skill_radares = COALESCE(r.skill_radares, 0),
+        skill_exploracion = COALESCE(r.skill_exploracion, 0),
+        skill_sigilo = COALESCE(r.skill_sigilo, 0),
+        skill_evasion_sensores = COALESCE(r.skill_evasion_sensores, 0),
+        skill_digest = r.skill_digest
+    FROM jsonb_to_recordset(p_rows) AS r(
+        id INTEGER,
+        skill_deteccion INTEGER,
+        skill_radares INTEGER,
+        skill_exploracion INTEGER,
+        skill_sigilo INTEGER,
+        skill_evasion_sensores INTEGER,
+        skill_digest TEXT
+    )
+    WHERE u.id = r.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION update_unit_skills_bulk(JSONB) TO authenticated;
+GRANT EXECUTE ON FUNCTION update_unit_skills_bulk(JSONB) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.12
+-- =====================================================
@@ -0,0 +1,113 @@
+-- =====================================================
+-- MIGRACION V26.25: Recalculo de Habilidades Solo en Unidades Modificadas
+-- Ejecutar en Supabase SQL Editor
+-- Requiere: db_update_unit_skills_bulk_v26.sql, db_update_character_hot_columns_v26.sql
+-- =====================================================
+
+-- 1. Versión de composición de la unidad
+-- skills_version: se incrementa (triggers) al cambiar miembros, líder o habilidades de un miembro.
+-- skills_computed_version: versión con la que el tick calculó skill_*.
+ALTER TABLE units ADD COLUMN IF NOT EXISTS skills_version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE units ADD COLUMN IF NOT EXISTS skills_computed_version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE units ADD COLUMN IF NOT EXISTS skills_dirty BOOLEAN
+    GENERATED ALWAYS AS (skills_version > skills_computed_version) STORED;
+
+COMMENT ON COLUMN units.skills_dirty IS
+    'V26.25: TRUE si la composición cambió desde el último recálculo de skill_* en el tick';
+
+CREATE INDEX IF NOT EXISTS idx_units_skills_dirty
+ON units(id) WHERE skills_dirty;
+
+-- 2. Trigger: altas, bajas y cambios de miembros (incluye is_leader y slot_index)
+CREATE OR REPLACE FUNCTION mark_unit_skills_dirty_from_members()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE units SET skills_version = skills_version + 1 WHERE id = OLD.unit_id;
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.unit_id IS DISTINCT FROM OLD.unit_id) THEN
+        UPDATE units SET skills_version = skills_version + 1 WHERE id = NEW.unit_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_unit_members_skills_dirty ON unit_members;
+CREATE TRIGGER trg_unit_members_skills_dirty
+    AFTER INSERT OR UPDATE OR DELETE ON unit_members
+    FOR EACH ROW
+    EXECUTE FUNCTION mark_unit_skills_dirty_from_members();
+
+-- 3. Trigger: cambio de habilidades de un personaje miembro (proyección hot)
+CREATE INDEX IF NOT EXISTS idx_unit_members_entity
+ON unit_members(entity_type, entity_id);
+
+CREATE OR REPLACE FUNCTION mark_unit_skills_dirty_from_character()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    UPDATE units u
+    SET skills_version = u.skills_version + 1
+    FROM unit_members m
+    WHERE m.unit_id = u.id
+      AND m.entity_type = 'character'
+      AND m.entity_id = NEW.id;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_characters_unit_skills_dirty ON characters;
+CREATE TRIGGER trg_characters_unit_skills_dirty
+    AFTER UPDATE ON characters
+    FOR EACH ROW
+    WHEN (OLD.hot_habilidades IS DISTINCT FROM NEW.hot_habilidades)
+    EXECUTE FUNCTION mark_unit_skills_dirty_from_character();
+
+-- 4. RPC: update_unit_skills_bulk marca además la versión calculada
+-- p_rows: [{"id": 1, "skill_deteccion": 40, ..., "skill_digest": "ab12...", "skills_version": 3}, ...]
+-- Una fila solo con {"id", "skills_version"} confirma una unidad cuya huella no cambió.
+-- Si un trigger incrementó skills_version tras la lectura, la unidad sigue marcada.
+CREATE OR REPLACE FUNCTION update_unit_skills_bulk(p_rows JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE units u
+    SET skill_deteccion = COALESCE(r.skill_deteccion, u.skill_deteccion),
+        skill_radares = COALESCE(r.skill_radares, u.skill_radares),
+        skill_exploracion = COALESCE(r.skill_exploracion, u.skill_exploracion),
+        skill_sigilo = COALESCE(r.skill_sigilo, u.skill_sigilo),
+        skill_evasion_sensores = COALESCE(r.skill_evasion_sensores, u.skill_evasion_sensores),
+        skill_digest = COALESCE(r.skill_digest, u.skill_digest),
+        skills_computed_version = GREATEST(u.skills_computed_version, COALESCE(r.skills_version, 0))
+    FROM jsonb_to_recordset(p_rows) AS r(
+        id INTEGER,
+        skill_deteccion INTEGER,
+        skill_radares INTEGER,
+        skill_exploracion INTEGER,
+        skill_sigilo INTEGER,
+        skill_evasion_sensores INTEGER,
+        skill_digest TEXT,
+        skills_version INTEGER
+    )
+    WHERE u.id = r.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION update_unit_skills_bulk(JSONB) TO authenticated;
+GRANT EXECUTE ON FUNCTION update_unit_skills_bulk(JSONB) TO service_role;
+
+-- =====================================================
+-- FIN MIGRACION V26.25
+-- =====================================================
@@ -96,6 +96,15 @@ def get_prestige_map() -> Dict[int, float]:
 # ACTUALIZACIÓN DE PRESTIGIO
 # ============================================================
 
+def _invalidate_prestige_caches() -> None:
+    """
+    V26.25: Descarta el prestigio cacheado por el mercado (calculate_market_prices)
+    tras cualquier escritura de prestigio, dentro o fuera del tick.
+    """
+    from core.market_engine import invalidate_market_price_cache
+    invalidate_market_price_cache()
+
+
 def update_faction_prestige(faction_id: int, new_prestige: float) -> bool:
     """
     Actualiza el prestigio de una facción individual.
@@ -111,6 +120,7 @@ def update_faction_prestige(faction_id: int, new_prestige: float) -> bool:
         _get_db().table("factions").update({
             "prestigio": round(new_prestige, 2)
         }).eq("id", faction_id).execute()
+        _invalidate_prestige_caches()
         return True
     except Exception as e:
         log_event(f"Error actualizando prestigio facción {faction_id}: {e}", is_error=True)
@@ -142,6 +152,9 @@ def batch_update_prestige(prestige_map: Dict[int, float]) -> bool:
     except Exception as e:
         log_event(f"Error en actualización batch de prestigio: {e}", is_error=True)
         return False
+    finally:
+        # Incluye escrituras parciales
+        _invalidate_prestige_caches()
 
 
 # ============================================================
@@ -452,6 +465,8 @@ def update_faction(faction_id: int, data: Dict[str, Any]) -> bool:
     """
     try:
         _get_db().table("factions").update(data).eq("id", faction_id).execute()
+        if "prestigio" in data:
+            _invalidate_prestige_caches()
         return True
     except Exception as e:
         log_event(f"Error actualizando facción (genérico) {faction_id}: {e}", is_error=True)
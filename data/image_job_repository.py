@@ -0,0 +1,116 @@
+# data/image_job_repository.py
+"""
+Repositorio de Trabajos de Imagen (V26.21).
+Cola persistente 'image_jobs' para retratos e imágenes tácticas.
+La deduplicación y el reclamo concurrente viven en las RPCs
+enqueue_image_job / claim_image_jobs (ver db_update_image_jobs_v26.sql).
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+from data.database import get_supabase
+from data.log_repository import log_event
+
+IMAGE_JOB_QUEUED = "queued"
+IMAGE_JOB_RUNNING = "running"
+IMAGE_JOB_DONE = "done"
+IMAGE_JOB_FAILED = "failed"
+
+
+def _get_db():
+    """Obtiene el cliente de Supabase de forma segura."""
+    return get_supabase()
+
+
+def enqueue_image_job(
+    job_key: str,
+    player_id: Optional[int],
+    character_id: Optional[int],
+    prompt: str,
+    force: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Encola un trabajo o devuelve el existente con el mismo job_key.
+    Un trabajo 'failed' se vuelve a encolar; con force=True también uno 'done'.
+    """
+    try:
+        response = _get_db().rpc("enqueue_image_job", {
+            "p_job_key": job_key,
+            "p_player_id": player_id,
+            "p_character_id": character_id,
+            "p_prompt": prompt,
+            "p_force": force
+        }).execute()
+        return response.data[0] if response.data else None
+    except Exception as e:
+        log_event(f"Error encolando trabajo de imagen: {e}", player_id, is_error=True)
+        return None
+
+
+def claim_image_jobs(limit: int = 1, stale_seconds: int = 600) -> List[Dict[str, Any]]:
+    """Reclama hasta 'limit' trabajos pendientes (FOR UPDATE SKIP LOCKED)."""
+    try:
+        response = _get_db().rpc("claim_image_jobs", {
+            "p_limit": limit,
+            "p_stale_seconds": stale_seconds
+        }).execute()
+        return response.data or []
+    except Exception as e:
+        log_event(f"Error reclamando trabajos de imagen: {e}", is_error=True)
+        return []
+
+
+def get_image_job(job_id: int) -> Optional[Dict[str, Any]]:
+    """Estado de un trabajo (para el polling de la UI)."""
+    try:
+        response = _get_db().table("image_jobs")\
+            .select("id, job_key, player_id, character_id, status, content_hash, public_url, error, attempts")\
+            .eq("id", job_id)\
+            .maybe_single()\
+            .execute()
+        return response.data if response else None
+    except Exception as e:
+        log_event(f"Error consultando trabajo de imagen {job_id}: {e}", is_error=True)
+        return None
+
+
+def complete_image_job(job_id: int, attempts: int, content_hash: str, public_url: Optional[str]) -> bool:
+    """
+    Marca el trabajo como hecho.
+    V26.25: Solo si sigue 'running' con el 'attempts' reclamado por este worker;
+    un trabajo reclamado de nuevo (stale) o regenerado no se sobrescribe.
+    Devuelve False si el trabajo ya no pertenece a este worker.
+    """
+    try:
+        response = _get_db().table("image_jobs").update({
+            "status": IMAGE_JOB_DONE,
+            "content_hash": content_hash,
+            "public_url": public_url,
+            "error": None,
+            "force_render": False,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }).eq("id", job_id)\
+            .eq("status", IMAGE_JOB_RUNNING)\
+            .eq("attempts", attempts)\
+            .execute()
+        return bool(response.data)
+    except Exception as e:
+        log_event(f"Error completando trabajo de imagen {job_id}: {e}", is_error=True)
+        return False
+
+
+def fail_image_job(job_id: int, attempts: int, error: str) -> bool:
+    """V26.25: Mismo guardia que complete_image_job (un fallo tardío no pisa un 'done')."""
+    try:
+        response = _get_db().table("image_jobs").update({
+            "status": IMAGE_JOB_FAILED,
+            "error": error[:500],
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }).eq("id", job_id)\
+            .eq("status", IMAGE_JOB_RUNNING)\
+            .eq("attempts", attempts)\
+            .execute()
+        return bool(response.data)
+    except Exception as e:
+        log_event(f"Error marcando fallo del trabajo de imagen {job_id}: {e}", is_error=True)
+        return False
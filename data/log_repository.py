@@ -5,7 +5,7 @@ Gestiona el registro de eventos del sistema.
 """
 
 import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from data.database import get_supabase
 
@@ -52,6 +52,37 @@ def log_event(
         print(f"❌ ERROR CRÍTICO AL GUARDAR LOG: {e}")
 
 
+def log_events_batch(entries: List[Tuple[str, Optional[int]]], is_error: bool = False) -> None:
+    """
+    Registra muchos eventos con un único INSERT (V26.1).
+
+    Args:
+        entries: Lista de tuplas (mensaje, player_id). Los eventos globales
+                 (player_id None) solo se imprimen, igual que en log_event.
+        is_error: Si son errores (para formateo de mensaje)
+    """
+    rows = []
+    now = datetime.datetime.now().isoformat()
+    for message, player_id in entries:
+        if player_id is None:
+            prefix = "❌ ERROR: " if is_error else "📋 "
+            print(f"{prefix}{message}")
+            continue
+        rows.append({
+            "evento_texto": str(f"❌ {message}" if is_error else message),
+            "player_id": int(player_id),
+            "fecha_evento": now
+        })
+
+    if not rows:
+        return
+
+    try:
+        _get_db().table("logs").insert(rows).execute()
+    except Exception as e:
+        print(f"❌ ERROR CRÍTICO AL GUARDAR LOGS EN LOTE: {e}")
+
+
 def get_recent_logs(player_id: int, limit: int = 20) -> List[Dict[str, Any]]:
     """
     Obtiene los logs más recientes de un jugador.
@@ -4,10 +4,10 @@ Repositorio de Mercado.
 Gestiona la persistencia de órdenes de compra/venta.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Set
 from .database import get_supabase
 from .log_repository import log_event
-from core.models import MarketOrder, MarketOrderStatus
+from core.models import MarketOrder, MarketOrderStatus, MarketOrderType
 
 def _get_db():
     return get_supabase()
@@ -26,6 +26,9 @@ def create_market_order(order: MarketOrder) -> Optional[MarketOrder]:
             "status": order.status.value,
             "created_at_tick": order.created_at_tick
         }
+        # V26.2: Solo enviar columnas del libro cuando aplica (compatibilidad pre-migración)
+        if order.order_type != MarketOrderType.BROKER:
+            data["order_type"] = order.order_type.value
         
         response = _get_db().table("market_orders").insert(data).execute()
         
@@ -87,4 +90,162 @@ def mark_orders_as_completed(order_ids: List[int], processed_tick: int) -> bool:
     except Exception as e:
         # Log genérico, no asociado a un player específico aquí fácilmente sin iterar
         print(f"Error marking orders completed: {e}") 
-        return False
\ No newline at end of file
+        return False
+
+
+def get_all_pending_orders_before_tick(tick: int) -> List[MarketOrder]:
+    """
+    V26.1: Obtiene en UNA consulta todas las órdenes pendientes de la galaxia
+    creadas antes del tick indicado (listas para entrega).
+    """
+    try:
+        response = _get_db().table("market_orders")\
+            .select("*")\
+            .eq("status", MarketOrderStatus.PENDING.value)\
+            .lt("created_at_tick", tick)\
+            .execute()
+        return [MarketOrder.from_dict(o) for o in response.data] if response.data else []
+    except Exception as e:
+        print(f"Error obteniendo órdenes pendientes globales: {e}")
+        return []
+
+
+def claim_pending_orders(order_ids: List[int], processed_tick: int) -> List[int]:
+    """
+    V26.1: Marca órdenes como COMPLETED en una sola sentencia, solo si siguen PENDING.
+    Retorna los IDs efectivamente reclamados (evita doble entrega si dos procesos
+    liquidan el mismo lote).
+    """
+    if not order_ids:
+        return []
+
+    try:
+        response = _get_db().table("market_orders")\
+            .update({
+                "status": MarketOrderStatus.COMPLETED.value,
+                "processed_at_tick": processed_tick
+            })\
+            .in_("id", order_ids)\
+            .eq("status", MarketOrderStatus.PENDING.value)\
+            .execute()
+        return [o["id"] for o in response.data] if response.data else []
+    except Exception as e:
+        print(f"Error reclamando órdenes de mercado: {e}")
+        return []
+
+
+def reopen_market_orders(order_ids: List[int]) -> bool:
+    """
+    V26.1: Devuelve órdenes reclamadas a PENDING (compensación si la
+    acreditación del lote falla). Se reintentarán en el próximo tick.
+    """
+    if not order_ids:
+        return True
+
+    try:
+        _get_db().table("market_orders")\
+            .update({
+                "status": MarketOrderStatus.PENDING.value,
+                "processed_at_tick": None
+            })\
+            .in_("id", order_ids)\
+            .execute()
+        return True
+    except Exception as e:
+        print(f"Error reabriendo órdenes de mercado: {e}")
+        return False
+
+
+# --- V26.2: LIBRO DE ÓRDENES ---
+
+def get_open_limit_orders() -> List[MarketOrder]:
+    """
+    Obtiene en UNA consulta todas las órdenes límite en reposo (status OPEN).
+    Fuente para reconstruir el libro en memoria en cada tick.
+    """
+    try:
+        response = _get_db().table("market_orders")\
+            .select("id, player_id, resource_type, amount, price_per_unit, status, created_at_tick, order_type, filled_amount")\
+            .eq("status", MarketOrderStatus.OPEN.value)\
+            .eq("order_type", MarketOrderType.LIMIT.value)\
+            .execute()
+        return [MarketOrder.from_dict(o) for o in response.data] if response.data else []
+    except Exception as e:
+        print(f"Error obteniendo libro de órdenes: {e}")
+        return []
+
+
+def get_open_limit_orders_for_player(player_id: int) -> List[MarketOrder]:
+    """Órdenes límite en reposo de un jugador (para UI y cancelación)."""
+    try:
+        response = _get_db().table("market_orders")\
+            .select("*")\
+            .eq("player_id", player_id)\
+            .eq("status", MarketOrderStatus.OPEN.value)\
+            .eq("order_type", MarketOrderType.LIMIT.value)\
+            .execute()
+        return [MarketOrder.from_dict(o) for o in response.data] if response.data else []
+    except Exception as e:
+        log_event(f"Error obteniendo órdenes límite: {e}", player_id, is_error=True)
+        return []
+
+
+def get_market_order_by_id(order_id: int) -> Optional[MarketOrder]:
+    """Obtiene una orden por ID."""
+    try:
+        response = _get_db().table("market_orders")\
+            .select("*")\
+            .eq("id", order_id)\
+            .maybe_single()\
+            .execute()
+        return MarketOrder.from_dict(response.data) if response and response.data else None
+    except Exception:
+        return None
+
+
+def update_market_orders_bulk(updates: List[Dict[str, Any]]) -> Optional[Set[int]]:
+    """
+    Actualiza filled_amount/status de muchas órdenes en una sola sentencia (RPC).
+    updates: [{"id", "filled_amount", "status", "processed_at_tick",
+               "expected_filled"?, "expected_status"?}]
+    V26.25: Solo se escriben las órdenes que siguen en el estado esperado (OPEN por defecto).
+    Retorna los ids realmente actualizados, o None si la RPC falla.
+    """
+    if not updates:
+        return set()
+    try:
+        response = _get_db().rpc("update_market_orders_bulk", {"p_updates": updates}).execute()
+        return {int(row["order_id"]) for row in (response.data or [])}
+    except Exception as e:
+        print(f"Error actualizando órdenes en lote: {e}")
+        return None
+
+
+def cancel_open_order(order_id: int, player_id: int) -> Optional[MarketOrder]:
+    """
+    Marca como CANCELLED una orden límite OPEN del jugador.
+    V26.25: Retorna la fila cancelada (filled_amount vigente al cancelar) o None.
+    """
+    try:
+        response = _get_db().table("market_orders")\
+            .update({"status": MarketOrderStatus.CANCELLED.value})\
+            .eq("id", order_id)\
+            .eq("player_id", player_id)\
+            .eq("status", MarketOrderStatus.OPEN.value)\
+            .execute()
+        return MarketOrder.from_dict(response.data[0]) if response.data else None
+    except Exception as e:
+        log_event(f"Error cancelando orden: {e}", player_id, is_error=True)
+        return None
+
+
+def insert_market_trades(trades: List[Dict[str, Any]]) -> bool:
+    """Registra las operaciones casadas de un tick con un único INSERT."""
+    if not trades:
+        return True
+    try:
+        _get_db().table("market_trades").insert(trades).execute()
+        return True
+    except Exception as e:
+        print(f"Error registrando operaciones de mercado: {e}")
+        return False
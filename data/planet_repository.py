@@ -36,6 +36,7 @@ from .planets.core import (
     _get_db,
     get_planet_by_id,
     get_all_colonized_system_ids,
+    get_habitable_planets,
 )
 
 # --- ASSETS: Gestión de planet_assets (colonización, población) ---
@@ -99,6 +100,7 @@ __all__ = [
     "_get_db",
     "get_planet_by_id",
     "get_all_colonized_system_ids",
+    "get_habitable_planets",
     # Assets
     "get_planet_asset",
     "get_planet_asset_by_id",
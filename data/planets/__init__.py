@@ -17,6 +17,7 @@ from .core import (
     _get_db,
     get_planet_by_id,
     get_all_colonized_system_ids,
+    get_habitable_planets,
 )
 
 # Assets
@@ -75,6 +76,7 @@ __all__ = [
     "_get_db",
     "get_planet_by_id",
     "get_all_colonized_system_ids",
+    "get_habitable_planets",
     # Assets
     "get_planet_asset",
     "get_planet_asset_by_id",
@@ -18,6 +18,7 @@ from core.world_constants import (
     SECTOR_TYPE_URBAN,
 )
 from core.rules import calculate_planet_security
+from core.territory_engine import on_planet_sovereignty_changed
 
 from .core import _get_db, get_planet_by_id
 
@@ -315,6 +316,8 @@ def create_planet_asset(
                 "orbital_owner_id": player_id,
                 "population": initial_population
             }).eq("id", planet_id).execute()
+            # V26.25: Refresca mapa de control y catálogo de planetas de nacimiento (población)
+            on_planet_sovereignty_changed(planet_id, player_id, player_id)
 
             # Paso 2: Asignar Seguridad Calculada
             db.table("planets").update({
@@ -13,6 +13,7 @@ Refactor v23.0: Implementación de Mejoras Tier 2 y Limpieza de Lógica HQ.
 Refactor v23.2: Cobro inmediato de recursos y validación de duplicidad por sector.
 Refactor v25.0: Persistencia de Extracción de Lujo en Tier 2 (Insert/Delete en luxury_extraction_sites).
 Refactor v25.1: Sincronización estricta de activación de extracción de lujo (is_active=False inicial).
+Refactor v26.4: Reconciliación set-based de sitios de lujo (reconcile_luxury_sites, RPC única).
 """
 
 from typing import Dict, List, Any, Optional, Tuple
@@ -527,79 +528,52 @@ def batch_update_building_status(updates: List[Tuple[int, bool]]) -> Tuple[int,
     return (success, failed)
 
 
+def reconcile_luxury_sites(
+    current_tick: int,
+    player_ids: Optional[List[int]] = None
+) -> Dict[str, Any]:
+    """
+    V26.4: Reconciliación set-based de sitios de extracción de lujo.
+    Una sola RPC compara el estado deseado (edificios Tier >= 2 en sectores con
+    recurso de lujo) contra los sitios existentes de todos los jugadores (o de
+    player_ids), creando los faltantes y sincronizando is_active.
+
+    Returns:
+        {"created": n, "activated": n, "deactivated": n,
+         "by_player": {player_id: {"created", "activated", "deactivated"}}}
+    """
+    summary: Dict[str, Any] = {"created": 0, "activated": 0, "deactivated": 0, "by_player": {}}
+    try:
+        params = {"p_current_tick": int(current_tick), "p_player_ids": player_ids}
+        response = _get_db().rpc("reconcile_luxury_extraction_sites", params).execute()
+        for row in (response.data or []):
+            counts = {
+                "created": row.get("created_count", 0) or 0,
+                "activated": row.get("activated_count", 0) or 0,
+                "deactivated": row.get("deactivated_count", 0) or 0,
+            }
+            summary["by_player"][row["player_id"]] = counts
+            for key, value in counts.items():
+                summary[key] += value
+    except Exception as e:
+        log_event(f"Error en reconciliación de sitios de lujo: {e}", is_error=True)
+    return summary
+
+
 def sync_luxury_sites(player_id: int):
     """
     V25.0: Función de utilidad para sincronizar/reparar sitios de extracción.
     Busca edificios Tier 2 existentes que deberían tener un sitio de extracción pero no lo tienen.
     V25.1: Sincroniza is_active con el estado del edificio padre.
+    V26.4: Delegado a reconcile_luxury_sites (una RPC en lugar de lecturas por edificio).
     """
     try:
-        db = _get_db()
-        log_event("🔄 Sincronizando sitios de extracción de lujo...", player_id)
-        
-        # 1. Obtener todos los edificios Tier >= 2 del jugador
-        buildings = db.table("planet_buildings")\
-            .select("id, sector_id, planet_asset_id, building_tier, is_active, built_at_tick")\
-            .eq("player_id", player_id)\
-            .gte("building_tier", 2)\
-            .execute().data
-            
-        if not buildings:
-            return
+        current_tick = get_world_state().get("current_tick", 1)
+        summary = reconcile_luxury_sites(current_tick, [player_id])
+        count_repaired = summary["created"] + summary["activated"] + summary["deactivated"]
 
-        count_repaired = 0
-        
-        # Obtener tick actual para validación adicional
-        world = get_world_state()
-        current_tick = world.get("current_tick", 1)
-        
-        for b in buildings:
-            sector_id = b.get("sector_id")
-            building_id = b.get("id")
-            # El edificio es efectivo si está activo en DB Y ya pasó su tiempo de construcción
-            building_is_effective = b.get("is_active", True) and b.get("built_at_tick", 0) <= current_tick
-            
-            if not sector_id: continue
-            
-            # Verificar si ya tiene sitio
-            site_res = db.table("luxury_extraction_sites")\
-                .select("id, is_active")\
-                .eq("building_id", building_id)\
-                .maybe_single().execute()
-            
-            site_exists = site_res.data
-                
-            if not site_exists:
-                # CREAR SITIO FALTANTE
-                sector = db.table("sectors")\
-                    .select("luxury_resource, luxury_category")\
-                    .eq("id", sector_id)\
-                    .single().execute().data
-                
-                if sector and sector.get("luxury_resource") and sector.get("luxury_resource") != "null":
-                    site_data = {
-                        "planet_asset_id": b["planet_asset_id"],
-                        "player_id": player_id,
-                        "resource_key": sector["luxury_resource"],
-                        "resource_category": sector["luxury_category"],
-                        "extraction_rate": 1,
-                        "is_active": building_is_effective, # Sincronizado
-                        "pops_required": 0,
-                        "building_id": building_id
-                    }
-                    db.table("luxury_extraction_sites").insert(site_data).execute()
-                    count_repaired += 1
-            else:
-                # ACTUALIZAR ESTADO SI DIFIERE
-                # Si el edificio es efectivo pero el sitio no, activar
-                # Si el edificio NO es efectivo pero el sitio si, desactivar
-                site_active = site_exists.get("is_active", False)
-                if site_active != building_is_effective:
-                    db.table("luxury_extraction_sites").update({"is_active": building_is_effective}).eq("id", site_exists["id"]).execute()
-                    count_repaired += 1
-        
         if count_repaired > 0:
             log_event(f"✅ Reparados/Sincronizados {count_repaired} sitios de extracción de lujo.", player_id)
-            
+
     except Exception as e:
         log_event(f"Error en sync_luxury_sites: {e}", player_id, is_error=True)
\ No newline at end of file
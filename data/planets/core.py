@@ -3,6 +3,7 @@
 Consultas básicas de planetas (tabla mundial 'planets').
 Hotfix v7.8.1: Estrategia Fail-Safe para resolución de nombres de soberanía.
 Actualizado v8.1.0: Robustez en resolución de nombres (Fail-Safe Desconocido).
+Actualizado V26.19: Lectura única del catálogo de planetas habitables.
 """
 
 from typing import Dict, List, Any, Optional
@@ -118,3 +119,21 @@ def get_all_colonized_system_ids() -> List[int]:
     except Exception as e:
         log_event(f"Error obteniendo sistemas colonizados: {e}", is_error=True)
         return []
+
+
+def get_habitable_planets(biomes: List[str]) -> List[Dict[str, Any]]:
+    """
+    V26.19: Todos los planetas de los biomas indicados en una sola consulta
+    (catálogo de planetas de nacimiento de la generación de personajes).
+    """
+    if not biomes:
+        return []
+    try:
+        response = _get_db().table("planets")\
+            .select("id, name, biome, system_id, population")\
+            .in_("biome", list(biomes))\
+            .execute()
+        return response.data or []
+    except Exception as e:
+        log_event(f"Error obteniendo planetas habitables: {e}", is_error=True)
+        return []
@@ -8,6 +8,7 @@ Refactor v11.0: INTEGRACIÓN DE SISTEMA DE BASES MILITARES (Tabla 'bases').
 Corrección v6.1: Fix crítico de tipos en seguridad (soporte Dict/Float).
 Refactor V19.0: Soberanía Estricta. Solo estructuras TERMINADAS (built_at_tick <= current) otorgan control.
 Refactor V20.0: Soberanía Disputada Estricta. Múltiples Outposts = Nadie controla.
+V26.5: Los cambios de soberanía se propagan al mapa de control territorial en memoria.
 """
 
 from typing import Dict, List, Any, Optional, Tuple
@@ -16,6 +17,7 @@ from ..log_repository import log_event
 from ..world_repository import get_world_state, update_system_controller, update_system_security
 
 from .core import _get_db
+from core.territory_engine import on_planet_sovereignty_changed
 
 
 def update_planet_sovereignty(planet_id: int, enemy_fleet_owner_id: Optional[int] = None):
@@ -119,6 +121,7 @@ def update_planet_sovereignty(planet_id: int, enemy_fleet_owner_id: Optional[int
             "orbital_owner_id": new_orbital_owner,
             "is_disputed": is_disputed
         }).eq("id", planet_id).execute()
+        on_planet_sovereignty_changed(planet_id, new_surface_owner, new_orbital_owner)
 
         # V9.0: Recalcular control del sistema en cascada
         if system_id:
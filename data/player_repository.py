@@ -309,6 +309,28 @@ def update_player_resources(player_id: int, updates: Dict[str, Any]) -> bool:
         return False
 
 
+def apply_player_resource_deltas(deltas: Dict[int, Dict[str, int]]) -> bool:
+    """
+    V26.1: Suma deltas de recursos base a muchos jugadores en una sola sentencia (RPC).
+    Args:
+        deltas: {player_id: {"creditos": +100, "materiales": -5, ...}}
+    """
+    rows = [
+        {"player_id": int(pid), **{k: int(v) for k, v in delta.items() if v}}
+        for pid, delta in deltas.items()
+        if any(delta.values())
+    ]
+    if not rows:
+        return True
+
+    try:
+        _get_db().rpc("apply_player_resource_deltas", {"p_deltas": rows}).execute()
+        return True
+    except Exception as e:
+        log_event(f"Error aplicando deltas de recursos en lote: {e}", is_error=True)
+        return False
+
+
 def update_player_credits(player_id: int, new_credits: int) -> bool:
     """Actualiza los créditos del jugador."""
     return update_player_resources(player_id, {"creditos": new_credits})
@@ -5,13 +5,20 @@ REFACTORIZADO: Ahora actúa como una interfaz sobre la tabla 'characters'
 filtrando por estado 'Candidato'.
 Actualizado v5.1.8: Persistencia de Conocimiento (SQL) en Investigación.
 Actualizado v5.1.9: Validación de persistencia unificada.
+Actualizado V26.18: Expiración global de candidatos en una RPC.
 """
 
 from typing import Dict, Any, List, Optional
 from data.database import get_supabase
-from data.log_repository import log_event
+from data.log_repository import log_event, log_events_batch
 from core.models import CharacterStatus, KnowledgeLevel
-from data.character_repository import update_character, get_character_by_id, set_character_knowledge_level
+from data.character_repository import (
+    update_character,
+    get_character_by_id,
+    set_character_knowledge_level,
+    stats_patch,
+    patch_character_stats_bulk
+)
 
 
 def _get_db():
@@ -108,21 +115,15 @@ def get_candidate_by_id(candidate_id: int) -> Optional[Dict[str, Any]]:
 # --- FUNCIONES DE SEGUIMIENTO (MANIPULACIÓN JSON) ---
 
 def _update_recruitment_metadata(candidate_id: int, updates: Dict[str, Any]) -> bool:
-    """Helper para actualizar campos dentro de stats_json->recruitment_data"""
+    """
+    Helper para actualizar campos dentro de stats_json->recruitment_data.
+    V26.16: Parche 'merge' por ruta (sin leer ni reescribir el stats_json completo).
+    """
     try:
-        char = get_character_by_id(candidate_id)
-        if not char: return False
-        
-        stats = char.get("stats_json", {})
-        rec_data = stats.get("recruitment_data", {})
-        
-        # Aplicar updates
-        rec_data.update(updates)
-        stats["recruitment_data"] = rec_data
-        
-        # Guardar
-        update_character(candidate_id, {"stats_json": stats})
-        return True
+        result = patch_character_stats_bulk([
+            stats_patch(candidate_id, "merge", ["recruitment_data"], updates)
+        ])
+        return candidate_id in result
     except Exception as e:
         log_event(f"Error actualizando metadata candidato: {e}", is_error=True)
         return False
@@ -208,6 +209,36 @@ def expire_old_candidates(player_id: int, current_tick: int, lifespan: int = CAN
         return 0
 
 
+def expire_all_old_candidates(current_tick: int, lifespan: int = CANDIDATE_LIFESPAN_TICKS) -> Dict[int, List[str]]:
+    """
+    V26.18: Expira los candidatos de TODA la galaxia en una sola RPC
+    (mismo criterio que expire_old_candidates) y registra un log por jugador.
+
+    Returns:
+        {player_id: [nombres de candidatos eliminados]}
+    """
+    try:
+        response = _get_db().rpc("expire_recruitment_candidates", {
+            "p_current_tick": current_tick,
+            "p_lifespan": lifespan
+        }).execute()
+        expired = {
+            row["player_id"]: list(row.get("names") or [])
+            for row in (response.data or [])
+            if row.get("player_id") is not None
+        }
+    except Exception as e:
+        log_event(f"Error expirando candidatos (global): {e}", is_error=True)
+        return {}
+
+    log_events_batch([
+        (f"RECLUTAMIENTO: {len(names)} candidato(s) abandonaron la estación: {', '.join(names)}", player_id)
+        for player_id, names in expired.items()
+        if names
+    ])
+    return expired
+
+
 # --- FUNCIONES DE INVESTIGACION ---
 
 def set_investigation_state(candidate_id: int, is_investigating: bool) -> bool:
@@ -16,6 +16,12 @@ V15.2: Fix "Problema del Anillo 0" en creación y limpieza de ubicación en diso
 V17.2: Fix Crítico Hydration - Aislamiento estricto de datos de miembros y validación de tipos.
 V17.3: Update Hydration Validation - Uso de keys descriptivas para verificar habilidades.
 V17.4: Add update_unit_moves - Soporte para actualización directa de fatiga.
+V26.6: Consultas y borrados en lote para la supervivencia global de tropas.
+V26.7: Llegadas de tránsito en lote (complete_unit_transits_bulk).
+V26.8: Modelo de tránsito por tick absoluto (transit_start_tick/transit_end_tick), sin decremento por tick.
+V26.12: Recalculo de habilidades de unidad en lote (skill_digest + update_unit_skills_bulk).
+V26.14: Transferencia de miembros en lote (transfer_unit_members_bulk).
+V26.17: Hidratación de miembros con la proyección hot de personajes.
 """
 
 from typing import Optional, List, Dict, Any
@@ -52,30 +58,25 @@ def _hydrate_member_names(members: List[Dict[str, Any]]) -> None:
         try:
             # V16.0: Incluir stats_json para extraer habilidades
             # V17.1: También incluir rango para tooltips informativos
-            resp = db.table("characters").select("id, nombre, rango, stats_json").in_("id", char_ids).execute()
+            # V26.17: Proyección hot (columnas generadas) en lugar del stats_json completo
+            resp = db.table("characters")\
+                .select("id, nombre, rango, hot_atributos, hot_habilidades")\
+                .in_("id", char_ids)\
+                .execute()
             if resp.data:
                 for row in resp.data:
                     c_id = row["id"]
                     c_name = row.get("nombre", "Desconocido")
                     c_rango = row.get("rango", "")
                     
-                    # Extracción segura de stats (Defensive Coding)
-                    stats = row.get("stats_json")
-                    if not isinstance(stats, dict):
-                        stats = {}
-                    
-                    capacidades = stats.get("capacidades")
-                    if not isinstance(capacidades, dict):
-                        capacidades = {}
-
-                    # Copias explícitas para evitar referencias compartidas
-                    current_skills = capacidades.get("habilidades", {})
+                    # Copias explícitas para evitar referencias compartidas (Defensive Coding)
+                    current_skills = row.get("hot_habilidades")
                     if not isinstance(current_skills, dict):
                         current_skills = {}
                     else:
                         current_skills = current_skills.copy()
 
-                    current_attrs = capacidades.get("atributos", {})
+                    current_attrs = row.get("hot_atributos")
                     if not isinstance(current_attrs, dict):
                         current_attrs = {}
                     else:
@@ -605,6 +606,44 @@ def remove_unit_member(unit_id: int, slot_index: int) -> bool:
         return False
 
 
+def transfer_unit_members_bulk(layouts: Dict[int, List[Dict[str, Any]]]) -> List[int]:
+    """
+    V26.14: Reescribe en una sola RPC la plantilla de miembros de varias unidades.
+    La RPC es atómica y rechaza la operación si alguna unidad está en TRANSIT.
+    No recalcula habilidades: el llamador lo hace una vez por unidad afectada.
+
+    Args:
+        layouts: {unit_id: [{"entity_type", "entity_id", "slot_index", "is_leader"}, ...]}
+                 Plantilla final completa de cada unidad (lista vacía = unidad sin miembros).
+
+    Returns:
+        IDs de unidades reescritas (vacío si la operación falló).
+    """
+    if not layouts:
+        return []
+    rows = [
+        {
+            "unit_id": unit_id,
+            "entity_type": m.get("entity_type"),
+            "entity_id": m.get("entity_id"),
+            "slot_index": m.get("slot_index"),
+            "is_leader": bool(m.get("is_leader"))
+        }
+        for unit_id, members in layouts.items()
+        for m in members
+    ]
+    db = get_supabase()
+    try:
+        response = db.rpc("transfer_unit_members_bulk", {
+            "p_unit_ids": list(layouts.keys()),
+            "p_members": rows
+        }).execute()
+        return [row["unit_id"] for row in (response.data or [])]
+    except Exception as e:
+        print(f"Error transferring unit members in bulk: {e}")
+        return []
+
+
 # --- V16.0: FUNCIONES DE LIDERAZGO ---
 
 def set_unit_leader(unit_id: int, character_entity_id: int, player_id: int) -> bool:
@@ -762,6 +801,99 @@ def get_troops_in_transit_count(player_id: int) -> int:
         return 0
 
 
+# --- V26.6: CONSULTAS Y BORRADOS EN LOTE (SUPERVIVENCIA GLOBAL) ---
+
+def get_all_stationed_units() -> List[Dict[str, Any]]:
+    """
+    V26.6: Obtiene todas las unidades de la galaxia que NO están en tránsito
+    (columnas de ubicación únicamente, sin miembros). Una sola consulta.
+    """
+    db = get_supabase()
+    try:
+        response = db.table("units")\
+            .select("id, player_id, name, status, location_system_id, location_planet_id, location_sector_id")\
+            .neq("status", UnitStatus.TRANSIT.value)\
+            .execute()
+        return response.data if response.data else []
+    except Exception as e:
+        print(f"Error fetching stationed units: {e}")
+        return []
+
+
+def get_members_for_units(unit_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """V26.6: Miembros (sin hidratar) de muchas unidades, agrupados por unit_id."""
+    if not unit_ids:
+        return {}
+    db = get_supabase()
+    try:
+        response = db.table("unit_members")\
+            .select("unit_id, slot_index, entity_type, entity_id, is_leader")\
+            .in_("unit_id", unit_ids)\
+            .execute()
+        members_by_unit: Dict[int, List[Dict[str, Any]]] = {}
+        for m in (response.data or []):
+            members_by_unit.setdefault(m["unit_id"], []).append(m)
+        return members_by_unit
+    except Exception as e:
+        print(f"Error fetching members for units: {e}")
+        return {}
+
+
+def get_troop_levels(troop_ids: List[int]) -> Dict[int, int]:
+    """V26.6: Nivel de muchas tropas en una consulta {troop_id: level}."""
+    if not troop_ids:
+        return {}
+    db = get_supabase()
+    try:
+        response = db.table("troops").select("id, level").in_("id", troop_ids).execute()
+        return {row["id"]: row.get("level", 1) or 1 for row in (response.data or [])}
+    except Exception as e:
+        print(f"Error fetching troop levels: {e}")
+        return {}
+
+
+def get_character_attributes(character_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    V26.6: Atributos (stats_json.capacidades.atributos) de muchos personajes.
+    V26.17: Leídos desde la columna hot_atributos.
+    """
+    if not character_ids:
+        return {}
+    db = get_supabase()
+    try:
+        response = db.table("characters").select("id, hot_atributos").in_("id", character_ids).execute()
+        result = {}
+        for row in (response.data or []):
+            attrs = row.get("hot_atributos")
+            result[row["id"]] = attrs if isinstance(attrs, dict) else {}
+        return result
+    except Exception as e:
+        print(f"Error fetching character attributes: {e}")
+        return {}
+
+
+def delete_troops_bulk(troop_ids: List[int]) -> List[int]:
+    """
+    V26.6: Elimina muchas tropas y sus membresías en dos sentencias
+    (unit_members primero, luego troops). Solo entidades tipo 'troop'.
+    Returns: IDs de tropas eliminadas.
+    """
+    if not troop_ids:
+        return []
+    db = get_supabase()
+    try:
+        db.table("unit_members")\
+            .delete()\
+            .eq("entity_type", "troop")\
+            .in_("entity_id", troop_ids)\
+            .execute()
+        response = db.table("troops").delete().in_("id", troop_ids).execute()
+        return [row["id"] for row in (response.data or [])]
+    except Exception as e:
+        print(f"Error bulk deleting troops: {e}")
+        return []
+
+
 # --- V10.0: FUNCIONES DE TRÁNSITO Y MOVIMIENTO ---
 
 def start_unit_transit(
@@ -797,8 +929,8 @@ def start_unit_transit(
         # V13.0 Update: Se guarda transit_destination_ring para persistencia de maniobras estratificadas
         update_data = {
             "status": UnitStatus.TRANSIT.value,
+            "transit_start_tick": current_tick,  # V26.8
             "transit_end_tick": current_tick + ticks_required,
-            "transit_ticks_remaining": ticks_required,
             "transit_origin_system_id": origin_data.get("location_system_id"),
             "transit_destination_system_id": destination_data.get("system_id"),
             "transit_destination_ring": destination_data.get("ring", 0), # Added V13.0
@@ -852,6 +984,7 @@ def complete_unit_transit(unit_id: int, current_tick: int) -> bool:
             "location_planet_id": None,
             "location_sector_id": None,
             "ring": dest_ring,  # Updated from hardcoded 0 to dynamic dest_ring
+            "transit_start_tick": None,
             "transit_end_tick": None,
             "transit_ticks_remaining": 0,
             "transit_origin_system_id": None,
@@ -873,14 +1006,43 @@ def complete_unit_transit(unit_id: int, current_tick: int) -> bool:
         return False
 
 
+def complete_unit_transits_bulk(arrivals: List[Dict[str, Any]], current_tick: int) -> List[int]:
+    """
+    V26.7: Completa muchos tránsitos en una sola RPC (ubicación final, estado,
+    limpieza de datos de tránsito e historial unit_transits).
+
+    Args:
+        arrivals: [{"id", "status", "location_system_id", "location_planet_id",
+                    "location_sector_id", "ring"}, ...]
+
+    Returns:
+        IDs de unidades efectivamente completadas.
+    """
+    if not arrivals:
+        return []
+    db = get_supabase()
+    try:
+        response = db.rpc("complete_unit_transits_bulk", {
+            "p_arrivals": arrivals,
+            "p_tick": current_tick
+        }).execute()
+        return [row["unit_id"] for row in (response.data or [])]
+    except Exception as e:
+        print(f"Error completing transits in bulk: {e}")
+        return []
+
+
 def get_units_in_transit_arriving_at_tick(tick: int) -> List[Dict[str, Any]]:
-    """Obtiene unidades cuyo tránsito termina en el tick especificado."""
+    """
+    Obtiene unidades cuyo tránsito termina en el tick especificado.
+    V26.8: Incluye llegadas vencidas (transit_end_tick <= tick) por si se omitió un tick.
+    """
     db = get_supabase()
     try:
         response = db.table("units")\
             .select("*")\
             .eq("status", "TRANSIT")\
-            .eq("transit_end_tick", tick)\
+            .lte("transit_end_tick", tick)\
             .execute()
         return response.data if response.data else []
     except Exception as e:
@@ -984,18 +1146,24 @@ def cancel_unit_transit(unit_id: int, current_tick: int) -> bool:
     """
     Cancela el tránsito de una unidad (ej: por interdicción).
     La unidad permanece en la starlane pero ya no está en tránsito activo.
+    V26.8: Los ticks restantes se derivan de current_tick y quedan congelados
+    en transit_ticks_remaining (posición en la ruta al ser interceptada).
     """
     db = get_supabase()
     try:
         # Obtener datos actuales
-        unit = db.table("units").select("*").eq("id", unit_id).single().execute()
+        unit = db.table("units").select("transit_end_tick").eq("id", unit_id).single().execute()
         if not unit.data:
             return False
 
+        end_tick = unit.data.get("transit_end_tick")
+        ticks_left = max(0, end_tick - current_tick) if end_tick is not None else 0
+
         update_data = {
             "status": UnitStatus.SPACE.value,
+            "transit_start_tick": None,
             "transit_end_tick": None,
-            "transit_ticks_remaining": 0,
+            "transit_ticks_remaining": ticks_left,
             "movement_locked": True  # Bloqueado por interdicción
         }
 
@@ -1067,38 +1235,6 @@ def update_unit_moves(unit_id: int, moves_count: int) -> bool:
         return False
 
 
-def decrement_transit_ticks() -> int:
-    """
-    Decrementa transit_ticks_remaining en 1 para todas las unidades en tránsito.
-    Retorna número de unidades actualizadas.
-    """
-    db = get_supabase()
-    try:
-        # Supabase no soporta decrement directo, necesitamos obtener y actualizar
-        units = db.table("units")\
-            .select("id, transit_ticks_remaining")\
-            .eq("status", "TRANSIT")\
-            .gt("transit_ticks_remaining", 0)\
-            .execute()
-
-        if not units.data:
-            return 0
-
-        updated = 0
-        for unit in units.data:
-            new_ticks = unit["transit_ticks_remaining"] - 1
-            db.table("units")\
-                .update({"transit_ticks_remaining": new_ticks})\
-                .eq("id", unit["id"])\
-                .execute()
-            updated += 1
-
-        return updated
-    except Exception as e:
-        print(f"Error decrementing transit ticks: {e}")
-        return 0
-
-
 # --- V10.0: FUNCIONES AUXILIARES DE HISTORIAL ---
 
 def _log_transit_start(
@@ -1170,9 +1306,10 @@ def _log_transit_interdicted(unit_id: int, current_tick: int) -> None:
 
 # --- V17.0: FUNCIONES DE HABILIDADES COLECTIVAS ---
 
-def update_unit_skills(unit_id: int, skills: dict) -> bool:
+def update_unit_skills(unit_id: int, skills: dict, digest: Optional[str] = None) -> bool:
     """
     V17.0: Actualiza las habilidades colectivas de una unidad.
+    V26.12: Persiste opcionalmente la huella de composición (skill_digest).
 
     Args:
         unit_id: ID de la unidad
@@ -1182,6 +1319,7 @@ def update_unit_skills(unit_id: int, skills: dict) -> bool:
             - skill_exploracion
             - skill_sigilo
             - skill_evasion_sensores
+        digest: Huella de composición con la que se calcularon (opcional)
 
     Returns:
         True si la actualización fue exitosa, False en caso contrario.
@@ -1195,9 +1333,61 @@ def update_unit_skills(unit_id: int, skills: dict) -> bool:
             "skill_sigilo": skills.get("skill_sigilo", 0),
             "skill_evasion_sensores": skills.get("skill_evasion_sensores", 0)
         }
+        if digest is not None:
+            update_data["skill_digest"] = digest
 
         response = db.table("units").update(update_data).eq("id", unit_id).execute()
         return bool(response.data)
     except Exception as e:
         print(f"Error updating unit skills for unit {unit_id}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def get_units_skill_state() -> List[Dict[str, Any]]:
+    """
+    V26.12: Habilidades persistidas y huella de composición de las unidades.
+    V26.25: Solo unidades marcadas (skills_dirty) por cambios de miembros o de
+    habilidades de sus personajes (triggers de db_update_unit_skills_dirty_v26.sql).
+    """
+    db = get_supabase()
+    try:
+        response = db.table("units")\
+            .select("id, skill_digest, skills_version, skill_deteccion, skill_radares, skill_exploracion, "
+                    "skill_sigilo, skill_evasion_sensores")\
+            .eq("skills_dirty", True)\
+            .execute()
+        return response.data or []
+    except Exception as e:
+        print(f"Error fetching unit skill state: {e}")
+        return []
+
+
+def hydrate_unit_members(members: List[Dict[str, Any]]) -> None:
+    """
+    V26.12: Hidratación en lote (nombre y 'details') de miembros de muchas unidades:
+    una consulta de personajes y una de tropas. Modifica la lista in-place.
+    """
+    _hydrate_member_names(members)
+
+
+def update_unit_skills_bulk(rows: List[Dict[str, Any]]) -> int:
+    """
+    V26.12: Escribe habilidades (y skill_digest) de muchas unidades en una RPC.
+
+    Args:
+        rows: [{"id", "skill_deteccion", "skill_radares", "skill_exploracion",
+                "skill_sigilo", "skill_evasion_sensores", "skill_digest", "skills_version"}, ...]
+              V26.25: {"id", "skills_version"} solo confirma la versión (huella sin cambios).
+
+    Returns:
+        Cantidad de unidades actualizadas.
+    """
+    if not rows:
+        return 0
+    db = get_supabase()
+    try:
+        response = db.rpc("update_unit_skills_bulk", {"p_rows": rows}).execute()
+        return int(response.data or 0)
+    except Exception as e:
+        print(f"Error updating unit skills in bulk: {e}")
+        return 0
@@ -3,6 +3,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from data.database import get_supabase
 from data.log_repository import log_event
+from core.territory_engine import on_system_controller_changed
 
 
 def _get_db():
@@ -261,6 +262,41 @@ def get_system_by_id(system_id: int) -> Optional[Dict[str, Any]]:
         return None
 
 
+# V26.7: Índice de nombres de sistemas (los nombres no cambian durante la partida)
+_SYSTEM_NAME_INDEX: Dict[int, str] = {}
+
+
+def get_system_name_index(refresh: bool = False) -> Dict[int, str]:
+    """Índice {system_id: nombre} cacheado en memoria. Una consulta por carga."""
+    global _SYSTEM_NAME_INDEX
+    if _SYSTEM_NAME_INDEX and not refresh:
+        return _SYSTEM_NAME_INDEX
+    try:
+        response = _get_db().table("systems").select("id, name").execute()
+        _SYSTEM_NAME_INDEX = {s["id"]: s.get("name") for s in (response.data or [])}
+    except Exception as e:
+        log_event(f"Error cargando índice de sistemas: {e}", is_error=True)
+    return _SYSTEM_NAME_INDEX
+
+
+def get_system_names(system_ids: List[int]) -> Dict[int, str]:
+    """Nombres de sistemas desde el índice cacheado; recarga una vez si falta alguno."""
+    index = get_system_name_index()
+    if any(sid not in index for sid in system_ids):
+        index = get_system_name_index(refresh=True)
+    return {sid: index.get(sid) or f"Sistema {sid}" for sid in system_ids}
+
+
+def get_system_coordinates() -> List[Dict[str, Any]]:
+    """V26.9: Proyección ligera (id, name, x, y) de todos los sistemas para navegación."""
+    try:
+        response = _get_db().table("systems").select("id, name, x, y").execute()
+        return response.data if response and response.data else []
+    except Exception as e:
+        log_event(f"Error obteniendo coordenadas de sistemas: {e}", is_error=True)
+        return []
+
+
 def get_planets_by_system_id(system_id: int) -> List[Dict[str, Any]]:
     """Obtiene todos los planetas de un sistema."""
     try:
@@ -295,6 +331,8 @@ def update_system_controller(system_id: int, controller_id: Optional[int]) -> bo
         }).eq("id", system_id).execute()
 
         if response:
+            # V26.5: Mantener el mapa de control territorial del tick al día
+            on_system_controller_changed(system_id, controller_id)
             status = f"Jugador {controller_id}" if controller_id else "Neutral/Disputado"
             log_event(f"Control del Sistema {system_id} actualizado a: {status}", event_type="GALAXY_CONTROL")
             return True
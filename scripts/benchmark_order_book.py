@@ -0,0 +1,64 @@
+# scripts/benchmark_order_book.py
+"""
+Benchmark del Motor de Libro de Órdenes (V26.2).
+Genera un libro sintético de órdenes en reposo y mide el throughput de la
+subasta por lotes en memoria (sin base de datos).
+
+Uso: python scripts/benchmark_order_book.py [num_ordenes]
+"""
+import sys
+import os
+import random
+import time
+
+# Ajuste de path para encontrar módulos
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.market_engine import BASE_PRICES
+from core.order_book_engine import BookOrder, OrderBook, run_batch_auction, get_npc_quotes
+
+
+def build_synthetic_book(num_orders: int, seed: int = 42) -> OrderBook:
+    """Libro con precios dispersos ±30% alrededor del precio base de cada recurso."""
+    rng = random.Random(seed)
+    resources = list(BASE_PRICES.keys())
+    book = OrderBook()
+    for order_id in range(1, num_orders + 1):
+        resource = rng.choice(resources)
+        base = BASE_PRICES[resource]
+        is_buy = rng.random() < 0.5
+        price = max(1, int(base * rng.uniform(0.7, 1.3)))
+        book.add(resource, BookOrder(
+            order_id=order_id,
+            player_id=rng.randint(1, 500),
+            is_buy=is_buy,
+            price=price,
+            remaining=rng.randint(1, 200),
+            tick=rng.randint(1, 50),
+        ))
+    return book
+
+
+def run_benchmark(num_orders: int = 100_000):
+    print(f"📒 Benchmark Libro de Órdenes: {num_orders:,} órdenes en reposo")
+
+    t0 = time.perf_counter()
+    book = build_synthetic_book(num_orders)
+    t1 = time.perf_counter()
+    result = run_batch_auction(book, get_npc_quotes())
+    t2 = time.perf_counter()
+
+    matched_orders = len(result.touched)
+    auction_time = t2 - t1
+    print(f"   Construcción del libro: {t1 - t0:.3f}s")
+    print(f"   Subasta por lotes:      {auction_time:.3f}s")
+    print(f"   Operaciones casadas:    {len(result.fills):,} ({result.matched_volume:,} u.)")
+    print(f"   Órdenes con llenados:   {matched_orders:,}")
+    print(f"   Throughput:             {matched_orders / auction_time:,.0f} órdenes casadas/s")
+    for resource, price in sorted(result.clearing_prices.items()):
+        print(f"     - {resource}: cierre {price} Cr/u")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    run_benchmark(n)
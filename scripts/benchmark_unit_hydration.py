@@ -0,0 +1,100 @@
+# scripts/benchmark_unit_hydration.py
+"""
+Benchmark de Hidratación de Unidades (V26.13).
+Compara el costo de convertir filas de la DB en objetos de unidad:
+- UnitSchema.from_dict (validación Pydantic v2, núcleo nativo)
+- UnitSchema.model_construct (sin validación, construido desde Python; referencia)
+- UnitRecord.from_row (registro compacto con __slots__, miembros perezosos)
+- UnitRecord.from_row + acceso a miembros
+
+Uso: python scripts/benchmark_unit_hydration.py [num_unidades]
+"""
+import sys
+import os
+import copy
+import random
+import time
+
+# Ajuste de path para encontrar módulos
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.models import UnitSchema, UnitMemberSchema, UnitRecord, LocationRing, UnitStatus
+
+
+def build_synthetic_rows(num_units: int, seed: int = 42):
+    """Filas tal como las devuelve get_unit_by_id (4-8 miembros hidratados)."""
+    rng = random.Random(seed)
+    rows = []
+    for unit_id in range(1, num_units + 1):
+        members = []
+        for slot in range(rng.randint(4, 8)):
+            is_character = slot == 0 or rng.random() < 0.3
+            members.append({
+                "id": unit_id * 10 + slot,
+                "unit_id": unit_id,
+                "slot_index": slot,
+                "entity_type": "character" if is_character else "troop",
+                "entity_id": rng.randint(1, 50_000),
+                "name": f"Entidad {slot}",
+                "is_leader": slot == 0,
+                "details": {"habilidades": {"Detección": rng.randint(10, 80)}} if is_character else {},
+            })
+        rows.append({
+            "id": unit_id,
+            "player_id": rng.randint(1, 500),
+            "name": f"Unidad {unit_id}",
+            "status": rng.choice(["GROUND", "SPACE", "TRANSIT", "STEALTH_MODE"]),
+            "ship_count": rng.randint(1, 8),
+            "location_system_id": rng.randint(1, 300),
+            "location_planet_id": rng.randint(1, 2_000),
+            "location_sector_id": None,
+            "ring": rng.randint(0, 6),
+            "starlane_id": None,
+            "movement_locked": False,
+            "local_moves_count": rng.randint(0, 2),
+            "skill_deteccion": rng.randint(0, 80),
+            "skill_digest": None,
+            "created_at": "2026-01-01T00:00:00Z",
+            "members": members,
+        })
+    return rows
+
+
+def _time(label: str, fn, rows, num_units: int) -> float:
+    t0 = time.perf_counter()
+    for row in rows:
+        fn(row)
+    elapsed = time.perf_counter() - t0
+    per_10k = elapsed * 10_000 / num_units
+    print(f"   {label:<28} {elapsed:.3f}s  ({per_10k * 1000:.1f} ms / 10k unidades)")
+    return elapsed
+
+
+def _construct_unvalidated(row):
+    """Ruta 'confiable' clásica: model_construct de unidad y miembros."""
+    data = {k: v for k, v in row.items() if k != "members"}
+    data["ring"] = LocationRing(data["ring"])
+    data["status"] = UnitStatus(data["status"])
+    data["members"] = [UnitMemberSchema.model_construct(**m) for m in row["members"]]
+    return UnitSchema.model_construct(**data)
+
+
+def run_benchmark(num_units: int = 10_000):
+    print(f"🧬 Benchmark Hidratación de Unidades: {num_units:,} filas")
+    rows = build_synthetic_rows(num_units)
+    # from_dict muta 'ring' en la fila: se le entrega una copia propia
+    validated_rows = copy.deepcopy(rows)
+
+    baseline = _time("UnitSchema.from_dict", UnitSchema.from_dict, validated_rows, num_units)
+    construct = _time("UnitSchema.model_construct", _construct_unvalidated, rows, num_units)
+    record = _time("UnitRecord.from_row", UnitRecord.from_row, rows, num_units)
+    with_members = _time("UnitRecord + miembros", lambda r: UnitRecord.from_row(r).members, rows, num_units)
+
+    print(f"   Relación model_construct:   x{baseline / construct:.1f}")
+    print(f"   Relación UnitRecord:        x{baseline / record:.1f}")
+    print(f"   Relación UnitRecord+miemb.: x{baseline / with_members:.1f}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    run_benchmark(n)
@@ -0,0 +1,43 @@
+# scripts/seed_npcs.py
+"""
+Siembra de NPCs sin IA (V26.20).
+Genera N personajes con generate_fast_characters (RNG reproducible por semilla)
+y los inserta en lotes con create_characters_bulk. Son NPCs sin facción
+(player_id NULL, is_npc = true).
+
+Uso:
+    python scripts/seed_npcs.py [cantidad] [semilla] [system_id]
+    python scripts/seed_npcs.py 50000 42 --dry-run   # Solo generación, sin BD
+"""
+import sys
+import os
+import time
+
+# Ajuste de path para encontrar módulos
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.character_generation_service import generate_fast_characters, spawn_fast_characters_bulk
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    dry_run = "--dry-run" in sys.argv
+    count = int(args[0]) if len(args) > 0 else 1000
+    seed = int(args[1]) if len(args) > 1 else 42
+    system_id = int(args[2]) if len(args) > 2 else None
+    location = {"system_id": system_id, "nombre_asentamiento": "Población Local"} if system_id else None
+
+    print(f"🧬 SIEMBRA DE NPCs: {count} personajes (semilla {seed})")
+    start = time.perf_counter()
+
+    if dry_run:
+        characters = generate_fast_characters(count, location=location, seed=seed, is_npc=True)
+        print(f"   Generados {len(characters)} personajes en {time.perf_counter() - start:.2f}s (sin persistir)")
+        return
+
+    created = spawn_fast_characters_bulk(None, count, location=location, seed=seed, is_npc=True)
+    print(f"✅ Insertados {len(created)}/{count} NPCs en {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
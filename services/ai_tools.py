@@ -21,7 +21,8 @@ from core.mrg_engine import resolve_action
 from core.mrg_constants import DIFFICULTY_STANDARD
 from core.character_engine import get_visible_biography, get_visible_skills, get_visible_feats
 
-from services.image_service import generate_and_upload_tactical_image
+from services.image_service import submit_tactical_image_job
+from data.image_job_repository import IMAGE_JOB_DONE
 
 # --- HERRAMIENTAS DE CONOCIMIENTO Y GESTIÓN ---
 
@@ -203,14 +204,18 @@ def get_table_schema(table_name: str) -> str:
 def generate_tactical_visual(description: str, player_id: int) -> str:
     """
     Wrapper para generar una imagen táctica. Devuelve la URL formateada para que la UI la detecte.
+    V26.21: El render va a la cola asíncrona; si la misma imagen ya existe se devuelve al instante,
+    si no, el worker publica 'IMAGE_URL: ...' en el canal al terminar.
     """
     try:
         log_event(f"🎨 Generando visual: {description[:50]}...", player_id)
-        url = generate_and_upload_tactical_image(description, player_id)
-        if url:
+        job = submit_tactical_image_job(description, player_id)
+        if not job:
+            return "Error: El sistema de visualización no pudo renderizar la imagen solicitada."
+        if job.get("status") == IMAGE_JOB_DONE and job.get("public_url"):
             # Este prefijo es clave para que main_game_page.py lo detecte
-            return f"IMAGE_URL: {url}"
-        return "Error: El sistema de visualización no pudo renderizar la imagen solicitada."
+            return f"IMAGE_URL: {job['public_url']}"
+        return f"Render en cola (trabajo #{job['id']}). La imagen aparecerá en el canal al completarse."
     except Exception as e:
         return f"Error Generación Imagen: {str(e)}"
 
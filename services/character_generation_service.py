@@ -12,6 +12,9 @@ Actualizado V9.0: Soporte para coordenadas precisas (Hero Spawn) en RecruitmentC
 Refactorizado V10: Inyección de coordenadas SQL en diccionario de retorno y limpieza de JSON.
 Actualizado V10.2: Eliminado fallback automático a base en generación de pool (Candidatos nacen sin ubicación física).
 Actualizado V10.3: Implementado recruit_initial_crew_fast para generación masiva sin IA.
+Actualizado V26.19: Catálogo cacheado de planetas de nacimiento (selección ponderada en memoria).
+Actualizado V26.20: Generación masiva sin IA con RNG reproducible e inserción en lote.
+Actualizado V26.22: Identidad IA marcada como cacheable (utils/ai_cache.py).
 """
 
 import random
@@ -21,15 +24,16 @@ import traceback
 import time
 import uuid
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from google.genai import types
 
 from data.database import get_service_container, get_supabase
 from data.log_repository import log_event
-from data.character_repository import create_character
-from data.planet_repository import get_planet_by_id, get_player_base_coordinates
+from data.character_repository import create_character, create_characters_bulk, CHARACTER_INSERT_CHUNK_SIZE
+from data.planet_repository import get_planet_by_id, get_player_base_coordinates, get_habitable_planets
 from data.world_repository import get_world_state
 from utils.helpers import clean_json_string, try_repair_json
+from utils.ai_governor import AIGovernorError
 
 from core.constants import RACES, CLASSES, SKILL_MAPPING
 from core.world_constants import HABITABLE_BIRTH_BIOMES
@@ -58,6 +62,8 @@ from config.app_constants import TEXT_MODEL_NAME
 AGE_MIN = 16
 AGE_MAX = 70
 PREDOMINANT_RACE_CHANCE = 0.5
+BIRTH_PLANET_BASE_WEIGHT = 1.0
+BIRTH_PLANET_CATALOGUE_TTL_SECONDS = 600  # V26.25: Red de seguridad ante escrituras fuera de la app
 DEFAULT_RANK = "Iniciado"
 
 # Prompt actualizado para Gemini 2.0 Flash con refuerzo de seguridad JSON
@@ -140,29 +146,32 @@ def _get_top_skills(skills: Dict[str, int], count: int = 3) -> str:
     return ", ".join([f"{name} ({val})" for name, val in top])
 
 
-def _generate_base_attributes() -> Dict[str, int]:
+def _generate_base_attributes(rng: Optional[random.Random] = None) -> Dict[str, int]:
+    rng = rng or random
     return {
-        "fuerza": random.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
-        "agilidad": random.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
-        "tecnica": random.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
-        "intelecto": random.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
-        "voluntad": random.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
-        "presencia": random.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
+        "fuerza": rng.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
+        "agilidad": rng.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
+        "tecnica": rng.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
+        "intelecto": rng.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
+        "voluntad": rng.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
+        "presencia": rng.randint(BASE_ATTRIBUTE_MIN, BASE_ATTRIBUTE_MAX),
     }
 
 
-def _distribute_random_points(attributes: Dict[str, int], points: int, primary_attr: Optional[str] = None) -> None:
+def _distribute_random_points(attributes: Dict[str, int], points: int, primary_attr: Optional[str] = None, rng: Optional[random.Random] = None) -> None:
+    rng = rng or random
     attr_keys = list(attributes.keys())
     for _ in range(points):
-        if primary_attr and primary_attr in attributes and random.random() < 0.7:
+        if primary_attr and primary_attr in attributes and rng.random() < 0.7:
             target_attr = primary_attr
         else:
-            target_attr = random.choice(attr_keys)
+            target_attr = rng.choice(attr_keys)
         if attributes[target_attr] < MAX_ATTRIBUTE_VALUE:
             attributes[target_attr] += 1
 
 
-def _boost_skills(skills: Dict[str, int], points: int, primary_attr: Optional[str] = None) -> Dict[str, int]:
+def _boost_skills(skills: Dict[str, int], points: int, primary_attr: Optional[str] = None, rng: Optional[random.Random] = None) -> Dict[str, int]:
+    rng = rng or random
     skill_keys = list(skills.keys())
     boosted = skills.copy()
     linked_skills = []
@@ -171,10 +180,10 @@ def _boost_skills(skills: Dict[str, int], points: int, primary_attr: Optional[st
             if skill_name in boosted and (attr1 == primary_attr or attr2 == primary_attr):
                 linked_skills.append(skill_name)
     for _ in range(points):
-        if linked_skills and random.random() < 0.6:
-            skill = random.choice(linked_skills)
+        if linked_skills and rng.random() < 0.6:
+            skill = rng.choice(linked_skills)
         else:
-            skill = random.choice(skill_keys)
+            skill = rng.choice(skill_keys)
         boosted[skill] += 1
     return boosted
 
@@ -198,48 +207,87 @@ def _select_class(level: int, force_class: Optional[str] = None) -> tuple[str, D
     return class_name, class_data
 
 
-def _select_birth_planet(preferred_system_id: Optional[int] = None) -> tuple[str, str]:
+@dataclass
+class BirthPlanetCatalogue:
+    """
+    V26.19: Planetas habitables (HABITABLE_BIRTH_BIOMES) agrupados por sistema.
+    Se carga con una sola consulta y resuelve la selección ponderada en memoria.
+    Peso = población + BIRTH_PLANET_BASE_WEIGHT (los mundos vacíos siguen siendo posibles).
+    """
+    by_system: Dict[int, List[tuple[str, str]]] = field(default_factory=dict)
+    _system_weights: Dict[int, List[float]] = field(default_factory=dict, repr=False)
+    _planets: List[tuple[str, str]] = field(default_factory=list, repr=False)
+    _cum_weights: List[float] = field(default_factory=list, repr=False)
+
+    def add(self, name: str, biome: str, system_id: Optional[int], population: Optional[float]) -> None:
+        weight = max(float(population or 0), 0.0) + BIRTH_PLANET_BASE_WEIGHT
+        entry = (name, biome)
+        if system_id is not None:
+            self.by_system.setdefault(system_id, []).append(entry)
+            self._system_weights.setdefault(system_id, []).append(weight)
+        self._planets.append(entry)
+        self._cum_weights.append((self._cum_weights[-1] if self._cum_weights else 0.0) + weight)
+
+    def __len__(self) -> int:
+        return len(self._planets)
+
+    def pick(self, preferred_system_id: Optional[int] = None, rng: Optional[random.Random] = None) -> Optional[tuple[str, str]]:
+        """Planeta del sistema preferido si tiene habitables; si no, de toda la galaxia."""
+        rng = rng or random
+        if preferred_system_id in self.by_system:
+            return rng.choices(self.by_system[preferred_system_id], weights=self._system_weights[preferred_system_id])[0]
+        if self._planets:
+            return rng.choices(self._planets, cum_weights=self._cum_weights)[0]
+        return None
+
+
+_BIRTH_PLANET_CATALOGUE: Optional[BirthPlanetCatalogue] = None
+_BIRTH_PLANET_CATALOGUE_BUILT_AT = 0.0
+
+
+def build_birth_planet_catalogue() -> BirthPlanetCatalogue:
+    catalogue = BirthPlanetCatalogue()
+    for p in get_habitable_planets(HABITABLE_BIRTH_BIOMES):
+        if p.get("name") and p.get("biome"):
+            catalogue.add(p["name"], p["biome"], p.get("system_id"), p.get("population"))
+    return catalogue
+
+
+def get_birth_planet_catalogue(refresh: bool = False) -> BirthPlanetCatalogue:
+    """
+    Catálogo compartido. Un catálogo vacío (fallo de lectura) no se memoriza.
+    V26.25: Caduca tras BIRTH_PLANET_CATALOGUE_TTL_SECONDS.
+    """
+    global _BIRTH_PLANET_CATALOGUE, _BIRTH_PLANET_CATALOGUE_BUILT_AT
+    expired = time.monotonic() - _BIRTH_PLANET_CATALOGUE_BUILT_AT > BIRTH_PLANET_CATALOGUE_TTL_SECONDS
+    if _BIRTH_PLANET_CATALOGUE is None or refresh or expired:
+        catalogue = build_birth_planet_catalogue()
+        _BIRTH_PLANET_CATALOGUE = catalogue if len(catalogue) else None
+        _BIRTH_PLANET_CATALOGUE_BUILT_AT = time.monotonic()
+        return catalogue
+    return _BIRTH_PLANET_CATALOGUE
+
+
+def invalidate_birth_planet_catalogue() -> None:
+    """
+    Descarta el catálogo (regeneración de galaxia, renombrado de planetas).
+    V26.25: También tras colonizaciones y cambios de soberanía (ver on_planet_sovereignty_changed),
+    porque el peso depende de planets.population.
+    """
+    global _BIRTH_PLANET_CATALOGUE
+    _BIRTH_PLANET_CATALOGUE = None
+
+
+def _select_birth_planet(preferred_system_id: Optional[int] = None, rng: Optional[random.Random] = None) -> tuple[str, str]:
     """
     Selecciona un planeta de origen que cumpla con las condiciones de habitabilidad.
-    Utiliza el cliente Supabase para consultas seguras.
+    V26.19: Selección ponderada en memoria sobre el catálogo cacheado (sin consultas por personaje).
     """
-    db = get_supabase()
-    
-    # 1. Intentar encontrar planeta habitable en el sistema actual
-    if preferred_system_id:
-        try:
-            response = db.table("planets")\
-                .select("name, biome")\
-                .eq("system_id", preferred_system_id)\
-                .in_("biome", HABITABLE_BIRTH_BIOMES)\
-                .limit(20)\
-                .execute()
-            
-            candidates = response.data
-            if candidates:
-                choice = random.choice(candidates)
-                return choice["name"], choice["biome"]
-        except Exception as e:
-            # Fallback silencioso si falla la consulta local
-            pass
-    
-    # 2. Fallback: Cualquier planeta habitable de la galaxia (Sample random)
-    try:
-        response = db.table("planets")\
-            .select("name, biome")\
-            .in_("biome", HABITABLE_BIRTH_BIOMES)\
-            .limit(50)\
-            .execute()
-        
-        candidates = response.data
-        if candidates:
-            choice = random.choice(candidates)
-            return choice["name"], choice["biome"]
-            
-    except Exception as e:
-        log_event(f"Error seleccionando planeta de origen (Fallback): {e}", is_error=True)
+    choice = get_birth_planet_catalogue().pick(preferred_system_id, rng)
+    if choice:
+        return choice
 
-    # 3. Fallback Último Recurso
+    # Fallback Último Recurso
     return "Estación Espacial Nómada", "Artificial"
 
 
@@ -256,7 +304,7 @@ def _calculate_recruitment_cost(stats_json: Dict[str, Any]) -> int:
         return 100
 
 
-def _generate_fallback_identity(race: str, sex: BiologicalSex) -> GeneratedIdentity:
+def _generate_fallback_identity(race: str, sex: BiologicalSex, rng: Optional[random.Random] = None) -> GeneratedIdentity:
     """Genera identidades con las 3 capas si la IA falla. ADN Visual incluido."""
     names_by_race = {
         "Humano": {
@@ -285,8 +333,9 @@ def _generate_fallback_identity(race: str, sex: BiologicalSex) -> GeneratedIdent
     race_names = names_by_race.get(race, names_by_race["Humano"])
     sex_names = race_names.get(sex, race_names[BiologicalSex.MALE])
     
-    name = random.choice(sex_names)
-    surname = random.choice(surnames)
+    rng = rng or random
+    name = rng.choice(sex_names)
+    surname = rng.choice(surnames)
 
     return GeneratedIdentity(
         nombre=name,
@@ -363,6 +412,8 @@ def generate_identity_with_ai_sync(
     for attempt in range(max_retries):
         try:
             log_event(f"AI_DEBUG: Llamando a Gemini (Intento {attempt+1})...")
+            # V26.25: Sin caché. Es una generación creativa (temperature 0.85) y los
+            # reintentos deben pedir una respuesta nueva, no repetir un JSON inválido.
             response = ai_client.models.generate_content(
                 model=TEXT_MODEL_NAME,
                 contents=prompt,
@@ -386,6 +437,10 @@ def generate_identity_with_ai_sync(
                 else:
                     log_event(f"AI_ERROR: Fallo crítico de parseo/reparación (Intento {attempt+1}). Raw: {response.text[:100]}...", is_error=True)
                     continue
+        except AIGovernorError as e:
+            # V26.23: Circuito abierto o sin turno: el gobernador ya aplicó backoff, fallback directo
+            log_event(f"AI_WARNING: {e}", is_error=True)
+            break
         except Exception as e:
             log_event(f"AI_CRITICAL: Error en generate_content: {str(e)}", is_error=True)
             time.sleep(1)
@@ -704,17 +759,199 @@ def generate_character_pool(
 # RECLUTAMIENTO RÁPIDO (NO-AI)
 # =============================================================================
 
-def recruit_initial_crew_fast(player_id: int, count: int = 7) -> List[Dict[str, Any]]:
+def _unique_fast_name(identity: GeneratedIdentity, existing_names: set, rng: random.Random) -> str:
+    """Resolución de nombres duplicados: sufijo corto y, si persiste, sufijo hex del RNG."""
+    full_name = f"{identity.nombre} {identity.apellido}"
+    if full_name in existing_names:
+        identity.apellido += f"-{rng.randint(10, 99)}"
+        full_name = f"{identity.nombre} {identity.apellido}"
+    while full_name in existing_names:
+        identity.apellido += f"{rng.getrandbits(16):04X}"
+        full_name = f"{identity.nombre} {identity.apellido}"
+    existing_names.add(full_name)
+    return full_name
+
+
+def generate_fast_characters(
+    count: int,
+    location: Optional[Dict[str, Any]] = None,
+    level: int = 1,
+    predominant_race: Optional[str] = None,
+    knowledge_level: KnowledgeLevel = KnowledgeLevel.FRIEND,
+    is_npc: bool = False,
+    existing_names: Optional[List[str]] = None,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None
+) -> List[Dict[str, Any]]:
+    """
+    V26.20: Genera N personajes completos sin IA y sin tocar la BD.
+    Raza, clase, sexo y edad se sortean en bloque (Random.choices(k=N)); atributos,
+    habilidades e identidad con los mismos helpers que el reclutamiento normal.
+    Con la misma semilla produce exactamente los mismos personajes.
+
+    Args:
+        location: {"system_id", "planet_id", "sector_id", "nombre_asentamiento"} o None.
+        seed / rng: RNG reproducible (rng tiene prioridad sobre seed).
+
+    Returns:
+        Lista de character_data lista para create_characters_bulk.
+    """
+    if count <= 0:
+        return []
+    rng = rng or random.Random(seed)
+    location = location or {}
+
+    location_system_id = location.get("system_id")
+    location_planet_id = location.get("planet_id")
+    location_sector_id = location.get("sector_id")
+    location_name = location.get("nombre_asentamiento", "Base Principal")
+    system_name = f"Sistema {location_system_id}" if location_system_id else "Desconocido"
+
+    # 1. Sorteos en bloque
+    race_names = list(RACES.keys())
+    races = rng.choices(race_names, k=count)
+    if predominant_race in RACES:
+        races = [
+            predominant_race if roll < PREDOMINANT_RACE_CHANCE else race
+            for race, roll in zip(races, (rng.random() for _ in range(count)))
+        ]
+    if level < 3:
+        classes = [_select_class(level)] * count
+    else:
+        classes = rng.choices(list(CLASSES.items()), k=count)
+    sexes = rng.choices([BiologicalSex.MALE, BiologicalSex.FEMALE], k=count)
+    ages = rng.choices(range(AGE_MIN, AGE_MAX + 1), k=count)
+
+    xp = get_xp_for_level(level) if level > 1 else 0
+    extra_attr_points = sum(1 for lvl in ATTRIBUTE_POINT_LEVELS if lvl <= level)
+    skill_points = level * SKILL_POINTS_PER_LEVEL
+    names_seen = set(existing_names or [])
+    characters = []
+
+    for race_name, (class_name, class_data), sex, age in zip(races, classes, sexes, ages):
+        race_data = RACES[race_name]
+        primary_attr = class_data.get("bonus_attr")
+
+        # 2. Generar Stats
+        attributes = _generate_base_attributes(rng)
+
+        # Bonus Raza
+        for attr, bonus in race_data.get("bonus", {}).items():
+            if attr in attributes: attributes[attr] = min(attributes[attr] + bonus, MAX_ATTRIBUTE_VALUE)
+
+        # Bonus Clase
+        if class_name != "Novato" and primary_attr and primary_attr in attributes:
+            attributes[primary_attr] = min(attributes[primary_attr] + 1, MAX_ATTRIBUTE_VALUE)
+
+        _distribute_random_points(attributes, extra_attr_points, primary_attr, rng)
+
+        skills = calculate_skills(attributes)
+        skills = _boost_skills(skills, skill_points, primary_attr, rng)
+
+        # 3. Identidad Fallback (Sin IA)
+        identity = _generate_fallback_identity(race_name, sex, rng)
+        full_name = _unique_fast_name(identity, names_seen, rng)
+
+        # 4. Construcción JSON Manual
+        birth_planet, birth_biome = _select_birth_planet(location_system_id, rng)
+
+        stats_json = {
+            "bio": {
+                "nombre": identity.nombre,
+                "apellido": identity.apellido,
+                "edad": age,
+                "sexo": sex.value,
+                "biografia_corta": "Recluta de asignación rápida.",
+                "bio_conocida": f"Personal operativo reclutado mediante protocolo de emergencia en {location_name}.",
+                "bio_profunda": "Expediente clasificado por reclutamiento rápido.",
+                "apariencia_visual": identity.apariencia_visual,
+                "origen": {"planeta": birth_planet, "bioma": birth_biome},
+                "nivel_acceso": BIO_ACCESS_UNKNOWN
+            },
+            "taxonomia": {
+                "raza": race_name,
+                "transformaciones": []
+            },
+            "progresion": {
+                "nivel": level,
+                "clase": class_name,
+                "xp": xp,
+                "rango": "Soldado" # Rango inicial por defecto para tropa
+            },
+            "capacidades": {
+                "atributos": attributes,
+                "habilidades": skills,
+                "feats": []
+            },
+            "comportamiento": {
+                "rasgos_personalidad": ["Disciplinado", "Leal"],
+                "relaciones": []
+            },
+            "logistica": {
+                "equipo": [],
+                "slots_ocupados": 0,
+                "slots_maximos": 10
+            },
+            "estado": {
+                "estados_activos": ["Disponible"],
+                "sistema_actual": system_name,
+                "ubicacion_local": location_name,
+                "rol_asignado": CharacterRole.NONE.value,
+                "accion_actual": "Reportándose al servicio",
+                # INYECCIÓN PARA EXTRACTOR SQL
+                "ubicacion": {
+                    "system_id": location_system_id,
+                    "planet_id": location_planet_id,
+                    "sector_id": location_sector_id,
+                    "ubicacion_local": location_name
+                }
+            }
+        }
+
+        characters.append({
+            "nombre": full_name,
+            "costo": _calculate_recruitment_cost(stats_json), # Fuera de stats_json (no se persiste)
+            "rango": "Soldado",
+            "estado": "Disponible",
+            "ubicacion": location_name,
+            "es_comandante": False,
+            "location_system_id": location_system_id,
+            "location_planet_id": location_planet_id,
+            "location_sector_id": location_sector_id,
+            "initial_knowledge_level": knowledge_level,
+            "is_npc": is_npc,
+            "stats_json": stats_json
+        })
+
+    return characters
+
+
+def spawn_fast_characters_bulk(
+    player_id: Optional[int],
+    count: int,
+    location: Optional[Dict[str, Any]] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = CHARACTER_INSERT_CHUNK_SIZE,
+    **generation_kwargs
+) -> List[Dict[str, Any]]:
+    """
+    V26.20: Genera y persiste N personajes sin IA (generate_fast_characters +
+    create_characters_bulk). Punto de entrada común para el inicio de partida
+    y los scripts de siembra de NPCs (player_id None + is_npc=True).
+    """
+    characters = generate_fast_characters(count, location=location, seed=seed, **generation_kwargs)
+    return create_characters_bulk(player_id, characters, chunk_size=chunk_size)
+
+
+def recruit_initial_crew_fast(player_id: int, count: int = 7, seed: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Genera 7 personajes de Nivel 1 de forma instantánea sin usar IA.
     Utiliza _generate_fallback_identity para velocidad máxima.
     Ideal para start-game o testing.
+    V26.20: Generación en bloque e inserción en lote (spawn_fast_characters_bulk).
     """
     log_event(f"🚀 Iniciando Reclutamiento Rápido ({count} unidades) para Jugador {player_id}", player_id)
-    
-    created_units = []
-    existing_names: List[str] = []
-    
+
     # Obtener coordenadas de base para spawn
     base_coords = {}
     try:
@@ -722,137 +959,14 @@ def recruit_initial_crew_fast(player_id: int, count: int = 7) -> List[Dict[str,
     except Exception:
         log_event("Advertencia: No se pudieron obtener coordenadas base para reclutamiento rápido.", player_id)
 
-    location_system_id = base_coords.get("system_id")
-    location_planet_id = base_coords.get("planet_id")
-    location_sector_id = base_coords.get("sector_id")
-    location_name = base_coords.get("nombre_asentamiento", "Base Principal")
-    system_name = f"Sistema {location_system_id}" if location_system_id else "Desconocido"
-    
-    context = RecruitmentContext(
-        player_id=player_id,
-        location_planet_id=location_planet_id
-    )
+    created_units = []
+    try:
+        created_units = spawn_fast_characters_bulk(
+            player_id, count, location=base_coords, seed=seed,
+            knowledge_level=KnowledgeLevel.FRIEND # Es tripulación propia
+        )
+    except Exception as e:
+        log_event(f"Error generando unidades rápidas: {e}", player_id, is_error=True)
 
-    for i in range(count):
-        try:
-            # 1. Selección básica
-            level = 1
-            xp = 0
-            race_name, race_data = _select_race(context)
-            
-            # Forzar variedad de clases (o aleatorio)
-            class_name, class_data = _select_class(1)
-            
-            primary_attr = class_data.get("bonus_attr")
-            age = random.randint(AGE_MIN, AGE_MAX)
-            sex = random.choice([BiologicalSex.MALE, BiologicalSex.FEMALE])
-            
-            # 2. Generar Stats
-            attributes = _generate_base_attributes()
-            
-            # Bonus Raza
-            for attr, bonus in race_data.get("bonus", {}).items():
-                if attr in attributes: attributes[attr] = min(attributes[attr] + bonus, MAX_ATTRIBUTE_VALUE)
-            
-            # Bonus Clase
-            if class_name != "Novato" and primary_attr and primary_attr in attributes:
-                attributes[primary_attr] = min(attributes[primary_attr] + 1, MAX_ATTRIBUTE_VALUE)
-            
-            # Distribuir puntos extra de nivel 1
-            extra_attr_points = sum(1 for lvl in ATTRIBUTE_POINT_LEVELS if lvl <= level)
-            _distribute_random_points(attributes, extra_attr_points, primary_attr)
-            
-            skills = calculate_skills(attributes)
-            skill_points = level * SKILL_POINTS_PER_LEVEL
-            skills = _boost_skills(skills, skill_points, primary_attr)
-            
-            # 3. Identidad Fallback (Sin IA)
-            identity = _generate_fallback_identity(race_name, sex)
-            
-            # Resolución de nombres duplicados simple
-            full_name = f"{identity.nombre} {identity.apellido}"
-            if full_name in existing_names:
-                identity.apellido += f"-{random.randint(10,99)}"
-                full_name = f"{identity.nombre} {identity.apellido}"
-            
-            existing_names.append(full_name)
-            
-            # 4. Construcción JSON Manual
-            birth_planet, birth_biome = _select_birth_planet(location_system_id)
-            
-            stats_json = {
-                "bio": {
-                    "nombre": identity.nombre,
-                    "apellido": identity.apellido,
-                    "edad": age,
-                    "sexo": sex.value,
-                    "biografia_corta": "Recluta de asignación rápida.",
-                    "bio_conocida": f"Personal operativo reclutado mediante protocolo de emergencia en {location_name}.",
-                    "bio_profunda": "Expediente clasificado por reclutamiento rápido.",
-                    "apariencia_visual": identity.apariencia_visual,
-                    "origen": {"planeta": birth_planet, "bioma": birth_biome},
-                    "nivel_acceso": BIO_ACCESS_UNKNOWN
-                },
-                "taxonomia": {
-                    "raza": race_name,
-                    "transformaciones": []
-                },
-                "progresion": {
-                    "nivel": level,
-                    "clase": class_name,
-                    "xp": 0,
-                    "rango": "Soldado" # Rango inicial por defecto para tropa
-                },
-                "capacidades": {
-                    "atributos": attributes,
-                    "habilidades": skills,
-                    "feats": []
-                },
-                "comportamiento": {
-                    "rasgos_personalidad": ["Disciplinado", "Leal"],
-                    "relaciones": []
-                },
-                "logistica": {
-                    "equipo": [],
-                    "slots_ocupados": 0,
-                    "slots_maximos": 10
-                },
-                "estado": {
-                    "estados_activos": ["Disponible"],
-                    "sistema_actual": system_name,
-                    "ubicacion_local": location_name,
-                    "rol_asignado": CharacterRole.NONE.value,
-                    "accion_actual": "Reportándose al servicio",
-                    # INYECCIÓN PARA EXTRACTOR SQL
-                    "ubicacion": { 
-                        "system_id": location_system_id,
-                        "planet_id": location_planet_id,
-                        "sector_id": location_sector_id,
-                        "ubicacion_local": location_name
-                    }
-                }
-            }
-            
-            character_data = {
-                "nombre": full_name,
-                "rango": "Soldado",
-                "estado": "Disponible",
-                "ubicacion": location_name,
-                "es_comandante": False,
-                "location_system_id": location_system_id,
-                "location_planet_id": location_planet_id,
-                "location_sector_id": location_sector_id,
-                "initial_knowledge_level": KnowledgeLevel.FRIEND, # Es tripulación propia
-                "stats_json": stats_json
-            }
-            
-            result = create_character(player_id, character_data)
-            if result:
-                created_units.append(result)
-                
-        except Exception as e:
-            log_event(f"Error generando unidad rápida {i}: {e}", player_id, is_error=True)
-            continue
-            
     log_event(f"✅ Reclutamiento Rápido finalizado. {len(created_units)} unidades desplegadas.", player_id)
-    return created_units
\ No newline at end of file
+    return created_units
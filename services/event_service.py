@@ -7,6 +7,7 @@ Genera eventos narrativos globales y procesa eventos de personajes.
 from typing import List
 from google.genai import types
 from data.database import ai_client
+from utils.ai_governor import AIGovernorError, is_ai_circuit_open
 from data.log_repository import log_event
 from data.character_repository import get_all_player_characters, update_character_stats
 from config.app_constants import TEXT_MODEL_NAME
@@ -37,7 +38,8 @@ def generate_tick_event(tick_number: int) -> str:
     Genera un evento narrativo aleatorio para el Tick actual usando la IA.
     Registra el evento en los logs globales.
     """
-    if not ai_client:
+    # V26.23: Con el circuito de IA abierto se usa directamente el texto estático
+    if not ai_client or is_ai_circuit_open():
         return "Sistemas de comunicación estática. Sin noticias."
 
     try:
@@ -64,6 +66,8 @@ def generate_tick_event(tick_number: int) -> str:
         
         return event_text
 
+    except AIGovernorError:
+        return "Sistemas de comunicación estática. Sin noticias."
     except Exception as e:
         error_msg = f"Error generando evento narrativo: {str(e)}"
         log_event(error_msg, is_error=True)
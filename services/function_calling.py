@@ -0,0 +1,112 @@
+# services/function_calling.py
+"""
+Bucle de Function Calling del Asistente Táctico (V26.24).
+- Atiende TODAS las function_call de un turno del modelo (antes solo la primera).
+- Las herramientas de solo lectura se ejecutan en paralelo en un ThreadPoolExecutor;
+  las que modifican estado se ejecutan en orden en el hilo llamador.
+- Todas las function_response del turno vuelven al modelo en un único send_message.
+
+El ejecutor de herramientas (ai_tools.execute_tool) se inyecta desde gemini_service,
+así este módulo no depende de credenciales ni de la base de datos.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from google.genai import types
+
+from config.app_constants import AI_TOOL_MAX_WORKERS
+
+# execute(tool_name, tool_args) -> str
+ToolExecutor = Callable[[str, Dict[str, Any]], str]
+
+
+def extract_function_calls(response: Any) -> List[Tuple[str, Dict[str, Any]]]:
+    """(nombre, args) de cada function_call del primer candidato, en orden."""
+    if not response or not response.candidates:
+        return []
+    candidate = response.candidates[0]
+    if not candidate.content or not candidate.content.parts:
+        return []
+
+    calls = []
+    for part in candidate.content.parts:
+        fc = getattr(part, 'function_call', None)
+        if not fc:
+            continue
+        calls.append((fc.name, dict(fc.args) if fc.args else {}))
+    return calls
+
+
+def _safe_execute(execute: ToolExecutor, name: str, args: Dict[str, Any]) -> str:
+    try:
+        return execute(name, args)
+    except Exception as e:
+        return f"Error ejecutando {name}: {str(e)}"
+
+
+def execute_function_calls(
+    calls: List[Tuple[str, Dict[str, Any]]],
+    execute: ToolExecutor,
+    parallel_safe: Iterable[str] = (),
+    max_workers: int = AI_TOOL_MAX_WORKERS
+) -> List[str]:
+    """
+    Ejecuta las llamadas de un turno y devuelve los resultados en el mismo orden.
+    Solo las herramientas de 'parallel_safe' (sin efectos) van al pool.
+    """
+    parallel_safe = set(parallel_safe)
+    results: List[Optional[str]] = [None] * len(calls)
+    parallel = [i for i, (name, _) in enumerate(calls) if name in parallel_safe]
+
+    if len(parallel) < 2 or max_workers < 2:
+        for i, (name, args) in enumerate(calls):
+            results[i] = _safe_execute(execute, name, args)
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(parallel)), thread_name_prefix="ai-tool") as pool:
+        futures = {i: pool.submit(_safe_execute, execute, *calls[i]) for i in parallel}
+        # Las herramientas con efectos corren en orden mientras el pool atiende las consultas
+        for i, (name, args) in enumerate(calls):
+            if i not in futures:
+                results[i] = _safe_execute(execute, name, args)
+        for i, future in futures.items():
+            results[i] = future.result()
+    return results
+
+
+def run_function_calls(
+    chat: Any,
+    response: Any,
+    execute: ToolExecutor,
+    max_iterations: int,
+    parallel_safe: Iterable[str] = (),
+    max_workers: int = AI_TOOL_MAX_WORKERS
+) -> Tuple[Any, List[Dict[str, Any]]]:
+    """
+    Bucle iterativo: mientras el modelo pida herramientas, ejecuta todas las del turno
+    y responde con un único send_message. Devuelve (respuesta_final, llamadas_realizadas).
+    """
+    function_calls_made: List[Dict[str, Any]] = []
+    current_response = response
+
+    for iteration in range(max_iterations):
+        calls = extract_function_calls(current_response)
+        if not calls:
+            break
+
+        for name, args in calls:
+            function_calls_made.append({
+                "function": name,
+                "args": args,
+                "iteration": iteration + 1
+            })
+
+        results = execute_function_calls(calls, execute, parallel_safe, max_workers)
+
+        current_response = chat.send_message([
+            types.Part.from_function_response(name=name, response={"result": result})
+            for (name, _), result in zip(calls, results)
+        ])
+
+    return current_response, function_calls_made
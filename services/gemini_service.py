@@ -10,6 +10,7 @@ Características:
 - Manejo robusto de Function Calling
 - Detección inteligente de habilidades (Business Intelligence)
 - V2.2: Delegación inteligente de operaciones de exploración (evita doble MRG).
+- V26.22: Caché de consultas informativas (utils/ai_cache.py) con métricas en check_ai_status.
 """
 
 import json
@@ -32,7 +33,10 @@ from core.mrg_engine import resolve_action, ResultType
 from core.mrg_constants import DIFFICULTY_STANDARD, DIFFICULTY_ROUTINE, get_difficulty_label
 
 from services.ai_tools import TOOL_DECLARATIONS, execute_tool
-from config.app_constants import TEXT_MODEL_NAME
+from services.function_calling import run_function_calls
+from config.app_constants import TEXT_MODEL_NAME, AI_QUERY_CACHE_TTL_SECONDS
+from utils.ai_cache import make_cache_key, get_ai_response_cache, get_ai_cache_metrics
+from utils.ai_governor import get_ai_governor_metrics
 
 
 # --- CONSTANTES DE CONFIGURACIÓN ---
@@ -50,6 +54,10 @@ QUERY_KEYWORDS = [
     "explicar", "mostrar"
 ]
 
+# V26.22: Herramientas de solo lectura; una respuesta que solo usó estas es cacheable
+# V26.24: Son también las que se ejecutan en paralelo dentro de un mismo turno
+CACHEABLE_QUERY_TOOLS = {"get_filtered_roster", "get_table_schema", "execute_sql_query"}
+
 # Palabras clave que indican operación de exploración (Delegada a Tool, sin MRG de comandante)
 EXPLORATION_KEYWORDS = [
     "explorar", "exploracion", "cartografiar", "escanear sector",
@@ -300,6 +308,25 @@ def _is_informational_query(action_text: str) -> bool:
     return any(text_lower.startswith(keyword) for keyword in QUERY_KEYWORDS)
 
 
+def _query_cache_key(system_prompt: str, user_message: str, world_state: Dict[str, Any]) -> str:
+    """
+    Clave exacta de una consulta informativa (V26.22).
+    El contexto táctico va dentro de user_message; el estado de herramientas
+    (tick actual + herramientas declaradas) invalida la entrada al cambiar el mundo.
+    """
+    tool_state = "tick:{}|tools:{}".format(
+        world_state.get("current_tick"),
+        ",".join(sorted(d.name for d in TOOL_DECLARATIONS))
+    )
+    return make_cache_key(
+        TEXT_MODEL_NAME,
+        user_message,
+        config={"temperature": AI_TEMPERATURE, "max_output_tokens": AI_MAX_TOKENS, "top_p": AI_TOP_P},
+        system_prompt=system_prompt,
+        scope=tool_state
+    )
+
+
 def _calculate_dynamic_merit(commander_data: Dict, action_text: str) -> Tuple[int, str]:
     """
     Business Intelligence: Detecta la habilidad más relevante en el texto de la acción.
@@ -383,57 +410,16 @@ def _process_function_calls(
 ) -> tuple[Any, List[Dict[str, Any]]]:
     """
     Procesa las llamadas a funciones del modelo de forma iterativa.
+    V26.24: Todas las function_call de un turno en un único round-trip; las consultas
+    de solo lectura se ejecutan en paralelo (ver services/function_calling.py).
     """
-    function_calls_made: List[Dict[str, Any]] = []
-    current_response = response
-
-    for iteration in range(max_iterations):
-        # Verificar si hay candidatos válidos
-        if not current_response.candidates:
-            break
-
-        candidate = current_response.candidates[0]
-        if not candidate.content or not candidate.content.parts:
-            break
-
-        # Buscar function calls en las partes
-        function_call_found = False
-
-        for part in candidate.content.parts:
-            if not hasattr(part, 'function_call') or not part.function_call:
-                continue
-
-            function_call_found = True
-            fc = part.function_call
-            fname = fc.name
-            fargs = dict(fc.args) if fc.args else {}
-
-            # Registrar la llamada
-            function_calls_made.append({
-                "function": fname,
-                "args": fargs,
-                "iteration": iteration + 1
-            })
-
-            # Ejecutar la herramienta
-            result_str = execute_tool(fname, fargs)
-
-            # Enviar respuesta de la función al chat
-            current_response = chat.send_message([
-                types.Part.from_function_response(
-                    name=fname,
-                    response={"result": result_str}
-                )
-            ])
-
-            # Solo procesar una función por iteración
-            break
-
-        # Si no hubo function call, terminar el loop
-        if not function_call_found:
-            break
-
-    return current_response, function_calls_made
+    return run_function_calls(
+        chat,
+        response,
+        execute_tool,
+        max_iterations,
+        parallel_safe=CACHEABLE_QUERY_TOOLS
+    )
 
 
 def _extract_narrative(response: Any) -> str:
@@ -585,6 +571,19 @@ Usa este resultado para narrar el éxito o fracaso de la acción.
 {mrg_info_block}
 """
 
+    # 5b. V26.22: Consultas informativas cacheables (clave exacta + estado de herramientas)
+    query_cache_key = None
+    if is_informational and not is_internal_action:
+        query_cache_key = _query_cache_key(system_prompt, user_message, world_state)
+        cached = get_ai_response_cache().get(query_cache_key)
+        if cached:
+            log_event(f"🤖 [ASISTENTE] {cached['narrative']}", player_id)
+            return {
+                "narrative": cached["narrative"],
+                "mrg_result": mrg_result,
+                "function_calls_made": cached.get("function_calls_made", [])
+            }
+
     try:
         # 6. Iniciar Chat con Gemini
         
@@ -624,6 +623,13 @@ Usa este resultado para narrar el éxito o fracaso de la acción.
         # 9. Persistir en Logs
         log_event(f"🤖 [ASISTENTE] {narrative}", player_id)
 
+        if query_cache_key and all(c["function"] in CACHEABLE_QUERY_TOOLS for c in function_calls_made):
+            get_ai_response_cache().put(
+                query_cache_key,
+                {"narrative": narrative, "function_calls_made": function_calls_made},
+                ttl=AI_QUERY_CACHE_TTL_SECONDS
+            )
+
         return {
             "narrative": narrative,
             "mrg_result": mrg_result,
@@ -650,5 +656,7 @@ def check_ai_status() -> Dict[str, Any]:
     container = get_service_container()
     return {
         "available": container.is_ai_available(),
+        "cache": get_ai_cache_metrics(),
+        "governor": get_ai_governor_metrics(),
         "error": container.status.ai_error
     }
\ No newline at end of file
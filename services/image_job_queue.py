@@ -0,0 +1,194 @@
+# services/image_job_queue.py
+"""
+Cola Asíncrona de Trabajos de Imagen (V26.21).
+- Persistencia y deduplicación en la tabla 'image_jobs' (clave = hash personaje + prompt).
+- Workers en hilos daemon que reclaman trabajos con claim_image_jobs (SKIP LOCKED).
+- Caché local direccionada por contenido: <sha256>.png + índice job_key -> sha256.
+
+El render concreto (Gemini + Storage) lo aporta image_service como handler,
+así este módulo no depende de credenciales ni del cliente de IA.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from config.app_constants import (
+    IMAGE_JOB_WORKERS,
+    IMAGE_JOB_POLL_SECONDS,
+    IMAGE_JOB_STALE_SECONDS,
+    IMAGE_CACHE_DIR,
+)
+from data.log_repository import log_event
+from data.image_job_repository import (
+    IMAGE_JOB_DONE,
+    IMAGE_JOB_FAILED,
+    enqueue_image_job,
+    claim_image_jobs,
+    get_image_job,
+    complete_image_job,
+    fail_image_job,
+)
+
+
+def image_job_key(character_id: Optional[int], prompt: str, player_id: Optional[int] = None) -> str:
+    """
+    Clave de deduplicación: sha256 de (personaje, prompt normalizado).
+    V26.25: Sin personaje, el ámbito es el jugador (el aviso IMAGE_URL va a un único jugador).
+    """
+    normalized = " ".join(prompt.split()).lower()
+    scope = character_id if character_id else f"p{player_id or 0}"
+    return hashlib.sha256(f"{scope}|{normalized}".encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    """
+    Caché local direccionada por contenido.
+    Los blobs se guardan como <sha256>.png; el índice keys/<job_key> apunta al hash.
+    """
+
+    def __init__(self, root: str = IMAGE_CACHE_DIR):
+        self.root = root
+
+    def path(self, content_hash: str) -> str:
+        return os.path.join(self.root, f"{content_hash}.png")
+
+    def _key_path(self, job_key: str) -> str:
+        return os.path.join(self.root, "keys", job_key)
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put(self, image_bytes: bytes) -> str:
+        content_hash = hashlib.sha256(image_bytes).hexdigest()
+        if not os.path.exists(self.path(content_hash)):
+            self._write_atomic(self.path(content_hash), image_bytes)
+        return content_hash
+
+    def get(self, content_hash: str) -> Optional[bytes]:
+        try:
+            with open(self.path(content_hash), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def link(self, job_key: str, content_hash: str) -> None:
+        self._write_atomic(self._key_path(job_key), content_hash.encode("ascii"))
+
+    def lookup(self, job_key: str) -> Optional[str]:
+        """Hash del blob asociado a job_key (solo si el blob sigue en disco)."""
+        try:
+            with open(self._key_path(job_key), "rb") as f:
+                content_hash = f.read().decode("ascii").strip()
+        except OSError:
+            return None
+        return content_hash if os.path.exists(self.path(content_hash)) else None
+
+
+# handler(job, cache) -> (content_hash, public_url). Lanza excepción si falla.
+ImageJobHandler = Callable[[Dict[str, Any], ImageCache], Tuple[str, Optional[str]]]
+
+
+class ImageJobQueue:
+    """Workers en hilos daemon sobre la cola persistente 'image_jobs'."""
+
+    def __init__(
+        self,
+        handler: ImageJobHandler,
+        workers: int = IMAGE_JOB_WORKERS,
+        poll_seconds: float = IMAGE_JOB_POLL_SECONDS,
+        cache: Optional[ImageCache] = None
+    ):
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.poll_seconds = poll_seconds
+        self.cache = cache or ImageCache()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    # --- API pública ---
+
+    def submit(
+        self,
+        prompt: str,
+        player_id: Optional[int],
+        character_id: Optional[int] = None,
+        force: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Encola (o reutiliza) el trabajo de (personaje, prompt) y despierta a los workers.
+        Un trabajo ya terminado se devuelve al instante con su public_url,
+        salvo con force=True (regeneración: se vuelve a renderizar).
+        """
+        job_key = image_job_key(character_id, prompt, player_id)
+        job = enqueue_image_job(job_key, player_id, character_id, prompt, force)
+        if job and job.get("status") != IMAGE_JOB_DONE:
+            self.start()
+            self._wakeup.set()
+        return job
+
+    def status(self, job_id: int) -> Optional[Dict[str, Any]]:
+        return get_image_job(job_id)
+
+    def wait(self, job_id: int, timeout: float, interval: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Polling bloqueante hasta 'done'/'failed' o timeout (uso fuera de la UI)."""
+        deadline = time.monotonic() + timeout
+        job = self.status(job_id)
+        while job and job.get("status") not in (IMAGE_JOB_DONE, IMAGE_JOB_FAILED) and time.monotonic() < deadline:
+            time.sleep(interval)
+            job = self.status(job_id)
+        return job
+
+    def start(self) -> None:
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._stop.clear()
+            for i in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"image-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # --- Workers ---
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            jobs = claim_image_jobs(1, IMAGE_JOB_STALE_SECONDS)
+            if not jobs:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+            self.run_job(jobs[0])
+
+    def run_job(self, job: Dict[str, Any]) -> bool:
+        try:
+            content_hash, public_url = self.handler(job, self.cache)
+            completed = complete_image_job(job["id"], job.get("attempts"), content_hash, public_url)
+            if not completed:
+                log_event(f"Trabajo de imagen #{job.get('id')} reclamado por otro worker; resultado descartado",
+                          job.get("player_id"))
+            return completed
+        except Exception as e:
+            log_event(f"❌ Trabajo de imagen #{job.get('id')} fallido: {e}", job.get("player_id"), is_error=True)
+            fail_image_job(job["id"], job.get("attempts"), str(e))
+            return False
@@ -1,7 +1,11 @@
 # services/image_service.py
-import time
-import re
-from typing import Optional
+"""
+Servicio de Imágenes (retratos y visuales tácticos).
+Actualizado V26.21: Render en cola asíncrona persistente (services/image_job_queue.py)
+con deduplicación por (personaje, prompt) y caché local direccionada por contenido.
+Actualizado V26.22: ADN Visual cacheable (utils/ai_cache.py).
+"""
+from typing import Dict, Any, Optional, Tuple
 from google import genai
 from google.genai import types
 
@@ -9,10 +13,14 @@ from config.settings import GEMINI_API_KEY
 from config.app_constants import TEXT_MODEL_NAME
 from data.database import get_supabase
 from data.log_repository import log_event
-from data.character_repository import get_character_by_id, update_character
+from data.character_repository import get_character_by_id, update_character, stats_patch, patch_character_stats_bulk
+from data.image_job_repository import IMAGE_JOB_DONE
 from core.models import CommanderData
+from services.image_job_queue import ImageCache, ImageJobQueue
+from utils.ai_cache import CachedAIClient
+from utils.ai_governor import GovernedAIClient
 
-client = genai.Client(api_key=GEMINI_API_KEY)
+client = CachedAIClient(GovernedAIClient(genai.Client(api_key=GEMINI_API_KEY)))
 
 def _generate_visual_dna(character: CommanderData) -> str:
     """
@@ -41,7 +49,8 @@ def _generate_visual_dna(character: CommanderData) -> str:
 
         response = client.models.generate_content(
             model=TEXT_MODEL_NAME,
-            contents=prompt
+            contents=prompt,
+            cache=True # V26.22: Mismo personaje/bio -> mismo ADN
         )
         
         if response and response.text:
@@ -55,100 +64,161 @@ def _generate_visual_dna(character: CommanderData) -> str:
         print(error_detail)
         return f"{character.sheet.taxonomia.raza} {character.sheet.progresion.clase} con equipamiento de combate estándar."
 
-def generate_and_upload_tactical_image(
-    prompt_situation: str, 
-    player_id: int, 
-    character_id: int
-) -> Optional[str]:
+def _ensure_visual_dna(character: CommanderData, player_id: Optional[int]) -> str:
+    """ADN Visual del personaje; si no existe lo genera y lo GUARDA (parche de bio.apariencia_visual)."""
+    visual_dna = character.sheet.bio.apariencia_visual
+
+    if not visual_dna or len(visual_dna) < 10:
+        log_event(f"🎨 Creando ADN Visual permanente para {character.nombre}...", player_id)
+
+        visual_dna = _generate_visual_dna(character)
+        character.sheet.bio.apariencia_visual = visual_dna
+
+        # V26.21: Parche por ruta en lugar de reescribir el stats_json completo
+        patch_character_stats_bulk([stats_patch(character.id, "set", ["bio", "apariencia_visual"], visual_dna)])
+
+        log_event(f"💾 ADN Visual guardado para {character.nombre}.", player_id)
+
+    return visual_dna
+
+
+def _render_image(final_prompt: str) -> Optional[bytes]:
+    """Generación de Imagen (llamada bloqueante a Imagen; solo desde los workers)."""
+    response = client.models.generate_images(
+        model='imagen-4.0-fast-generate-001', 
+        prompt=final_prompt,
+        config=types.GenerateImagesConfig(
+            number_of_images=1,
+            aspect_ratio="16:9",
+            person_generation="allow_adult"
+        )
+    )
+
+    if not response or not response.generated_images:
+        return None
+
+    return response.generated_images[0].image.image_bytes
+
+
+def _run_image_job(job: Dict[str, Any], cache: ImageCache) -> Tuple[str, Optional[str]]:
     """
-    Flujo Inteligente:
-    1. Carga Personaje.
-    2. ¿Tiene ADN Visual? NO -> Genéralo y GUÁRDALO en DB.
-    3. Genera Imagen combinando (ADN Visual + Situación).
-    4. Sube con nombre semántico.
-    5. Actualiza portrait_url en la tabla characters.
+    Handler de la cola (V26.21). Flujo Inteligente:
+    1. ¿Imagen ya en caché local para (personaje, prompt)? -> se reutiliza sin IA.
+    2. Si no: carga personaje, ADN Visual (lazy + persistencia), genera imagen y la cachea.
+    3. Sube con nombre direccionado por contenido (<sha256>.png, idempotente).
+    4. Actualiza portrait_url en la tabla characters (si hay personaje).
     """
-    try:
-        # 1. Obtener datos del personaje
+    player_id = job.get("player_id")
+    character_id = job.get("character_id")
+    prompt_situation = job["prompt"]
+    character = None
+
+    if character_id:
         char_data_dict = get_character_by_id(character_id)
         if not char_data_dict:
-            log_event(f"❌ Personaje {character_id} no encontrado para imagen.", player_id)
-            return None
-            
-        # Convertimos a objeto CommanderData para trabajar cómodamente
+            raise ValueError(f"Personaje {character_id} no encontrado para imagen.")
         character = CommanderData.from_dict(char_data_dict)
-        
-        # 2. Verificar / Generar ADN Visual (Lazy Load)
-        visual_dna = character.sheet.bio.apariencia_visual
-        
-        if not visual_dna or len(visual_dna) < 10:
-            log_event(f"🎨 Creando ADN Visual permanente para {character.nombre}...", player_id)
-            
-            # A) Generar
-            visual_dna = _generate_visual_dna(character)
-            
-            # B) Actualizar Objeto Local
-            character.sheet.bio.apariencia_visual = visual_dna
-            
-            # C) PERSISTENCIA: Guardar en stats_json
-            updated_stats = character.sheet.model_dump()
-            update_character(character.id, {"stats_json": updated_stats}) 
-            
-            log_event(f"💾 ADN Visual guardado para {character.nombre}.", player_id)
-
-        # 3. Construcción del Prompt de Imagen
+
+    # V26.25: Una regeneración forzada ignora la imagen cacheada
+    content_hash = None if job.get("force_render") else cache.lookup(job["job_key"])
+    if not content_hash:
+        # Construcción del Prompt de Imagen
+        subject = f"[SUBJECT VISUAL DNA]: {_ensure_visual_dna(character, player_id)}" if character else ""
         final_prompt = f"""
-        [SUBJECT VISUAL DNA]: {visual_dna}
+        {subject}
         [CURRENT ACTION/CONTEXT]: {prompt_situation}
         [ART STYLE]: Cinematic sci-fi character portrait, hyper-realistic, 8k resolution, volumetric lighting, atmospheric, detailed textures.
         """
-        
-        print(f"🎨 Generando imagen para: {character.nombre} en situación: {prompt_situation}")
-
-        # 4. Generación de Imagen
-        response = client.models.generate_images(
-            model='imagen-4.0-fast-generate-001', 
-            prompt=final_prompt,
-            config=types.GenerateImagesConfig(
-                number_of_images=1,
-                aspect_ratio="16:9",
-                person_generation="allow_adult"
-            )
-        )
 
-        if not response or not response.generated_images:
-            return None
+        print(f"🎨 Generando imagen (trabajo #{job.get('id')}) en situación: {prompt_situation}")
+        image_bytes = _render_image(final_prompt)
+        if not image_bytes:
+            raise RuntimeError("El modelo de imagen no devolvió resultados.")
 
-        image_bytes = response.generated_images[0].image.image_bytes
-        
-        # 5. Nombre Semántico del Archivo
-        safe_name = re.sub(r'[^a-zA-Z0-9]', '', character.nombre.replace(' ', '_'))
-        safe_action = re.sub(r'[^a-zA-Z0-9]', '', prompt_situation[:15].replace(' ', '_'))
-        timestamp = int(time.time())
-        
-        file_name = f"{safe_name}_{safe_action}_{timestamp}.png"
-        bucket_name = "tactical-images"
-
-        # 6. Subida a Supabase
-        supabase = get_supabase()
-        supabase.storage.from_(bucket_name).upload(
-            path=file_name,
-            file=image_bytes,
-            file_options={"content-type": "image/png"}
-        )
+        content_hash = cache.put(image_bytes)
+        cache.link(job["job_key"], content_hash)
+
+    # Subida a Supabase (mismo contenido -> misma ruta)
+    file_name = f"{content_hash}.png"
+    bucket_name = "tactical-images"
+    supabase = get_supabase()
+    supabase.storage.from_(bucket_name).upload(
+        path=file_name,
+        file=cache.get(content_hash),
+        file_options={"content-type": "image/png", "upsert": "true"}
+    )
+    public_url = supabase.storage.from_(bucket_name).get_public_url(file_name)
+
+    # Persistencia Crítica: Actualizar portrait_url (Columna SQL)
+    if public_url and character:
+        update_character(character.id, {"portrait_url": public_url})
+        log_event(f"🖼️ Retrato actualizado exitosamente para {character.nombre}. IMAGE_URL: {public_url}", player_id)
+    elif public_url:
+        log_event(f"🖼️ Visual táctico listo. IMAGE_URL: {public_url}", player_id)
+
+    return content_hash, public_url
+
+
+_IMAGE_JOB_QUEUE: Optional[ImageJobQueue] = None
 
-        public_url = supabase.storage.from_(bucket_name).get_public_url(file_name)
-        
-        # 7. Persistencia Crítica: Actualizar portrait_url (Columna SQL)
-        if public_url:
-            # Aseguramos la actualización de la columna específica además del JSON si fuera necesario
-            update_character(character.id, {"portrait_url": public_url})
-            log_event(f"🖼️ Retrato actualizado exitosamente para {character.nombre}.", player_id)
 
-        return public_url
+def get_image_job_queue() -> ImageJobQueue:
+    """
+    Cola compartida del proceso (sobrevive a los reruns de Streamlit).
+    V26.25: Los workers arrancan al crearla, así retoman los trabajos pendientes tras un reinicio.
+    """
+    global _IMAGE_JOB_QUEUE
+    if _IMAGE_JOB_QUEUE is None:
+        _IMAGE_JOB_QUEUE = ImageJobQueue(_run_image_job)
+        _IMAGE_JOB_QUEUE.start()
+    return _IMAGE_JOB_QUEUE
+
+
+def start_image_workers() -> None:
+    """Arranque de la app: workers activos aunque nadie encole en esta sesión (idempotente)."""
+    get_image_job_queue().start()
+
+
+def submit_tactical_image_job(
+    prompt_situation: str,
+    player_id: int,
+    character_id: Optional[int] = None,
+    force: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    V26.21: Encola la imagen y retorna de inmediato (sin bloquear la sesión).
+    Devuelve la fila del trabajo: status 'done' + public_url si ya existía.
+    V26.25: force=True vuelve a renderizar un trabajo ya terminado.
+    """
+    return get_image_job_queue().submit(prompt_situation, player_id, character_id, force)
+
+
+def get_image_job_status(job_id: int) -> Optional[Dict[str, Any]]:
+    """Polling de estado para la UI."""
+    return get_image_job_queue().status(job_id)
+
+
+def generate_and_upload_tactical_image(
+    prompt_situation: str, 
+    player_id: int, 
+    character_id: Optional[int] = None,
+    timeout: float = 120.0
+) -> Optional[str]:
+    """
+    Variante síncrona (scripts/compatibilidad): encola y espera el resultado.
+    V26.21: El trabajo lo ejecutan los workers de la cola; repetir la misma
+    petición devuelve la URL existente al instante.
+    """
+    try:
+        job = submit_tactical_image_job(prompt_situation, player_id, character_id)
+        if not job:
+            return None
+        if job.get("status") != IMAGE_JOB_DONE:
+            job = get_image_job_queue().wait(job["id"], timeout)
+        return job.get("public_url") if job and job.get("status") == IMAGE_JOB_DONE else None
 
     except Exception as e:
         error_msg = f"❌ Error Critical Image Service: {str(e)}"
         print(error_msg)
         log_event(error_msg, player_id)
-        return None
\ No newline at end of file
+        return None
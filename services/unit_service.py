@@ -3,6 +3,7 @@
 Servicio de Gestión de Unidades V10.0.
 Operaciones de alto nivel para agrupamiento, transferencia y gestión de unidades.
 Actualizado V14.2: Gestión de Modo Sigilo y Resolución de Escapes.
+Actualizado V26.14: Transferencias de miembros en lote (plantilla en memoria + una RPC).
 """
 
 from typing import Optional, Dict, Any, List, Tuple
@@ -12,15 +13,114 @@ from data.unit_repository import (
     create_unit,
     get_unit_by_id,
     get_units_by_player,
-    add_unit_member,
-    remove_unit_member,
+    delete_unit,
+    transfer_unit_members_bulk,
     update_unit_status
 )
+from core.unit_engine import calculate_and_update_unit_skills
 from data.character_repository import get_character_by_id
 from data.log_repository import log_event
+from data.world_repository import get_world_state
 from data.database import get_supabase
 
 
+# --- V26.14: PRIMITIVAS DE TRANSFERENCIA EN LOTE ---
+
+def plan_member_transfer(
+    members_by_unit: Dict[int, List[Dict[str, Any]]],
+    transfers: List[Dict[str, Any]]
+) -> Tuple[Dict[int, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    V26.14: Calcula en memoria la plantilla final de miembros tras mover N miembros.
+
+    Reglas (equivalentes a add_unit_member/remove_unit_member en secuencia):
+    - Los miembros que se quedan conservan su orden; los que llegan se añaden al final.
+    - Los slots de cada unidad afectada se renumeran de forma contigua desde 0.
+    - Un miembro transferido pierde el liderazgo; si la unidad destino estaba vacía,
+      el primer personaje que llega pasa a ser líder (auto-liderazgo V16.0).
+
+    Args:
+        members_by_unit: {unit_id: miembros actuales} de todas las unidades implicadas
+        transfers: Lista de dicts con {source_unit_id, target_unit_id, entity_type, entity_id}
+
+    Returns:
+        Tupla (layouts, missing):
+        - layouts: {unit_id: plantilla final} solo de las unidades que cambian
+        - missing: transferencias cuyo miembro o unidad no se encontró
+    """
+    layouts = {
+        unit_id: sorted((dict(m) for m in members), key=lambda m: m.get("slot_index") or 0)
+        for unit_id, members in members_by_unit.items()
+    }
+    initially_empty = {unit_id for unit_id, members in layouts.items() if not members}
+    touched = set()
+    missing = []
+
+    for transfer in transfers:
+        src_id = transfer.get("source_unit_id")
+        dst_id = transfer.get("target_unit_id")
+        key = (transfer.get("entity_type"), transfer.get("entity_id"))
+
+        src_members = layouts.get(src_id)
+        if src_members is None or dst_id not in layouts:
+            missing.append(transfer)
+            continue
+        if src_id == dst_id:
+            continue
+
+        index = next(
+            (i for i, m in enumerate(src_members) if (m.get("entity_type"), m.get("entity_id")) == key),
+            None
+        )
+        if index is None:
+            missing.append(transfer)
+            continue
+
+        member = src_members.pop(index)
+        member["is_leader"] = False
+        layouts[dst_id].append(member)
+        touched.update((src_id, dst_id))
+
+    for unit_id in touched:
+        members = layouts[unit_id]
+        for slot, member in enumerate(members):
+            member["slot_index"] = slot
+        if unit_id in initially_empty:
+            first_character = next((m for m in members if m.get("entity_type") == "character"), None)
+            if first_character is not None:
+                first_character["is_leader"] = True
+
+    return {unit_id: layouts[unit_id] for unit_id in touched}, missing
+
+
+def apply_member_layouts(
+    layouts: Dict[int, List[Dict[str, Any]]],
+    unit_rows: Optional[Dict[int, Dict[str, Any]]] = None
+) -> List[int]:
+    """
+    V26.14: Persiste las plantillas de plan_member_transfer en una RPC atómica y
+    recalcula las habilidades colectivas UNA vez por unidad afectada.
+
+    Args:
+        layouts: {unit_id: plantilla final}
+        unit_rows: Filas de unidad ya cargadas; evitan releer la unidad al recalcular
+
+    Returns:
+        IDs de unidades reescritas (vacío si la RPC falló).
+    """
+    if not layouts:
+        return []
+    written = transfer_unit_members_bulk(layouts)
+    unit_rows = unit_rows or {}
+    for unit_id in written:
+        row = unit_rows.get(unit_id)
+        if row is None:
+            calculate_and_update_unit_skills(unit_id)
+        else:
+            calculate_and_update_unit_skills(unit_id, dict(row, members=layouts[unit_id]))
+    return written
+
+
 def agile_grouping(
     source_unit_ids: List[int],
     target_unit_id: int,
@@ -72,6 +172,7 @@ def agile_grouping(
 
     # 2. Validar unidades fuente y ubicaciones
     source_units = {}
+    unit_rows = {target_unit_id: target_unit_data}
     for src_id in source_unit_ids:
         src_data = get_unit_by_id(src_id)
         if not src_data:
@@ -99,6 +200,7 @@ def agile_grouping(
             continue
 
         source_units[src_id] = src_unit
+        unit_rows[src_id] = src_data
 
     if not source_units:
         result["errors"].append("No hay unidades fuente válidas")
@@ -142,45 +244,34 @@ def agile_grouping(
             )
             return result
 
-    # 5. Ejecutar transferencias
-    next_slot = current_members
-    for transfer in member_transfers:
-        src_id = transfer.get("source_unit_id")
-        entity_type = transfer.get("entity_type")
-        entity_id = transfer.get("entity_id")
-
-        if src_id not in source_units:
-            continue
-
-        src_unit = source_units[src_id]
-
-        # Buscar el slot actual del miembro en la unidad fuente
-        source_slot = None
-        for member in src_unit.members:
-            if member.entity_type == entity_type and member.entity_id == entity_id:
-                source_slot = member.slot_index
-                break
-
-        if source_slot is None:
-            result["warnings"].append(f"Miembro {entity_type}:{entity_id} no encontrado en unidad {src_id}")
-            continue
+    # 5. Ejecutar transferencias (V26.14: plantilla en memoria + una RPC)
+    transfers = [
+        dict(transfer, target_unit_id=target_unit_id)
+        for transfer in member_transfers
+        if transfer.get("source_unit_id") in source_units
+    ]
+    layouts, missing = plan_member_transfer(
+        {unit_id: row.get("members", []) for unit_id, row in unit_rows.items()},
+        transfers
+    )
+    for transfer in missing:
+        result["warnings"].append(
+            f"Miembro {transfer.get('entity_type')}:{transfer.get('entity_id')} "
+            f"no encontrado en unidad {transfer.get('source_unit_id')}"
+        )
 
-        # Remover de fuente
-        remove_success = remove_unit_member(src_id, source_slot)
-        if not remove_success:
-            result["warnings"].append(f"Error removiendo miembro de unidad {src_id}")
-            continue
+    # V26.25: Solo cuentan los movimientos aplicados (src == dst no mueve nada)
+    missing_ids = {id(transfer) for transfer in missing}
+    moved = [
+        transfer for transfer in transfers
+        if id(transfer) not in missing_ids and transfer.get("source_unit_id") != target_unit_id
+    ]
 
-        # Añadir a destino
-        add_success = add_unit_member(target_unit_id, entity_type, entity_id, next_slot)
-        if not add_success:
-            result["warnings"].append(f"Error añadiendo miembro a unidad destino")
-            # Intentar revertir
-            add_unit_member(src_id, entity_type, entity_id, source_slot)
-            continue
-
-        next_slot += 1
-        result["moved_count"] += 1
+    if layouts:
+        if apply_member_layouts(layouts, unit_rows):
+            result["moved_count"] = len(moved)
+        else:
+            result["warnings"].append("Error aplicando la transferencia de miembros")
 
     result["success"] = result["moved_count"] > 0
 
@@ -248,10 +339,12 @@ def split_unit(
             return result
 
     # Crear nueva unidad
+    # V26.14: El anillo de origen se pasa en la creación (sin update posterior)
     location_data = {
         "system_id": source_unit.location_system_id,
         "planet_id": source_unit.location_planet_id,
-        "sector_id": source_unit.location_sector_id
+        "sector_id": source_unit.location_sector_id,
+        "ring": source_unit.ring.value if hasattr(source_unit.ring, 'value') else source_unit.ring
     }
 
     new_unit_data = create_unit(player_id, new_unit_name, location_data)
@@ -260,33 +353,28 @@ def split_unit(
         return result
 
     new_unit_id = new_unit_data.get("id")
-    
-    # Asignar anillo correcto (create_unit por defecto usa Stellar/0)
-    origin_ring = source_unit.ring.value if hasattr(source_unit.ring, 'value') else source_unit.ring
-    if origin_ring != 0:
-        db = get_supabase()
-        db.table("units").update({"ring": origin_ring}).eq("id", new_unit_id).execute()
-
-    # Transferir miembros
-    slot = 0
-    for member_spec in member_ids:
-        entity_type = member_spec.get("entity_type")
-        entity_id = member_spec.get("entity_id")
-
-        # Buscar slot en unidad fuente
-        source_slot = None
-        for member in source_unit.members:
-            if member.entity_type == entity_type and member.entity_id == entity_id:
-                source_slot = member.slot_index
-                break
-
-        if source_slot is None:
-            continue
+    new_unit_data["members"] = []
+
+    # Transferir miembros (V26.14: plantilla en memoria + una RPC)
+    transfers = [
+        {
+            "source_unit_id": source_unit_id,
+            "target_unit_id": new_unit_id,
+            "entity_type": spec.get("entity_type"),
+            "entity_id": spec.get("entity_id")
+        }
+        for spec in member_ids
+    ]
+    unit_rows = {source_unit_id: source_data, new_unit_id: new_unit_data}
+    layouts, _missing = plan_member_transfer(
+        {unit_id: row.get("members", []) for unit_id, row in unit_rows.items()},
+        transfers
+    )
 
-        # Transferir
-        remove_unit_member(source_unit_id, source_slot)
-        add_unit_member(new_unit_id, entity_type, entity_id, slot)
-        slot += 1
+    if not layouts or not apply_member_layouts(layouts, unit_rows):
+        delete_unit(new_unit_id, player_id)
+        result["error"] = "Error transfiriendo miembros a la nueva unidad"
+        return result
 
     result["success"] = True
     result["new_unit_id"] = new_unit_id
@@ -326,6 +414,7 @@ def merge_units(
 
     # Validar todas las unidades
     units = []
+    unit_rows = {}
     reference_location = None
     total_members = 0
 
@@ -359,6 +448,7 @@ def merge_units(
 
         total_members += len(unit.members)
         units.append(unit)
+        unit_rows[uid] = unit_data
 
     # Validar capacidad
     if total_members > MAX_UNIT_SLOTS:
@@ -373,17 +463,27 @@ def merge_units(
     # Por ahora, usamos la unidad base tal cual
 
     # Transferir miembros de las otras unidades a la base
-    slot = len(base_unit.members)
-    for unit in units[1:]:
-        for member in unit.members:
-            add_unit_member(base_unit_id, member.entity_type, member.entity_id, slot)
-            slot += 1
+    # V26.14: plantilla en memoria + una RPC; las unidades origen quedan vacías
+    transfers = [
+        {
+            "source_unit_id": unit.id,
+            "target_unit_id": base_unit_id,
+            "entity_type": member.entity_type,
+            "entity_id": member.entity_id
+        }
+        for unit in units[1:]
+        for member in unit.members
+    ]
+    layouts, _missing = plan_member_transfer(
+        {uid: row.get("members", []) for uid, row in unit_rows.items()},
+        transfers
+    )
 
-        # Marcar unidad original como disuelta (eliminar miembros y actualizar status)
-        for member in unit.members:
-            remove_unit_member(unit.id, member.slot_index)
+    if layouts and not apply_member_layouts(layouts, unit_rows):
+        result["error"] = "Error transfiriendo miembros a la unidad base"
+        return result
 
-        result["dissolved_units"].append(unit.id)
+    result["dissolved_units"] = [unit.id for unit in units[1:]]
 
     result["success"] = True
     result["merged_unit_id"] = base_unit_id
@@ -393,9 +493,10 @@ def merge_units(
     return result
 
 
-def get_unit_summary(unit_id: int) -> Optional[Dict[str, Any]]:
+def get_unit_summary(unit_id: int, current_tick: Optional[int] = None) -> Optional[Dict[str, Any]]:
     """
     Obtiene un resumen de una unidad para la UI.
+    V26.8: Ticks restantes y progreso de tránsito derivados de current_tick.
     """
     unit_data = get_unit_by_id(unit_id)
     if not unit_data:
@@ -403,6 +504,9 @@ def get_unit_summary(unit_id: int) -> Optional[Dict[str, Any]]:
 
     unit = UnitSchema.from_dict(unit_data)
 
+    if current_tick is None and unit.status == UnitStatus.TRANSIT:
+        current_tick = get_world_state().get("current_tick", 1)
+
     # Contar tipos de miembros
     characters = sum(1 for m in unit.members if m.entity_type == 'character')
     troops = sum(1 for m in unit.members if m.entity_type == 'troop')
@@ -426,7 +530,9 @@ def get_unit_summary(unit_id: int) -> Optional[Dict[str, Any]]:
         "transit": {
             "in_transit": unit.status == UnitStatus.TRANSIT,
             "end_tick": unit.transit_end_tick,
-            "ticks_remaining": unit.transit_ticks_remaining,
+            "start_tick": unit.transit_start_tick,
+            "ticks_remaining": unit.transit_ticks_left(current_tick) if current_tick is not None else unit.transit_ticks_remaining,
+            "progress": unit.transit_progress(current_tick) if current_tick is not None else 0.0,
             "destination_system_id": unit.transit_destination_system_id
         },
         "movement_locked": unit.movement_locked
@@ -0,0 +1,126 @@
+# tests/conftest.py
+"""
+Utilidades compartidas de los tests (V26.25).
+Cliente Supabase simulado: cadena table()...execute() y rpc() que registran
+las llamadas, sin conexión a base de datos real.
+
+Uso:
+    def test_x(monkeypatch, fake_db):
+        db = fake_db(rows={"characters": [...]})
+        monkeypatch.setattr(repo, "_get_db", lambda: db)
+"""
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeResponse:
+    """Respuesta mínima: .data (Supabase) y .text (modelos de IA)."""
+
+    def __init__(self, data=None, text=None):
+        self.data = data
+        self.text = text
+
+
+class FakeQuery:
+    """Cadena mínima table().select()/update()/insert()/upsert().eq()/in_().execute()."""
+
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = {}
+        self.payload = None
+        self.rows_to_insert = None
+
+    def select(self, *args, **kwargs):
+        self.db.selects.append((self.table, args[0] if args else "*"))
+        return self
+
+    def maybe_single(self):
+        return self
+
+    def update(self, payload):
+        self.payload = payload
+        return self
+
+    def insert(self, rows):
+        self.db.inserts.append((self.table, rows))
+        self.rows_to_insert = rows
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.db.inserts.append((self.table, rows))
+        self.rows_to_insert = []
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = list(values)
+        return self
+
+    def execute(self):
+        if self.rows_to_insert is not None:
+            rows = [dict(row, id=self.db.next_id + i) for i, row in enumerate(self.rows_to_insert)]
+            self.db.next_id += len(rows)
+            return FakeResponse(rows)
+        if self.payload is not None:
+            self.db.updates.append((self.table, self.payload, self.filters))
+            return FakeResponse([])
+        rows = self.db.rows.get(self.table, [])
+        # Filas dependientes de los filtros: {"tabla": lambda filters: [...]}
+        return FakeResponse(rows(self.filters) if callable(rows) else rows)
+
+
+class FakeRPC:
+    def __init__(self, db, name, params):
+        self.db = db
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        if self.db.error:
+            raise self.db.error
+        data = self.db.rpc_result
+        return FakeResponse(data(self.name, self.params) if callable(data) else data)
+
+
+class FakeDB:
+    """
+    Cliente simulado.
+
+    Args:
+        rows: {tabla: filas} o {tabla: callable(filters) -> filas} para las lecturas
+        rpc_result: datos devueltos por rpc() o callable(name, params) -> datos
+        error: excepción lanzada al ejecutar cualquier rpc()
+    """
+
+    def __init__(self, rows=None, rpc_result=None, error=None):
+        self.rows = rows or {}
+        self.rpc_result = rpc_result
+        self.error = error
+        self.tables = []
+        self.rpc_calls = []
+        self.selects = []
+        self.updates = []
+        self.inserts = []
+        self.next_id = 1
+
+    def table(self, name):
+        self.tables.append(name)
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        self.rpc_calls.append((name, params))
+        return FakeRPC(self, name, params)
+
+
+@pytest.fixture
+def fake_db():
+    """Factoría de FakeDB: fake_db(rows=..., rpc_result=..., error=...)."""
+    return FakeDB
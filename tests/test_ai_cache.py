@@ -0,0 +1,147 @@
+# tests/test_ai_cache.py
+"""
+Tests de la Caché de Respuestas de IA (utils/ai_cache.py, V26.22).
+Clave exacta, TTL, LRU, backend en disco y opt-in por llamada.
+
+Ejecutar con: pytest tests/test_ai_cache.py -v
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.conftest import FakeResponse
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeModels:
+    def __init__(self, texts=None):
+        self.calls = []
+        self.texts = list(texts or [])
+
+    def generate_content(self, *, model, contents, config=None):
+        self.calls.append(contents)
+        if self.texts:
+            return FakeResponse(text=self.texts.pop(0))
+        return FakeResponse(text=f"respuesta {len(self.calls)}")
+
+    def generate_images(self, **kwargs):
+        return "imagen"
+
+
+class _FakeClient:
+    def __init__(self):
+        self.models = _FakeModels()
+        self.chats = "chats"
+
+
+class TestCacheKey:
+    """La clave cambia con cualquier parte de la petición."""
+
+    def test_key_is_exact(self):
+        from utils.ai_cache import make_cache_key
+
+        base = make_cache_key("m", "hola", {"temperature": 0.3}, system_prompt="sys", scope="tick:1")
+        assert base == make_cache_key("m", "hola", {"temperature": 0.3}, system_prompt="sys", scope="tick:1")
+        assert base != make_cache_key("m", "hola ", {"temperature": 0.3}, system_prompt="sys", scope="tick:1")
+        assert base != make_cache_key("m", "hola", {"temperature": 0.4}, system_prompt="sys", scope="tick:1")
+        assert base != make_cache_key("m", "hola", {"temperature": 0.3}, system_prompt="sys", scope="tick:2")
+        assert base != make_cache_key("otro", "hola", {"temperature": 0.3}, system_prompt="sys", scope="tick:1")
+
+
+class TestAIResponseCache:
+    """TTL, LRU y disco."""
+
+    def test_ttl_expires_entries(self):
+        from utils.ai_cache import AIResponseCache
+
+        clock = _Clock()
+        cache = AIResponseCache(max_entries=4, default_ttl=10, disk_dir=None, clock=clock)
+        cache.put("k", {"v": 1})
+
+        assert cache.get("k") == {"v": 1}
+        clock.now += 11
+        assert cache.get("k") is None
+        assert cache.metrics()["expirations"] == 1
+
+    def test_lru_evicts_least_recently_used(self):
+        from utils.ai_cache import AIResponseCache
+
+        cache = AIResponseCache(max_entries=2, default_ttl=60, disk_dir=None)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.metrics()["evictions"] == 1
+
+    def test_disk_backend_survives_new_instance(self, tmp_path):
+        from utils.ai_cache import AIResponseCache
+
+        AIResponseCache(disk_dir=str(tmp_path)).put("k", {"narrative": "ok"}, ttl=60)
+        fresh = AIResponseCache(disk_dir=str(tmp_path))
+
+        assert fresh.get("k") == {"narrative": "ok"}
+        metrics = fresh.metrics()
+        assert metrics["disk_hits"] == 1
+        assert metrics["size"] == 1
+
+
+class TestCachedAIClient:
+    """Solo las llamadas con cache=True usan la caché."""
+
+    def test_opt_in_calls_hit_cache(self):
+        from utils.ai_cache import AIResponseCache, CachedAIClient
+
+        raw = _FakeClient()
+        cache = AIResponseCache(disk_dir=None)
+        client = CachedAIClient(raw, cache)
+
+        first = client.models.generate_content(model="m", contents="prompt", cache=True)
+        second = client.models.generate_content(model="m", contents="prompt", cache=True)
+        other_scope = client.models.generate_content(model="m", contents="prompt", cache=True, cache_scope="x")
+
+        assert first.text == second.text == "respuesta 1"
+        assert other_scope.text == "respuesta 2"
+        assert cache.metrics()["hits"] == 1
+
+    def test_calls_without_flag_bypass_cache(self):
+        from utils.ai_cache import AIResponseCache, CachedAIClient
+
+        raw = _FakeClient()
+        client = CachedAIClient(raw, AIResponseCache(disk_dir=None))
+
+        client.models.generate_content(model="m", contents="prompt")
+        client.models.generate_content(model="m", contents="prompt")
+
+        assert len(raw.models.calls) == 2
+        assert client.models.generate_images(prompt="x") == "imagen"
+        assert client.chats == "chats"
+
+    def test_invalid_json_is_not_cached(self):
+        from utils.ai_cache import AIResponseCache, CachedAIClient
+
+        raw = _FakeClient()
+        raw.models = _FakeModels(['{"nombre": "Ka', '{"nombre": "Kael"}'])
+        cache = AIResponseCache(disk_dir=None)
+        client = CachedAIClient(raw, cache)
+        config = {"response_mime_type": "application/json"}
+
+        first = client.models.generate_content(model="m", contents="p", config=config, cache=True)
+        second = client.models.generate_content(model="m", contents="p", config=config, cache=True)
+        third = client.models.generate_content(model="m", contents="p", config=config, cache=True)
+
+        assert first.text == '{"nombre": "Ka'
+        assert second.text == third.text == '{"nombre": "Kael"}'
+        assert len(raw.models.calls) == 2
+        assert cache.metrics()["stores"] == 1
@@ -0,0 +1,236 @@
+# tests/test_ai_governor.py
+"""
+Tests del Gobernador de Llamadas de IA (utils/ai_governor.py, V26.23).
+Token bucket, presupuesto de reintentos, circuit breaker y envoltorio del cliente,
+con reloj y sleep simulados.
+
+Ejecutar con: pytest tests/test_ai_governor.py -v
+"""
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Clock:
+    """Reloj simulado: sleep() avanza el tiempo."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _ProviderError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+def _governor(clock, **overrides):
+    from utils.ai_governor import AIGovernor, CircuitBreaker, RetryBudget
+
+    params = dict(
+        rate_per_second=100.0, burst=10, max_in_flight=2, acquire_timeout=5.0,
+        max_retries=2, backoff_base=0.5, backoff_max=4.0,
+        retry_budget=RetryBudget(ratio=0.5, max_balance=10.0),
+        breaker=CircuitBreaker(failure_threshold=3, cooldown_seconds=30.0, clock=clock),
+    )
+    params.update(overrides)
+    return AIGovernor(clock=clock, sleep=clock.sleep, **params)
+
+
+class TestTokenBucket:
+    """Ritmo sostenido y ráfaga."""
+
+    def test_burst_then_waits_for_refill(self):
+        from utils.ai_governor import TokenBucket
+
+        clock = _Clock()
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+        assert bucket.acquire() and bucket.acquire()
+        assert bucket.try_acquire() is False
+        assert bucket.acquire(timeout=1.0) is True
+        assert clock.sleeps == [pytest.approx(0.5)]
+
+    def test_acquire_times_out(self):
+        from utils.ai_governor import TokenBucket
+
+        clock = _Clock()
+        bucket = TokenBucket(rate=0.1, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+
+        assert bucket.acquire(timeout=2.0) is False
+
+
+class TestTransientErrors:
+    def test_classification(self):
+        from utils.ai_governor import is_transient_error, AICircuitOpenError
+
+        assert is_transient_error(_ProviderError(429))
+        assert is_transient_error(_ProviderError(503))
+        assert not is_transient_error(_ProviderError(400))
+        assert is_transient_error(TimeoutError())
+        assert is_transient_error(RuntimeError("RESOURCE_EXHAUSTED: quota"))
+        assert not is_transient_error(ValueError("JSON inválido"))
+        assert not is_transient_error(AICircuitOpenError("abierto"))
+
+
+class TestAIGovernor:
+    """Reintentos, presupuesto y circuito."""
+
+    def test_retries_transient_errors_with_backoff(self):
+        clock = _Clock()
+        governor = _governor(clock)
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise _ProviderError(503)
+            return "ok"
+
+        assert governor.call(flaky) == "ok"
+        assert len(attempts) == 3
+        assert 0.25 <= clock.sleeps[0] <= 0.5
+        assert 0.5 <= clock.sleeps[1] <= 1.0
+        metrics = governor.metrics()
+        assert metrics["retries"] == 2
+        assert metrics["successes"] == 1
+        assert metrics["latency_seconds"]["count"] == 3
+
+    def test_non_transient_errors_are_not_retried(self):
+        clock = _Clock()
+        governor = _governor(clock)
+        attempts = []
+
+        def bad_request():
+            attempts.append(1)
+            raise _ProviderError(400)
+
+        with pytest.raises(_ProviderError):
+            governor.call(bad_request)
+        assert len(attempts) == 1
+        assert governor.breaker.state == "closed"
+
+    def test_retry_budget_limits_retries(self):
+        from utils.ai_governor import RetryBudget
+
+        clock = _Clock()
+        governor = _governor(clock, retry_budget=RetryBudget(ratio=0.0, max_balance=1.0))
+        attempts = []
+
+        def always_busy():
+            attempts.append(1)
+            raise _ProviderError(429)
+
+        with pytest.raises(_ProviderError):
+            governor.call(always_busy)
+        assert len(attempts) == 2  # 1 intento + 1 reintento pagado por el presupuesto
+        assert governor.metrics()["budget_exhausted"] == 1
+
+    def test_breaker_opens_and_recovers_after_cooldown(self):
+        from utils.ai_governor import AICircuitOpenError
+
+        clock = _Clock()
+        governor = _governor(clock, max_retries=0)
+
+        def down():
+            raise _ProviderError(500)
+
+        for _ in range(3):
+            with pytest.raises(_ProviderError):
+                governor.call(down)
+
+        assert governor.is_open()
+        with pytest.raises(AICircuitOpenError):
+            governor.call(lambda: "no llega")
+        assert governor.metrics()["rejected_open"] == 1
+
+        clock.now += 31
+        assert governor.breaker.state == "half_open"
+        assert governor.call(lambda: "ok") == "ok"
+        assert governor.breaker.state == "closed"
+
+    def test_half_open_probe_failure_reopens(self):
+        clock = _Clock()
+        governor = _governor(clock, max_retries=0)
+        governor.breaker._state = "open"
+        governor.breaker._opened_at = clock.now - 31
+
+        with pytest.raises(_ProviderError):
+            governor.call(lambda: (_ for _ in ()).throw(_ProviderError(503)))
+        assert governor.is_open()
+
+    def test_acquire_timeout_raises_governor_error(self):
+        from utils.ai_governor import AIGovernorTimeoutError
+
+        clock = _Clock()
+        governor = _governor(clock, rate_per_second=0.01, burst=1, acquire_timeout=1.0)
+        governor.call(lambda: "primera")
+
+        with pytest.raises(AIGovernorTimeoutError):
+            governor.call(lambda: "segunda")
+        metrics = governor.metrics()
+        assert metrics["rejected_timeout"] == 1
+        assert metrics["queue_depth"] == 0
+        assert metrics["in_flight"] == 0
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        from utils.ai_governor import Histogram
+
+        histogram = Histogram((1.0, 5.0))
+        for value in (0.5, 2.0, 10.0):
+            histogram.observe(value)
+
+        data = histogram.to_dict()
+        assert data["buckets"] == {"le_1": 1, "le_5": 2, "le_inf": 3}
+        assert data["count"] == 3
+
+
+class TestGovernedAIClient:
+    """models.* y chat.send_message pasan por el gobernador."""
+
+    def test_calls_are_governed(self):
+        from utils.ai_governor import GovernedAIClient
+
+        class _Chat:
+            def send_message(self, message):
+                return f"eco: {message}"
+
+        class _Chats:
+            def create(self, **kwargs):
+                return _Chat()
+
+        class _Models:
+            def generate_content(self, **kwargs):
+                return "texto"
+
+            def generate_images(self, **kwargs):
+                return "imagen"
+
+        class _Client:
+            models = _Models()
+            chats = _Chats()
+            files = "files"
+
+        clock = _Clock()
+        governor = _governor(clock)
+        client = GovernedAIClient(_Client(), governor)
+
+        assert client.models.generate_content(model="m", contents="x") == "texto"
+        assert client.models.generate_images(model="m", prompt="x") == "imagen"
+        assert client.chats.create(model="m").send_message("hola") == "eco: hola"
+        assert client.files == "files"
+        assert governor.metrics()["calls"] == 3
@@ -0,0 +1,85 @@
+# tests/test_character_engine.py
+"""
+Tests del Motor de Personajes (character_engine.py).
+Progresión pasiva de conocimiento en lote (V26.15), sin base de datos real.
+
+Ejecutar con: pytest tests/test_character_engine.py -v
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _char(char_id, player_id=1, presencia=10, es_comandante=False):
+    return {"id": char_id, "player_id": player_id, "nombre": f"P{char_id}",
+            "es_comandante": es_comandante, "atributos": {"presencia": presencia}}
+
+
+class TestKnowledgeProgressPlan:
+    """Transiciones calculadas en memoria."""
+
+    def test_required_ticks_follow_presence(self):
+        from core.character_engine import knowledge_ticks_required
+        from core.models import KnowledgeLevel
+
+        assert knowledge_ticks_required(KnowledgeLevel.UNKNOWN, 15) == 15
+        assert knowledge_ticks_required(KnowledgeLevel.UNKNOWN, 40) == 5
+        assert knowledge_ticks_required(KnowledgeLevel.KNOWN, 7) == 53
+        assert knowledge_ticks_required(KnowledgeLevel.FRIEND, 10) is None
+
+    def test_counters_advance_and_level_up_resets(self):
+        from core.character_engine import plan_knowledge_progress
+
+        characters = [
+            _char(1),                               # sin fila: UNKNOWN, 0 -> 1
+            _char(2, presencia=15),                 # UNKNOWN 14 -> 15 => KNOWN
+            _char(3),                               # FRIEND: sin progreso
+            _char(4, es_comandante=True),           # comandante: ignorado
+            _char(5, presencia="8"),                # KNOWN 51 -> 52 => FRIEND
+        ]
+        knowledge = {
+            (2, 1): {"knowledge_level": "unknown", "progress_ticks": 14},
+            (3, 1): {"knowledge_level": "friend", "progress_ticks": 0},
+            (5, 1): {"knowledge_level": "known", "progress_ticks": 51},
+        }
+
+        rows = {r["character_id"]: r for r in plan_knowledge_progress(characters, knowledge)}
+
+        assert set(rows) == {1, 2, 5}
+        assert rows[1] == {"character_id": 1, "player_id": 1, "from_level": "unknown",
+                           "knowledge_level": "unknown", "progress_ticks": 1}
+        assert (rows[2]["knowledge_level"], rows[2]["progress_ticks"]) == ("known", 0)
+        assert (rows[5]["knowledge_level"], rows[5]["progress_ticks"]) == ("friend", 0)
+
+
+class TestKnowledgeProgressBulk:
+    """Una RPC de contadores; efectos pesados solo en subidas de nivel."""
+
+    def test_only_level_ups_touch_characters(self, monkeypatch):
+        import data.character_repository as repo
+        import core.character_engine as engine
+        from core.models import KnowledgeLevel
+
+        calls = {"rpc": 0, "level_ups": []}
+
+        def fake_apply(rows):
+            calls["rpc"] += 1
+            return [(r["character_id"], r["player_id"], KnowledgeLevel(r["knowledge_level"]))
+                    for r in rows if r["knowledge_level"] != r["from_level"]]
+
+        monkeypatch.setattr(repo, "get_faction_characters_for_knowledge",
+                            lambda player_ids=None: [_char(1), _char(2, player_id=2, presencia=30)])
+        monkeypatch.setattr(repo, "get_all_character_knowledge", lambda player_ids=None: {
+            (2, 2): {"knowledge_level": "unknown", "progress_ticks": 4}
+        })
+        monkeypatch.setattr(repo, "apply_knowledge_progress_bulk", fake_apply)
+        monkeypatch.setattr(engine, "_apply_knowledge_level_up",
+                            lambda cid, pid, level: calls["level_ups"].append((cid, level)) or ["msg"])
+
+        result = engine.process_passive_knowledge_bulk(current_tick=10)
+
+        assert calls["rpc"] == 1
+        assert calls["level_ups"] == [(2, KnowledgeLevel.KNOWN)]
+        assert result == {2: ["msg"]}
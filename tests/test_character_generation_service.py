@@ -0,0 +1,161 @@
+# tests/test_character_generation_service.py
+"""
+Tests del Servicio de Generación de Personajes (character_generation_service.py).
+Catálogo cacheado de planetas de nacimiento (V26.19) y generación masiva
+sin IA con RNG reproducible (V26.20).
+
+Ejecutar con: pytest tests/test_character_generation_service.py -v
+"""
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+PLANETS = [
+    {"id": 1, "name": "Aurea", "biome": "Templado", "system_id": 10, "population": 5.0},
+    {"id": 2, "name": "Brisa", "biome": "Oceánico", "system_id": 10, "population": 0.0},
+    {"id": 3, "name": "Ceniza", "biome": "Desértico", "system_id": 20, "population": 1.0},
+]
+
+
+class TestBirthPlanetCatalogue:
+    """Una consulta para N personajes; selección ponderada en memoria."""
+
+    def test_catalogue_is_loaded_once(self, monkeypatch):
+        import services.character_generation_service as cgs
+
+        calls = []
+
+        def fake_get_habitable_planets(biomes):
+            calls.append(list(biomes))
+            return PLANETS
+
+        monkeypatch.setattr(cgs, "get_habitable_planets", fake_get_habitable_planets)
+        cgs.invalidate_birth_planet_catalogue()
+
+        for _ in range(100):
+            cgs._select_birth_planet(10)
+            cgs._select_birth_planet(None)
+
+        assert calls == [cgs.HABITABLE_BIRTH_BIOMES]
+        cgs.invalidate_birth_planet_catalogue()
+
+    def test_preferred_system_and_galaxy_fallback(self, monkeypatch):
+        import services.character_generation_service as cgs
+
+        monkeypatch.setattr(cgs, "get_habitable_planets", lambda biomes: PLANETS)
+        catalogue = cgs.get_birth_planet_catalogue(refresh=True)
+        rng = random.Random(7)
+
+        in_system = {catalogue.pick(20, rng) for _ in range(20)}
+        assert in_system == {("Ceniza", "Desértico")}
+
+        unknown_system = catalogue.pick(999, rng)
+        assert unknown_system in {("Aurea", "Templado"), ("Brisa", "Oceánico"), ("Ceniza", "Desértico")}
+        cgs.invalidate_birth_planet_catalogue()
+
+    def test_selection_is_weighted_by_population(self):
+        import services.character_generation_service as cgs
+
+        catalogue = cgs.BirthPlanetCatalogue()
+        for p in PLANETS:
+            catalogue.add(p["name"], p["biome"], p["system_id"], p["population"])
+        rng = random.Random(42)
+
+        picks = [catalogue.pick(10, rng)[0] for _ in range(2000)]
+
+        # Pesos 6:1 (población + peso base)
+        assert picks.count("Aurea") > 4 * picks.count("Brisa")
+        assert picks.count("Brisa") > 0
+
+    def test_empty_catalogue_is_not_cached(self, monkeypatch):
+        import services.character_generation_service as cgs
+
+        calls = []
+        monkeypatch.setattr(cgs, "get_habitable_planets", lambda biomes: calls.append(1) or [])
+        cgs.invalidate_birth_planet_catalogue()
+
+        assert cgs._select_birth_planet(10) == ("Estación Espacial Nómada", "Artificial")
+        assert cgs._select_birth_planet(10) == ("Estación Espacial Nómada", "Artificial")
+        assert len(calls) == 2
+        cgs.invalidate_birth_planet_catalogue()
+
+    def test_catalogue_refreshes_on_colonization_and_ttl(self, monkeypatch):
+        import services.character_generation_service as cgs
+        from core.territory_engine import on_planet_sovereignty_changed
+
+        calls = []
+        monkeypatch.setattr(cgs, "get_habitable_planets", lambda biomes: calls.append(1) or PLANETS)
+        cgs.invalidate_birth_planet_catalogue()
+
+        cgs._select_birth_planet(10)
+        cgs._select_birth_planet(10)
+        on_planet_sovereignty_changed(2, 7, 7)
+        cgs._select_birth_planet(10)
+        assert len(calls) == 2
+
+        monkeypatch.setattr(cgs, "BIRTH_PLANET_CATALOGUE_TTL_SECONDS", -1)
+        cgs._select_birth_planet(10)
+        assert len(calls) == 3
+        cgs.invalidate_birth_planet_catalogue()
+
+
+class TestFastCharacterGeneration:
+    """generate_fast_characters: N personajes completos sin IA ni BD."""
+
+    def test_same_seed_same_characters(self, monkeypatch):
+        import services.character_generation_service as cgs
+
+        monkeypatch.setattr(cgs, "get_habitable_planets", lambda biomes: PLANETS)
+        cgs.invalidate_birth_planet_catalogue()
+
+        first = cgs.generate_fast_characters(25, seed=123)
+        second = cgs.generate_fast_characters(25, seed=123)
+        other = cgs.generate_fast_characters(25, seed=124)
+
+        assert first == second
+        assert first != other
+        cgs.invalidate_birth_planet_catalogue()
+
+    def test_characters_are_complete_and_unique(self, monkeypatch):
+        import services.character_generation_service as cgs
+        from core.models import KnowledgeLevel
+
+        monkeypatch.setattr(cgs, "get_habitable_planets", lambda biomes: PLANETS)
+        cgs.invalidate_birth_planet_catalogue()
+
+        location = {"system_id": 10, "planet_id": 1, "sector_id": 3, "nombre_asentamiento": "Bastión"}
+        characters = cgs.generate_fast_characters(600, location=location, seed=1, existing_names=["Marcus Voss"])
+
+        names = [c["nombre"] for c in characters]
+        assert len(set(names)) == 600
+        assert "Marcus Voss" not in names
+
+        sample = characters[0]
+        stats = sample["stats_json"]
+        assert set(stats["capacidades"]["atributos"]) == {"fuerza", "agilidad", "tecnica", "intelecto", "voluntad", "presencia"}
+        assert stats["capacidades"]["habilidades"]
+        assert stats["bio"]["origen"] in ({"planeta": "Aurea", "bioma": "Templado"}, {"planeta": "Brisa", "bioma": "Oceánico"})
+        assert stats["estado"]["ubicacion"]["system_id"] == 10
+        assert sample["costo"] == cgs._calculate_recruitment_cost(stats)
+        assert sample["initial_knowledge_level"] == KnowledgeLevel.FRIEND
+        cgs.invalidate_birth_planet_catalogue()
+
+    def test_crew_is_inserted_in_one_bulk_call(self, monkeypatch):
+        import services.character_generation_service as cgs
+
+        calls = []
+        monkeypatch.setattr(cgs, "get_habitable_planets", lambda biomes: PLANETS)
+        monkeypatch.setattr(cgs, "log_event", lambda *a, **k: None)
+        monkeypatch.setattr(cgs, "get_player_base_coordinates", lambda pid: {"system_id": 20})
+        monkeypatch.setattr(cgs, "create_characters_bulk",
+                            lambda pid, chars, chunk_size: calls.append((pid, len(chars))) or chars)
+        cgs.invalidate_birth_planet_catalogue()
+
+        crew = cgs.recruit_initial_crew_fast(4, count=7, seed=9)
+
+        assert calls == [(4, 7)]
+        assert all(c["stats_json"]["bio"]["origen"]["planeta"] == "Ceniza" for c in crew)
+        cgs.invalidate_birth_planet_catalogue()
@@ -0,0 +1,181 @@
+# tests/test_character_repository.py
+"""
+Tests del Repositorio de Personajes (character_repository.py).
+Parches parciales de stats_json (V26.16), proyecciones hot/cold (V26.17)
+e inserción en lote (V26.20), con un cliente Supabase simulado.
+
+Ejecutar con: pytest tests/test_character_repository.py -v
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _patch_results(rpc_value):
+    """Respuesta de patch_character_stats_bulk: {id, value} por parche."""
+
+    def result(name, params):
+        assert name == "patch_character_stats_bulk"
+        return [{"id": p["id"], "value": rpc_value(p)} for p in params["p_patches"]]
+
+    return result
+
+
+def _patch_batches(db):
+    return [params["p_patches"] for _, params in db.rpc_calls]
+
+
+class TestStatsPatch:
+    """API de parches por ruta."""
+
+    def test_invalid_operation_is_rejected(self):
+        from data.character_repository import stats_patch
+
+        with pytest.raises(ValueError):
+            stats_patch(1, "append", ["bio"])
+
+    def test_patches_for_same_character_are_split_in_rounds(self, monkeypatch, fake_db):
+        import data.character_repository as repo
+
+        db = fake_db(rpc_result=_patch_results(lambda patch: patch["op"]))
+        monkeypatch.setattr(repo, "_get_db", lambda: db)
+
+        result = repo.patch_character_stats_bulk([
+            repo.stats_patch(1, "set", ["a"], 1),
+            repo.stats_patch(2, "delete", ["b"]),
+            repo.stats_patch(1, "increment", ["a"], 2),
+        ])
+
+        assert [[p["id"] for p in batch] for batch in _patch_batches(db)] == [[1, 2], [1]]
+        assert result == {1: "increment", 2: "delete"}
+
+
+class TestCharacterProjections:
+    """Lecturas hot/cold sin el stats_json completo (V26.17)."""
+
+    def test_hot_projection_excludes_stats_json(self, monkeypatch, fake_db):
+        import data.character_repository as repo
+
+        db = fake_db(rows={"characters": [{"id": 1, "atributos": {"presencia": 12}}]})
+        monkeypatch.setattr(repo, "_get_db", lambda: db)
+
+        rows = repo.get_characters_by_ids([1])
+
+        assert rows == [{"id": 1, "atributos": {"presencia": 12}}]
+        columns = db.selects[0][1]
+        assert "stats_json" not in columns
+        assert "atributos:hot_atributos" in columns
+        assert repo._projection_columns("full") == "*"
+
+    def test_cold_data_is_loaded_by_section(self, monkeypatch, fake_db):
+        import data.character_repository as repo
+
+        db = fake_db(rows={"characters": {"id": 1, "bio": {"bio_profunda": "..."}, "taxonomia": None}})
+        monkeypatch.setattr(repo, "_get_db", lambda: db)
+
+        cold = repo.get_character_cold_data(1, sections=("bio", "taxonomia"))
+
+        assert cold == {"bio": {"bio_profunda": "..."}}
+        assert db.selects[0][1] == "id, bio:stats_json->bio, taxonomia:stats_json->taxonomia"
+
+
+class TestTickPhasePatches:
+    """La fase 1 envía parches de bytes en lugar de documentos completos."""
+
+    def test_decrement_phase_uses_path_patches(self, monkeypatch, fake_db):
+        import data.character_repository as repo
+        import core.time_engine as time_engine
+
+        on_mission = repo.STATUS_ID_MAP["En Misión"]
+        wounded = repo.STATUS_ID_MAP["Herido"]
+        by_status = {
+            on_mission: [
+                {"id": 1, "player_id": 7, "nombre": "A", "remaining_days": 1},
+                {"id": 2, "player_id": 7, "nombre": "B", "remaining_days": 0},
+            ],
+            wounded: [
+                {"id": 3, "player_id": 7, "nombre": "C", "wound_ticks": 3},
+                {"id": 4, "player_id": 7, "nombre": "D", "wound_ticks": 1},
+            ],
+        }
+        db = fake_db(
+            rows={"characters": lambda filters: by_status.get(filters.get("estado_id"), [])},
+            rpc_result=_patch_results(
+                lambda patch: 0 if patch["op"] == "increment" and patch["id"] == 1 else None
+            ),
+        )
+        logs = []
+        monkeypatch.setattr(repo, "_get_db", lambda: db)
+        monkeypatch.setattr(time_engine, "_get_db", lambda: db)
+        monkeypatch.setattr(time_engine, "log_event", lambda *a, **k: None)
+        monkeypatch.setattr(time_engine, "log_events_batch", lambda entries, **k: logs.extend(entries))
+
+        time_engine._phase_decrement_and_persistence()
+
+        sent = [(p["id"], p["op"], p["path"]) for batch in _patch_batches(db) for p in batch]
+        assert sent == [
+            (1, "increment", ["active_mission", "remaining_days"]),
+            (3, "increment", ["wound_ticks_remaining"]),
+            (4, "delete", ["wound_ticks_remaining"]),
+        ]
+        assert db.updates == [("characters", {"estado_id": repo.STATUS_ID_MAP["Disponible"]}, {"id": [4]})]
+        assert ("Mission ready for resolution: A", 7) in logs
+        assert ("D has recovered from injuries.", 7) in logs
+
+
+class TestBulkCharacterInsert:
+    """create_characters_bulk: un INSERT por lote (V26.20)."""
+
+    def _character(self, name):
+        from core.models import KnowledgeLevel
+
+        return {
+            "initial_knowledge_level": KnowledgeLevel.FRIEND,
+            "is_npc": True,
+            "stats_json": {
+                "bio": {"nombre": name, "apellido": "Test"},
+                "progresion": {"nivel": 1, "clase": "Novato", "xp": 0, "rango": "Soldado"},
+                "estado": {"rol_asignado": "Sin Asignar", "ubicacion": {"system_id": 5}},
+            },
+        }
+
+    def test_inserts_in_chunks_with_knowledge(self, monkeypatch, fake_db):
+        import data.character_repository as repo
+        import data.game_config_repository as config
+
+        db = fake_db()
+        monkeypatch.setattr(repo, "_get_db", lambda: db)
+        monkeypatch.setattr(repo, "log_event", lambda *a, **k: None)
+        monkeypatch.setattr(config, "get_current_tick", lambda: 9)
+
+        created = repo.create_characters_bulk(3, [self._character(f"N{i}") for i in range(5)], chunk_size=2)
+
+        assert [row["id"] for row in created] == [1, 2, 3, 4, 5]
+        char_batches = [rows for table, rows in db.inserts if table == "characters"]
+        knowledge_batches = [rows for table, rows in db.inserts if table == "character_knowledge"]
+        assert [len(b) for b in char_batches] == [2, 2, 1]
+        assert [len(b) for b in knowledge_batches] == [2, 2, 1]
+
+        first = char_batches[0][0]
+        assert first["nombre"] == "N0"
+        assert first["is_npc"] is True
+        assert first["recruited_at_tick"] == 9
+        assert first["location_system_id"] == 5
+        assert "ubicacion" not in first["stats_json"]["estado"]
+        assert knowledge_batches[0][0] == {"character_id": 1, "player_id": 3, "knowledge_level": "friend"}
+
+    def test_no_knowledge_rows_without_player(self, monkeypatch, fake_db):
+        import data.character_repository as repo
+        import data.game_config_repository as config
+
+        db = fake_db()
+        monkeypatch.setattr(repo, "_get_db", lambda: db)
+        monkeypatch.setattr(repo, "log_event", lambda *a, **k: None)
+        monkeypatch.setattr(config, "get_current_tick", lambda: 1)
+
+        created = repo.create_characters_bulk(None, [self._character("Solo")])
+
+        assert len(created) == 1
+        assert [table for table, _ in db.inserts] == ["characters"]
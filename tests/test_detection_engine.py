@@ -0,0 +1,102 @@
+# tests/test_detection_engine.py
+"""
+Tests del Motor de Detección (detection_engine.py).
+Solo lógica en memoria, sin conexión a base de datos real.
+
+Ejecutar con: pytest tests/test_detection_engine.py -v
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _transit(unit_id, player_id, origin=1, dest=2, start=0, end=4, lane=7):
+    return {
+        "id": unit_id, "player_id": player_id, "starlane_id": lane,
+        "transit_origin_system_id": origin, "transit_destination_system_id": dest,
+        "transit_start_tick": start, "transit_end_tick": end,
+    }
+
+
+class TestLaneSegments:
+    """Tests para el índice de segmentos de starlane (V26.10)."""
+
+    def test_segment_covers_last_tick_in_lane_coordinates(self):
+        from core.detection_engine import build_lane_segment
+
+        forward = build_lane_segment(_transit(1, 10), current_tick=2)
+        backward = build_lane_segment(_transit(2, 20, origin=2, dest=1), current_tick=2)
+
+        assert (forward.low, forward.high) == (0.25, 0.5)
+        assert (backward.low, backward.high) == (0.5, 0.75)
+        assert backward.direction == -1
+
+    def test_legacy_rows_occupy_whole_lane(self):
+        from core.detection_engine import build_lane_segment
+
+        seg = build_lane_segment(_transit(1, 10, start=None), current_tick=2)
+
+        assert (seg.low, seg.high) == (0.0, 1.0)
+
+    def test_index_skips_single_player_lanes(self):
+        from core.detection_engine import index_lane_segments
+
+        units = [_transit(1, 10), _transit(2, 10), _transit(3, 10, lane=8), _transit(4, 20, lane=8)]
+
+        assert list(index_lane_segments(units, current_tick=2)) == [8]
+
+
+class TestLaneEncounters:
+    """Tests para find_lane_encounters (barrido de intervalos)."""
+
+    def _pairs(self, units, tick):
+        from core.detection_engine import index_lane_segments, find_lane_encounters
+
+        pairs = []
+        for segments in index_lane_segments(units, tick).values():
+            pairs.extend(find_lane_encounters(segments))
+        return {tuple(sorted((a.unit_id, b.unit_id))) for a, b in pairs}
+
+    def test_distant_units_on_same_lane_do_not_meet(self):
+        # Salen con 3 ticks de diferencia: nunca coinciden en posición
+        units = [_transit(1, 10, start=0, end=4), _transit(2, 20, start=3, end=7)]
+
+        assert self._pairs(units, tick=4) == set()
+
+    def test_head_on_units_cross(self):
+        units = [_transit(1, 10, start=0, end=4), _transit(2, 20, origin=2, dest=1, start=0, end=4)]
+
+        assert self._pairs(units, tick=1) == set()
+        assert self._pairs(units, tick=2) == {(1, 2)}  # Se cruzan en el punto medio
+
+    def test_overtaking_and_same_player(self):
+        # 3 (boost) alcanza a 1 durante el tick 2; 2 es aliado de 1
+        units = [
+            _transit(1, 10, start=0, end=4),
+            _transit(2, 10, start=0, end=4),
+            _transit(3, 20, start=1, end=2),
+        ]
+
+        assert self._pairs(units, tick=2) == {(1, 3), (2, 3)}
+
+    def test_sweep_matches_brute_force(self):
+        import random
+        from core.detection_engine import build_lane_segment, find_lane_encounters, _segments_meet
+
+        rng = random.Random(7)
+        units = []
+        for uid in range(1, 120):
+            start = rng.randint(0, 8)
+            origin, dest = rng.choice([(1, 2), (2, 1)])
+            units.append(_transit(uid, rng.randint(1, 4), origin, dest, start, start + rng.randint(1, 4)))
+        segments = [s for s in (build_lane_segment(u, 6) for u in units) if s]
+
+        swept = {tuple(sorted((a.unit_id, b.unit_id))) for a, b in find_lane_encounters(segments)}
+        brute = {
+            tuple(sorted((a.unit_id, b.unit_id)))
+            for i, a in enumerate(segments) for b in segments[i + 1:]
+            if a.player_id != b.player_id and _segments_meet(a, b, 0.05)
+        }
+        assert swept == brute
@@ -0,0 +1,126 @@
+# tests/test_forecast_engine.py
+"""
+Tests del Motor de Pronóstico Económico (forecast_engine.py).
+La simulación es pura: se construyen snapshots sintéticos sin DB.
+
+Ejecutar con: pytest tests/test_forecast_engine.py -v
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _make_snapshot(**overrides):
+    from core.forecast_engine import EconomySnapshot
+
+    data = dict(
+        player_id=1,
+        current_tick=10,
+        resources={
+            "creditos": 100, "materiales": 0, "componentes": 0,
+            "celulas_energia": 12, "influencia": 0, "datos": 0
+        },
+        planets=[{
+            "id": 100, "planet_id": 1, "system_id": 1,
+            "population": 0.0, "surface_owner_id": 1,
+            "buildings": [
+                {"id": 1, "building_type": "mat_foundry", "is_active": True, "built_at_tick": 1},
+            ],
+        }],
+    )
+    data.update(overrides)
+    return EconomySnapshot(**data)
+
+
+class TestForecastSimulation:
+    """Tests para simulate_economy_forecast."""
+
+    def test_returns_one_entry_per_tick(self):
+        from core.forecast_engine import simulate_economy_forecast
+
+        forecast = simulate_economy_forecast(_make_snapshot(), ticks=5)
+
+        assert len(forecast.ticks) == 5
+        assert [t.tick for t in forecast.ticks] == [11, 12, 13, 14, 15]
+        assert len(forecast.curves()["materiales"]) == 5
+
+    def test_snapshot_is_not_mutated(self):
+        from core.forecast_engine import simulate_economy_forecast
+
+        snapshot = _make_snapshot()
+        simulate_economy_forecast(snapshot, ticks=5)
+
+        assert snapshot.resources["creditos"] == 100
+        assert snapshot.planets[0]["buildings"][0]["is_active"] is True
+
+    def test_maintenance_shutdown_cascade(self):
+        """La fundición consume 5 celulas/tick: con 12 opera 2 ticks y se detiene en el 3°."""
+        from core.forecast_engine import simulate_economy_forecast
+
+        forecast = simulate_economy_forecast(_make_snapshot(), ticks=4)
+        curves = forecast.curves()
+
+        assert curves["materiales"][:2] == [20, 40]
+        assert forecast.first_shutdown_tick() == 13
+        # Detenida: sin producción adicional
+        assert curves["materiales"][2] == 40
+        assert curves["materiales"][3] == 40
+        # Solo se reporta el apagado una vez (el estado se arrastra)
+        assert forecast.ticks[3].buildings_disabled == []
+
+    def test_reactivation_after_market_delivery(self):
+        """Una compra pendiente de celulas reactiva la fundición al ser entregada."""
+        from core.forecast_engine import simulate_economy_forecast
+
+        snapshot = _make_snapshot(
+            resources={
+                "creditos": 100, "materiales": 0, "componentes": 0,
+                "celulas_energia": 0, "influencia": 0, "datos": 0
+            },
+            pending_orders=[{
+                "resource_type": "celulas_energia", "amount": 10,
+                "price_per_unit": 30, "created_at_tick": 10
+            }],
+        )
+        snapshot.planets[0]["buildings"][0]["is_active"] = False
+
+        forecast = simulate_economy_forecast(snapshot, ticks=1)
+        first = forecast.ticks[0]
+
+        assert first.market_deliveries == 1
+        assert first.buildings_reactivated == [1]
+        assert first.resources["materiales"] == 20
+        assert first.resources["celulas_energia"] == 5
+
+    def test_pending_construction_comes_online(self):
+        from core.forecast_engine import simulate_economy_forecast
+
+        snapshot = _make_snapshot()
+        snapshot.planets[0]["buildings"][0]["built_at_tick"] = 12
+
+        curves = simulate_economy_forecast(snapshot, ticks=3).curves()
+
+        assert curves["materiales"] == [0, 20, 40]
+
+    def test_transit_logistics_cost(self):
+        from core.forecast_engine import simulate_economy_forecast
+
+        snapshot = _make_snapshot(planets=[], troops_in_transit=8)
+        forecast = simulate_economy_forecast(snapshot, ticks=3)
+
+        assert forecast.curves()["creditos"] == [60, 20, 0]
+        assert forecast.ticks[2].logistics_failure is True
+        assert forecast.ticks[2].transit_cost == 20
+
+    def test_luxury_extraction_accumulates(self):
+        from core.forecast_engine import simulate_economy_forecast
+
+        snapshot = _make_snapshot(luxury_sites=[{
+            "resource_key": "helio3", "resource_category": "gases",
+            "extraction_rate": 2, "is_active": True
+        }])
+        luxury = simulate_economy_forecast(snapshot, ticks=3).luxury_curves()
+
+        assert luxury == {"gases.helio3": [2, 4, 6]}
@@ -0,0 +1,139 @@
+# tests/test_function_calling.py
+"""
+Tests del Bucle de Function Calling (services/function_calling.py, V26.24).
+Todas las function_call de un turno en un único round-trip y ejecución
+concurrente de las herramientas de solo lectura.
+
+Ejecutar con: pytest tests/test_function_calling.py -v
+"""
+import threading
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+READ_ONLY = {"get_filtered_roster", "get_table_schema", "execute_sql_query"}
+
+
+def _response(*parts):
+    from google.genai import types
+
+    return types.GenerateContentResponse(candidates=[
+        types.Candidate(content=types.Content(role="model", parts=list(parts)))
+    ])
+
+
+def _call(name, **args):
+    from google.genai import types
+
+    return types.Part.from_function_call(name=name, args=args)
+
+
+def _text(text):
+    from google.genai import types
+
+    return types.Part.from_text(text=text)
+
+
+class _FakeChat:
+    """Chat guionizado: cuenta los round-trips y guarda lo enviado."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def send_message(self, parts):
+        self.sent.append(parts)
+        return self.responses.pop(0)
+
+
+class TestRunFunctionCalls:
+    """Round-trips al modelo."""
+
+    def test_all_calls_of_a_turn_share_one_round_trip(self):
+        from services.function_calling import run_function_calls
+
+        first = _response(
+            _call("get_filtered_roster", player_id=1),
+            _call("execute_sql_query", query="SELECT 1"),
+            _call("get_table_schema", table_name="characters"),
+        )
+        chat = _FakeChat(_response(_text("Informe listo, Comandante.")))
+
+        final, made = run_function_calls(
+            chat, first, lambda name, args: f"ok:{name}", max_iterations=10, parallel_safe=READ_ONLY
+        )
+
+        assert len(chat.sent) == 1
+        sent_names = [part.function_response.name for part in chat.sent[0]]
+        assert sent_names == ["get_filtered_roster", "execute_sql_query", "get_table_schema"]
+        assert chat.sent[0][1].function_response.response == {"result": "ok:execute_sql_query"}
+        assert [c["function"] for c in made] == sent_names
+        assert all(c["iteration"] == 1 for c in made)
+        assert final.text == "Informe listo, Comandante."
+
+    def test_chained_turns_cost_one_round_trip_each(self):
+        from services.function_calling import run_function_calls
+
+        chat = _FakeChat(
+            _response(_call("execute_sql_query", query="SELECT 2")),
+            _response(_text("Hecho.")),
+        )
+
+        _, made = run_function_calls(
+            chat, _response(_call("get_table_schema", table_name="players")),
+            lambda name, args: "ok", max_iterations=10, parallel_safe=READ_ONLY
+        )
+
+        assert len(chat.sent) == 2
+        assert [c["iteration"] for c in made] == [1, 2]
+
+    def test_text_response_makes_no_round_trip(self):
+        from services.function_calling import run_function_calls
+
+        chat = _FakeChat()
+        final, made = run_function_calls(chat, _response(_text("Sin herramientas.")), lambda n, a: "", 10)
+
+        assert chat.sent == []
+        assert made == []
+        assert final.text == "Sin herramientas."
+
+
+class TestExecuteFunctionCalls:
+    """Concurrencia y orden de resultados."""
+
+    def test_read_only_tools_run_concurrently(self):
+        from services.function_calling import execute_function_calls
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def execute(name, args):
+            barrier.wait()  # Solo se libera si las tres corren a la vez
+            return f"{name}:{args['n']}"
+
+        calls = [("execute_sql_query", {"n": i}) for i in range(3)]
+        results = execute_function_calls(calls, execute, READ_ONLY, max_workers=4)
+
+        assert results == ["execute_sql_query:0", "execute_sql_query:1", "execute_sql_query:2"]
+
+    def test_mutating_tools_stay_in_caller_thread_and_errors_are_reported(self):
+        from services.function_calling import execute_function_calls
+
+        threads = {}
+
+        def execute(name, args):
+            threads[name] = threading.current_thread().name
+            if name == "get_table_schema":
+                raise RuntimeError("tabla inexistente")
+            return "ok"
+
+        calls = [
+            ("investigate_character", {}),
+            ("get_filtered_roster", {}),
+            ("get_table_schema", {}),
+        ]
+        results = execute_function_calls(calls, execute, READ_ONLY, max_workers=4)
+
+        assert threads["investigate_character"] == threading.current_thread().name
+        assert threads["get_filtered_roster"].startswith("ai-tool")
+        assert results == ["ok", "ok", "Error ejecutando get_table_schema: tabla inexistente"]
@@ -0,0 +1,219 @@
+# tests/test_image_job_queue.py
+"""
+Tests de la Cola Asíncrona de Imágenes (image_job_queue.py, V26.21).
+Deduplicación, caché direccionada por contenido y workers en hilos,
+con el repositorio 'image_jobs' simulado en memoria.
+
+Ejecutar con: pytest tests/test_image_job_queue.py -v
+"""
+import threading
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _FakeJobStore:
+    """Réplica en memoria de enqueue_image_job / claim_image_jobs / complete / fail."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def enqueue(self, job_key, player_id, character_id, prompt, force=False):
+        with self.lock:
+            for job in self.jobs.values():
+                if job["job_key"] == job_key:
+                    if job["status"] == "failed" or (force and job["status"] == "done"):
+                        job["status"] = "queued"
+                        job["force_render"] = job["force_render"] or force
+                    return dict(job)
+            job_id = len(self.jobs) + 1
+            self.jobs[job_id] = {
+                "id": job_id, "job_key": job_key, "player_id": player_id,
+                "character_id": character_id, "prompt": prompt, "status": "queued",
+                "content_hash": None, "public_url": None, "error": None,
+                "force_render": force, "attempts": 0,
+            }
+            return dict(self.jobs[job_id])
+
+    def claim(self, limit=1, stale_seconds=600):
+        with self.lock:
+            queued = [j for j in self.jobs.values() if j["status"] == "queued"][:limit]
+            for job in queued:
+                job["status"] = "running"
+                job["attempts"] += 1
+            return [dict(j) for j in queued]
+
+    def _owned(self, job_id, attempts):
+        job = self.jobs[job_id]
+        return job["status"] == "running" and job["attempts"] == attempts
+
+    def complete(self, job_id, attempts, content_hash, public_url):
+        with self.lock:
+            if not self._owned(job_id, attempts):
+                return False
+            self.jobs[job_id].update(status="done", content_hash=content_hash, public_url=public_url,
+                                     force_render=False)
+        self.done.set()
+        return True
+
+    def fail(self, job_id, attempts, error):
+        with self.lock:
+            if not self._owned(job_id, attempts):
+                return False
+            self.jobs[job_id].update(status="failed", error=error)
+        self.done.set()
+        return True
+
+    def install(self, monkeypatch, queue_module):
+        monkeypatch.setattr(queue_module, "enqueue_image_job", self.enqueue)
+        monkeypatch.setattr(queue_module, "claim_image_jobs", self.claim)
+        monkeypatch.setattr(queue_module, "complete_image_job", self.complete)
+        monkeypatch.setattr(queue_module, "fail_image_job", self.fail)
+        monkeypatch.setattr(queue_module, "get_image_job", lambda job_id: dict(self.jobs[job_id]))
+        monkeypatch.setattr(queue_module, "log_event", lambda *a, **k: None)
+
+
+class TestImageJobKey:
+    """Clave de deduplicación (personaje, prompt)."""
+
+    def test_key_ignores_whitespace_and_case(self):
+        from services.image_job_queue import image_job_key
+
+        assert image_job_key(5, "Retrato  en el Puente") == image_job_key(5, "retrato en el puente ")
+        assert image_job_key(5, "Retrato") != image_job_key(6, "Retrato")
+
+    def test_key_without_character_is_scoped_to_player(self):
+        from services.image_job_queue import image_job_key
+
+        assert image_job_key(None, "Nebulosa", player_id=1) != image_job_key(None, "Nebulosa", player_id=2)
+        assert image_job_key(5, "Retrato", player_id=1) == image_job_key(5, "Retrato", player_id=2)
+
+
+class TestImageCache:
+    """Caché local direccionada por contenido."""
+
+    def test_put_is_content_addressed_and_linkable(self, tmp_path):
+        from services.image_job_queue import ImageCache
+
+        cache = ImageCache(str(tmp_path))
+        first = cache.put(b"png-bytes")
+        second = cache.put(b"png-bytes")
+        cache.link("job-a", first)
+
+        assert first == second
+        assert cache.get(first) == b"png-bytes"
+        assert cache.lookup("job-a") == first
+        assert cache.lookup("job-b") is None
+
+    def test_lookup_ignores_missing_blob(self, tmp_path):
+        from services.image_job_queue import ImageCache
+
+        cache = ImageCache(str(tmp_path))
+        content_hash = cache.put(b"x")
+        cache.link("job", content_hash)
+        os.remove(cache.path(content_hash))
+
+        assert cache.lookup("job") is None
+
+
+class TestImageJobQueue:
+    """Workers en hilos sobre la cola persistente."""
+
+    def test_worker_renders_once_and_repeat_returns_instantly(self, monkeypatch, tmp_path):
+        import services.image_job_queue as queue_module
+
+        store = _FakeJobStore()
+        store.install(monkeypatch, queue_module)
+        renders = []
+
+        def handler(job, cache):
+            renders.append(job["id"])
+            content_hash = cache.put(b"image-" + job["prompt"].encode())
+            cache.link(job["job_key"], content_hash)
+            return content_hash, f"https://cdn/{content_hash}.png"
+
+        queue = queue_module.ImageJobQueue(handler, workers=2, poll_seconds=0.05,
+                                           cache=queue_module.ImageCache(str(tmp_path)))
+        try:
+            job = queue.submit("Retrato en el puente", player_id=1, character_id=7)
+            assert job["status"] == "queued"
+            assert store.done.wait(5)
+
+            finished = queue.wait(job["id"], timeout=5, interval=0.01)
+            assert finished["status"] == "done"
+            assert finished["public_url"].startswith("https://cdn/")
+
+            again = queue.submit("retrato en el  puente", player_id=1, character_id=7)
+            assert again["id"] == job["id"]
+            assert again["status"] == "done"
+            assert renders == [job["id"]]
+        finally:
+            queue.stop()
+
+    def test_failed_job_is_recorded(self, monkeypatch, tmp_path):
+        import services.image_job_queue as queue_module
+
+        store = _FakeJobStore()
+        store.install(monkeypatch, queue_module)
+
+        def handler(job, cache):
+            raise RuntimeError("sin resultados")
+
+        queue = queue_module.ImageJobQueue(handler, cache=queue_module.ImageCache(str(tmp_path)))
+        store.enqueue("key", 1, None, "Nebulosa")
+        job = store.claim()[0]
+
+        assert queue.run_job(job) is False
+        assert store.jobs[job["id"]]["status"] == "failed"
+        assert store.jobs[job["id"]]["error"] == "sin resultados"
+
+    def test_force_requeues_done_job(self, monkeypatch, tmp_path):
+        import services.image_job_queue as queue_module
+
+        store = _FakeJobStore()
+        store.install(monkeypatch, queue_module)
+        forced = []
+
+        def handler(job, cache):
+            forced.append(job["force_render"])
+            return "hash", "https://cdn/hash.png"
+
+        queue = queue_module.ImageJobQueue(handler, cache=queue_module.ImageCache(str(tmp_path)))
+        monkeypatch.setattr(queue, "start", lambda: None)
+
+        job = queue.submit("Retrato", player_id=1, character_id=7)
+        queue.run_job(store.claim()[0])
+        assert queue.submit("Retrato", player_id=1, character_id=7)["status"] == "done"
+
+        again = queue.submit("Retrato", player_id=1, character_id=7, force=True)
+        assert again["id"] == job["id"] and again["status"] == "queued"
+        queue.run_job(store.claim()[0])
+
+        assert forced == [False, True]
+        assert store.jobs[job["id"]]["force_render"] is False
+
+    def test_superseded_claim_cannot_finish_job(self, monkeypatch, tmp_path):
+        import services.image_job_queue as queue_module
+
+        store = _FakeJobStore()
+        store.install(monkeypatch, queue_module)
+
+        def handler(job, cache):
+            if job["attempts"] == 1:
+                raise RuntimeError("worker lento")
+            return "hash", "https://cdn/hash.png"
+
+        queue = queue_module.ImageJobQueue(handler, cache=queue_module.ImageCache(str(tmp_path)))
+        store.enqueue("key", 1, 7, "Retrato")
+        slow = store.claim()[0]
+
+        # El trabajo se da por abandonado y otro worker lo reclama y termina
+        store.jobs[slow["id"]]["status"] = "queued"
+        assert queue.run_job(store.claim()[0]) is True
+
+        assert queue.run_job(slow) is False
+        assert store.jobs[slow["id"]]["status"] == "done"
+        assert store.jobs[slow["id"]]["error"] is None
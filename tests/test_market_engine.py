@@ -0,0 +1,247 @@
+# tests/test_market_engine.py
+"""
+Tests del Motor de Mercado (market_engine.py).
+Solo lógica en memoria, sin conexión a base de datos real.
+
+Ejecutar con: pytest tests/test_market_engine.py -v
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _order(order_id, player_id, resource, amount, price, tick=1):
+    from core.models import MarketOrder
+    return MarketOrder(
+        id=order_id, player_id=player_id, resource_type=resource,
+        amount=amount, price_per_unit=price, created_at_tick=tick
+    )
+
+
+class TestSettlementDeltas:
+    """Tests para calculate_settlement_deltas (V26.1)."""
+
+    def test_buy_orders_credit_resource(self):
+        from core.market_engine import calculate_settlement_deltas
+
+        deltas, counts = calculate_settlement_deltas([
+            _order(1, 10, "materiales", 5, 24),
+            _order(2, 10, "materiales", 3, 24),
+        ])
+
+        assert deltas == {10: {"materiales": 8}}
+        assert counts == {10: 2}
+
+    def test_sell_orders_credit_credits(self):
+        from core.market_engine import calculate_settlement_deltas
+
+        deltas, _ = calculate_settlement_deltas([_order(1, 10, "datos", -4, 16)])
+
+        assert deltas == {10: {"creditos": 64}}
+
+    def test_deltas_are_grouped_per_player(self):
+        from core.market_engine import calculate_settlement_deltas
+
+        deltas, counts = calculate_settlement_deltas([
+            _order(1, 10, "componentes", 2, 36),
+            _order(2, 20, "componentes", -2, 24),
+            _order(3, 20, "influencia", 1, 60),
+        ])
+
+        assert deltas[10] == {"componentes": 2}
+        assert deltas[20] == {"creditos": 48, "influencia": 1}
+        assert counts == {10: 1, 20: 2}
+
+
+def _book_order(order_id, player_id, is_buy, price, qty, tick=1):
+    from core.order_book_engine import BookOrder
+    return BookOrder(order_id, player_id, is_buy, price, qty, tick=tick)
+
+
+class TestOrderBookMatching:
+    """Tests para la subasta por lotes del libro de órdenes (V26.2)."""
+
+    def test_uniform_clearing_price(self):
+        from core.order_book_engine import match_resource
+
+        bids = [_book_order(1, 10, True, 24, 5)]
+        asks = [_book_order(2, 20, False, 18, 5)]
+        fills, price = match_resource("materiales", bids, asks)
+
+        assert price == 21
+        assert len(fills) == 1 and fills[0].quantity == 5 and fills[0].price == 21
+        assert bids[0].remaining == 0 and asks[0].remaining == 0
+
+    def test_price_time_priority_and_partial_fill(self):
+        from core.order_book_engine import match_resource
+
+        old_bid = _book_order(1, 10, True, 22, 4, tick=1)
+        new_bid = _book_order(2, 11, True, 22, 4, tick=5)
+        ask = _book_order(3, 20, False, 20, 6)
+        fills, _ = match_resource("materiales", [new_bid, old_bid], [ask])
+
+        assert [f.buy.order_id for f in fills] == [1, 2]
+        assert old_bid.remaining == 0
+        assert new_bid.filled == 2 and new_bid.remaining == 2
+
+    def test_no_cross_no_trades(self):
+        from core.order_book_engine import match_resource
+
+        fills, price = match_resource(
+            "datos", [_book_order(1, 10, True, 10, 3)], [_book_order(2, 20, False, 12, 3)]
+        )
+        assert fills == [] and price is None
+
+    def test_npc_fallback_fills_residual_at_quote(self):
+        from core.order_book_engine import match_resource
+
+        bid = _book_order(1, 10, True, 30, 10)
+        ask = _book_order(2, 20, False, 22, 4)
+        fills, price = match_resource("materiales", [bid], [ask], npc_quote=(16, 24))
+
+        p2p = [f for f in fills if f.sell is not None]
+        npc = [f for f in fills if f.sell is None]
+        assert sum(f.quantity for f in p2p) == 4
+        # El precio uniforme queda acotado a la cotización NPC
+        assert price == 24
+        assert len(npc) == 1 and npc[0].quantity == 6 and npc[0].price == 24
+        assert bid.remaining == 0
+
+    def test_npc_is_preferred_over_worse_player_asks(self):
+        from core.order_book_engine import match_resource
+
+        bid = _book_order(1, 10, True, 40, 5)
+        expensive_ask = _book_order(2, 20, False, 35, 5)
+        fills, price = match_resource("materiales", [bid], [expensive_ask], npc_quote=(16, 24))
+
+        assert price is None
+        assert len(fills) == 1 and fills[0].sell is None and fills[0].price == 24
+        assert expensive_ask.remaining == 5
+
+    def test_fill_deltas_refund_escrow_difference(self):
+        from core.order_book_engine import Fill, calculate_fill_deltas
+
+        buy = _book_order(1, 10, True, 25, 4)
+        sell = _book_order(2, 20, False, 19, 4)
+        deltas = calculate_fill_deltas([
+            Fill("componentes", 4, 22, buy, sell),
+            Fill("componentes", 2, 36, None, _book_order(3, 30, False, 20, 2)),
+        ])
+
+        assert deltas[10] == {"componentes": 4, "creditos": 12}
+        assert deltas[20] == {"creditos": 88}
+        assert deltas[30] == {"creditos": 72}
+
+
+class TestOrderBookTick:
+    """Persistencia de la subasta con órdenes canceladas a mitad de tick (V26.25)."""
+
+    def _install(self, monkeypatch, orders, cancelled_ids):
+        import core.order_book_engine as ob
+
+        calls = {"updates": [], "deltas": [], "trades": []}
+
+        def fake_update(updates):
+            calls["updates"].append(updates)
+            return {u["id"] for u in updates if u["id"] not in cancelled_ids}
+
+        monkeypatch.setattr(ob, "get_open_limit_orders", lambda: orders)
+        monkeypatch.setattr(ob, "get_npc_quotes", lambda: {"materiales": (16, 24)})
+        monkeypatch.setattr(ob, "update_market_orders_bulk", fake_update)
+        monkeypatch.setattr(ob, "apply_player_resource_deltas", lambda d: calls["deltas"].append(d) or True)
+        monkeypatch.setattr(ob, "insert_market_trades", lambda t: calls["trades"].append(t) or True)
+        monkeypatch.setattr(ob, "log_event", lambda *a, **k: None)
+        monkeypatch.setattr(ob, "log_events_batch", lambda *a, **k: None)
+        return ob, calls
+
+    def _limit(self, order_id, player_id, amount, price):
+        from core.models import MarketOrderStatus, MarketOrderType
+        order = _order(order_id, player_id, "materiales", amount, price)
+        order.status = MarketOrderStatus.OPEN
+        order.order_type = MarketOrderType.LIMIT
+        return order
+
+    def test_updates_are_guarded_by_expected_fill(self, monkeypatch):
+        ob, calls = self._install(monkeypatch, [self._limit(1, 10, 5, 24), self._limit(2, 20, -5, 18)], set())
+
+        result = ob.process_order_book_tick(current_tick=7)
+
+        assert result.matched_volume == 5
+        assert all(u["expected_filled"] == 0 for u in calls["updates"][0])
+        assert len(calls["deltas"]) == 1
+
+    def test_cancelled_counterparty_is_not_settled(self, monkeypatch):
+        # Compra 10 @ 30: 4 u. contra la venta #2 (cancelada durante la subasta) + 6 u. del NPC
+        ob, calls = self._install(monkeypatch, [self._limit(1, 10, 10, 30), self._limit(2, 20, -4, 22)], {2})
+
+        result = ob.process_order_book_tick(current_tick=7)
+
+        assert [f.sell for f in result.fills] == [None]
+        assert set(result.touched) == {1}
+        # Corrección del llenado ya escrito de la orden #1: 10 -> 6
+        correction = calls["updates"][1][0]
+        assert correction["id"] == 1 and correction["filled_amount"] == 6
+        assert correction["status"] == "OPEN" and correction["expected_filled"] == 10
+        deltas = calls["deltas"][0]
+        assert 20 not in deltas
+        assert deltas[10]["materiales"] == 6
+        assert len(calls["trades"][0]) == 1
+
+
+class TestPriceTableCache:
+    """Tests para la caché de tablas de precios por prestigio (V26.3)."""
+
+    def test_neutral_prestige_prices(self):
+        from core.market_engine import build_price_table
+
+        table = build_price_table(14)
+        assert table["materiales"]["buy"] == 24
+        assert table["materiales"]["sell"] == 16
+
+    def test_tables_are_shared_per_bucket(self):
+        from core.market_engine import get_price_table
+
+        assert get_price_table(20.001) is get_price_table(20.004)
+        assert get_price_table(20.0) is not get_price_table(20.01)
+
+    def test_prestige_read_once_until_invalidated(self, monkeypatch):
+        import core.market_engine as market
+
+        calls = []
+
+        def fake_prestige(player_id):
+            calls.append(player_id)
+            return 30.0
+
+        monkeypatch.setattr(market, "get_player_prestige_level", fake_prestige)
+        market.invalidate_market_price_cache()
+
+        first = market.calculate_market_prices(7)
+        first["materiales"]["buy"] = -1
+        second = market.calculate_market_prices(7)
+        assert calls == [7]
+        assert second == market.build_price_table(30.0)
+
+        market.invalidate_market_price_cache()
+        market.calculate_market_prices(7)
+        assert calls == [7, 7]
+        market.invalidate_market_price_cache()
+
+    def test_prestige_writes_outside_tick_invalidate(self, monkeypatch, fake_db):
+        import core.market_engine as market
+        import data.faction_repository as factions
+
+        db = fake_db()
+        monkeypatch.setattr(factions, "_get_db", lambda: db)
+        monkeypatch.setattr(market, "get_player_prestige_level", lambda player_id: 30.0)
+
+        market.calculate_market_prices(7)
+        assert factions.update_faction_prestige(1, 20.0)
+        assert market._PLAYER_PRESTIGE_CACHE == {}
+
+        market.calculate_market_prices(7)
+        assert factions.update_faction(1, {"prestigio": 25.0})
+        assert market._PLAYER_PRESTIGE_CACHE == {}
+        assert [payload for _, payload, _ in db.updates] == [{"prestigio": 20.0}, {"prestigio": 25.0}]
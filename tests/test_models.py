@@ -175,3 +175,79 @@ class TestExceptions:
         assert issubclass(DatabaseError, SuperXException)
         assert issubclass(ValidationError, SuperXException)
         assert issubclass(GenesisProtocolError, SuperXException)
+
+
+class TestUnitTransitModel:
+    """Tests for the absolute arrival-tick transit model (V26.8)."""
+
+    def _unit(self, **kwargs):
+        from core.models import UnitSchema
+        return UnitSchema(id=1, player_id=1, name="Alpha", status="TRANSIT", **kwargs)
+
+    def test_ticks_left_derived_from_current_tick(self):
+        unit = self._unit(transit_start_tick=10, transit_end_tick=14)
+
+        assert unit.transit_ticks_left(10) == 4
+        assert unit.transit_ticks_left(13) == 1
+        assert unit.transit_ticks_left(20) == 0
+
+    def test_progress(self):
+        unit = self._unit(transit_start_tick=10, transit_end_tick=14)
+
+        assert unit.transit_progress(10) == 0.0
+        assert unit.transit_progress(12) == 0.5
+        assert unit.transit_progress(99) == 1.0
+
+    def test_legacy_rows_fall_back_to_stored_counter(self):
+        unit = self._unit(transit_ticks_remaining=3)
+
+        assert unit.transit_ticks_left(50) == 3
+        assert unit.transit_progress(50) == 0.0
+
+
+class TestUnitRecord:
+    """Tests for the slotted engine records (V26.13)."""
+
+    def _row(self):
+        return {
+            "id": 7, "player_id": 2, "name": "Bravo", "status": "SPACE", "ring": 3,
+            "skill_digest": "abc", "created_at": "2026-01-01",
+            "members": [
+                {"id": 70, "unit_id": 7, "slot_index": 0, "entity_type": "character",
+                 "entity_id": 5, "name": "Lead", "is_leader": True, "details": {"habilidades": {}}},
+                {"id": 71, "unit_id": 7, "slot_index": 1, "entity_type": "troop",
+                 "entity_id": 9, "name": "Squad"},
+            ],
+        }
+
+    def test_record_is_slotted_with_lazy_members(self):
+        from core.models import UnitRecord, UnitMemberRecord
+
+        record = UnitRecord.from_row(self._row())
+
+        assert not hasattr(record, "__dict__")
+        assert record._members is None
+        assert [m.entity_id for m in record.members] == [5, 9]
+        assert isinstance(record.members[0], UnitMemberRecord)
+        assert record.ring == 3 and record.status == "SPACE"
+        assert record.extra == {"skill_digest": "abc", "created_at": "2026-01-01"}
+
+    def test_round_trip_matches_validated_schema(self):
+        from core.models import UnitSchema, UnitRecord
+
+        schema = UnitSchema.from_dict(self._row())
+        from_row = UnitRecord.from_row(self._row())
+
+        assert from_row.to_schema() == schema
+        assert UnitRecord.from_schema(schema).to_row() == from_row.to_row()
+        assert UnitRecord.from_row(schema).to_schema() == schema
+
+    def test_defaults_for_missing_columns(self):
+        from core.models import UnitRecord, UnitSchema
+
+        record = UnitRecord.from_row({"id": 1, "player_id": 1, "name": "Min"})
+        schema = UnitSchema(id=1, player_id=1, name="Min")
+
+        assert record.ship_count == schema.ship_count
+        assert record.status == schema.status.value
+        assert record.members == [] and record.to_schema() == schema
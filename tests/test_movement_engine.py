@@ -0,0 +1,142 @@
+# tests/test_movement_engine.py
+"""
+Tests del Motor de Movimiento (movement_engine.py).
+Solo lógica en memoria, sin conexión a base de datos real.
+
+Ejecutar con: pytest tests/test_movement_engine.py -v
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _transit_unit(unit_id, dest_system=5, ring=2, status="TRANSIT", dest_data=None):
+    return {
+        "id": unit_id, "name": f"U{unit_id}", "player_id": 10, "status": status,
+        "location_system_id": 1, "transit_destination_system_id": dest_system,
+        "transit_destination_ring": ring, "transit_destination_data": dest_data,
+    }
+
+
+class TestArrivalUpdate:
+    """Tests para build_arrival_update (V26.7)."""
+
+    def test_space_arrival(self):
+        from core.movement_engine import build_arrival_update
+
+        update = build_arrival_update(_transit_unit(1))
+
+        assert update == {
+            "id": 1, "status": "SPACE", "location_system_id": 5,
+            "location_planet_id": None, "location_sector_id": None, "ring": 2,
+        }
+
+    def test_sector_destination_lands_on_ground(self):
+        from core.movement_engine import build_arrival_update
+
+        update = build_arrival_update(
+            _transit_unit(1, ring=None, dest_data='{"planet_id": 7, "sector_id": 70, "ring": 3}')
+        )
+
+        assert update["status"] == "GROUND"
+        assert update["location_planet_id"] == 7 and update["location_sector_id"] == 70
+        assert update["ring"] == 3
+
+    def test_local_transit_keeps_current_system(self):
+        from core.movement_engine import build_arrival_update
+
+        assert build_arrival_update(_transit_unit(1, dest_system=None))["location_system_id"] == 1
+
+
+class TestBulkArrivals:
+    """Tests para process_transit_arrivals en lote (V26.7)."""
+
+    def test_single_rpc_and_batched_logs(self, monkeypatch):
+        import core.movement_engine as engine
+
+        rpc_calls, logs = [], []
+        monkeypatch.setattr(engine, "get_units_in_transit_arriving_at_tick",
+                            lambda tick: [_transit_unit(1), _transit_unit(2), _transit_unit(3)])
+        monkeypatch.setattr(engine, "complete_unit_transits_bulk",
+                            lambda updates, tick: rpc_calls.append(updates) or [1, 2])
+        monkeypatch.setattr(engine, "get_system_names", lambda ids: {5: "Sol"})
+        monkeypatch.setattr(engine, "log_events_batch",
+                            lambda entries, is_error=False: logs.append((is_error, entries)))
+
+        arrivals = engine.process_transit_arrivals(4)
+
+        assert len(rpc_calls) == 1 and len(rpc_calls[0]) == 3
+        assert [a["unit_id"] for a in arrivals] == [1, 2]
+        assert all(a["destination"] == "Sol" for a in arrivals)
+        assert [len(entries) for _, entries in logs] == [2, 1]
+
+
+def _nav_fixture(monkeypatch):
+    """Galaxia mínima: 1-2 lane corta, 2-3 lane larga (distancia por defecto), 4 solo por Warp."""
+    import core.movement_engine as engine
+
+    systems = [
+        {"id": 1, "name": "Alfa", "x": 0, "y": 0},
+        {"id": 2, "name": "Beta", "x": 10, "y": 0},
+        {"id": 3, "name": "Gamma", "x": 31, "y": 0},
+        {"id": 4, "name": "Delta", "x": 0, "y": 25},
+        {"id": 5, "name": "Lejano", "x": 500, "y": 500},
+    ]
+    lanes = [
+        {"id": 100, "system_a_id": 1, "system_b_id": 2, "distancia": 10.0},
+        {"id": 101, "system_a_id": 2, "system_b_id": 3, "distancia": 1.0},
+    ]
+    by_id = {s["id"]: s for s in systems}
+    monkeypatch.setattr(engine, "get_system_coordinates", lambda: systems)
+    monkeypatch.setattr(engine, "get_starlanes_from_db", lambda: lanes)
+    monkeypatch.setattr(engine, "get_system_by_id", lambda sid: by_id.get(sid))
+    engine.invalidate_navigation_index()
+    return engine
+
+
+class TestReachability:
+    """Tests para compute_reachability y el índice de navegación (V26.9)."""
+
+    def test_index_recomputes_default_lane_distance(self, monkeypatch):
+        engine = _nav_fixture(monkeypatch)
+
+        index = engine.build_navigation_index()
+
+        assert (3, 101, 21.0) in index.lanes[2]
+        assert [dest for dest, _ in index.warp_neighbors(1)] == [4]  # 2 es vecino por lane
+
+    def test_direct_legs_match_estimate_travel_time(self, monkeypatch):
+        engine = _nav_fixture(monkeypatch)
+
+        reach = engine.compute_reachability(2, origin_ring=3, ship_count=4, max_ticks=1)
+
+        for leg in reach.direct_legs:
+            expected = engine.estimate_travel_time(
+                2, leg.dest_system_id, 3, leg.dest_ring, ship_count=4, use_boost=leg.use_boost
+            )
+            assert leg.as_estimate() == expected
+
+    def test_expansion_respects_horizon_and_boost(self, monkeypatch):
+        engine = _nav_fixture(monkeypatch)
+
+        reach = engine.compute_reachability(1, ship_count=2, max_ticks=2)
+        assert reach.get(2).ticks == 1
+        assert reach.get(3).ticks == 2 and reach.get(3).energy_cost == 10  # boost 5 x 2 naves
+        assert not reach.is_reachable(4)  # Warp mínimo 3 ticks
+        assert reach.leg_to(4) is not None  # pero la opción directa existe
+
+        no_boost = engine.compute_reachability(1, ship_count=2, max_ticks=2, allow_boost=False)
+        assert not no_boost.is_reachable(3, 0)
+        assert no_boost.is_reachable(2, 1)  # 1 tick lane + 1 tick anillo
+
+    def test_path_and_isochrones(self, monkeypatch):
+        engine = _nav_fixture(monkeypatch)
+
+        reach = engine.compute_reachability(1, max_ticks=5)
+
+        assert [leg.dest_system_id for leg in reach.path_to(3)] == [2, 3]
+        bands = reach.systems_by_tick()
+        assert bands[1] == [2] and bands[2] == [3] and bands[5] == [4]  # Warp 25: 3 + 2 ticks
+        assert not reach.is_reachable(5)
@@ -0,0 +1,51 @@
+# tests/test_recruitment_repository.py
+"""
+Tests del Repositorio de Reclutamiento (recruitment_repository.py).
+Expiración global de candidatos en una sola RPC (V26.18).
+
+Ejecutar con: pytest tests/test_recruitment_repository.py -v
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestGlobalCandidateExpiry:
+    """Una RPC para toda la galaxia, un log por jugador."""
+
+    def test_single_rpc_and_per_player_logs(self, monkeypatch, fake_db):
+        import data.recruitment_repository as repo
+
+        db = fake_db(rpc_result=[
+            {"player_id": 1, "names": ["Ana", "Bruno"]},
+            {"player_id": 2, "names": ["Ceres"]},
+        ])
+        logs = []
+        monkeypatch.setattr(repo, "_get_db", lambda: db)
+        monkeypatch.setattr(repo, "log_events_batch", lambda entries, **k: logs.extend(entries))
+
+        expired = repo.expire_all_old_candidates(current_tick=10)
+
+        assert db.rpc_calls == [("expire_recruitment_candidates", {
+            "p_current_tick": 10,
+            "p_lifespan": repo.CANDIDATE_LIFESPAN_TICKS,
+        })]
+        assert db.tables == []  # La expiración global no consulta tablas
+        assert expired == {1: ["Ana", "Bruno"], 2: ["Ceres"]}
+        assert logs == [
+            ("RECLUTAMIENTO: 2 candidato(s) abandonaron la estación: Ana, Bruno", 1),
+            ("RECLUTAMIENTO: 1 candidato(s) abandonaron la estación: Ceres", 2),
+        ]
+
+    def test_rpc_error_returns_empty(self, monkeypatch, fake_db):
+        import data.recruitment_repository as repo
+
+        db = fake_db(error=RuntimeError("rpc missing"))
+        errors = []
+        monkeypatch.setattr(repo, "_get_db", lambda: db)
+        monkeypatch.setattr(repo, "log_event", lambda msg, *a, **k: errors.append(msg))
+        monkeypatch.setattr(repo, "log_events_batch", lambda entries, **k: None)
+
+        assert repo.expire_all_old_candidates(current_tick=10) == {}
+        assert len(errors) == 1
@@ -0,0 +1,86 @@
+# tests/test_territory_engine.py
+"""
+Tests del Mapa de Control Territorial (territory_engine.py).
+Solo lógica en memoria, sin conexión a base de datos real.
+
+Ejecutar con: pytest tests/test_territory_engine.py -v
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _control_map():
+    from core.territory_engine import ControlMap
+    return ControlMap(
+        tick=5,
+        planets={1: (10, 10), 2: (None, None), 3: (None, 20)},
+        systems={100: 10, 200: None},
+    )
+
+
+class TestControlMap:
+    """Tests para las reglas de control de ControlMap (V26.5)."""
+
+    def test_planet_rules(self):
+        control = _control_map()
+
+        assert control.is_controlled(10, planet_id=1, system_id=100)
+        assert not control.is_controlled(20, planet_id=1, system_id=100)
+        # Neutral = seguro
+        assert control.is_controlled(20, planet_id=2, system_id=100)
+        # Dueño orbital también controla
+        assert control.is_controlled(20, planet_id=3, system_id=100)
+
+    def test_system_rules(self):
+        control = _control_map()
+
+        assert control.is_controlled(10, system_id=100)
+        assert not control.is_controlled(20, system_id=100)
+        assert control.is_controlled(20, system_id=200)
+
+    def test_unknown_location_is_safe(self):
+        control = _control_map()
+
+        assert control.is_controlled(20, planet_id=999, system_id=999)
+        assert control.is_controlled(20)
+
+    def test_unknown_planet_falls_back_to_system(self):
+        control = _control_map()
+
+        assert not control.is_controlled(20, planet_id=999, system_id=100)
+
+    def test_sovereignty_changes_update_loaded_map(self, monkeypatch):
+        import core.territory_engine as territory
+
+        control = _control_map()
+        monkeypatch.setattr(territory, "_CONTROL_MAP", control)
+
+        territory.on_planet_sovereignty_changed(1, 20, 20)
+        territory.on_system_controller_changed(100, None)
+
+        assert territory.get_control_map() is control
+        assert control.is_controlled(20, planet_id=1)
+        assert control.is_controlled(20, system_id=100)
+
+    def test_location_check_outside_tick_reads_fresh_control(self, monkeypatch):
+        import core.territory_engine as territory
+        import core.unit_engine as engine
+        from core.territory_engine import ControlMap
+
+        # Mapa compartido desfasado: el planeta 1 aún figura como del jugador 10
+        monkeypatch.setattr(territory, "_CONTROL_MAP", _control_map())
+        reads = []
+
+        def fresh(planet_id=None, system_id=None):
+            reads.append((planet_id, system_id))
+            return ControlMap(planets={1: (20, 20)}, systems={100: 20})
+
+        monkeypatch.setattr(engine, "build_location_control_map", fresh)
+        location = {"location_planet_id": 1, "location_system_id": 100}
+
+        assert not engine.is_location_controlled(10, location)
+        assert engine.is_location_controlled(10, location, _control_map())
+        assert reads == [(1, 100)]
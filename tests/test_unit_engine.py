@@ -0,0 +1,183 @@
+# tests/test_unit_engine.py
+"""
+Tests del Motor de Unidades (unit_engine.py).
+Solo lógica en memoria, sin conexión a base de datos real.
+
+Ejecutar con: pytest tests/test_unit_engine.py -v
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _member(slot, entity_type, entity_id, is_leader=False):
+    return {"slot_index": slot, "entity_type": entity_type, "entity_id": entity_id, "is_leader": is_leader}
+
+
+class TestSurvivalHelpers:
+    """Tests para los cálculos en memoria de supervivencia (V26.6)."""
+
+    def test_capacity_from_leader_skill(self):
+        from core.unit_engine import capacity_from_leader_skill, leader_skill_from_attributes
+
+        assert capacity_from_leader_skill(0) == 4
+        assert capacity_from_leader_skill(leader_skill_from_attributes({"presencia": 10, "voluntad": 10})) == 8
+        assert capacity_from_leader_skill(500) == 12
+
+    def test_leader_falls_back_to_first_character(self):
+        from core.unit_engine import find_leader_character_id
+
+        members = [_member(2, "character", 7), _member(0, "troop", 1), _member(1, "character", 5)]
+        assert find_leader_character_id(members) == 5
+
+        members.append(_member(3, "character", 9, is_leader=True))
+        assert find_leader_character_id(members) == 9
+        assert find_leader_character_id([_member(0, "troop", 1)]) is None
+
+    def test_desertion_removes_lowest_level_troops_only(self):
+        from core.unit_engine import select_troops_for_desertion
+
+        members = [_member(0, "character", 5)] + [_member(i, "troop", 100 + i) for i in range(1, 7)]
+        levels = {101: 3, 102: 1, 103: 2, 104: 4, 105: 1, 106: 2}
+
+        doomed = select_troops_for_desertion(members, levels, max_capacity=4)
+
+        assert sorted(doomed) == [102, 103, 105]
+        assert select_troops_for_desertion(members, levels, max_capacity=7) == []
+
+
+class TestGlobalTroopSurvival:
+    """Tests para process_global_troop_survival (V26.6)."""
+
+    def test_only_hostile_overcapacity_units_lose_troops(self, monkeypatch):
+        import core.unit_engine as engine
+        from core.territory_engine import ControlMap
+
+        units = [
+            {"id": 1, "player_id": 10, "name": "Hostil", "location_planet_id": 50, "location_system_id": 5},
+            {"id": 2, "player_id": 10, "name": "Propia", "location_planet_id": 60, "location_system_id": 5},
+        ]
+        members = {
+            1: [_member(0, "character", 900)] + [_member(i, "troop", 100 + i) for i in range(1, 6)],
+            2: [_member(i, "troop", 200 + i) for i in range(0, 8)],
+        }
+        deleted = []
+
+        monkeypatch.setattr(engine, "get_all_stationed_units", lambda: units)
+        monkeypatch.setattr(engine, "get_members_for_units", lambda ids: {i: members[i] for i in ids})
+        monkeypatch.setattr(engine, "get_troop_levels", lambda ids: {tid: 1 for tid in ids})
+        monkeypatch.setattr(engine, "get_character_attributes", lambda ids: {900: {"presencia": 1, "voluntad": 1}})
+        monkeypatch.setattr(engine, "delete_troops_bulk", lambda ids: deleted.extend(ids) or list(ids))
+        monkeypatch.setattr(engine, "log_events_batch", lambda entries: None)
+
+        control = ControlMap(planets={50: (20, 20), 60: (10, 10)}, systems={5: None})
+        result = engine.process_global_troop_survival(1, control)
+
+        # Unidad 1: 6 miembros, capacidad 4 -> 2 tropas. Unidad 2 está en territorio propio.
+        assert result["total_removed"] == 2
+        assert result["units_affected"] == [1]
+        assert all(100 < tid < 200 for tid in deleted)
+
+
+def _skilled(slot, entity_id, value, is_leader=False):
+    member = _member(slot, "character", entity_id, is_leader)
+    member["details"] = {"habilidades": {
+        "Detección": value, "Orientación y exploración": value,
+        "Sigilo físico": value, "Evasión de sensores": value,
+    }}
+    return member
+
+
+class TestUnitSkillCache:
+    """Tests para las habilidades colectivas memoizadas (V26.11)."""
+
+    def _patch(self, monkeypatch):
+        import core.unit_engine as engine
+
+        writes = []
+        monkeypatch.setattr(engine, "update_unit_skills", lambda uid, skills, digest=None: writes.append((uid, skills)) or True)
+        engine.invalidate_unit_skill_cache()
+        return engine, writes
+
+    def test_weighted_average_with_leader(self):
+        from core.unit_engine import compute_unit_skills
+
+        skills = compute_unit_skills([_skilled(0, 1, 50, is_leader=True), _skilled(1, 2, 0)])
+
+        assert skills["skill_exploracion"] == 40  # (50*4 + 0) / 5
+        assert compute_unit_skills([_member(0, "troop", 3)])["skill_deteccion"] == 0
+
+    def test_unchanged_roster_skips_compute_and_write(self, monkeypatch):
+        engine, writes = self._patch(monkeypatch)
+        unit = {"id": 1, "members": [_skilled(0, 1, 50, is_leader=True), _skilled(1, 2, 30)]}
+
+        first = engine.calculate_and_update_unit_skills(1, unit)
+        second = engine.calculate_and_update_unit_skills(1, dict(unit))
+
+        assert not first["cached"] and second["cached"]
+        assert second["skills"] == first["skills"]
+        assert len(writes) == 1
+
+    def test_digest_tracks_members_leader_and_stats(self, monkeypatch):
+        engine, writes = self._patch(monkeypatch)
+        base = [_skilled(0, 1, 50, is_leader=True), _skilled(1, 2, 30)]
+
+        engine.calculate_and_update_unit_skills(1, {"id": 1, "members": base})
+        engine.calculate_and_update_unit_skills(1, {"id": 1, "members": [_skilled(0, 1, 50), _skilled(1, 2, 30, is_leader=True)]})
+        engine.calculate_and_update_unit_skills(1, {"id": 1, "members": [_skilled(0, 1, 60, is_leader=True), _skilled(1, 2, 30)]})
+
+        assert len(writes) == 3
+
+    def test_row_already_up_to_date_is_not_rewritten(self, monkeypatch):
+        engine, writes = self._patch(monkeypatch)
+        members = [_skilled(0, 1, 50, is_leader=True)]
+        unit = {"id": 1, "members": members, **engine.compute_unit_skills(members),
+                "skill_digest": engine.unit_skill_digest(members)}
+
+        result = engine.calculate_and_update_unit_skills(1, unit)
+
+        assert result["success"] and writes == []
+
+
+class TestBatchSkillRecompute:
+    """Tests para recompute_changed_unit_skills (V26.12)."""
+
+    def test_only_changed_units_are_written_in_one_call(self, monkeypatch):
+        import core.unit_engine as engine
+
+        stale = [_skilled(0, 1, 50, is_leader=True)]
+        fresh = [_skilled(0, 2, 30, is_leader=True)]
+        units = [
+            {"id": 1, "skill_digest": "old", "skills_version": 4},
+            {"id": 2, "skill_digest": engine.unit_skill_digest(fresh), "skills_version": 2,
+             **engine.compute_unit_skills(fresh)},
+        ]
+        bulk_calls, hydrated = [], []
+        monkeypatch.setattr(engine, "get_units_skill_state", lambda: units)
+        monkeypatch.setattr(engine, "get_members_for_units", lambda ids: {1: stale, 2: fresh})
+        monkeypatch.setattr(engine, "hydrate_unit_members", lambda members: hydrated.append(len(members)))
+        monkeypatch.setattr(engine, "update_unit_skills_bulk", lambda rows: bulk_calls.append(rows) or len(rows))
+        engine.invalidate_unit_skill_cache()
+
+        result = engine.recompute_changed_unit_skills()
+
+        assert result == {"checked": 2, "updated": 1}
+        assert hydrated == [2]
+        assert len(bulk_calls) == 1 and [r["id"] for r in bulk_calls[0]] == [1, 2]
+        assert bulk_calls[0][0]["skill_exploracion"] == 50
+        assert bulk_calls[0][0]["skill_digest"] == engine.unit_skill_digest(stale)
+        assert bulk_calls[0][0]["skills_version"] == 4
+        # Unidad marcada sin cambio de huella: solo se confirma la versión
+        assert bulk_calls[0][1] == {"id": 2, "skills_version": 2}
+
+    def test_no_dirty_units_no_member_reads(self, monkeypatch):
+        import core.unit_engine as engine
+
+        member_reads = []
+        monkeypatch.setattr(engine, "get_units_skill_state", lambda: [])
+        monkeypatch.setattr(engine, "get_members_for_units", lambda ids: member_reads.append(ids) or {})
+
+        assert engine.recompute_changed_unit_skills() == {"checked": 0, "updated": 0}
+        assert member_reads == []
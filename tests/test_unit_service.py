@@ -0,0 +1,187 @@
+# tests/test_unit_service.py
+"""
+Tests del Servicio de Unidades (unit_service.py).
+Transferencias de miembros en lote (V26.14), sin conexión a base de datos real.
+
+Ejecutar con: pytest tests/test_unit_service.py -v
+"""
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _member(slot, entity_type, entity_id, is_leader=False):
+    return {
+        "slot_index": slot, "entity_type": entity_type, "entity_id": entity_id,
+        "name": f"{entity_type}-{entity_id}", "is_leader": is_leader
+    }
+
+
+def _unit(unit_id, members, player_id=1):
+    return {
+        "id": unit_id, "player_id": player_id, "name": f"U{unit_id}", "status": "GROUND",
+        "location_system_id": 1, "location_planet_id": 2, "location_sector_id": 3,
+        "ring": 1, "members": members
+    }
+
+
+class TestPlanMemberTransfer:
+    """Plantilla final calculada en memoria."""
+
+    def test_slots_are_renumbered_contiguously(self):
+        from services.unit_service import plan_member_transfer
+
+        members = {
+            1: [_member(0, "character", 10, is_leader=True), _member(3, "troop", 20), _member(5, "troop", 21)],
+            2: [_member(0, "character", 11, is_leader=True)],
+        }
+        layouts, missing = plan_member_transfer(members, [
+            {"source_unit_id": 1, "target_unit_id": 2, "entity_type": "troop", "entity_id": 20},
+        ])
+
+        assert missing == []
+        assert [(m["entity_id"], m["slot_index"]) for m in layouts[1]] == [(10, 0), (21, 1)]
+        assert [(m["entity_id"], m["slot_index"]) for m in layouts[2]] == [(11, 0), (20, 1)]
+        # La entrada original no se modifica
+        assert members[1][1]["slot_index"] == 3
+
+    def test_leadership_follows_add_remove_rules(self):
+        from services.unit_service import plan_member_transfer
+
+        members = {
+            1: [_member(0, "character", 10, is_leader=True), _member(1, "character", 12)],
+            2: [_member(0, "character", 11, is_leader=True)],
+            3: [],
+        }
+        layouts, _ = plan_member_transfer(members, [
+            {"source_unit_id": 1, "target_unit_id": 2, "entity_type": "character", "entity_id": 10},
+            {"source_unit_id": 1, "target_unit_id": 3, "entity_type": "character", "entity_id": 12},
+        ])
+
+        assert [m["is_leader"] for m in layouts[2]] == [True, False]
+        assert layouts[3][0]["is_leader"] is True
+        assert layouts[1] == []
+
+    def test_unknown_members_are_reported(self):
+        from services.unit_service import plan_member_transfer
+
+        layouts, missing = plan_member_transfer({1: [_member(0, "troop", 20)], 2: []}, [
+            {"source_unit_id": 1, "target_unit_id": 2, "entity_type": "troop", "entity_id": 99},
+            {"source_unit_id": 7, "target_unit_id": 2, "entity_type": "troop", "entity_id": 20},
+        ])
+
+        assert layouts == {}
+        assert len(missing) == 2
+
+
+class TestBulkTransferOperations:
+    """Las operaciones de alto nivel usan una RPC y un recálculo por unidad."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        import services.unit_service as service
+
+        recorded = {"rpc": [], "skills": []}
+
+        def fake_transfer(layouts):
+            recorded["rpc"].append(layouts)
+            return list(layouts.keys())
+
+        def fake_skills(unit_id, unit_data=None):
+            recorded["skills"].append((unit_id, unit_data))
+            return {"success": True}
+
+        monkeypatch.setattr(service, "transfer_unit_members_bulk", fake_transfer)
+        monkeypatch.setattr(service, "calculate_and_update_unit_skills", fake_skills)
+        monkeypatch.setattr(service, "log_event", lambda *a, **k: None)
+        return recorded
+
+    def test_merge_moves_all_members_in_one_call(self, monkeypatch, calls):
+        import services.unit_service as service
+
+        units = {
+            1: _unit(1, [_member(0, "character", 10, is_leader=True)]),
+            2: _unit(2, [_member(0, "character", 11, is_leader=True), _member(1, "troop", 20)]),
+            3: _unit(3, [_member(0, "character", 12, is_leader=True)]),
+        }
+        monkeypatch.setattr(service, "get_unit_by_id", lambda uid: units.get(uid))
+
+        result = service.merge_units([1, 2, 3], "Fusion", player_id=1)
+
+        assert result["success"] is True
+        assert result["dissolved_units"] == [2, 3]
+        assert len(calls["rpc"]) == 1
+        assert [m["entity_id"] for m in calls["rpc"][0][1]] == [10, 11, 20, 12]
+        assert [m["slot_index"] for m in calls["rpc"][0][1]] == [0, 1, 2, 3]
+        assert sorted(uid for uid, _ in calls["skills"]) == [1, 2, 3]
+        # El recálculo recibe la plantilla final, sin releer la unidad
+        assert all(data is not None for _, data in calls["skills"])
+
+    def test_split_creates_unit_and_transfers_once(self, monkeypatch, calls):
+        import services.unit_service as service
+
+        source = _unit(1, [
+            _member(0, "character", 10, is_leader=True),
+            _member(1, "character", 11),
+            _member(2, "troop", 20),
+        ])
+        created = {}
+
+        def fake_create(player_id, name, location_data):
+            created.update(location_data)
+            return {"id": 5, "player_id": player_id, "name": name}
+
+        monkeypatch.setattr(service, "get_unit_by_id", lambda uid: source if uid == 1 else None)
+        monkeypatch.setattr(service, "create_unit", fake_create)
+
+        result = service.split_unit(1, "Nueva", [
+            {"entity_type": "character", "entity_id": 11},
+            {"entity_type": "troop", "entity_id": 20},
+        ], player_id=1)
+
+        assert result["success"] is True
+        assert result["new_unit_id"] == 5
+        assert created["ring"] == 1
+        assert len(calls["rpc"]) == 1
+        new_layout = calls["rpc"][0][5]
+        assert [(m["entity_id"], m["slot_index"], m["is_leader"]) for m in new_layout] == [
+            (11, 0, True), (20, 1, False)
+        ]
+        assert sorted(uid for uid, _ in calls["skills"]) == [1, 5]
+
+    def test_failed_rpc_reports_no_moves(self, monkeypatch, calls):
+        import services.unit_service as service
+
+        units = {
+            1: _unit(1, [_member(0, "character", 10, is_leader=True), _member(1, "troop", 20)]),
+            2: _unit(2, [_member(0, "character", 11, is_leader=True)]),
+        }
+        monkeypatch.setattr(service, "get_unit_by_id", lambda uid: units.get(uid))
+        monkeypatch.setattr(service, "transfer_unit_members_bulk", lambda layouts: [])
+
+        result = service.agile_grouping([1], 2, [
+            {"source_unit_id": 1, "entity_type": "troop", "entity_id": 20},
+        ], player_id=1)
+
+        assert result["success"] is False
+        assert result["moved_count"] == 0
+        assert calls["skills"] == []
+
+    def test_same_unit_transfers_are_not_counted(self, monkeypatch, calls):
+        import services.unit_service as service
+
+        units = {
+            1: _unit(1, [_member(0, "character", 10, is_leader=True), _member(1, "troop", 20)]),
+            2: _unit(2, [_member(0, "character", 11, is_leader=True), _member(1, "troop", 21)]),
+        }
+        monkeypatch.setattr(service, "get_unit_by_id", lambda uid: units.get(uid))
+
+        result = service.agile_grouping([1, 2], 2, [
+            {"source_unit_id": 1, "entity_type": "troop", "entity_id": 20},
+            {"source_unit_id": 2, "entity_type": "troop", "entity_id": 21},
+        ], player_id=1)
+
+        assert result["success"] is True
+        assert result["moved_count"] == 1
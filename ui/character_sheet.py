@@ -3,6 +3,7 @@
 Interfaz de Ficha de Personaje.
 Renderiza los datos hidratados del personaje con soporte para niveles de conocimiento.
 Actualizado v5.1.0: Biografía consolidada de 3 niveles y limpieza de campos legacy.
+Actualizado V26.21: Retrato IA asíncrono con polling de estado.
 """
 
 import streamlit as st
@@ -80,6 +81,69 @@ def _safe_get_data(stats, keys_v2, keys_v1_fallback, default_val=None):
             
     return default_val if default_val is not None else {}
 
+PORTRAIT_PROMPT = "Retrato oficial de servicio, plano medio, mirada a cámara."
+
+
+def _render_portrait(char_id: int, player_id: int, portrait_url: str, caption: str,
+                     can_edit: bool = False, has_portrait: bool = False):
+    """
+    V26.21: Retrato IA en segundo plano. El botón encola el trabajo y un
+    fragmento consulta su estado sin bloquear la sesión.
+    V26.25: Con retrato existente el botón fuerza una regeneración.
+    V26.25: El retrato de cabecera vive en el fragmento; el resultado del trabajo
+    (URL o error) se guarda en session_state y se sigue mostrando tras cerrar el
+    trabajo, incluso si los datos del roster aún traen el portrait_url anterior.
+    """
+    job_state_key = f"portrait_job_{char_id}"
+    has_portrait = has_portrait or bool(st.session_state.get(f"portrait_url_{char_id}"))
+    image_slot = st.container()
+
+    if can_edit:
+        label = "🔄 Regenerar retrato" if has_portrait else "🎨 Generar retrato"
+        if st.button(label, key=f"btn_portrait_{char_id}", use_container_width=True):
+            from services.image_service import submit_tactical_image_job
+            job = submit_tactical_image_job(PORTRAIT_PROMPT, player_id, char_id, force=has_portrait)
+            st.session_state.pop(f"portrait_error_{char_id}", None)
+            if job:
+                st.session_state[job_state_key] = job["id"]
+            else:
+                st.error("No se pudo encolar el retrato.")
+
+    # Solo se consulta periódicamente mientras hay un trabajo en curso
+    run_every = 2 if st.session_state.get(job_state_key) else None
+    with image_slot:
+        st.fragment(_portrait_view, run_every=run_every)(char_id, portrait_url, caption)
+
+
+def _portrait_view(char_id: int, portrait_url: str, caption: str):
+    from services.image_service import get_image_job_status
+    from data.image_job_repository import IMAGE_JOB_DONE, IMAGE_JOB_FAILED, IMAGE_JOB_QUEUED
+
+    job_state_key = f"portrait_job_{char_id}"
+    url_key = f"portrait_url_{char_id}"
+    error_key = f"portrait_error_{char_id}"
+
+    job_id = st.session_state.get(job_state_key)
+    status = None
+    if job_id:
+        job = get_image_job_status(job_id) or {}
+        status = job.get("status")
+        if status == IMAGE_JOB_DONE:
+            st.session_state.pop(job_state_key, None)
+            if job.get("public_url"):
+                st.session_state[url_key] = job["public_url"]
+        elif status == IMAGE_JOB_FAILED:
+            st.session_state.pop(job_state_key, None)
+            st.session_state[error_key] = job.get("error") or "error desconocido"
+
+    st.image(st.session_state.get(url_key) or portrait_url, caption=caption)
+
+    if st.session_state.get(error_key):
+        st.error(f"Retrato fallido: {st.session_state[error_key]}")
+    elif st.session_state.get(job_state_key):
+        st.caption("⏳ Retrato en cola..." if status == IMAGE_JOB_QUEUED else "🖌️ Renderizando retrato...")
+
+
 def render_character_sheet(character_data, player_id):
     """
     Renderiza la ficha de personaje con estética unificada.
@@ -120,6 +184,7 @@ def render_character_sheet(character_data, player_id):
 
     # Retrato: Prioridad absoluta a la URL de la base de datos
     portrait_url = character_data.get('portrait_url')
+    has_portrait = bool(portrait_url)
     if not portrait_url:
         portrait_url = f"https://ui-avatars.com/api/?name={nombre.replace(' ', '+')}&background=random"
 
@@ -127,7 +192,11 @@ def render_character_sheet(character_data, player_id):
     col_avatar, col_basic = st.columns([1, 3])
     
     with col_avatar:
-        st.image(portrait_url, caption=rango)
+        _render_portrait(
+            char_id, player_id, portrait_url, rango,
+            can_edit=character_data.get('player_id') == player_id,
+            has_portrait=has_portrait
+        )
 
     with col_basic:
         loyalty_color = "#e74c3c" if lealtad < 30 else "#f1c40f" if lealtad < 70 else "#2ecc71"
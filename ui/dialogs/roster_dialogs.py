@@ -38,6 +38,12 @@ def view_character_dialog(char: Any, player_id: int):
     """Modal para ver ficha completa de personaje."""
     # Convertir a dict si es modelo para el renderizador legacy
     char_dict = char.model_dump() if hasattr(char, 'model_dump') else char
+    # V26.17: El roster usa la proyección hot; la ficha carga stats_json bajo demanda
+    if isinstance(char_dict, dict) and "stats_json" not in char_dict:
+        from data.character_repository import get_character_by_id
+        full_char = get_character_by_id(get_prop(char_dict, "id"))
+        if full_char:
+            char_dict = {**full_char, **char_dict}
     render_character_sheet(char_dict, player_id)
 
 
@@ -73,7 +73,8 @@ def render_comando_page():
     with st.spinner("Sincronizando red táctica..."):
         try:
             player_id = player.id
-            all_chars = get_all_player_characters(player_id)
+            # V26.17: Proyección hot (sin bio/narrativa); la ficha la carga bajo demanda
+            all_chars = get_all_player_characters(player_id, projection="hot")
             
             # Filter candidates (safety check)
             active_chars = [c for c in all_chars if get_prop(c, "status_id") != CharacterStatus.CANDIDATE.value]
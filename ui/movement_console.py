@@ -14,11 +14,11 @@ V22.0: Refactor integral de firmas de funciones y limpieza de UI.
 V22.1: Sincronización con MovementEngine V16.1 y Robustez en UI de Construcción.
 V22.2: Fix Navegación Orbital - Redirección correcta de menús para sectores Orbitales.
 V22.3: Fix TypeError en cálculo de distancia WARP (uso de math.sqrt in-line).
+V26.9: Opciones de anillo/Starlane/Warp desde un mapa de alcance precalculado + pestaña de isócronas.
 """
 
 import streamlit as st
 import json
-import math  # Import necesario para cálculo de distancias
 from typing import Dict, Any, List, Optional, Tuple
 
 # Nueva importación para gestión de estado
@@ -29,8 +29,7 @@ from data.unit_repository import get_unit_by_id
 from data.world_repository import (
     get_system_by_id,
     get_planets_by_system_id,
-    get_starlanes_from_db,
-    get_all_systems_from_db,
+    get_system_names,
     get_world_state,
 )
 from data.planet_repository import get_planet_sectors_status, get_planet_by_id, has_urban_sector
@@ -42,11 +41,12 @@ from core.movement_engine import (
     estimate_travel_time,
     initiate_movement,
     find_starlane_between,
-    # calculate_euclidean_distance # Eliminado: Se usa math.sqrt localmente para evitar overhead DB
+    ReachabilityMap,
+    compute_reachability,
 )
 from core.movement_constants import (
     RING_STELLAR, RING_MIN, RING_MAX, MAX_LOCAL_MOVES_PER_TURN, 
-    WARP_MAX_DISTANCE
+    REACHABILITY_DEFAULT_MAX_TICKS
 )
 from core.detection_constants import DISORIENTED_MAX_LOCAL_MOVES
 from services.unit_service import toggle_stealth_mode
@@ -159,9 +159,8 @@ def _get_location_display(unit: UnitSchema) -> Dict[str, str]:
         world_state = get_world_state()
         current_tick = world_state.get('current_tick', 0)
         
-        real_ticks_remaining = unit.transit_ticks_remaining # Fallback
-        if unit.transit_end_tick:
-            real_ticks_remaining = max(0, unit.transit_end_tick - current_tick)
+        # V26.8: Derivado del tick actual (transit_end_tick es absoluto)
+        real_ticks_remaining = unit.transit_ticks_left(current_tick)
             
         origin_sys = get_system_by_id(unit.transit_origin_system_id)
         
@@ -272,26 +271,6 @@ def _render_cost_display(estimate: Dict[str, Any], ship_count: int = 1):
         """, unsafe_allow_html=True)
 
 
-def _get_starlanes_from_system(system_id: int) -> List[Dict[str, Any]]:
-    """Obtiene starlanes conectadas a un sistema."""
-    all_starlanes = get_starlanes_from_db()
-    connected = []
-    for lane in all_starlanes:
-        if lane.get('system_a_id') == system_id:
-            connected.append({
-                'id': lane['id'],
-                'dest_system_id': lane.get('system_b_id'),
-                'distance': lane.get('distancia', 0)
-            })
-        elif lane.get('system_b_id') == system_id:
-            connected.append({
-                'id': lane['id'],
-                'dest_system_id': lane.get('system_a_id'),
-                'distance': lane.get('distancia', 0)
-            })
-    return connected
-
-
 def _get_valid_rings_for_selector(system_id: int) -> List[int]:
     """Retorna lista de anillos válidos (poblados o estelar) para el sistema."""
     planets = get_planets_by_system_id(system_id)
@@ -494,6 +473,7 @@ def _render_ring_options(
     Opciones cuando la unidad está en un anillo.
     V14.0: Filtro Warp > 30 y opción Boost para Starlanes.
     V14.6: Uso de miembros reales para cálculo de flota.
+    V26.9: Todas las estimaciones salen de un único compute_reachability (sin consultas por destino).
     """
     st.markdown("#### Opciones de Movimiento")
 
@@ -506,13 +486,17 @@ def _render_ring_options(
     planets_in_system = get_planets_by_system_id(system_id)
     planets_in_ring = [p for p in planets_in_system if p.get('orbital_ring') == current_ring]
 
-    starlanes = _get_starlanes_from_system(system_id)
+    # V26.9: Una expansión cubre anillos, starlanes, warp e isócronas
+    reach = compute_reachability(system_id, current_ring, real_ship_count)
+    starlane_legs = reach.direct('starlane')
+    warp_legs = reach.direct('warp')
+    system_names = get_system_names(sorted({sid for sid, _ in reach.nodes} | {leg.dest_system_id for leg in reach.direct_legs}))
 
     selected_dest = None
     selected_type = None
     use_boost = False
 
-    tab1, tab2, tab3, tab4 = st.tabs(["Órbita Planeta", "Navegación Intra-Sistema", "Starlane", "WARP"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Órbita Planeta", "Navegación Intra-Sistema", "Starlane", "WARP", "Alcance"])
 
     with tab1:
         st.markdown("**🪐 Entrar en Órbita de Planeta**")
@@ -571,14 +555,9 @@ def _render_ring_options(
                 key="select_ring_space"
             )
 
-            if selected_ring is not None:
-                estimate = estimate_travel_time(
-                    system_id, 
-                    system_id, 
-                    origin_ring=current_ring, 
-                    dest_ring=selected_ring,
-                    ship_count=real_ship_count
-                )
+            ring_leg = reach.leg_to(system_id, selected_ring) if selected_ring is not None else None
+            if ring_leg:
+                estimate = ring_leg.as_estimate()
                 
                 with action_container:
                     _render_cost_display(estimate, real_ship_count)
@@ -598,12 +577,11 @@ def _render_ring_options(
         st.markdown("**🛤️ Usar Starlane**")
         action_container = st.container()
 
-        if starlanes:
-            lane_options = {}
-            for lane in starlanes:
-                dest_sys = get_system_by_id(lane['dest_system_id'])
-                dest_name = dest_sys.get('name', f"Sistema {lane['dest_system_id']}") if dest_sys else f"Sistema {lane['dest_system_id']}"
-                lane_options[lane['dest_system_id']] = f"{dest_name} (dist: {lane['distance']:.1f})"
+        if starlane_legs:
+            lane_options = {
+                leg.dest_system_id: f"{system_names[leg.dest_system_id]} (dist: {leg.distance:.1f})"
+                for leg in starlane_legs
+            }
 
             selected_lane_dest = st.selectbox(
                 "Sistema destino",
@@ -616,14 +594,9 @@ def _render_ring_options(
                 # Checkbox para Boost
                 boost_check = st.checkbox("🔥 Sobrecarga de Motores (Boost)", key="boost_check_space")
                 
-                estimate = estimate_travel_time(
-                    system_id, 
-                    selected_lane_dest, 
-                    current_ring, 
-                    0, 
-                    ship_count=real_ship_count,
-                    use_boost=boost_check
-                )
+                lane_leg = reach.leg_to(selected_lane_dest, RING_STELLAR, use_boost=boost_check) \
+                    or reach.leg_to(selected_lane_dest, RING_STELLAR)
+                estimate = lane_leg.as_estimate()
                 
                 with action_container:
                     if estimate.get('can_boost') and not boost_check:
@@ -647,34 +620,11 @@ def _render_ring_options(
         st.markdown("**🌌 Salto WARP (Sin Starlane)**")
         action_container = st.container()
         
-        all_systems = get_all_systems_from_db()
-        # Filtrar solo sistemas a distancia válida (WARP_MAX_DISTANCE)
-        valid_warp_targets = []
-        
-        current_sys = get_system_by_id(system_id)
-        
-        if current_sys:
-             for s in all_systems:
-                 if s['id'] == system_id:
-                     continue
-                 
-                 # FIX V22.3: Cálculo in-line de distancia euclidiana
-                 # Se elimina el uso incorrecto de calculate_euclidean_distance(x,y,x,y)
-                 # Usamos math.sqrt directamente con coordenadas para evitar llamadas extra a DB
-                 dist = math.sqrt(
-                     (s.get('x', 0) - current_sys.get('x', 0))**2 + 
-                     (s.get('y', 0) - current_sys.get('y', 0))**2
-                 )
-                 
-                 if dist <= WARP_MAX_DISTANCE:
-                     valid_warp_targets.append({
-                         'id': s['id'],
-                         'name': s['name'],
-                         'dist': dist
-                     })
-        
-        if valid_warp_targets:
-            warp_options = {s['id']: f"{s['name']} (Dist: {s['dist']:.1f})" for s in valid_warp_targets}
+        if warp_legs:
+            warp_options = {
+                leg.dest_system_id: f"{system_names[leg.dest_system_id]} (Dist: {leg.distance:.1f})"
+                for leg in warp_legs
+            }
             
             selected_warp_dest = st.selectbox(
                 "Sistema destino (Warp)",
@@ -684,7 +634,7 @@ def _render_ring_options(
             )
             
             if selected_warp_dest:
-                st.info(f"Distancia de Salto: {warp_options[selected_warp_dest].split('Dist: ')[1]}")
+                _render_cost_display(reach.leg_to(selected_warp_dest).as_estimate(), real_ship_count)
                 
                 if st.button("Iniciar Salto WARP", type="primary", key="btn_warp_space", use_container_width=True):
                      selected_dest = DestinationData(
@@ -697,11 +647,56 @@ def _render_ring_options(
         else:
             st.warning("No hay sistemas dentro del rango de salto WARP.")
 
+    with tab5:
+        _render_reachability(reach, system_id, current_ring, real_ship_count, system_names)
+
     if selected_dest and selected_type:
         return (selected_dest, selected_type, use_boost)
     return None
 
 
+def _render_reachability(
+    reach: ReachabilityMap,
+    system_id: int,
+    current_ring: int,
+    ship_count: int,
+    system_names: Dict[int, str]
+):
+    """V26.9: Isócronas de la unidad (sistemas alcanzables por tick, encadenando órdenes)."""
+    st.markdown("**🧭 Alcance de la Unidad**")
+    horizon = st.slider(
+        "Horizonte (ticks)", min_value=1, max_value=12,
+        value=REACHABILITY_DEFAULT_MAX_TICKS, key="reach_horizon"
+    )
+    if horizon != reach.max_ticks:
+        reach = compute_reachability(system_id, current_ring, ship_count, max_ticks=horizon)
+        missing = {sid for sid, _ in reach.nodes} - set(system_names)
+        if missing:
+            system_names = {**system_names, **get_system_names(sorted(missing))}
+
+    bands = reach.systems_by_tick()
+    if not bands:
+        st.info("Ningún otro sistema es alcanzable en este horizonte.")
+        return
+
+    for ticks, system_ids in bands.items():
+        rows = []
+        for sid in system_ids:
+            node = reach.get(sid)
+            path = reach.path_to(sid)
+            route = " → ".join(
+                system_names.get(leg.dest_system_id, f"Sistema {leg.dest_system_id}")
+                for leg in path if leg.route_type != 'inter_ring'
+            )
+            rows.append(
+                f"- **{system_names.get(sid, f'Sistema {sid}')}** | "
+                f"Energía: {node.energy_cost if node else '?'} | {route}"
+            )
+        with st.expander(f"⏱️ {ticks} Tick(s) — {len(system_ids)} sistema(s)", expanded=ticks == min(bands)):
+            st.markdown("\n".join(rows))
+    st.caption(f"Rutas óptimas en tiempo (desempate por energía) para {ship_count} naves.")
+
+
 def render_movement_console(unit_id: int):
     """
     Renderiza la consola de movimiento y acciones tácticas para una unidad.
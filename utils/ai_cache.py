@@ -0,0 +1,344 @@
+# utils/ai_cache.py
+"""
+Caché de Respuestas de IA (V26.22).
+Clave exacta = sha256(modelo, system prompt, contents, config/herramientas, scope).
+Memoria LRU con TTL + backend opcional en disco (JSON por clave).
+
+Uso:
+    - CachedAIClient envuelve el cliente GenAI del ServiceContainer. Solo las llamadas
+      que pasan cache=True a models.generate_content consultan la caché.
+    - get_ai_response_cache().get_or_set(...) para cachear resultados compuestos.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.app_constants import (
+    AI_CACHE_ENABLED,
+    AI_CACHE_TTL_SECONDS,
+    AI_CACHE_MAX_ENTRIES,
+    AI_CACHE_DIR,
+)
+
+logger = logging.getLogger("superx")
+
+_KIND_JSON = "json"
+_KIND_GENAI = "genai_response"
+
+
+def _canonical(value: Any) -> Any:
+    """Forma JSON estable de prompts, contents y configs (modelos pydantic de google.genai)."""
+    if hasattr(value, "model_dump"):
+        return _canonical(value.model_dump(mode="json", exclude_none=True))
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+def make_cache_key(
+    model: str,
+    contents: Any,
+    config: Any = None,
+    system_prompt: Optional[str] = None,
+    scope: Optional[str] = None
+) -> str:
+    """
+    Clave exacta. 'config' incluye system_instruction y tools; 'scope' permite
+    añadir el estado del que dependen las herramientas (p. ej. tick actual).
+    """
+    payload = {
+        "model": model,
+        "system_prompt": system_prompt,
+        "contents": _canonical(contents),
+        "config": _canonical(config),
+        "scope": scope,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class AICacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def to_dict(self, size: int) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "disk_hits": self.disk_hits,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": size,
+        }
+
+
+class AIResponseCache:
+    """LRU en memoria con TTL por entrada y persistencia opcional en disco."""
+
+    def __init__(
+        self,
+        max_entries: int = AI_CACHE_MAX_ENTRIES,
+        default_ttl: float = AI_CACHE_TTL_SECONDS,
+        disk_dir: Optional[str] = AI_CACHE_DIR,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self.disk_dir = disk_dir or None
+        self.clock = clock
+        self.stats = AICacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- API pública ---
+
+    def get(self, key: str) -> Optional[Any]:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._entries[key]
+                self.stats.expirations += 1
+
+        value = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self.stats.disk_hits += 1
+        return value
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = self.clock() + (self.default_ttl if ttl is None else ttl)
+        self._remember(key, expires_at, value)
+        with self._lock:
+            self.stats.stores += 1
+        self._disk_put(key, expires_at, value)
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Devuelve la entrada vigente o calcula y guarda (None no se cachea)."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = compute()
+        if value is not None:
+            self.put(key, value, ttl)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.disk_dir, name))
+                    except OSError:
+                        pass
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return self.stats.to_dict(len(self._entries))
+
+    # --- Memoria ---
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    # --- Disco ---
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_put(self, key: str, expires_at: float, value: Any) -> None:
+        if not self.disk_dir:
+            return
+        encoded = _encode(value)
+        if encoded is None:
+            return  # No serializable: solo memoria
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"expires_at": expires_at, **encoded}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._disk_path(key))
+        except Exception as e:
+            logger.warning(f"AI cache: no se pudo escribir en disco: {e}")
+
+    def _disk_get(self, key: str, now: float) -> Optional[Any]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        expires_at = record.get("expires_at", 0)
+        if expires_at <= now:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            with self._lock:
+                self.stats.expirations += 1
+            return None
+
+        value = _decode(record)
+        if value is not None:
+            self._remember(key, expires_at, value)
+        return value
+
+
+def _encode(value: Any) -> Optional[Dict[str, Any]]:
+    if hasattr(value, "model_dump"):
+        try:
+            return {"kind": _KIND_GENAI, "value": value.model_dump(mode="json", exclude_none=True)}
+        except Exception:
+            return None
+    try:
+        json.dumps(value)
+        return {"kind": _KIND_JSON, "value": value}
+    except (TypeError, ValueError):
+        return None
+
+
+def _decode(record: Dict[str, Any]) -> Optional[Any]:
+    kind = record.get("kind")
+    if kind == _KIND_JSON:
+        return record.get("value")
+    if kind == _KIND_GENAI:
+        try:
+            from google.genai import types
+            return types.GenerateContentResponse.model_validate(record.get("value") or {})
+        except Exception:
+            return None
+    return None
+
+
+# --- ENVOLTORIO DEL CLIENTE GENAI ---
+
+def _is_cacheable_response(response: Any, config: Any) -> bool:
+    """
+    Respuesta con texto y, si se pidió JSON (response_mime_type), JSON válido.
+    V26.25: Un JSON truncado no se cachea; el reintento del llamador pide uno nuevo.
+    """
+    text = getattr(response, "text", None) if response is not None else None
+    if not text:
+        return False
+    mime_type = config.get("response_mime_type") if isinstance(config, dict) \
+        else getattr(config, "response_mime_type", None)
+    if mime_type == "application/json":
+        try:
+            json.loads(text)
+        except ValueError:
+            return False
+    return True
+
+
+class _CachedModels:
+    """Proxy de client.models: generate_content admite cache / cache_ttl / cache_scope."""
+
+    def __init__(self, models: Any, cache_provider: Callable[[], AIResponseCache]):
+        self._models = models
+        self._cache_provider = cache_provider
+
+    def generate_content(
+        self,
+        *,
+        model: str,
+        contents: Any,
+        config: Any = None,
+        cache: bool = False,
+        cache_ttl: Optional[float] = None,
+        cache_scope: Optional[str] = None,
+        **kwargs
+    ) -> Any:
+        if not (cache and AI_CACHE_ENABLED):
+            return self._models.generate_content(model=model, contents=contents, config=config, **kwargs)
+
+        response_cache = self._cache_provider()
+        key = make_cache_key(model, contents, config, scope=cache_scope)
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self._models.generate_content(model=model, contents=contents, config=config, **kwargs)
+        # Solo se cachean respuestas con texto (los errores/bloqueos se reintentan)
+        if _is_cacheable_response(response, config):
+            response_cache.put(key, response, cache_ttl)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._models, name)
+
+
+class CachedAIClient:
+    """Envoltorio transparente del cliente GenAI (chats, generate_images, etc. sin cambios)."""
+
+    def __init__(self, client: Any, cache: Optional[AIResponseCache] = None):
+        self._client = client
+        self._cache = cache
+        self.models = _CachedModels(client.models, self._get_cache)
+
+    def _get_cache(self) -> AIResponseCache:
+        return self._cache or get_ai_response_cache()
+
+    @property
+    def wrapped(self) -> Any:
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+_AI_RESPONSE_CACHE: Optional[AIResponseCache] = None
+_AI_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def get_ai_response_cache() -> AIResponseCache:
+    """Caché compartida del proceso."""
+    global _AI_RESPONSE_CACHE
+    with _AI_RESPONSE_CACHE_LOCK:
+        if _AI_RESPONSE_CACHE is None:
+            _AI_RESPONSE_CACHE = AIResponseCache()
+        return _AI_RESPONSE_CACHE
+
+
+def get_ai_cache_metrics() -> Dict[str, Any]:
+    return get_ai_response_cache().metrics()
@@ -0,0 +1,495 @@
+# utils/ai_governor.py
+"""
+Gobernador de Llamadas de IA (V26.23).
+Control compartido para todas las llamadas a Gemini (tick, acciones diferidas,
+búsqueda de candidatos y sesiones de UI):
+    - Token bucket (ritmo sostenido + ráfaga).
+    - Semáforo de llamadas simultáneas (max in-flight).
+    - Reintentos con backoff exponencial + jitter, limitados por un presupuesto compartido.
+    - Circuit breaker: con el circuito abierto las llamadas fallan al instante con
+      AICircuitOpenError y ServiceContainer.is_ai_available() devuelve False, de modo
+      que cada llamador usa su fallback existente (identidad procedural, texto estático...).
+    - Métricas: profundidad de cola, en vuelo, contadores e histogramas de latencia y espera.
+
+Uso:
+    GovernedAIClient envuelve el cliente GenAI (models.generate_content, models.generate_images
+    y chat.send_message pasan por get_ai_governor().call).
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from config.app_constants import (
+    AI_RATE_PER_SECOND,
+    AI_RATE_BURST,
+    AI_MAX_IN_FLIGHT,
+    AI_ACQUIRE_TIMEOUT_SECONDS,
+    AI_MAX_RETRIES,
+    AI_BACKOFF_BASE_SECONDS,
+    AI_BACKOFF_MAX_SECONDS,
+    AI_RETRY_BUDGET_RATIO,
+    AI_RETRY_BUDGET_MAX,
+    AI_BREAKER_FAILURE_THRESHOLD,
+    AI_BREAKER_COOLDOWN_SECONDS,
+)
+
+logger = logging.getLogger("superx")
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32)
+
+_TRANSIENT_CODES = {408, 429, 500, 502, 503, 504}
+_TRANSIENT_MARKERS = ("RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED", "TIMEOUT", "TIMED OUT")
+
+
+class AIGovernorError(RuntimeError):
+    """Llamada rechazada por el gobernador (no llegó al proveedor)."""
+
+
+class AICircuitOpenError(AIGovernorError):
+    """Circuito abierto: el proveedor se considera caído, usar fallback."""
+
+
+class AIGovernorTimeoutError(AIGovernorError):
+    """No se obtuvo turno (token + slot) dentro del tiempo de espera."""
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    Errores que justifican reintento y cuentan para el circuit breaker:
+    cuota (429), 5xx del proveedor, timeouts y fallos de conexión.
+    Los 4xx restantes (prompt inválido, bloqueos) se propagan sin reintentar.
+    """
+    if isinstance(exc, AIGovernorError):
+        return False
+    code = getattr(exc, "code", None)
+    if isinstance(code, int):
+        return code in _TRANSIENT_CODES
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    name = type(exc).__name__
+    if "Timeout" in name or "Connect" in name:
+        return True
+    message = str(exc).upper()
+    return any(marker in message for marker in _TRANSIENT_MARKERS)
+
+
+# --- PRIMITIVAS ---
+
+class TokenBucket:
+    """Token bucket bloqueante: 'rate' tokens/segundo, hasta 'capacity' acumulados."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(capacity, 1.0)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill(self.clock())
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait = (1.0 - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            self.sleep(wait)
+
+
+class RetryBudget:
+    """
+    Presupuesto compartido de reintentos: cada llamada aporta 'ratio' y cada
+    reintento consume 1. Evita que una caída del proveedor multiplique la carga.
+    """
+
+    def __init__(self, ratio: float = AI_RETRY_BUDGET_RATIO, max_balance: float = AI_RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self) -> float:
+        return self._balance
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1.0:
+                return False
+            self._balance -= 1.0
+            return True
+
+
+class CircuitBreaker:
+    """closed -> open tras N fallos transitorios seguidos; open -> half_open tras el cooldown (una sonda)."""
+
+    def __init__(
+        self,
+        failure_threshold: int = AI_BREAKER_FAILURE_THRESHOLD,
+        cooldown_seconds: float = AI_BREAKER_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == BREAKER_OPEN and self.clock() - self._opened_at >= self.cooldown_seconds:
+                return BREAKER_HALF_OPEN
+            return self._state
+
+    def is_open(self) -> bool:
+        """True mientras el circuito rechaza llamadas (half_open ya admite una sonda)."""
+        return self.state == BREAKER_OPEN
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == BREAKER_CLOSED:
+                return True
+            if self._state == BREAKER_OPEN:
+                if self.clock() - self._opened_at < self.cooldown_seconds:
+                    return False
+                self._state = BREAKER_HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != BREAKER_CLOSED:
+                logger.info("AI governor: circuito cerrado, proveedor recuperado.")
+            self._state = BREAKER_CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == BREAKER_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != BREAKER_OPEN:
+                    logger.warning(f"AI governor: circuito abierto tras {self._failures} fallos.")
+                self._state = BREAKER_OPEN
+                self._opened_at = self.clock()
+
+    def release(self) -> None:
+        """Libera la sonda half_open sin veredicto (la llamada no llegó al proveedor)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class Histogram:
+    """Histograma acumulado estilo Prometheus (le_<límite> + sum/count)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            index = len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    index = i
+                    break
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            cumulative = 0
+            buckets: Dict[str, int] = {}
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[f"le_{bound:g}"] = cumulative
+            buckets["le_inf"] = self._count
+            return {"buckets": buckets, "sum": round(self._sum, 3), "count": self._count}
+
+
+# --- GOBERNADOR ---
+
+class AIGovernor:
+    """Punto único por el que pasan las llamadas al proveedor de IA."""
+
+    def __init__(
+        self,
+        rate_per_second: float = AI_RATE_PER_SECOND,
+        burst: float = AI_RATE_BURST,
+        max_in_flight: int = AI_MAX_IN_FLIGHT,
+        acquire_timeout: float = AI_ACQUIRE_TIMEOUT_SECONDS,
+        max_retries: int = AI_MAX_RETRIES,
+        backoff_base: float = AI_BACKOFF_BASE_SECONDS,
+        backoff_max: float = AI_BACKOFF_MAX_SECONDS,
+        retry_budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.bucket = TokenBucket(rate_per_second, burst, clock=clock, sleep=sleep)
+        self.max_in_flight = max(1, max_in_flight)
+        self.acquire_timeout = acquire_timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_budget = retry_budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.clock = clock
+        self.sleep = sleep
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._in_flight = 0
+        self._counters = {
+            "calls": 0, "successes": 0, "failures": 0, "retries": 0,
+            "rejected_open": 0, "rejected_timeout": 0, "budget_exhausted": 0,
+        }
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queue_wait = Histogram(LATENCY_BUCKETS)
+        self.queue_depth = Histogram(QUEUE_DEPTH_BUCKETS)
+
+    # --- API pública ---
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Ejecuta fn(*args, **kwargs) respetando ritmo, concurrencia, reintentos y circuito.
+        Lanza AICircuitOpenError / AIGovernorTimeoutError sin tocar al proveedor.
+        """
+        self._count("calls")
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self._count("rejected_open")
+                raise AICircuitOpenError("Circuito de IA abierto: usando fallback.")
+
+            if not self._acquire_slot():
+                self.breaker.release()
+                self._count("rejected_timeout")
+                raise AIGovernorTimeoutError(f"Sin turno de IA en {self.acquire_timeout}s.")
+
+            started = self.clock()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._release_slot(started)
+                if not is_transient_error(e):
+                    # El proveedor respondió: el circuito no se penaliza
+                    self.breaker.record_success()
+                    self._count("failures")
+                    raise
+                self.breaker.record_failure()
+                if not self._should_retry(attempt):
+                    self._count("failures")
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"AI governor: error transitorio ({e}); reintento {attempt + 1} en {delay:.2f}s.")
+                self._count("retries")
+                attempt += 1
+                self.sleep(delay)
+                continue
+
+            self._release_slot(started)
+            self.breaker.record_success()
+            self._count("successes")
+            return result
+
+    def is_open(self) -> bool:
+        return self.breaker.is_open()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {
+                "queue_depth": self._queue_depth,
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                **self._counters,
+            }
+        snapshot.update({
+            "breaker": self.breaker.state,
+            "retry_budget": round(self.retry_budget.balance, 2),
+            "latency_seconds": self.latency.to_dict(),
+            "queue_wait_seconds": self.queue_wait.to_dict(),
+            "queue_depth_histogram": self.queue_depth.to_dict(),
+        })
+        return snapshot
+
+    # --- Internos ---
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _acquire_slot(self) -> bool:
+        """Token + slot en vuelo. La espera se mide como tiempo en cola."""
+        with self._lock:
+            self.queue_depth.observe(self._queue_depth)
+            self._queue_depth += 1
+        queued_at = self.clock()
+        acquired = False
+        try:
+            if not self.bucket.acquire(self.acquire_timeout):
+                return False
+            remaining = self.acquire_timeout - (self.clock() - queued_at)
+            acquired = self._slots.acquire(timeout=max(0.0, remaining))
+            return acquired
+        finally:
+            with self._lock:
+                self._queue_depth -= 1
+                if acquired:
+                    self._in_flight += 1
+            if acquired:
+                self.queue_wait.observe(self.clock() - queued_at)
+
+    def _release_slot(self, started: float) -> None:
+        self.latency.observe(self.clock() - started)
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _should_retry(self, attempt: int) -> bool:
+        if attempt >= self.max_retries or self.breaker.is_open():
+            return False
+        if not self.retry_budget.withdraw():
+            self._count("budget_exhausted")
+            return False
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        """Backoff exponencial con 'equal jitter': [d/2, d], d = base * 2^intento."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+# --- ENVOLTORIO DEL CLIENTE GENAI ---
+
+class _GovernedChat:
+    """Proxy de un chat: cada send_message es una llamada gobernada."""
+
+    def __init__(self, chat: Any, governor_provider: Callable[[], AIGovernor]):
+        self._chat = chat
+        self._governor_provider = governor_provider
+
+    def send_message(self, *args, **kwargs) -> Any:
+        return self._governor_provider().call(self._chat.send_message, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._chat, name)
+
+
+class _GovernedChats:
+    def __init__(self, chats: Any, governor_provider: Callable[[], AIGovernor]):
+        self._chats = chats
+        self._governor_provider = governor_provider
+
+    def create(self, *args, **kwargs) -> _GovernedChat:
+        return _GovernedChat(self._chats.create(*args, **kwargs), self._governor_provider)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._chats, name)
+
+
+class _GovernedModels:
+    def __init__(self, models: Any, governor_provider: Callable[[], AIGovernor]):
+        self._models = models
+        self._governor_provider = governor_provider
+
+    def generate_content(self, *args, **kwargs) -> Any:
+        return self._governor_provider().call(self._models.generate_content, *args, **kwargs)
+
+    def generate_images(self, *args, **kwargs) -> Any:
+        return self._governor_provider().call(self._models.generate_images, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._models, name)
+
+
+class GovernedAIClient:
+    """Envoltorio transparente del cliente GenAI; el resto de atributos pasa sin cambios."""
+
+    def __init__(self, client: Any, governor: Optional[AIGovernor] = None):
+        self._client = client
+        self._governor = governor
+        self.models = _GovernedModels(client.models, self._get_governor)
+        self.chats = _GovernedChats(client.chats, self._get_governor)
+
+    def _get_governor(self) -> AIGovernor:
+        return self._governor or get_ai_governor()
+
+    @property
+    def wrapped(self) -> Any:
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+_AI_GOVERNOR: Optional[AIGovernor] = None
+_AI_GOVERNOR_LOCK = threading.Lock()
+
+
+def get_ai_governor() -> AIGovernor:
+    """Gobernador compartido del proceso (tick + sesiones de UI)."""
+    global _AI_GOVERNOR
+    with _AI_GOVERNOR_LOCK:
+        if _AI_GOVERNOR is None:
+            _AI_GOVERNOR = AIGovernor()
+        return _AI_GOVERNOR
+
+
+def is_ai_circuit_open() -> bool:
+    return get_ai_governor().is_open()
+
+
+def get_ai_governor_metrics() -> Dict[str, Any]:
+    return get_ai_governor().metrics()